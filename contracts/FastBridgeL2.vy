@@ -24,7 +24,9 @@ exports: (
 )
 
 interface IMessenger:
-    def initiate_fast_bridge(_to: address, _amount: uint256, _lz_fee_refund: address): payable
+    def initiate_fast_bridge(
+        _to: address, _amount: uint256, _lz_fee_refund: address, _transfer_id: bytes32=empty(bytes32)
+    ): payable
     def quote_message_fee() -> uint256: view
 
 event SetMinAmount:
@@ -39,6 +41,42 @@ event SetBridger:
 event SetMessenger:
     messenger: IMessenger
 
+event SetRedundantMessengers:
+    messengers: DynArray[IMessenger, MAX_REDUNDANT_MESSENGERS]
+
+event InitiateRedundant:
+    transfer_id: indexed(bytes32)
+    receiver: indexed(address)
+    amount: uint256
+
+event RedundantFailed:
+    transfer_id: indexed(bytes32)
+    messenger: indexed(IMessenger)
+
+event Queue:
+    id: indexed(uint256)
+    sender: indexed(address)
+    receiver: address
+    amount: uint256
+    interval: uint256
+
+event ReleaseQueued:
+    id: indexed(uint256)
+    receiver: address
+    amount: uint256
+
+event CancelQueued:
+    id: indexed(uint256)
+    sender: indexed(address)
+    amount: uint256
+
+struct Queued:
+    sender: address
+    receiver: address
+    amount: uint256
+    interval: uint256  # Released from the start of this INTERVAL
+    prepaid: uint256  # msg.value paid in advance for bridger and messenger of this part
+
 
 CRVUSD: public(immutable(IERC20))
 VAULT: public(immutable(address))
@@ -50,6 +88,21 @@ bridged: public(HashMap[uint256, uint256])  # Amounts of bridge coins per INTERV
 
 bridger: public(IBridger)
 messenger: public(IMessenger)
+# FastBridgeVault takes up to 4 minters, one is the main messenger's
+MAX_REDUNDANT_MESSENGERS: constant(uint256) = 3
+# Also send every fast message through these, tagged with a transfer id so VAULT mints on the first arrival only
+redundant_messengers: public(DynArray[IMessenger, MAX_REDUNDANT_MESSENGERS])
+transfer_nonce: public(uint256)  # Transfers sent through redundant messengers
+
+MAX_QUEUE_INTERVALS: constant(uint256) = 8  # How far ahead bridge_queued reserves limit, 14 days
+MAX_RELEASE: constant(uint256) = 64
+REFUND_GAS: constant(uint256) = 50_000  # For native refunds to senders of queued parts, enough for smart wallets
+ADDRESS_MASK: constant(uint256) = 2**160 - 1
+# Parts waiting for their INTERVAL, ordered by interval. Packed in 3 slots instead of 5 of Queued:
+# sender | interval << 160, receiver | prepaid << 160, amount
+queue_parts: HashMap[uint256, uint256[3]]
+queue_head: public(uint256)  # Next id to release
+queue_tail: public(uint256)  # Next id to queue
 
 
 @deploy
@@ -88,9 +141,12 @@ def __init__(_crvusd: IERC20, _vault: address, _bridger: IBridger, _messenger: I
 def messaging_cost() -> uint256:
     """
     Messaging cost to pass message to VAULT (Fast Bridge)
-    @return Native token amount needed for messenger
+    @return Native token amount needed for messenger and redundant messengers
     """
-    return staticcall self.messenger.quote_message_fee()
+    cost: uint256 = staticcall self.messenger.quote_message_fee()
+    for messenger: IMessenger in self.redundant_messengers:
+        cost += staticcall messenger.quote_message_fee()
+    return cost
 
 
 @internal
@@ -155,16 +211,278 @@ def bridge(_token: IERC20, _to: address, _amount: uint256, _min_amount: uint256=
     extcall self.bridger.bridge(CRVUSD, VAULT, amount, self.min_amount, value=bridger_cost)
 
     # Message for VAULT to release amount while waiting
-    extcall self.messenger.initiate_fast_bridge(_to, amount, msg.sender, value=messaging_cost)
+    unspent: uint256 = self._initiate(_to, amount, msg.sender, messaging_cost)
 
     # Refund the rest of the msg.value
-    if msg.value > bridger_cost + messaging_cost:
-        send(msg.sender, msg.value - bridger_cost - messaging_cost)
+    if msg.value + unspent > bridger_cost + messaging_cost:
+        send(msg.sender, msg.value + unspent - bridger_cost - messaging_cost)
 
     log IBridger.Bridge(token=_token, sender=msg.sender, receiver=_to, amount=amount)
     return amount
 
 
+@internal
+@pure
+def _unpack(_part: uint256[3]) -> Queued:
+    return Queued(
+        sender=convert(_part[0] & ADDRESS_MASK, address),
+        receiver=convert(_part[1] & ADDRESS_MASK, address),
+        amount=_part[2],
+        interval=_part[0] >> 160,
+        prepaid=_part[1] >> 160,
+    )
+
+
+@external
+@view
+def queue(_id: uint256) -> Queued:
+    """
+    @notice Part of a `bridge_queued`, only the interval is kept once released or cancelled
+    @param _id Id from `queue_head` (next to release) to `queue_tail` (exclusive)
+    """
+    return self._unpack(self.queue_parts[_id])
+
+
+@internal
+def _initiate(_to: address, _amount: uint256, _sender: address, _messaging_cost: uint256) -> uint256:
+    """
+    @notice Send the fast message through the messenger, and through redundant messengers if any
+    @dev The same transfer id goes on every path, so the fastest one mints and the others are ignored by VAULT.
+        Each messenger is paid its own quote. A redundant messenger that reverts is skipped, so one broken
+        transport doesn't stop bridging
+    @return Part of `_messaging_cost` not spent, quotes of redundant messengers that reverted
+    """
+    redundant: DynArray[IMessenger, MAX_REDUNDANT_MESSENGERS] = self.redundant_messengers
+    if len(redundant) == 0:
+        extcall self.messenger.initiate_fast_bridge(_to, _amount, _sender, value=_messaging_cost)
+        return 0
+
+    nonce: uint256 = self.transfer_nonce
+    transfer_id: bytes32 = keccak256(abi_encode(chain.id, self, nonce))
+    self.transfer_nonce = nonce + 1
+    cost: uint256 = staticcall self.messenger.quote_message_fee()
+    extcall self.messenger.initiate_fast_bridge(_to, _amount, _sender, transfer_id, value=cost)
+    left: uint256 = _messaging_cost - cost
+    for messenger: IMessenger in redundant:
+        cost = staticcall messenger.quote_message_fee()
+        success: bool = raw_call(
+            messenger.address,
+            abi_encode(
+                _to, _amount, _sender, transfer_id,
+                method_id=method_id("initiate_fast_bridge(address,uint256,address,bytes32)"),
+            ),
+            value=cost,
+            revert_on_failure=False,
+        )
+        if success:
+            left -= cost
+        else:
+            log RedundantFailed(transfer_id=transfer_id, messenger=messenger)
+    log InitiateRedundant(transfer_id=transfer_id, receiver=_to, amount=_amount)
+    return left
+
+
+@internal
+def _bridge(
+    _sender: address,
+    _to: address,
+    _amount: uint256,
+    _min_amount: uint256,
+    _bridger_cost: uint256,
+    _messaging_cost: uint256,
+) -> uint256:
+    """
+    @notice Native bridge and fast message of a queued part, the same calls `bridge` makes inline
+    @return Part of `_messaging_cost` not spent
+    """
+    extcall self.bridger.bridge(CRVUSD, VAULT, _amount, _min_amount, value=_bridger_cost)
+    unspent: uint256 = self._initiate(_to, _amount, _sender, _messaging_cost)
+    log IBridger.Bridge(token=CRVUSD, sender=_sender, receiver=_to, amount=_amount)
+    return unspent
+
+
+@internal
+@pure
+def _split(_amount: uint256, _available: uint256, _min_amount: uint256) -> uint256:
+    """
+    @notice Part of `_amount` to bridge within `_available`, so that neither the part nor the rest is
+        smaller than `_min_amount`
+    @return Part to bridge, 0 if none
+    """
+    part: uint256 = min(_amount, _available)
+    if part < _amount:
+        part = min(part, _amount - _min_amount)
+    if part < _min_amount:
+        return 0
+    return part
+
+
+@internal
+def _refund(_to: address, _value: uint256) -> uint256:
+    """
+    @notice Send native token to the sender of a queued part, which must not be able to block the queue
+    @return Amount not sent because `_to` rejected it
+    """
+    if _value == 0:
+        return 0
+    if raw_call(_to, b"", value=_value, gas=REFUND_GAS, revert_on_failure=False):
+        return 0
+    return _value
+
+
+@internal
+def _cancel(_id: uint256, _queued: Queued) -> uint256:
+    """
+    @notice Return crvUSD and prepaid native token of a queued part to its sender and free the limit it reserved
+    @return Prepaid native token the sender rejected
+    """
+    self.queue_parts[_id] = [_queued.interval << 160, 0, 0]  # Parts queued later are still scheduled after it
+    self.bridged[_queued.interval] -= _queued.amount
+    assert extcall CRVUSD.transfer(_queued.sender, _queued.amount, default_return_value=True)
+    log CancelQueued(id=_id, sender=_queued.sender, amount=_queued.amount)
+    return self._refund(_queued.sender, _queued.prepaid)
+
+
+@external
+@payable
+@nonreentrant
+def bridge_queued(_token: IERC20, _to: address, _amount: uint256) -> uint256:
+    """
+    @notice Bridge crvUSD in full: what the limit allows now is bridged now, the rest is queued against the limits
+        of the next intervals and bridged by `release_queued` once each interval starts
+    @dev msg.value has to cover `cost()` for every part, see `queue` for the parts and their intervals.
+        Queued parts are never scheduled before parts queued earlier, and none is smaller than `min_amount`.
+    @param _token The token to bridge (only crvUSD is supported)
+    @param _to The receiver on destination chain
+    @param _amount The amount of crvUSD to deposit, 2^256-1 for the whole available balance
+    @return Amount bridged now
+    """
+    assert _token == CRVUSD, "Not supported"
+    assert _to != empty(address), "Bad receiver"
+
+    amount: uint256 = _amount
+    if amount == max_value(uint256):
+        amount = min(staticcall CRVUSD.balanceOf(msg.sender), staticcall CRVUSD.allowance(msg.sender, self))
+    min_amount: uint256 = self.min_amount
+    assert amount >= min_amount, "Amount too small"
+    assert extcall CRVUSD.transferFrom(msg.sender, self, amount, default_return_value=True)
+
+    bridger_cost: uint256 = self.bridger_cost()
+    messaging_cost: uint256 = self.messaging_cost()
+    cost: uint256 = bridger_cost + messaging_cost
+    assert cost < 2**96  # Packed with the receiver
+    interval: uint256 = block.timestamp // INTERVAL
+
+    now: uint256 = self._split(amount, self._get_available(), min_amount)
+    paid: uint256 = 0
+    if now > 0:
+        self.bridged[interval] += now
+        paid = cost - self._bridge(msg.sender, _to, now, min_amount, bridger_cost, messaging_cost)
+
+    # Reserve the rest in the next intervals, after everything queued so far
+    remaining: uint256 = amount - now
+    tail: uint256 = self.queue_tail
+    if tail > self.queue_head:
+        interval = max(interval, (self.queue_parts[tail - 1][0] >> 160) - 1)
+    for i: uint256 in range(MAX_QUEUE_INTERVALS):
+        if remaining == 0:
+            break
+        interval += 1
+        part: uint256 = self._split(remaining, self._get_available(interval * INTERVAL), min_amount)
+        if part == 0:
+            continue  # Not worth a bridge transaction
+        self.bridged[interval] += part
+        self.queue_parts[tail] = [
+            convert(msg.sender, uint256) | (interval << 160),
+            convert(_to, uint256) | (cost << 160),
+            part,
+        ]
+        log Queue(id=tail, sender=msg.sender, receiver=_to, amount=part, interval=interval)
+        tail += 1
+        remaining -= part
+        paid += cost
+    assert remaining == 0, "Queue too long"
+    self.queue_tail = tail
+
+    assert msg.value >= paid, "Insufficient msg.value"
+    if msg.value > paid:
+        send(msg.sender, msg.value - paid)
+    return now
+
+
+@external
+@payable
+@nonreentrant
+def release_queued(_n: uint256 = 1) -> uint256:
+    """
+    @notice Bridge up to `_n` queued parts whose interval has started, anyone can call
+    @dev Each part pays its bridger and messenger with what was prepaid for it. msg.value covers the shortfall
+        if costs went up and is returned to the caller, what is left of the prepaid amount goes to the part's sender.
+        A part smaller than `min_amount` (raised after it was queued) is returned to its sender instead.
+    @param _n Maximum number of parts to go through, at most MAX_RELEASE
+    @return Number of parts released
+    """
+    head: uint256 = self.queue_head
+    tail: uint256 = self.queue_tail
+    interval: uint256 = block.timestamp // INTERVAL
+    min_amount: uint256 = self.min_amount
+    bridger_cost: uint256 = self.bridger_cost()
+    messaging_cost: uint256 = self.messaging_cost()
+    cost: uint256 = bridger_cost + messaging_cost
+    budget: uint256 = msg.value
+    released: uint256 = 0
+
+    for i: uint256 in range(min(_n, MAX_RELEASE), bound=MAX_RELEASE):
+        if head == tail:
+            break
+        queued: Queued = self._unpack(self.queue_parts[head])
+        if queued.interval > interval:
+            break
+        if queued.amount == 0:  # Cancelled
+            head += 1
+            continue
+        if queued.amount < min_amount:
+            budget += self._cancel(head, queued)
+            head += 1
+            continue
+
+        shortfall: uint256 = cost - min(cost, queued.prepaid)
+        assert budget >= shortfall, "Insufficient msg.value"
+        self.queue_parts[head] = [queued.interval << 160, 0, 0]
+        unspent: uint256 = self._bridge(
+            queued.sender, queued.receiver, queued.amount, min_amount, bridger_cost, messaging_cost
+        )
+        # Fees of messengers that failed pay back the caller's share first
+        back: uint256 = min(unspent, shortfall)
+        budget = budget - shortfall + back
+        budget += self._refund(queued.sender, queued.prepaid + shortfall + unspent - back - cost)
+        log ReleaseQueued(id=head, receiver=queued.receiver, amount=queued.amount)
+        head += 1
+        released += 1
+    self.queue_head = head
+
+    if budget > 0:
+        send(msg.sender, budget)
+    return released
+
+
+@external
+@nonreentrant
+def cancel_queued(_id: uint256):
+    """
+    @notice Return a queued part to its sender, e.g. one that can't be bridged. Callable by the sender and owner
+    @dev Prepaid native token the sender rejects goes to the caller
+    @param _id Id of the part, see `queue`
+    """
+    queued: Queued = self._unpack(self.queue_parts[_id])
+    assert queued.amount > 0, "Not queued"
+    assert msg.sender == queued.sender or msg.sender == ownable.owner, "Access denied"
+
+    rejected: uint256 = self._cancel(_id, queued)
+    if rejected > 0:
+        send(msg.sender, rejected)
+
+
 @external
 @view
 def allowed_to_bridge(_ts: uint256=block.timestamp) -> (uint256, uint256):
@@ -236,3 +554,19 @@ def set_messenger(_messenger: IMessenger):
 
     self.messenger = _messenger
     log SetMessenger(messenger=_messenger)
+
+
+@external
+def set_redundant_messengers(_messengers: DynArray[IMessenger, MAX_REDUNDANT_MESSENGERS]):
+    """
+    @notice Set messengers that send every fast message in addition to `messenger`, empty to send through it alone
+    @dev VAULT must accept their peers as minters and support transfer ids
+    @param _messengers Contracts passing bridge tx fast, each on its own transport
+    """
+    ownable._check_owner()
+    for messenger: IMessenger in _messengers:
+        assert messenger != empty(IMessenger), "Bad messenger value"
+        assert messenger != self.messenger, "Duplicate messenger"
+
+    self.redundant_messengers = _messengers
+    log SetRedundantMessengers(messengers=_messengers)
@@ -34,6 +34,10 @@ event Minted:
     receiver: indexed(address)
     amount: uint256
 
+event DuplicateIgnored:
+    transfer_id: indexed(bytes32)
+    minter: indexed(address)
+
 event RugScheduled:
     status: bool
 
@@ -63,8 +67,13 @@ CRVUSD: public(constant(IERC20)) = IERC20(0xf939E0A03FB07F59A73314E73794Be0E57ac
 MINTER: public(constant(IMinter)) = IMinter(0xC9332fdCB1C491Dcc683bAe86Fe3cb70360738BC)
 
 balanceOf: public(HashMap[address, uint256])
+delivered: public(HashMap[bytes32, bool])  # keccak256(abi_encode(transfer_id, receiver, amount)) already minted
 
-fee: public(uint256)  # 10^18 precision
+FEE_BITS: constant(uint256) = 64
+FEE_MASK: constant(uint256) = 2 ** FEE_BITS - 1
+# Fees accrued since the last claim in the upper bits, fee with 10^18 precision in the lower FEE_BITS,
+# so a mint from the messenger reads and writes one slot for the fee
+fee_state: uint256
 fee_receiver: public(address)
 
 rug_scheduled: public(bool)
@@ -98,6 +107,24 @@ def __init__(_ownership: address, _emergency: address, _minters: DynArray[addres
     log SetFeeReceiver(fee_receiver=0xa2Bcd1a4Efbd04B63cd03f5aFf2561106ebCCE00)
 
 
+@external
+@view
+def fee() -> uint256:
+    """
+    @notice Fee on bridge transactions with 10^18 precision
+    """
+    return self.fee_state & FEE_MASK
+
+
+@external
+@view
+def fees_accrued() -> uint256:
+    """
+    @notice Fees not yet claimed by `fee_receiver`, paid out on its next `mint`
+    """
+    return self.fee_state >> FEE_BITS
+
+
 @view
 def _need_to_rug() -> bool:
     """
@@ -136,30 +163,49 @@ def schedule_rug() -> bool:
 
 @external
 @nonreentrant
-def mint(_receiver: address, _amount: uint256) -> uint256:
+def mint(_receiver: address, _amount: uint256, _transfer_id: bytes32=empty(bytes32)) -> uint256:
     """
     @notice Receive bridged crvUSD
     @param _receiver Receiver of crvUSD
     @param _amount Amount of crvUSD to mint (0 if not minter)
+    @param _transfer_id Id of a transfer sent through several minters, the first arrival mints
+        and later ones with the same receiver and amount are ignored. Empty for a transfer sent
+        through one minter
     @return Amount of crvUSD minted to receiver
     """
-    assert not (self.is_killed[empty(address)] or self.is_killed[msg.sender])
+    assert not self.is_killed[empty(address)]
 
-    amount: uint256 = self.balanceOf[_receiver]
+    owed: uint256 = self.balanceOf[_receiver]
+    amount: uint256 = owed
     if access_control.hasRole[MINTER_ROLE][msg.sender]:
+        assert not self.is_killed[msg.sender]
+        if _transfer_id != empty(bytes32):
+            # Keyed on the whole transfer, a reused id with another receiver or amount still mints
+            delivery: bytes32 = keccak256(abi_encode(_transfer_id, _receiver, _amount))
+            if self.delivered[delivery]:
+                log DuplicateIgnored(transfer_id=_transfer_id, minter=msg.sender)
+                return 0
+            self.delivered[delivery] = True
         amount += _amount
 
-        # Apply fee
-        fee: uint256 = _amount * self.fee // 10 ** 18
-        fee_receiver: address = self.fee_receiver
-        if _receiver != fee_receiver:
-            self.balanceOf[fee_receiver] += fee
+        # Apply fee, accrued for fee_receiver to claim later
+        fee_state: uint256 = self.fee_state
+        fee: uint256 = _amount * (fee_state & FEE_MASK) // 10 ** 18
+        if fee != 0 and _receiver != self.fee_receiver:
+            self.fee_state = fee_state + (fee << FEE_BITS)
             amount -= fee
+    elif _receiver == self.fee_receiver:
+        # Claim accrued fees
+        fee_state: uint256 = self.fee_state
+        if fee_state > FEE_MASK:
+            self.fee_state = fee_state & FEE_MASK
+            amount += fee_state >> FEE_BITS
 
     available: uint256 = min(self._get_balance(), amount)
     if available != 0:
         assert extcall CRVUSD.transfer(_receiver, available, default_return_value=True)
-    self.balanceOf[_receiver] = amount - available
+    if amount - available != owed:
+        self.balanceOf[_receiver] = amount - available
 
     log Minted(receiver=_receiver, amount=available)
     return available
@@ -187,14 +233,15 @@ def set_fee(_new_fee: uint256):
     access_control._check_role(access_control.DEFAULT_ADMIN_ROLE, msg.sender)
     assert _new_fee <= 10 ** 18
 
-    self.fee = _new_fee
+    fee_state: uint256 = self.fee_state
+    self.fee_state = fee_state - (fee_state & FEE_MASK) + _new_fee
     log SetFee(fee=_new_fee)
 
 
 @external
 def set_fee_receiver(_new_fee_receiver: address):
     """
-    @notice Set new fee receiver
+    @notice Set new fee receiver, fees accrued and not claimed yet go to the new receiver
     @param _new_fee_receiver Fee receiver address
     """
     access_control._check_role(access_control.DEFAULT_ADMIN_ROLE, msg.sender)
@@ -0,0 +1,50 @@
+# pragma version 0.4.3
+
+"""
+@title WithdrawalExecutor
+@notice Executes many native bridge withdrawals to L1 in one transaction,
+    e.g. Arbitrum `Outbox.executeTransaction` or OP `OptimismPortal.finalizeWithdrawalTransaction`
+@dev Both calls are permissionless, so the executor has no owner and holds no funds.
+    A failing withdrawal is logged and skipped instead of reverting the batch.
+@license MIT
+@author curve.fi
+@custom:version 0.0.1
+@custom:security security@curve.fi
+"""
+
+version: public(constant(String[8])) = "0.0.1"
+
+MAX_CALLS: constant(uint256) = 16
+MAX_CALLDATA: constant(uint256) = 2048  # executeTransaction and finalizeWithdrawalTransaction take ~1KB
+
+event Executed:
+    target: indexed(address)
+    index: uint256
+    success: bool
+
+struct Call:
+    target: address
+    gas: uint256  # 0 to forward all gas left
+    data: Bytes[MAX_CALLDATA]
+
+
+@external
+def execute(_calls: DynArray[Call, MAX_CALLS]) -> DynArray[bool, MAX_CALLS]:
+    """
+    @notice Execute withdrawal calls one by one
+    @param _calls Withdrawal calls with the gas each of them is given
+    @return Success of every call
+    """
+    results: DynArray[bool, MAX_CALLS] = []
+    for i: uint256 in range(len(_calls), bound=MAX_CALLS):
+        call: Call = _calls[i]
+        success: bool = False
+        if call.gas == 0:
+            success = raw_call(call.target, call.data, revert_on_failure=False)
+        else:
+            # Less gas than the call needs would fail it for a reason other than the withdrawal itself
+            assert msg.gas * 63 // 64 > call.gas, "Out of gas"
+            success = raw_call(call.target, call.data, gas=call.gas, revert_on_failure=False)
+        log Executed(target=call.target, index=i, success=success)
+        results.append(success)
+    return results
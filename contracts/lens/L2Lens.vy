@@ -0,0 +1,80 @@
+# pragma version 0.4.3
+
+"""
+@title L2Lens
+@notice Read-only view of FastBridgeL2 with everything needed to quote a bridge in one call
+@dev Holds no state, one deployment serves every FastBridgeL2 on the chain
+@license MIT
+@author curve.fi
+@custom:version 0.0.1
+@custom:security security@curve.fi
+"""
+
+version: public(constant(String[8])) = "0.0.1"
+
+from ethereum.ercs import IERC20
+from contracts.bridgers import IBridger
+
+interface IFastBridgeL2:
+    def CRVUSD() -> IERC20: view
+    def min_amount() -> uint256: view
+    def limit() -> uint256: view
+    def bridged(_interval: uint256) -> uint256: view
+    def allowed_to_bridge(_ts: uint256) -> (uint256, uint256): view
+    def bridger() -> IBridger: view
+    def cost() -> uint256: view
+
+INTERVAL: constant(uint256) = 86400 * 7 // 4  # FastBridgeL2.INTERVAL
+
+struct Quote:
+    timestamp: uint256
+    min_amount: uint256  # allowed_to_bridge, (0, 0) when bridging is not possible now
+    max_amount: uint256
+    available: uint256  # Limit left in the current interval
+    limit: uint256
+    next_interval: uint256  # Timestamp when `available` resets to `limit`
+    bridger_cost: uint256  # Native token for the native bridge
+    messaging_cost: uint256  # Native token for the fast message, through every messenger
+    cost: uint256  # msg.value of bridge()
+    balance: uint256  # crvUSD of the user
+    allowance: uint256  # crvUSD of the user approved to FastBridgeL2
+
+
+@external
+@view
+def quote(_fast_bridge: IFastBridgeL2, _user: address=empty(address)) -> Quote:
+    """
+    @notice Quote a bridge through `_fast_bridge`
+    @param _fast_bridge FastBridgeL2 to quote
+    @param _user Bridge initiator, its crvUSD balance and allowance are included
+    @return Limits, costs and user balances at the current block
+    """
+    interval: uint256 = block.timestamp // INTERVAL
+    limit: uint256 = staticcall _fast_bridge.limit()
+    bridged: uint256 = staticcall _fast_bridge.bridged(interval)
+    min_amount: uint256 = 0
+    max_amount: uint256 = 0
+    min_amount, max_amount = staticcall _fast_bridge.allowed_to_bridge(block.timestamp)
+    bridger_cost: uint256 = staticcall (staticcall _fast_bridge.bridger()).cost()
+    messaging_cost: uint256 = staticcall _fast_bridge.cost() - bridger_cost
+
+    balance: uint256 = 0
+    allowance: uint256 = 0
+    if _user != empty(address):
+        crvusd: IERC20 = staticcall _fast_bridge.CRVUSD()
+        balance = staticcall crvusd.balanceOf(_user)
+        allowance = staticcall crvusd.allowance(_user, _fast_bridge.address)
+
+    return Quote(
+        timestamp=block.timestamp,
+        min_amount=min_amount,
+        max_amount=max_amount,
+        available=limit - min(bridged, limit),
+        limit=limit,
+        next_interval=(interval + 1) * INTERVAL,
+        bridger_cost=bridger_cost,
+        messaging_cost=messaging_cost,
+        cost=bridger_cost + messaging_cost,
+        balance=balance,
+        allowance=allowance,
+    )
@@ -0,0 +1,73 @@
+# pragma version 0.4.3
+
+"""
+@title VaultLens
+@notice Read-only view of FastBridgeVault liquidity, rug state, fee and receiver IOUs in one call
+@dev Holds no state, one deployment serves every FastBridgeVault
+@license MIT
+@author curve.fi
+@custom:version 0.0.1
+@custom:security security@curve.fi
+"""
+
+version: public(constant(String[8])) = "0.0.1"
+
+from ethereum.ercs import IERC20
+
+interface IMinter:  # ControllerFactory
+    def debt_ceiling(of: address) -> uint256: view
+    def debt_ceiling_residual(of: address) -> uint256: view
+
+interface IFastBridgeVault:
+    def CRVUSD() -> IERC20: view
+    def MINTER() -> IMinter: view
+    def balanceOf(_receiver: address) -> uint256: view
+    def fee() -> uint256: view
+    def fees_accrued() -> uint256: view
+    def fee_receiver() -> address: view
+    def rug_scheduled() -> bool: view
+    def is_killed(_minter: address) -> bool: view
+
+MAX_RECEIVERS: constant(uint256) = 64
+
+struct VaultState:
+    balance: uint256  # crvUSD held by the vault
+    debt_ceiling: uint256
+    debt_ceiling_residual: uint256
+    need_to_rug: bool  # Debt ceiling was cut, the vault burns the difference before paying out
+    rug_scheduled: bool
+    killed: bool  # All minting is stopped
+    fee: uint256  # 10^18 precision
+    fee_receiver: address
+    fees_accrued: uint256  # Not claimed by fee_receiver yet, not part of its IOU
+    balances: DynArray[uint256, MAX_RECEIVERS]  # IOUs of the requested receivers
+
+
+@external
+@view
+def state(_vault: IFastBridgeVault, _receivers: DynArray[address, MAX_RECEIVERS]=[]) -> VaultState:
+    """
+    @notice State of `_vault` at the current block
+    @param _vault FastBridgeVault to read
+    @param _receivers Receivers whose `balanceOf` IOUs are returned, in the same order
+    """
+    minter: IMinter = staticcall _vault.MINTER()
+    debt_ceiling: uint256 = staticcall minter.debt_ceiling(_vault.address)
+    debt_ceiling_residual: uint256 = staticcall minter.debt_ceiling_residual(_vault.address)
+
+    balances: DynArray[uint256, MAX_RECEIVERS] = []
+    for receiver: address in _receivers:
+        balances.append(staticcall _vault.balanceOf(receiver))
+
+    return VaultState(
+        balance=staticcall (staticcall _vault.CRVUSD()).balanceOf(_vault.address),
+        debt_ceiling=debt_ceiling,
+        debt_ceiling_residual=debt_ceiling_residual,
+        need_to_rug=debt_ceiling_residual > debt_ceiling,
+        rug_scheduled=staticcall _vault.rug_scheduled(),
+        killed=staticcall _vault.is_killed(empty(address)),
+        fee=staticcall _vault.fee(),
+        fee_receiver=staticcall _vault.fee_receiver(),
+        fees_accrued=staticcall _vault.fees_accrued(),
+        balances=balances,
+    )
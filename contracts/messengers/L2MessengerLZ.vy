@@ -109,8 +109,8 @@ def quote_message_fee() -> uint256:
     @notice Quote message fee in native token
     @return Native token amount needed for message
     """
-    # step 1: mock message 
-    encoded_message: Bytes[OApp.MAX_MESSAGE_SIZE] = abi_encode(self, empty(uint256))
+    # step 1: mock message
+    encoded_message: Bytes[OApp.MAX_MESSAGE_SIZE] = abi_encode(self, empty(uint256), empty(bytes32))
 
     # step 2: mock options
     options: Bytes[OptionsBuilder.MAX_OPTIONS_TOTAL_SIZE] = OptionsBuilder.newOptions()
@@ -122,18 +122,21 @@ def quote_message_fee() -> uint256:
 
 @external
 @payable
-def initiate_fast_bridge(_to: address, _amount: uint256, _lz_fee_refund: address):
+def initiate_fast_bridge(
+    _to: address, _amount: uint256, _lz_fee_refund: address, _transfer_id: bytes32=empty(bytes32)
+):
     """
     @notice Initiate fast bridge by sending (to, amount) to peer on main chain
     Only callable by FastBridgeL2
     @param _to Address to mint to
     @param _amount Amount to mint
     @param _lz_fee_refund Address to deposit excess fees from transaction
+    @param _transfer_id Id of a transfer also sent through other messengers, empty if sent through this one only
     """
     assert msg.sender == self.fast_bridge_l2, "Only FastBridgeL2!"
     
      # step 1: convert message to bytes
-    encoded_message: Bytes[OApp.MAX_MESSAGE_SIZE] = abi_encode(_to, _amount)
+    encoded_message: Bytes[OApp.MAX_MESSAGE_SIZE] = abi_encode(_to, _amount, _transfer_id)
 
     # step 2: create options using OptionsBuilder module
     options: Bytes[OptionsBuilder.MAX_OPTIONS_TOTAL_SIZE] = OptionsBuilder.newOptions()
@@ -25,7 +25,7 @@ exports: (
 )
 
 interface IVault:
-    def mint(_receiver: address, _amount: uint256) -> uint256: nonpayable
+    def mint(_receiver: address, _amount: uint256, _transfer_id: bytes32=empty(bytes32)) -> uint256: nonpayable
 
 event Receive:
     origin: OApp.Origin
@@ -35,6 +35,8 @@ event Receive:
 event SetVault:
     vault: IVault
 
+LEGACY_MESSAGE_SIZE: constant(uint256) = 64
+
 vault: public(IVault)
 
 @deploy
@@ -75,18 +77,22 @@ def lzReceive(
     @notice Receive message from main chain
     @param _origin Origin information containing srcEid, sender, and nonce
     @param _guid Global unique identifier for the message
-    @param _message The encoded message payload containing to and amount
+    @param _message The encoded message payload containing to, amount and transfer id,
+        or to and amount only from a messenger not upgraded yet
     @param _executor Address of the executor for the message
     @param _extraData Additional data passed by the executor
     """
     # Verify message source
     OApp._lzReceive(_origin, _guid, _message, _executor, _extraData)
 
-    # Decode message
+    # Decode message, the transfer id is empty unless it was sent through several messengers
     to: address = empty(address)
     amount: uint256 = empty(uint256)
-    to, amount = abi_decode(_message, (address, uint256))
-
-    # Pass mint command to vault
-    extcall self.vault.mint(to, amount)
+    transfer_id: bytes32 = empty(bytes32)
+    if len(_message) == LEGACY_MESSAGE_SIZE:
+        # (to, amount) from an L2MessengerLZ not upgraded yet, kept for the migration
+        to, amount = abi_decode(_message, (address, uint256))
+    else:
+        to, amount, transfer_id = abi_decode(_message, (address, uint256, bytes32))
+    extcall self.vault.mint(to, amount, transfer_id)
     log Receive(origin=_origin, guid=_guid, message=_message)
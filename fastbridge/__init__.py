@@ -0,0 +1,34 @@
+"""
+Python client of FastBridge: chain and deployment registry, contract wrappers and batched reads.
+
+    from fastbridge import FastBridge
+    client = FastBridge()
+    client.quote(user="0x...")  # {"arbitrum": Quote(...), "optimism": Quote(...), ...}
+    client.status([("arbitrum", "0x..."), ("fraxtal", "0x...")])  # [Status(...), Status(...)]
+
+Withdrawals through the native bridges are handled by the `fastbridge` command, see `fastbridge.cli`.
+"""
+from importlib import import_module
+
+# Resolved on first access so that `fastbridge.cli` starts without importing web3
+_EXPORTS = {
+    "chains": ["CHAINS", "DEPLOYMENTS", "L1", "MULTICALL3", "Chain", "Deployment"],
+    "client": ["INTERVAL", "FastBridge", "Quote", "Status"],
+    "contracts": ["ERC20", "FastBridgeL2", "FastBridgeVault", "L2MessengerLZ", "VaultMessengerLZ", "load_abi"],
+    "multicall": ["Batch", "Call"],
+}
+_MODULES = {name: module for module, names in _EXPORTS.items() for name in names}
+
+__all__ = list(_MODULES)
+
+
+def __getattr__(name):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{_MODULES[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -0,0 +1,71 @@
+"""
+Chains and FastBridge deployments.
+
+Every L2 has its own FastBridgeL2 and a FastBridgeVault on Ethereum. RPC endpoints default to public
+ones and can be overridden with `FASTBRIDGE_RPC_<CHAIN>`, e.g. `FASTBRIDGE_RPC_ARBITRUM`.
+"""
+import os
+from dataclasses import dataclass
+from typing import Dict
+
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"  # Same address on every chain
+L1 = "ethereum"
+
+
+@dataclass(frozen=True, slots=True)
+class Chain:
+    name: str
+    chain_id: int
+    eid: int  # LayerZero endpoint ID
+    rpc: str
+    explorer: str
+    multicall: str = MULTICALL3
+
+    @property
+    def rpc_url(self) -> str:
+        return os.getenv(f"FASTBRIDGE_RPC_{self.name.upper()}", self.rpc)
+
+
+@dataclass(frozen=True, slots=True)
+class Deployment:
+    chain: str  # L2 of FastBridgeL2, the vault side is always on `L1`
+    fast_bridge_l2: str
+    l2_messenger: str
+    bridger: str
+    vault: str
+    vault_messenger: str
+
+
+CHAINS: Dict[str, Chain] = {
+    "ethereum": Chain("ethereum", 1, 30101, "https://eth.llamarpc.com", "https://etherscan.io"),
+    "arbitrum": Chain("arbitrum", 42161, 30110, "https://arb1.arbitrum.io/rpc", "https://arbiscan.io"),
+    "optimism": Chain("optimism", 10, 30111, "https://mainnet.optimism.io", "https://optimistic.etherscan.io"),
+    "fraxtal": Chain("fraxtal", 252, 30255, "https://rpc.frax.com", "https://fraxscan.com"),
+}
+
+DEPLOYMENTS: Dict[str, Deployment] = {
+    "arbitrum": Deployment(
+        chain="arbitrum",
+        fast_bridge_l2="0x1F2aF270029d028400265Ce1dd0919BA8780dAe1",
+        l2_messenger="0x14e11C1B8F04A7dE306a7B5bf21bbca0D5cF79ff",
+        bridger="0x8A5a5299f35614Ac558AA290C2d5856EDeC1B5Ad",
+        vault="0xadB10d2d5A95e58Ddb1A0744a0d2D7B55Db7843D",
+        vault_messenger="0x15945526b5C32D963391343e9Bc080838fe3e6d9",
+    ),
+    "optimism": Deployment(
+        chain="optimism",
+        fast_bridge_l2="0xD16d5eC345Dd86Fb63C6a9C43c517210F1027914",
+        l2_messenger="0x7a1f2f99B65f6c3B2413648c86C0326CfF8D8837",
+        bridger="0x5dFAFdA4D5B26bE0e99e6A8C6B1eB97eD99B9bD3",
+        vault="0x97d024859B68394122B3d0bb407dD7299cC8E937",
+        vault_messenger="0x4A10d0FF9e394f3A3dCdb297973Db40Ce304b44f",
+    ),
+    "fraxtal": Deployment(
+        chain="fraxtal",
+        fast_bridge_l2="0x3fE593E651Cd0B383AD36b75F4159f30BB0631A6",
+        l2_messenger="0x672C38258729060bF443BA28FaEF4F2db154C6fC",
+        bridger="0xeB896fB7D1AaE921d586B0E5a037496aFd3E2412",
+        vault="0x5EF620631AA46e7d2F6f963B6bE4F6823521B9eC",
+        vault_messenger="0xEC0e1c5Cc900D87b1FA44584310C43f82F75870F",
+    ),
+}
@@ -0,0 +1,210 @@
+"""
+`fastbridge` command: status, prove and finalize many native-bridge withdrawals at once.
+
+    fastbridge status --chain arbitrum 0x<l2 tx> 0x<l2 tx>
+    fastbridge finalize --file withdrawals.txt --execute
+    cat withdrawals.txt | fastbridge prove --chain optimism
+
+Each input line is an L2 transaction hash, optionally preceded by its chain (`optimism 0x...`), `#` starts a
+comment. Withdrawals are processed concurrently and a JSON line is written to stdout as soon as each one is done,
+progress of the underlying scripts goes to stderr. Transactions are only sent with `--execute`, through one
+`TxSender` so they are all in flight at once, and a line with the receipt of each follows at the end.
+
+The proof scripts are imported from `scripts/` of the checkout on first use, only when a chain needs them. They are
+not part of the package, so the command needs an editable install from a checkout (`uv sync` or `pip install -e .`).
+A transaction whose gas estimate failed is reported and not sent with `--execute`.
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO, Tuple
+
+SCRIPTS = Path(__file__).resolve().parent.parent / "scripts"
+ZERO_ADDRESS = "0x" + "00" * 20
+CHAINS = ("arbitrum", "optimism")
+OPERATIONS = ("status", "prove", "finalize")
+
+
+def _import_scripts():
+    if not SCRIPTS.is_dir():
+        raise RuntimeError(f"Proof scripts not found in {SCRIPTS}, they are not packaged: install fastbridge from a "
+                           "checkout of the repository with `uv sync` or `pip install -e .`")
+    for path in (SCRIPTS / "op_proof", SCRIPTS / "arb_proof", SCRIPTS):
+        if str(path) not in sys.path:
+            sys.path.insert(0, str(path))
+
+
+class Arbitrum:
+    """Outbox execution, Arbitrum withdrawals are not proven separately"""
+
+    def __init__(self):
+        _import_scripts()
+        import arb_proof
+
+        self.arb_proof = arb_proof
+        self.w3_l1, self.w3_l2 = arb_proof.get_providers()
+        self.index = arb_proof.send_index(self.w3_l2)
+
+    def status(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        data = self.arb_proof.check_status(self.w3_l1, self.w3_l2, tx_hash, self.index)
+        return {"status": data["status"]}
+
+    def prove(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        return {**self.status(tx_hash), "error": "Arbitrum withdrawals are executed with their proof, use finalize"}
+
+    def finalize(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        data = self.arb_proof.check_status(self.w3_l1, self.w3_l2, tx_hash, self.index)
+        result = {"status": data["status"]}
+        if data["status"] == "READY":
+            result["tx"] = self.arb_proof.build_execute_transaction(self.w3_l1, data, sender)
+        return result
+
+
+class Optimism:
+    """Dispute game proofs and finalization through OptimismPortal"""
+
+    def __init__(self):
+        _import_scripts()
+        import op_finalize
+        import op_proof
+        from op_proof_utils import get_providers
+
+        self.op_proof, self.op_finalize = op_proof, op_finalize
+        self.w3_l1, self.w3_l2 = get_providers()
+
+    def status(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        return self.op_finalize.status(self.w3_l1, self.w3_l2, tx_hash)
+
+    def prove(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        return self.op_proof.prove(self.w3_l1, self.w3_l2, tx_hash, sender)
+
+    def finalize(self, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+        return self.op_finalize.finalize(self.w3_l1, self.w3_l2, tx_hash, sender)
+
+
+HANDLERS: Dict[str, Callable[[], Any]] = {"arbitrum": Arbitrum, "optimism": Optimism}
+
+
+def read_items(lines: Iterable[str], chain: Optional[str]) -> List[Tuple[str, str]]:
+    """(chain, tx hash) of every input line"""
+    items = []
+    for number, line in enumerate(lines, 1):
+        fields = line.split("#", 1)[0].replace(",", " ").split()
+        if not fields:
+            continue
+        if len(fields) == 1 and chain is not None:
+            fields = [chain, fields[0]]
+        if len(fields) != 2 or fields[0] not in CHAINS:
+            raise ValueError(f"Line {number}: expected '[{'|'.join(CHAINS)}] <tx hash>', got {line.strip()!r}")
+        items.append((fields[0], fields[1]))
+    return items
+
+
+def _summary(result: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON-friendly result, a built transaction is reduced to what is needed to send it"""
+    summary = {key: value for key, value in result.items() if key != "tx"}
+    if result.get("tx") is not None:
+        tx = result["tx"]
+        summary["tx"] = {"to": tx["to"], "data": tx["data"], "gas": tx.get("gas")}
+    return summary
+
+
+def run(operation: str, items: List[Tuple[str, str]], handlers: Dict[str, Any], out: TextIO,
+        workers: int = 8, sender=None) -> int:
+    """
+    Process every item concurrently and write a JSON line per item as it completes.
+    @param sender TxSender for built transactions, dry run when None
+    @return Number of items that failed
+    """
+    lock = threading.Lock()
+    address = sender.address if sender is not None else ZERO_ADDRESS
+    pending = []
+
+    def process(chain: str, tx_hash: str) -> Dict[str, Any]:
+        result = getattr(handlers[chain], operation)(tx_hash, address)
+        if sender is not None and result.get("tx") is not None:
+            if "gas" in result and result["gas"] is None:
+                result["error"] = "Gas estimation failed, not sent"
+                return result
+            with lock:
+                result["submitted"] = sender.send(result["tx"])
+        return result
+
+    def emit(line: Dict[str, Any]):
+        with lock:
+            out.write(json.dumps(line, default=str) + "\n")
+            out.flush()
+
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(process, chain, tx_hash): (chain, tx_hash) for chain, tx_hash in items}
+        for future in as_completed(futures):
+            chain, tx_hash = futures[future]
+            line = {"chain": chain, "tx_hash": tx_hash, "operation": operation}
+            try:
+                result = future.result()
+            except Exception as e:
+                failed += 1
+                emit({**line, "error": f"{type(e).__name__}: {e}"})
+                continue
+            if "submitted" in result:
+                pending.append((line, result["submitted"]))
+                result["submitted"] = "0x" + result["submitted"].hash.hex()
+            failed += "error" in result
+            emit({**line, **_summary(result)})
+
+    for line, tx in pending:
+        receipt = sender.wait(tx)
+        failed += receipt["status"] != 1
+        emit({**line, "tx": "0x" + tx.hash.hex(), "receipt_status": receipt["status"],
+              "gas_used": receipt["gasUsed"]})
+    return failed
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="fastbridge", description=__doc__,
+                                     formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("operation", choices=OPERATIONS)
+    parser.add_argument("tx_hashes", nargs="*", help="L2 transactions, read from --file or stdin when empty")
+    parser.add_argument("--chain", choices=CHAINS, help="Chain of lines without one")
+    parser.add_argument("--file", type=Path, help="File with a transaction per line")
+    parser.add_argument("--workers", type=int, default=8, help="Withdrawals processed at once")
+    parser.add_argument("--execute", action="store_true", help="Send built transactions (WEB3_TESTNET_PK)")
+    args = parser.parse_intermixed_args(argv)
+
+    if args.tx_hashes:
+        lines = args.tx_hashes
+    elif args.file is not None:
+        lines = args.file.read_text().splitlines()
+    else:
+        lines = sys.stdin.read().splitlines()
+    try:
+        items = read_items(lines, args.chain)
+    except ValueError as e:
+        parser.error(str(e))
+
+    out = sys.stdout
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            handlers = {chain: HANDLERS[chain]() for chain in sorted({chain for chain, _ in items})}
+        except (ValueError, RuntimeError) as e:  # No API key or RPC unreachable
+            parser.error(str(e))
+        sender = None
+        if args.execute and handlers:
+            _import_scripts()
+            from eth_account import Account
+            from tx_sender import TxSender
+
+            w3_l1 = next(iter(handlers.values())).w3_l1
+            sender = TxSender(w3_l1, Account.from_key(os.environ["WEB3_TESTNET_PK"]))
+        failed = run(args.operation, items, handlers, out, args.workers, sender)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
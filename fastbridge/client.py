@@ -0,0 +1,150 @@
+"""
+Quotes and IOU status of many bridges over many chains.
+
+Reads are batched per chain: a `quote` is one `eth_call` on each L2 and `status` of any number of
+receivers is one `eth_call` on Ethereum, chains are queried concurrently. Immutables (crvUSD and vault
+addresses) are read once per client and cached.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from threading import Lock
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from eth_utils import to_checksum_address
+from web3 import Web3
+
+from .chains import CHAINS, DEPLOYMENTS, L1, Chain, Deployment
+from .contracts import ERC20, Contract, FastBridgeL2, FastBridgeVault
+from .multicall import Batch
+
+INTERVAL = 86400 * 7 // 4  # FastBridgeL2.INTERVAL
+
+
+@dataclass(frozen=True, slots=True)
+class Quote:
+    chain: str
+    timestamp: int
+    min_amount: int  # allowed_to_bridge, (0, 0) when bridging is not possible now
+    max_amount: int
+    limit: int
+    cost: int  # msg.value of bridge()
+    balance: int  # crvUSD of the user, 0 without a user
+    allowance: int  # crvUSD of the user approved to FastBridgeL2
+
+    @property
+    def next_interval(self) -> int:
+        """Timestamp when the limit resets"""
+        return (self.timestamp // INTERVAL + 1) * INTERVAL
+
+
+@dataclass(frozen=True, slots=True)
+class Status:
+    chain: str
+    receiver: str
+    owed: int  # IOU in the vault, paid out by mint(receiver, 0)
+    claimable: int  # Part of `owed` the vault can pay now, a scheduled rug is applied first and may lower it
+
+
+class FastBridge:
+    def __init__(self, deployments: Dict[str, Deployment] = DEPLOYMENTS, chains: Dict[str, Chain] = CHAINS,
+                 w3: Optional[Dict[str, Web3]] = None, max_calls: int = 500):
+        """
+        @param w3 web3 instances by chain name, created from `Chain.rpc_url` when missing
+        @param max_calls Reads per multicall
+        """
+        self.deployments = deployments
+        self.chains = chains
+        self.max_calls = max_calls
+        self._w3: Dict[str, Web3] = dict(w3 or {})
+        self._immutables: Dict[Tuple[str, str, str], Any] = {}
+        self._lock = Lock()
+
+    def web3(self, chain: str) -> Web3:
+        with self._lock:
+            if chain not in self._w3:
+                # Cached eth_chainId, otherwise web3 asks for it before every eth_call
+                self._w3[chain] = Web3(Web3.HTTPProvider(self.chains[chain].rpc_url, cache_allowed_requests=True))
+            return self._w3[chain]
+
+    def batch(self, chain: str) -> Batch:
+        return Batch(self.web3(chain), self.chains[chain].multicall, self.max_calls)
+
+    def immutable(self, chain: str, contract: Contract, name: str) -> Any:
+        self._load_immutables(chain, [contract])
+        return self._immutables[(chain, contract.address, name)]
+
+    def _load_immutables(self, chain: str, contracts: Iterable[Contract]):
+        missing = [(contract, name) for contract in contracts for name in contract.IMMUTABLES
+                   if (chain, contract.address, name) not in self._immutables]
+        if not missing:
+            return
+        batch = self.batch(chain)
+        for contract, name in missing:
+            batch.add(contract.call(name))
+        for (contract, name), value in zip(missing, batch.execute()):
+            if value is None:
+                raise ValueError(f"Could not read {name} of {contract} on {chain}")
+            self._immutables[(chain, contract.address, name)] = value
+
+    def quote(self, user: Optional[str] = None, chains: Optional[Sequence[str]] = None) -> Dict[str, Quote]:
+        """
+        Quote bridging from every L2 in `chains` (all deployments by default)
+        @param user Bridge initiator, its crvUSD balance and allowance are included
+        """
+        chains = list(self.deployments) if chains is None else list(chains)
+        return dict(zip(chains, self._each(lambda chain: self._quote(chain, user), chains)))
+
+    def _quote(self, chain: str, user: Optional[str]) -> Quote:
+        fast_bridge = FastBridgeL2(self.deployments[chain].fast_bridge_l2)
+        batch = self.batch(chain)
+        timestamp = batch.timestamp()
+        limit = batch.add(fast_bridge.limit())
+        allowed = batch.add(fast_bridge.allowed_to_bridge())
+        cost = batch.add(fast_bridge.cost())
+        balance = allowance = None
+        if user is not None:
+            crvusd = ERC20(self.immutable(chain, fast_bridge, "CRVUSD"))
+            balance = batch.add(crvusd.balanceOf(user))
+            allowance = batch.add(crvusd.allowance(user, fast_bridge.address))
+
+        results = batch.execute()
+        return Quote(
+            chain=chain,
+            timestamp=results[timestamp],
+            min_amount=results[allowed][0],
+            max_amount=results[allowed][1],
+            limit=results[limit],
+            cost=results[cost],
+            balance=0 if balance is None else results[balance],
+            allowance=0 if allowance is None else results[allowance],
+        )
+
+    def status(self, bridges: Iterable[Tuple[str, str]]) -> List[Status]:
+        """
+        IOUs of bridged receivers, every vault lives on Ethereum so this is a single round trip
+        @param bridges (L2 name, receiver) pairs
+        @return Status of every pair in the same order
+        """
+        bridges = [(chain, to_checksum_address(receiver)) for chain, receiver in bridges]
+        vaults = {chain: FastBridgeVault(self.deployments[chain].vault) for chain, _ in bridges}
+        self._load_immutables(L1, vaults.values())
+
+        batch = self.batch(L1)
+        liquidity = {}
+        for chain, vault in vaults.items():
+            crvusd = ERC20(self._immutables[(L1, vault.address, "CRVUSD")])
+            liquidity[chain] = (batch.add(crvusd.balanceOf(vault.address)), batch.add(vault.is_killed()))
+        owed = [batch.add(vaults[chain].balanceOf(receiver)) for chain, receiver in bridges]
+
+        results = batch.execute()
+        statuses = []
+        for (chain, receiver), i in zip(bridges, owed):
+            balance, killed = (results[j] for j in liquidity[chain])
+            statuses.append(Status(chain, receiver, results[i], 0 if killed else min(results[i], balance)))
+        return statuses
+
+    def _each(self, fn: Callable[[str], Any], chains: List[str]) -> List[Any]:
+        if len(chains) <= 1:
+            return [fn(chain) for chain in chains]
+        with ThreadPoolExecutor(max_workers=len(chains)) as pool:
+            return list(pool.map(fn, chains))
@@ -0,0 +1,151 @@
+"""
+Read-only wrappers of FastBridge contracts.
+
+Methods don't touch the network, they return `Call`s to be added to a `Batch`. ABIs in `abis/` are
+the compiler output of `contracts/`, IERC20 is a copy of `interfaces/IERC20.json`.
+"""
+import json
+from functools import cache
+from pathlib import Path
+from typing import Dict, Tuple
+
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+from eth_utils.abi import get_abi_input_types, get_abi_output_types
+
+from .multicall import Call
+
+ABIS = Path(__file__).parent / "abis"
+
+
+@cache
+def load_abi(name: str) -> list:
+    return json.loads((ABIS / f"{name}.json").read_text())
+
+
+@cache
+def _functions(name: str) -> Dict[Tuple[str, int], Tuple[bytes, Tuple[str, ...], Tuple[str, ...]]]:
+    """(function name, number of inputs) -> (selector, input types, output types)"""
+    return {
+        (entry["name"], len(entry["inputs"])): (
+            function_abi_to_4byte_selector(entry),
+            tuple(get_abi_input_types(entry)),
+            tuple(get_abi_output_types(entry)),
+        )
+        for entry in load_abi(name) if entry["type"] == "function"
+    }
+
+
+class Contract:
+    __slots__ = ("address",)
+    ABI = ""
+    IMMUTABLES: Tuple[str, ...] = ()  # Read once and cached by the client
+
+    def __init__(self, address: str):
+        self.address = to_checksum_address(address)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.address})"
+
+    def call(self, name: str, *args) -> Call:
+        selector, input_types, output_types = _functions(self.ABI)[(name, len(args))]
+        return Call(self.address, selector + encode(input_types, args), output_types)
+
+
+class ERC20(Contract):
+    __slots__ = ()
+    ABI = "IERC20"
+
+    def balanceOf(self, account: str) -> Call:
+        return self.call("balanceOf", account)
+
+    def allowance(self, owner: str, spender: str) -> Call:
+        return self.call("allowance", owner, spender)
+
+
+class FastBridgeL2(Contract):
+    __slots__ = ()
+    ABI = "FastBridgeL2"
+    IMMUTABLES = ("CRVUSD", "VAULT")
+
+    def CRVUSD(self) -> Call:
+        return self.call("CRVUSD")
+
+    def VAULT(self) -> Call:
+        return self.call("VAULT")
+
+    def min_amount(self) -> Call:
+        return self.call("min_amount")
+
+    def limit(self) -> Call:
+        return self.call("limit")
+
+    def bridged(self, interval: int) -> Call:
+        return self.call("bridged", interval)
+
+    def allowed_to_bridge(self) -> Call:
+        """(min, max) amount to bridge now, (0, 0) when the limit is exhausted"""
+        return self.call("allowed_to_bridge")
+
+    def cost(self) -> Call:
+        return self.call("cost")
+
+    def bridger(self) -> Call:
+        return self.call("bridger")
+
+    def messenger(self) -> Call:
+        return self.call("messenger")
+
+
+class FastBridgeVault(Contract):
+    __slots__ = ()
+    ABI = "FastBridgeVault"
+    IMMUTABLES = ("CRVUSD",)
+
+    def CRVUSD(self) -> Call:
+        return self.call("CRVUSD")
+
+    def balanceOf(self, receiver: str) -> Call:
+        """crvUSD owed to `receiver`"""
+        return self.call("balanceOf", receiver)
+
+    def rug_scheduled(self) -> Call:
+        return self.call("rug_scheduled")
+
+    def is_killed(self, minter: str = "0x0000000000000000000000000000000000000000") -> Call:
+        return self.call("is_killed", minter)
+
+    def fee(self) -> Call:
+        return self.call("fee")
+
+    def fee_receiver(self) -> Call:
+        return self.call("fee_receiver")
+
+    def fees_accrued(self) -> Call:
+        """Fees not claimed by `fee_receiver` yet, they are not in its `balanceOf`"""
+        return self.call("fees_accrued")
+
+
+class L2MessengerLZ(Contract):
+    __slots__ = ()
+    ABI = "L2MessengerLZ"
+
+    def quote_message_fee(self) -> Call:
+        return self.call("quote_message_fee")
+
+    def vault_eid(self) -> Call:
+        return self.call("vault_eid")
+
+    def gas_limit(self) -> Call:
+        return self.call("gas_limit")
+
+    def fast_bridge_l2(self) -> Call:
+        return self.call("fast_bridge_l2")
+
+
+class VaultMessengerLZ(Contract):
+    __slots__ = ()
+    ABI = "VaultMessengerLZ"
+
+    def vault(self) -> Call:
+        return self.call("vault")
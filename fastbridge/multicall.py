@@ -0,0 +1,77 @@
+"""
+Batching of reads into Multicall3 `aggregate3` calls, one `eth_call` per batch.
+"""
+from dataclasses import dataclass
+from typing import Any, List, Optional, Tuple
+
+from eth_abi import decode, encode
+from eth_abi.exceptions import DecodingError
+from eth_utils import function_signature_to_4byte_selector
+from web3 import Web3
+from web3.exceptions import ContractLogicError
+
+AGGREGATE3 = function_signature_to_4byte_selector("aggregate3((address,bool,bytes)[])")
+GET_CURRENT_BLOCK_TIMESTAMP = function_signature_to_4byte_selector("getCurrentBlockTimestamp()")
+
+
+@dataclass(frozen=True, slots=True)
+class Call:
+    target: str
+    data: bytes
+    output_types: Tuple[str, ...]
+
+    def decode(self, data: bytes) -> Any:
+        values = decode(self.output_types, data)
+        return values[0] if len(values) == 1 else values
+
+
+class Batch:
+    """
+    Reads on one chain, sent together by `execute`.
+    Failed reads result in None, the rest of the batch is not affected.
+    """
+    __slots__ = ("w3", "multicall", "max_calls", "calls")
+
+    def __init__(self, w3: Web3, multicall: Optional[str], max_calls: int = 500):
+        """
+        @param multicall Multicall3 address, None to send every read separately
+        @param max_calls Reads per `eth_call`, larger batches are split
+        """
+        self.w3 = w3
+        self.multicall = multicall
+        self.max_calls = max_calls
+        self.calls: List[Call] = []
+
+    def add(self, call: Call) -> int:
+        """@return Index of the result in `execute()`"""
+        self.calls.append(call)
+        return len(self.calls) - 1
+
+    def timestamp(self) -> int:
+        """Add the block timestamp, read from Multicall3 itself or from the latest block without it"""
+        return self.add(Call(self.multicall, GET_CURRENT_BLOCK_TIMESTAMP, ("uint256",)))
+
+    def execute(self) -> List[Any]:
+        results = []
+        for start in range(0, len(self.calls), self.max_calls):
+            results += self._execute(self.calls[start:start + self.max_calls])
+        self.calls = []
+        return results
+
+    def _execute(self, calls: List[Call]) -> List[Any]:
+        if self.multicall is None or len(calls) == 1 and calls[0].target != self.multicall:
+            return [self._single(call) for call in calls]
+        data = AGGREGATE3 + encode(["(address,bool,bytes)[]"], [[(c.target, True, c.data) for c in calls]])
+        output = self.w3.eth.call({"to": self.multicall, "data": data})
+        results = []
+        for call, (success, return_data) in zip(calls, decode(["(bool,bytes)[]"], output)[0]):
+            results.append(call.decode(return_data) if success and return_data else None)
+        return results
+
+    def _single(self, call: Call) -> Any:
+        if call.target is None:
+            return self.w3.eth.get_block("latest")["timestamp"]
+        try:
+            return call.decode(self.w3.eth.call({"to": call.target, "data": call.data}))
+        except (ContractLogicError, DecodingError):  # Reverted or no code at the target
+            return None
@@ -0,0 +1,98 @@
+"""
+Process-wide registry of parsed ABIs and web3 contract objects.
+
+Every ABI file is parsed once and indexed by function selector, event topic and
+custom error selector, so decoding a revert or a log is a dict lookup. Contract
+objects are cached per (web3 instance, address), one web3 instance per chain.
+"""
+import json
+from dataclasses import dataclass, field
+from pathlib import Path
+from threading import Lock
+from typing import Any, Dict, Tuple
+
+from eth_abi import decode
+from eth_utils import function_abi_to_4byte_selector, event_abi_to_log_topic, to_checksum_address
+from eth_utils.abi import get_abi_input_types
+from web3 import Web3
+
+SCRIPTS = Path(__file__).parent
+
+
+@dataclass(frozen=True)
+class Abi:
+    entries: list
+    functions: Dict[bytes, dict] = field(default_factory=dict)
+    events: Dict[bytes, dict] = field(default_factory=dict)
+    errors: Dict[bytes, dict] = field(default_factory=dict)
+
+    @classmethod
+    def from_entries(cls, entries: list) -> "Abi":
+        abi = cls(entries)
+        for entry in entries:
+            if entry.get("type") == "function":
+                abi.functions[function_abi_to_4byte_selector(entry)] = entry
+            elif entry.get("type") == "event":
+                abi.events[event_abi_to_log_topic(entry)] = entry
+            elif entry.get("type") == "error":
+                # Errors are selected exactly like functions
+                abi.errors[function_abi_to_4byte_selector(entry)] = entry
+        return abi
+
+    def decode_error(self, data: bytes | str) -> Tuple[str, Dict[str, Any]]:
+        """
+        Decode custom error revert data
+        @return Error name and its arguments by name, `Unknown(<selector>)` if it is not in the ABI
+        """
+        if isinstance(data, str):
+            data = bytes.fromhex(data.removeprefix("0x"))
+        entry = self.errors.get(data[:4])
+        if entry is None:
+            return f"Unknown({data[:4].hex()})", {}
+        values = decode(get_abi_input_types(entry), data[4:])
+        names = [arg["name"] or f"arg{i}" for i, arg in enumerate(entry["inputs"])]
+        return entry["name"], dict(zip(names, values))
+
+    def format_error(self, data: bytes | str) -> str:
+        name, args = self.decode_error(data)
+        return f"{name}({', '.join(f'{k}={_format(v)}' for k, v in args.items())})"
+
+
+class AbiRegistry:
+    def __init__(self):
+        self._abis: Dict[Path, Abi] = {}
+        self._contracts: Dict[Tuple[int, str, Path], Any] = {}
+        self._by_entries: Dict[int, Abi] = {}  # id of the entries list -> Abi
+        self._lock = Lock()
+
+    def abi(self, path: Path | str) -> Abi:
+        """Parsed ABI of a JSON file, relative paths are resolved against `scripts/`"""
+        path = (SCRIPTS / path).resolve()
+        if path not in self._abis:
+            with self._lock:
+                if path not in self._abis:
+                    abi = Abi.from_entries(json.loads(path.read_text()))
+                    self._abis[path] = self._by_entries[id(abi.entries)] = abi
+        return self._abis[path]
+
+    def of(self, contract) -> Abi:
+        """Indexed ABI of a web3 contract, parsed on first use if it wasn't created by the registry"""
+        abi = self._by_entries.get(id(contract.abi))
+        if abi is None or abi.entries is not contract.abi:
+            abi = self._by_entries[id(contract.abi)] = Abi.from_entries(contract.abi)
+        return abi
+
+    def contract(self, w3: Web3, address: str, path: Path | str):
+        """web3 contract at `address` with the ABI in `path`, created once per web3 instance"""
+        path = (SCRIPTS / path).resolve()
+        key = (id(w3), to_checksum_address(address), path)
+        if key not in self._contracts:
+            self._contracts[key] = w3.eth.contract(address=key[1], abi=self.abi(path).entries)
+        return self._contracts[key]
+
+
+def _format(value: Any) -> str:
+    return "0x" + value.hex() if isinstance(value, bytes) else str(value)
+
+
+ABIS = AbiRegistry()
@@ -1,21 +1,34 @@
 #!/usr/bin/env python3
+"""
+Arbitrum withdrawal status check and execution on L1.
+
+    DRPC_API_KEY=... python scripts/arb_proof/arb_proof.py 0x<l2 tx>
+    WEB3_TESTNET_PK=... python scripts/arb_proof/arb_proof.py 0x<l2 tx> --execute
+"""
+import argparse
 import os
 import sys
-import json
 import warnings
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 from eth_account import Account
 from web3 import Web3
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from abi_registry import ABIS  # noqa: E402
+from rpc_metrics import instrument  # noqa: E402
+from send_tree import SendIndex, SendTree, latest_send_root  # noqa: E402
+from tx_sender import TxSender  # noqa: E402
+
 # Suppress ABI mismatch warnings from web3
 warnings.filterwarnings("ignore", message=".*MismatchedABI.*")
 
 # ============================================================================
 # USER CONFIGURATION
 # ============================================================================
-TX_HASH = "0x5f3577b204fac64ada3e796622ef8806fe1ef0c4df20491115bd54bb01a7a2e0"
-DRY_RUN = False  # Set to False to actually execute the transaction
+# Build proofs from indexed L2ToL1Tx events instead of NodeInterface. Indexing starts with a scan of every block
+# since Nitro genesis, so it is opt-in. Once a run has left a cache it is used regardless.
+LOCAL_PROOFS = False
 
 # ============================================================================
 # CONSTANTS
@@ -28,11 +41,9 @@ NODE_INTERFACE = "0x00000000000000000000000000000000000000C8"
 # HELPER FUNCTIONS
 # ============================================================================
 
-def load_abi(name: str) -> list:
-    """Load ABI from file."""
-    abi_path = Path(__file__).parent / "abis" / f"{name}.json"
-    with open(abi_path, 'r') as f:
-        return json.load(f)
+def contract(w3: Web3, address: str, name: str):
+    """Contract object, created once per chain and address."""
+    return ABIS.contract(w3, address, Path(__file__).parent / "abis" / f"{name}.json")
 
 
 def get_providers() -> Tuple[Web3, Web3]:
@@ -41,8 +52,8 @@ def get_providers() -> Tuple[Web3, Web3]:
     if not key:
         raise ValueError("DRPC_API_KEY not set in environment")
     
-    l1 = Web3(Web3.HTTPProvider(f"https://lb.drpc.org/ogrpc?network=ethereum&dkey={key}"))
-    l2 = Web3(Web3.HTTPProvider(f"https://lb.drpc.org/ogrpc?network=arbitrum&dkey={key}"))
+    l1 = instrument(Web3(Web3.HTTPProvider(f"https://lb.drpc.org/ogrpc?network=ethereum&dkey={key}")))
+    l2 = instrument(Web3(Web3.HTTPProvider(f"https://lb.drpc.org/ogrpc?network=arbitrum&dkey={key}")))
     
     if not (l1.is_connected() and l2.is_connected()):
         raise RuntimeError("Cannot connect to L1/L2 networks")
@@ -50,6 +61,12 @@ def get_providers() -> Tuple[Web3, Web3]:
     return l1, l2
 
 
+def send_index(w3_l2: Web3) -> Optional[SendIndex]:
+    """Index for local proofs with LOCAL_PROOFS or a cache from an earlier run, None to use NodeInterface."""
+    index = SendIndex(w3_l2)
+    return index if LOCAL_PROOFS or index.warm else None
+
+
 def extract_size_from_receipt(receipt: Dict[str, Any]) -> Tuple[int, int]:
     """Extract the cumulative size from SendMerkleUpdate event in L2 receipt.
     
@@ -90,7 +107,7 @@ def parse_withdrawal_event(w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
         raise ValueError(f"Transaction {tx_hash} not found")
     
     # Parse L2ToL1Tx event
-    arb_sys = w3_l2.eth.contract(address=ARBSYS, abi=load_abi("ArbSys"))
+    arb_sys = contract(w3_l2, ARBSYS, "ArbSys")
     events = arb_sys.events.L2ToL1Tx().process_receipt(receipt)
     
     if not events:
@@ -123,9 +140,16 @@ def parse_withdrawal_event(w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
     }
 
 
-def find_valid_size(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, leaf: int) -> int:
+def find_valid_size(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, leaf: int, tree: SendTree = None) -> int:
     """Find a valid size by trying different values when SendMerkleUpdate has size=0."""
-    outbox = w3_l1.eth.contract(address=Web3.to_checksum_address(outbox_addr), abi=load_abi("Outbox_impl"))
+    outbox = contract(w3_l1, outbox_addr, "Outbox_impl")
+
+    if tree is not None:
+        # The latest posted root covers every send before its L2 block
+        _, size = latest_send_root(w3_l1, w3_l2, outbox_addr)
+        if size > leaf:
+            print(f"    Latest Outbox root covers {size} sends")
+            return size
     
     # Try common size patterns
     size_attempts = [
@@ -141,7 +165,7 @@ def find_valid_size(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, leaf: int) -> in
     for test_size in size_attempts:
         try:
             print(f"    Trying size {test_size}...")
-            proof_data = build_proof(w3_l2, test_size, leaf)
+            proof_data = build_proof(w3_l2, test_size, leaf, tree)
             root = proof_data['root']
             
             # Check if this root is registered in the outbox
@@ -155,15 +179,18 @@ def find_valid_size(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, leaf: int) -> in
     return None
 
 
-def build_proof(w3_l2: Web3, size: int, leaf: int) -> Dict[str, Any]:
-    """Build merkle proof using NodeInterface."""
-    node = w3_l2.eth.contract(address=NODE_INTERFACE, abi=load_abi("NodeInterface"))
-    
+def build_proof(w3_l2: Web3, size: int, leaf: int, tree: SendTree = None) -> Dict[str, Any]:
+    """Build merkle proof locally when `tree` has indexed `size` sends, else using NodeInterface."""
     # NodeInterface uses uint64
     size64 = size & ((1 << 64) - 1)
     leaf64 = leaf & ((1 << 64) - 1)
-    
-    send, root, proof = node.functions.constructOutboxProof(size64, leaf64).call()
+
+    if tree is not None and len(tree) >= size64:
+        local = tree.proof(size64, leaf64)
+        send, root, proof = local["send"], local["root"], local["proof"]
+    else:
+        node = contract(w3_l2, NODE_INTERFACE, "NodeInterface")
+        send, root, proof = node.functions.constructOutboxProof(size64, leaf64).call()
     
     return {
         "send": Web3.to_hex(send),
@@ -172,8 +199,10 @@ def build_proof(w3_l2: Web3, size: int, leaf: int) -> Dict[str, Any]:
     }
 
 
-def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
-    """Check withdrawal status and return detailed information."""
+def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str, index: SendIndex = None) -> Dict[str, Any]:
+    """Check withdrawal status and return detailed information.
+
+    With `index`, sends are indexed up to the withdrawal and proofs are built locally."""
     print(f"\nChecking withdrawal: {tx_hash}")
     print("=" * 70)
     
@@ -184,7 +213,7 @@ def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
     leaf64 = leaf & ((1 << 64) - 1)
     
     # Get outbox address first
-    rollup = w3_l1.eth.contract(address=ROLLUP_PROXY, abi=load_abi("Rollup_impl"))
+    rollup = contract(w3_l1, ROLLUP_PROXY, "Rollup_impl")
     outbox_addr = rollup.functions.outbox().call()
     
     # Extract size from receipt
@@ -196,7 +225,8 @@ def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
     except RuntimeError as e:
         print(f"  WARNING: {e}")
         print("  Trying to find valid size...")
-        size64 = find_valid_size(w3_l1, w3_l2, outbox_addr, leaf)
+        tree = index.sync(size=leaf + 1) if index is not None else None
+        size64 = find_valid_size(w3_l1, w3_l2, outbox_addr, leaf, tree)
         if size64 is None:
             print("\nStatus: ERROR - Could not determine valid size")
             return {
@@ -223,13 +253,14 @@ def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
     
     # Build proof with the uint64 values
     print("\nBuilding merkle proof...")
-    proof_data = build_proof(w3_l2, size64, leaf64)
+    tree = index.sync(size=size64) if index is not None else None
+    proof_data = build_proof(w3_l2, size64, leaf64, tree)
     root = proof_data["root"]
     print(f"  Root: {root}")
     print(f"  Send: {proof_data['send']}")
     
     # Check if root is posted on L1
-    outbox = w3_l1.eth.contract(address=Web3.to_checksum_address(outbox_addr), abi=load_abi("Outbox_impl"))
+    outbox = contract(w3_l1, outbox_addr, "Outbox_impl")
     l2_block_hash = outbox.functions.roots(root).call()
     
     if int.from_bytes(l2_block_hash, "big") == 0:
@@ -299,29 +330,15 @@ def check_status(w3_l1: Web3, w3_l2: Web3, tx_hash: str) -> Dict[str, Any]:
     }
 
 
-def execute_withdrawal(w3_l1: Web3, status_data: Dict[str, Any]) -> bool:
-    """Execute a ready withdrawal."""
-    if status_data["status"] != "READY":
-        print(f"\nCannot execute: status is {status_data['status']}")
-        return False
-    
-    # Get signer
-    pk = os.getenv("WEB3_TESTNET_PK")
-    if not pk:
-        raise ValueError("WEB3_TESTNET_PK not set")
-    
-    account = Account.from_key(pk)
-    print("\nPreparing withdrawal execution")
-    print(f"  Signer: {account.address}")
-    
-    # Build transaction
-    outbox = w3_l1.eth.contract(address=status_data["outbox_addr"], abi=load_abi("Outbox_impl"))
+def build_execute_transaction(w3_l1: Web3, status_data: Dict[str, Any], sender: str) -> Dict[str, Any]:
+    """Outbox.executeTransaction of a withdrawal `check_status` found READY."""
+    outbox = contract(w3_l1, status_data["outbox_addr"], "Outbox_impl")
     withdrawal = status_data["withdrawal"]
     
     # Convert proof to bytes
     proof_bytes = [Web3.to_bytes(hexstr=p) for p in status_data["proof_data"]["proof"]]
     
-    tx = outbox.functions.executeTransaction(
+    return outbox.functions.executeTransaction(
         proof_bytes,
         status_data["leaf64"],  # Use leaf64 for consistency
         withdrawal["caller"],
@@ -332,14 +349,29 @@ def execute_withdrawal(w3_l1: Web3, status_data: Dict[str, Any]) -> bool:
         withdrawal["callvalue"],
         withdrawal["data"]  # Already normalized to bytes
     ).build_transaction({
-        "from": account.address,
+        "from": sender,
         "value": 0,
         "gas": 600_000,
-        "maxFeePerGas": w3_l1.eth.gas_price,
-        "maxPriorityFeePerGas": w3_l1.eth.gas_price // 50,
-        "nonce": w3_l1.eth.get_transaction_count(account.address),
         "chainId": 1  # Explicitly set mainnet chainId
     })
+
+
+def execute_withdrawal(w3_l1: Web3, status_data: Dict[str, Any]) -> bool:
+    """Execute a ready withdrawal."""
+    if status_data["status"] != "READY":
+        print(f"\nCannot execute: status is {status_data['status']}")
+        return False
+    
+    # Get signer
+    pk = os.getenv("WEB3_TESTNET_PK")
+    if not pk:
+        raise ValueError("WEB3_TESTNET_PK not set")
+    
+    account = Account.from_key(pk)
+    print("\nPreparing withdrawal execution")
+    print(f"  Signer: {account.address}")
+    
+    tx = build_execute_transaction(w3_l1, status_data, account.address)
     
     print(f"  To: {tx['to']}")
     print(f"  Gas: {tx['gas']}")
@@ -352,13 +384,13 @@ def execute_withdrawal(w3_l1: Web3, status_data: Dict[str, Any]) -> bool:
         print("Transaction cancelled")
         return False
     
-    # Execute
-    signed = w3_l1.eth.account.sign_transaction(tx, account.key)
-    tx_hash = w3_l1.eth.send_raw_transaction(signed.raw_transaction)
-    print(f"\nTransaction submitted: {tx_hash.hex()}")
+    # Execute, nonce and fees are set by the sender
+    sender = TxSender(w3_l1, account)
+    pending = sender.send(tx)
+    print(f"\nTransaction submitted: {pending.hash.hex()}")
     
     print("Waiting for confirmation...")
-    receipt = w3_l1.eth.wait_for_transaction_receipt(tx_hash)
+    receipt = sender.wait(pending)
     
     if receipt["status"] == 1:
         print("\nWithdrawal executed successfully!")
@@ -369,20 +401,26 @@ def execute_withdrawal(w3_l1: Web3, status_data: Dict[str, Any]) -> bool:
 
 
 def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tx_hash", help="L2 transaction of the withdrawal")
+    parser.add_argument("--execute", action="store_true", help="Execute the withdrawal on L1, dry run otherwise")
+    args = parser.parse_args()
+
     try:
         # Get providers
         w3_l1, w3_l2 = get_providers()
         print("Connected to L1 and L2")
         
         # Check status
-        status_data = check_status(w3_l1, w3_l2, TX_HASH)
+        index = send_index(w3_l2)
+        status_data = check_status(w3_l1, w3_l2, args.tx_hash, index)
         
         # Handle execution
-        if DRY_RUN:
+        if not args.execute:
             print("\n" + "=" * 70)
             print("DRY RUN MODE - No transaction will be sent")
             if status_data["status"] == "READY":
-                print("Withdrawal is ready to execute. Set DRY_RUN=False to execute.")
+                print("Withdrawal is ready to execute. Pass --execute to execute.")
         else:
             if status_data["status"] == "READY":
                 execute_withdrawal(w3_l1, status_data)
@@ -399,4 +437,4 @@ def main():
 
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""Local Arbitrum outbox Merkle proofs.
+
+Nitro appends the hash of every L2->L1 send to a Merkle accumulator and posts its root
+to the L1 Outbox. `SendTree` rebuilds that accumulator from `L2ToL1Tx` events, so roots
+and proofs for any (size, leaf) are computed locally instead of one
+`NodeInterface.constructOutboxProof` call per withdrawal and size guess.
+
+Tree layout, as in Nitro's merkleAccumulator and Outbox.calculateMerkleRoot:
+- leaves are keccak256(send hash), in position order
+- a node is keccak256(left ++ right), a subtree with no leaves is bytes32(0)
+- a tree of `size` sends has depth ceil(log2(size))
+"""
+import json
+import os
+from pathlib import Path
+from threading import Lock
+from typing import Dict, Iterable, List, Tuple
+
+from eth_utils import keccak
+from web3 import Web3
+
+ARBSYS = "0x0000000000000000000000000000000000000064"
+L2_TO_L1_TX_TOPIC = Web3.keccak(text="L2ToL1Tx(address,address,uint256,uint256,uint256,uint256,uint256,uint256,bytes)")
+SEND_ROOT_UPDATED_TOPIC = Web3.keccak(text="SendRootUpdated(bytes32,bytes32)")
+NITRO_GENESIS_BLOCK = 22207817  # Arbitrum One, the send accumulator starts empty here
+ZERO = bytes(32)
+GROW_CHUNK_AFTER = 4  # Ranges scanned without an error before a shrunk get_logs chunk doubles
+
+CACHE_DIR = Path(os.getenv("FASTBRIDGE_ARB_SENDS_CACHE", Path(__file__).parent.parent.parent / ".cache" / "arb_sends"))
+
+
+def calculate_root(proof: List[bytes], index: int, send: bytes) -> bytes:
+    """Root the Outbox computes for `send` at `index` with `proof`."""
+    node = keccak(send)
+    for sibling in proof:
+        node = keccak(node + sibling) if index & 1 == 0 else keccak(sibling + node)
+        index >>= 1
+    return node
+
+
+class SendTree:
+    """Send accumulator keeping the hash of every complete subtree."""
+
+    def __init__(self, sends: Iterable[bytes] = ()):
+        self.sends: List[bytes] = []
+        # _levels[k][j] is the root of the complete subtree of 2**k leaves starting at leaf j << k
+        self._levels: List[List[bytes]] = [[]]
+        for send in sends:
+            self.append(send)
+
+    def __len__(self) -> int:
+        return len(self.sends)
+
+    def append(self, send: bytes):
+        self.sends.append(send)
+        node = keccak(send)
+        level = 0
+        while True:
+            if level == len(self._levels):
+                self._levels.append([])
+            self._levels[level].append(node)
+            if len(self._levels[level]) % 2 == 1:
+                return
+            node = keccak(self._levels[level][-2] + node)
+            level += 1
+
+    @staticmethod
+    def depth(size: int) -> int:
+        return (size - 1).bit_length()
+
+    def _node(self, level: int, index: int, size: int, memo: Dict) -> bytes:
+        start, end = index << level, (index + 1) << level
+        if start >= size:
+            return ZERO
+        if end <= size:
+            return self._levels[level][index]
+        # Right edge of the tree, only O(depth) of these per size
+        key = (level, index)
+        if key not in memo:
+            memo[key] = keccak(
+                self._node(level - 1, 2 * index, size, memo) + self._node(level - 1, 2 * index + 1, size, memo)
+            )
+        return memo[key]
+
+    def root(self, size: int) -> bytes:
+        """Outbox root after the first `size` sends."""
+        self._check(size)
+        return self._node(self.depth(size), 0, size, {})
+
+    def proof(self, size: int, leaf: int) -> Dict[str, object]:
+        """Same result as NodeInterface.constructOutboxProof(size, leaf)."""
+        return self.proofs(size, [leaf])[0]
+
+    def proofs(self, size: int, leaves: Iterable[int]) -> List[Dict[str, object]]:
+        """Proofs of many leaves against one root, sharing the right-edge nodes."""
+        self._check(size)
+        memo = {}
+        depth = self.depth(size)
+        root = self._node(depth, 0, size, memo)
+        result = []
+        for leaf in leaves:
+            if not 0 <= leaf < size:
+                raise ValueError(f"leaf {leaf} is not in a tree of size {size}")
+            proof = [self._node(level, (leaf >> level) ^ 1, size, memo) for level in range(depth)]
+            result.append({"send": self.sends[leaf], "root": root, "proof": proof, "leaf": leaf})
+        return result
+
+    def _check(self, size: int):
+        if not 0 < size <= len(self):
+            raise ValueError(f"size {size} is outside of the {len(self)} indexed sends")
+
+
+class SendIndex:
+    """
+    Send hashes of `L2ToL1Tx` events by position, scanned from ArbSys logs and cached on disk.
+    `sync` may be called from several threads, the tree is append-only so proofs of synced sizes stay valid.
+    `warm` is set when an earlier run left a cache, so syncing only scans blocks after it.
+    """
+
+    def __init__(self, w3_l2: Web3, cache_dir: Path = CACHE_DIR, start_block: int = NITRO_GENESIS_BLOCK,
+                 chunk: int = 500_000):
+        self.w3 = w3_l2
+        self.chunk = chunk
+        chain_id = w3_l2.eth.chain_id
+        self._sends_path = Path(cache_dir) / f"{chain_id}.bin"
+        self._meta_path = Path(cache_dir) / f"{chain_id}.json"
+
+        self.next_block = start_block
+        self.tree = SendTree()
+        self._lock = Lock()
+        self.warm = self._meta_path.exists() and self._sends_path.exists()
+        if self.warm:
+            self.next_block = json.loads(self._meta_path.read_text())["next_block"]
+            data = self._sends_path.read_bytes()
+            for i in range(0, len(data), 32):
+                self.tree.append(data[i:i + 32])
+
+    def _get_logs(self, from_block: int, to_block: int) -> list:
+        return self.w3.eth.get_logs({
+            "address": Web3.to_checksum_address(ARBSYS),
+            "topics": [L2_TO_L1_TX_TOPIC],
+            "fromBlock": from_block,
+            "toBlock": to_block,
+        })
+
+    def sync(self, size: int = None, to_block: int = None) -> SendTree:
+        """Index sends until at least `size` are known or `to_block` (latest by default) is scanned."""
+        with self._lock:
+            to_block = self.w3.eth.block_number if to_block is None else to_block
+            self._sends_path.parent.mkdir(parents=True, exist_ok=True)
+            chunk = self.chunk
+            scanned = 0  # Ranges scanned since the chunk last shrank
+            while self.next_block <= to_block and (size is None or len(self.tree) < size):
+                end = min(self.next_block + chunk - 1, to_block)
+                try:
+                    logs = self._get_logs(self.next_block, end)
+                except Exception:
+                    if chunk == 1:
+                        raise
+                    chunk = max(1, chunk // 2)  # Too many logs in the range for the RPC
+                    scanned = 0
+                    continue
+                # Dense ranges come in runs, so keep the smaller chunk and grow it back a step at a time
+                scanned += 1
+                if scanned % GROW_CHUNK_AFTER == 0:
+                    chunk = min(self.chunk, chunk * 2)
+
+                new = []
+                for log in logs:
+                    position = int.from_bytes(log["topics"][3], "big")
+                    if position < len(self.tree) + len(new):
+                        continue  # Already indexed
+                    if position != len(self.tree) + len(new):
+                        raise RuntimeError(
+                            f"Send {len(self.tree) + len(new)} is missing, found {position} at block "
+                            f"{log['blockNumber']}. Start scanning from an earlier block."
+                        )
+                    new.append(bytes(log["topics"][2]))
+                with open(self._sends_path, "ab") as f:
+                    f.write(b"".join(new))
+                for send in new:
+                    self.tree.append(send)
+                self.next_block = end + 1
+                self._meta_path.write_text(json.dumps({"next_block": self.next_block}) + "\n")
+                print(f"  Indexed {len(self.tree)} sends up to block {end}")
+            return self.tree
+
+
+def latest_send_root(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, lookback: int = 50_000) -> Tuple[bytes, int]:
+    """Latest root posted to the Outbox and the number of sends it covers.
+
+    The size comes from the `sendCount` of the L2 block the root was posted for.
+    """
+    latest = w3_l1.eth.block_number
+    logs = w3_l1.eth.get_logs({
+        "address": Web3.to_checksum_address(outbox_addr),
+        "topics": [SEND_ROOT_UPDATED_TOPIC],
+        "fromBlock": max(0, latest - lookback),
+        "toBlock": latest,
+    })
+    if not logs:
+        raise RuntimeError(f"No SendRootUpdated in the last {lookback} L1 blocks")
+    root, l2_block_hash = bytes(logs[-1]["topics"][1]), logs[-1]["topics"][2]
+    send_count = w3_l2.eth.get_block(l2_block_hash)["sendCount"]
+    return root, int(send_count, 16) if isinstance(send_count, str) else int(send_count)
+
+
+def prove_all(w3_l1: Web3, w3_l2: Web3, outbox_addr: str, leaves: List[int], index: SendIndex = None) -> List[Dict]:
+    """Proofs of many withdrawals against the latest Outbox root in one pass.
+
+    Leaves newer than the root are returned with `proof` set to None.
+    """
+    root, size = latest_send_root(w3_l1, w3_l2, outbox_addr)
+    index = index or SendIndex(w3_l2)
+    tree = index.sync(size=size)
+    if tree.root(size) != root:
+        raise RuntimeError(f"Local root of {size} sends does not match the Outbox root {Web3.to_hex(root)}")
+
+    provable = [leaf for leaf in leaves if leaf < size]
+    proofs = {p["leaf"]: p for p in tree.proofs(size, provable)} if provable else {}
+    return [proofs.get(leaf, {"leaf": leaf, "root": None, "proof": None}) for leaf in leaves]
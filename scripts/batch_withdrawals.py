@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Finalize many Arbitrum and OP withdrawals in one L1 transaction through WithdrawalExecutor.
+
+Withdrawals are checked with the existing status checkers, only ready ones are batched.
+Every call gets its own estimated gas, so one failing withdrawal can't starve the rest.
+
+    DRPC_API_KEY=... python scripts/batch_withdrawals.py --executor 0x... \\
+        --arbitrum 0x<l2 tx> --arbitrum 0x<l2 tx> --optimism 0x<l2 tx>
+    WEB3_TESTNET_PK=... python scripts/batch_withdrawals.py ... --execute
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+from typing import List, NamedTuple
+
+from eth_account import Account
+from web3 import Web3
+
+SCRIPTS = Path(__file__).parent
+sys.path[:0] = [str(SCRIPTS / "arb_proof"), str(SCRIPTS / "op_proof")]
+
+from arb_proof import check_status, contract, get_providers, send_index  # noqa: E402
+from compile_cache import artifact  # noqa: E402
+from op_proof_utils import (  # noqa: E402
+    build_withdrawal_transaction, get_providers as op_providers, get_withdrawal_status, load_contracts, parse_withdrawal,
+)
+from tx_sender import TxSender  # noqa: E402
+
+GAS_MARGIN = 1.25
+MAX_CALLS = 16  # WithdrawalExecutor.MAX_CALLS
+
+
+class Call(NamedTuple):
+    target: str
+    gas: int
+    data: bytes
+
+
+def arbitrum_call(w3_l1: Web3, status_data: dict) -> Call:
+    """Outbox.executeTransaction of a withdrawal `check_status` found READY"""
+    withdrawal = status_data["withdrawal"]
+    outbox = contract(w3_l1, status_data["outbox_addr"], "Outbox_impl")
+    data = outbox.encode_abi("executeTransaction", args=[
+        [Web3.to_bytes(hexstr=p) for p in status_data["proof_data"]["proof"]],
+        status_data["leaf64"],
+        withdrawal["caller"],
+        withdrawal["destination"],
+        withdrawal["arbBlockNum"],
+        withdrawal["ethBlockNum"],
+        withdrawal["timestamp"],
+        withdrawal["callvalue"],
+        withdrawal["data"],
+    ])
+    return Call(outbox.address, 0, Web3.to_bytes(hexstr=data))
+
+
+def optimism_call(portal, withdrawal_tx: tuple, proof_submitter: str = None) -> Call:
+    """OptimismPortal finalization of a proven withdrawal"""
+    if proof_submitter:
+        data = portal.encode_abi("finalizeWithdrawalTransactionExternalProof", args=[withdrawal_tx, proof_submitter])
+    else:
+        data = portal.encode_abi("finalizeWithdrawalTransaction", args=[withdrawal_tx])
+    return Call(portal.address, 0, Web3.to_bytes(hexstr=data))
+
+
+def with_gas(w3_l1: Web3, executor: str, call: Call) -> Call:
+    """Set the gas of a call from an estimate as if sent by the executor, raises if it would fail"""
+    tx = {"from": Web3.to_checksum_address(executor), "to": Web3.to_checksum_address(call.target), "data": call.data}
+    gas = w3_l1.eth.estimate_gas(tx)
+    return call._replace(gas=int(gas * GAS_MARGIN))
+
+
+def executor_contract(w3_l1: Web3, address: str):
+    abi = artifact("contracts/WithdrawalExecutor.vy")["abi"]
+    return w3_l1.eth.contract(address=Web3.to_checksum_address(address), abi=abi)
+
+
+def build_batch(w3_l1: Web3, executor: str, calls: List[Call], sender: str) -> dict:
+    """WithdrawalExecutor.execute transaction for up to MAX_CALLS `calls`"""
+    assert len(calls) <= MAX_CALLS, f"At most {MAX_CALLS} calls per batch"
+    executor = executor_contract(w3_l1, executor)
+    return executor.functions.execute([tuple(call) for call in calls]).build_transaction({
+        "from": sender,
+        "gas": sum(call.gas for call in calls) + 50_000 * len(calls) + 50_000,
+    })
+
+
+def split(calls: List[Call]) -> List[List[Call]]:
+    """Batches of at most MAX_CALLS calls"""
+    return [calls[i:i + MAX_CALLS] for i in range(0, len(calls), MAX_CALLS)]
+
+
+def estimated(w3_l1: Web3, executor: str, calls: List[Call]) -> List[Call]:
+    """`calls` with their gas set, dropping the ones whose estimate fails"""
+    ready = []
+    for call in calls:
+        try:
+            ready.append(with_gas(w3_l1, executor, call))
+        except Exception as e:
+            print(f"Dropping call to {call.target}: estimation failed, {e}")
+    return ready
+
+
+def failed_calls(w3_l1: Web3, executor: str, receipt: dict) -> List[int]:
+    """Indices of the calls of an executed batch that reverted, from its Executed events"""
+    executed = executor_contract(w3_l1, executor).events.Executed().process_receipt(receipt)
+    return [event["args"]["index"] for event in executed if not event["args"]["success"]]
+
+
+def arbitrum_calls(w3_l1: Web3, tx_hashes: List[str], w3_l2: Web3 = None) -> List[Call]:
+    if not tx_hashes:
+        return []
+    if w3_l2 is None:
+        _, w3_l2 = get_providers()
+    index = send_index(w3_l2)
+    calls = []
+    for tx_hash in tx_hashes:
+        status_data = check_status(w3_l1, w3_l2, tx_hash, index)
+        if status_data["status"] == "READY":
+            calls.append(arbitrum_call(w3_l1, status_data))
+        else:
+            print(f"Skipping {tx_hash}: {status_data['status']}")
+    return calls
+
+
+def optimism_calls(w3_l1: Web3, tx_hashes: List[str]) -> List[Call]:
+    if not tx_hashes:
+        return []
+    _, w3_l2 = op_providers()
+    contracts = load_contracts(w3_l1, w3_l2)
+    portal = contracts["portal"]
+
+    calls = []
+    for tx_hash in tx_hashes:
+        _, args = parse_withdrawal(w3_l2, contracts["message_passer"], tx_hash)
+        status = get_withdrawal_status(portal, contracts["anchor_state_registry"], args["withdrawalHash"])
+        if status == "ready-to-finalize":
+            calls.append(optimism_call(portal, build_withdrawal_transaction(args)))
+        else:
+            print(f"Skipping {tx_hash}: {status}")
+    return calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--executor", required=True, help="WithdrawalExecutor address on L1")
+    parser.add_argument("--arbitrum", action="append", default=[], help="L2 tx hash of an Arbitrum withdrawal")
+    parser.add_argument("--optimism", action="append", default=[], help="L2 tx hash of an OP withdrawal")
+    parser.add_argument("--execute", action="store_true", help="Send the batch, dry run otherwise")
+    args = parser.parse_args()
+
+    w3_l1, _ = get_providers()
+    calls = arbitrum_calls(w3_l1, args.arbitrum) + optimism_calls(w3_l1, args.optimism)
+
+    ready = estimated(w3_l1, args.executor, calls)
+    if not ready:
+        print("Nothing to execute")
+        return 1
+
+    batches = split(ready)
+    if not args.execute:
+        for batch in batches:
+            tx = build_batch(w3_l1, args.executor, batch, "0x" + "00" * 20)
+            print(f"{len(batch)} withdrawals, gas {tx['gas']}, calldata {len(tx['data']) // 2 - 1} bytes")
+        print("DRY RUN MODE - pass --execute to send")
+        return 0
+
+    # All batches are in flight at once, nonces are assigned by the sender
+    sender = TxSender(w3_l1, Account.from_key(os.environ["WEB3_TESTNET_PK"]))
+    for batch in batches:
+        pending = sender.send(build_batch(w3_l1, args.executor, batch, sender.address))
+        print(f"Batch of {len(batch)} withdrawals submitted: {pending.hash.hex()}")
+    for receipt in sender.wait_all():
+        failed = failed_calls(w3_l1, args.executor, receipt)
+        print(f"Status {receipt['status']}, failed withdrawals: {failed or 'none'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
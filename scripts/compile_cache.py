@@ -0,0 +1,106 @@
+"""
+Shared on-disk cache of compiled contracts for tests and scripts.
+
+Artifacts are keyed by a hash of the contract source and every Vyper source it may
+import (`contracts/` including the oapp_vyper module, the test mocks and snekmate),
+so editing any of them invalidates the cache without running the compiler to find
+out. A hit skips parsing and analysis entirely. Compilation of a missing artifact is
+serialized by a file lock, so parallel xdist workers compile each contract once and
+the rest read the result.
+
+Next to the pickled compiler data a `<name>-<key>.json` with bytecode, ABI and
+storage layout is written for consumers that don't use boa.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import pickle
+from functools import cache
+from importlib.metadata import version
+from pathlib import Path
+
+import boa
+import snekmate
+from boa.contracts.vyper.vyper_contract import VyperDeployer
+from vyper.compiler.output import build_abi_output, build_layout_output
+
+ROOT = Path(__file__).resolve().parent.parent
+CACHE_DIR = Path(os.getenv("FASTBRIDGE_COMPILE_CACHE", ROOT / ".cache" / "compile"))
+SOURCE_ROOTS = [ROOT / "contracts", ROOT / "tests" / "mocks", *map(Path, snekmate.__path__)]
+
+_deployers = {}
+
+
+@cache
+def _sources_digest() -> bytes:
+    h = hashlib.sha256(f"vyper {version('vyper')} titanoboa {version('titanoboa')}".encode())
+    for source_root in SOURCE_ROOTS:
+        for path in sorted(source_root.rglob("*.vy*")):
+            h.update(str(path.relative_to(source_root)).encode())
+            h.update(hashlib.sha256(path.read_bytes()).digest())
+    return h.digest()
+
+
+def cache_key(filename: str | Path) -> str:
+    path = Path(filename).resolve()
+    h = hashlib.sha256(_sources_digest())
+    h.update(str(path.relative_to(ROOT) if path.is_relative_to(ROOT) else path).encode())
+    h.update(path.read_bytes())
+    return h.hexdigest()[:32]
+
+
+def _compile(filename: Path, artifact: Path) -> VyperDeployer:
+    deployer = boa.load_partial(str(filename))
+    data = deployer.compiler_data
+
+    tmp = artifact.with_suffix(f".{os.getpid()}.tmp")
+    tmp.write_text(json.dumps({
+        "bytecode": "0x" + data.bytecode.hex(),
+        "bytecode_runtime": "0x" + data.bytecode_runtime.hex(),
+        "abi": build_abi_output(data),
+        "layout": build_layout_output(data),
+    }, indent=2))
+    tmp.replace(artifact.with_suffix(".json"))
+
+    tmp.write_bytes(pickle.dumps(data))
+    tmp.replace(artifact)
+    return deployer
+
+
+def load_partial(filename: str | Path) -> VyperDeployer:
+    """
+    Drop-in replacement of `boa.load_partial` backed by the shared cache
+    """
+    key = cache_key(filename)
+    if key in _deployers:
+        return _deployers[key]
+
+    artifact = CACHE_DIR / f"{Path(filename).stem}-{key}.pickle"
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(artifact.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        if artifact.exists():
+            deployer = VyperDeployer(pickle.loads(artifact.read_bytes()), filename=str(filename))
+        else:
+            deployer = _compile(Path(filename), artifact)
+
+    _deployers[key] = deployer
+    return deployer
+
+
+def load(filename: str | Path, *args, **kwargs):
+    """
+    Drop-in replacement of `boa.load` backed by the shared cache
+    """
+    kwargs.setdefault("contract_name", Path(filename).stem)
+    return load_partial(filename).deploy(*args, **kwargs)
+
+
+def artifact(filename: str | Path) -> dict:
+    """
+    @return Bytecode, ABI and storage layout of a contract
+    """
+    load_partial(filename)
+    return json.loads((CACHE_DIR / f"{Path(filename).stem}-{cache_key(filename)}.json").read_text())
@@ -8,6 +8,9 @@ from web3 import Web3
 from getpass import getpass
 from eth_account import account
 
+from compile_cache import load_partial
+from fork_pool import FORKS
+
 
 L2_NETWORK = (
     f"https://rpc.frax.com"  # ALTER
@@ -24,10 +27,10 @@ L2_OWNER = "0x28c4A1Fa47EEE9226F8dE7D6AF0a41C62Ca98267"  # ALTER
 
 
 def deploy_l1():
-    vault_messenger = (boa.load_partial("contracts/messengers/VaultMessengerLZ.vy")
+    vault_messenger = (load_partial("contracts/messengers/VaultMessengerLZ.vy")
                        .deploy(LZ_ENDPOINT))
                        # .at("0x4A10d0FF9e394f3A3dCdb297973Db40Ce304b44f"))  # noqa
-    fast_bridge_vault = (boa.load_partial("contracts/FastBridgeVault.vy")
+    fast_bridge_vault = (load_partial("contracts/FastBridgeVault.vy")
                          .deploy(OWNERSHIP_DAO, EMERGENCY_DAO, [vault_messenger]))
                          # .at("0x97d024859B68394122B3d0bb407dD7299cC8E937"))  # noqa
     vault_messenger.set_vault(fast_bridge_vault)
@@ -44,14 +47,14 @@ def deploy_l2(fast_bridge_vault):
     lz_endpoint = "0x1a44076050125825900e736c501f859c50fE728c"  # ALTER: https://docs.layerzero.network/v2/deployments/deployed-contracts?chains=
     vault_eid = 30101  # Vault Endpoint ID (Ethereum)
     gas_limit = 200_000
-    l2_messenger = (boa.load_partial("contracts/messengers/L2MessengerLZ.vy")
+    l2_messenger = (load_partial("contracts/messengers/L2MessengerLZ.vy")
                     .deploy(lz_endpoint, vault_eid, gas_limit))
                     # .at("0x345BBb82a124A2ab64aD515605274F36b6e5aB3e"))  # noqa
-    bridger = (boa.load_partial("contracts/bridgers/OptimismBridger.vy")
+    bridger = (load_partial("contracts/bridgers/OptimismBridger.vy")
                .deploy())
                # .at("0x5dfafda4d5b26be0e99e6a8c6b1eb97ed99b9bd3"))  # noqa
     crvusd = "0xC52D7F23a2e460248Db6eE192Cb23dD12bDDCbf6"  # ALTER: crvusd address on L2
-    fast_bridge_l2 = (boa.load_partial("contracts/FastBridgeL2.vy")
+    fast_bridge_l2 = (load_partial("contracts/FastBridgeL2.vy")
                       .deploy(crvusd, fast_bridge_vault, bridger, l2_messenger))
                       # .at("0x60F542FCdCb5Edb26a42514A8434CE4c772F2fd7"))  # noqa
     l2_messenger.set_fast_bridge_l2(fast_bridge_l2)
@@ -66,7 +69,7 @@ def deploy_l2(fast_bridge_vault):
 
 
 def setup_l1(vault_messenger_lz, l2_messenger_lz):
-    vault_messenger = boa.load_partial("contracts/messengers/VaultMessengerLZ.vy").at(vault_messenger_lz)
+    vault_messenger = load_partial("contracts/messengers/VaultMessengerLZ.vy").at(vault_messenger_lz)
 
     l2_eid = 30111  # ALTER: https://docs.layerzero.network/v2/deployments/deployed-contracts?chains=
     vault_messenger.setPeer(
@@ -108,7 +111,7 @@ def setup_l1(vault_messenger_lz, l2_messenger_lz):
 
 
 def setup_l2(vault_messenger_lz, l2_messenger_lz):
-    l2_messenger = boa.load_partial("contracts/messengers/L2MessengerLZ.vy").at(l2_messenger_lz)
+    l2_messenger = load_partial("contracts/messengers/L2MessengerLZ.vy").at(l2_messenger_lz)
 
     l1_eid = 30101  # Ethereum
     l2_messenger.setPeer(
@@ -149,19 +152,19 @@ def setup_l2(vault_messenger_lz, l2_messenger_lz):
 
 
 def set_limits(fast_bridge_l2):
-    fast_bridge_l2 = boa.load_partial("contracts/FastBridgeL2.vy").at(fast_bridge_l2)
+    fast_bridge_l2 = load_partial("contracts/FastBridgeL2.vy").at(fast_bridge_l2)
 
     fast_bridge_l2.set_min_amount(10 * 10 ** 18)
     fast_bridge_l2.set_limit((200_000 // 4) * 10 ** 18)  # ALTER
 
 
 def revoke_ownership_l1(fast_bridge_vault, vault_messenger_lz):
-    fast_bridge_vault = boa.load_partial("contracts/FastBridgeVault.vy").at(fast_bridge_vault)
+    fast_bridge_vault = load_partial("contracts/FastBridgeVault.vy").at(fast_bridge_vault)
     # Should be revoked at deployment
     if fast_bridge_vault.hasRole(fast_bridge_vault.DEFAULT_ADMIN_ROLE(), boa.env.eoa):
         fast_bridge_vault.revokeRole(fast_bridge_vault.DEFAULT_ADMIN_ROLE(), boa.env.eoa)
 
-    vault_messenger = boa.load_partial("contracts/messengers/VaultMessengerLZ.vy").at(vault_messenger_lz)
+    vault_messenger = load_partial("contracts/messengers/VaultMessengerLZ.vy").at(vault_messenger_lz)
     vault_messenger.setDelegate(OWNERSHIP_DAO)
     vault_messenger.transfer_ownership(OWNERSHIP_DAO)
 
@@ -169,16 +172,19 @@ def revoke_ownership_l1(fast_bridge_vault, vault_messenger_lz):
 
 
 def revoke_ownership_l2(fast_bridge_l2, l2_messenger_lz):
-    fast_bridge_l2 = boa.load_partial("contracts/FastBridgeL2.vy").at(fast_bridge_l2)
+    fast_bridge_l2 = load_partial("contracts/FastBridgeL2.vy").at(fast_bridge_l2)
     fast_bridge_l2.transfer_ownership(L2_OWNER)
 
-    l2_messenger = boa.load_partial("contracts/messengers/L2MessengerLZ.vy").at(l2_messenger_lz)
+    l2_messenger = load_partial("contracts/messengers/L2MessengerLZ.vy").at(l2_messenger_lz)
     l2_messenger.setDelegate(L2_OWNER)
     l2_messenger.transfer_ownership(L2_OWNER)
 
     print("Ownership on L2 transferred")
 
 
+_account = None
+
+
 def account_load(fname):
     path = os.path.expanduser(os.path.join("~", ".brownie", "accounts", fname + ".json"))
     with open(path, "r") as f:
@@ -187,12 +193,13 @@ def account_load(fname):
 
 
 def set_env(simulation: bool, mainnet: bool):
+    url = ETH_NETWORK if mainnet else L2_NETWORK
     if simulation:
-        boa.fork(ETH_NETWORK if mainnet else L2_NETWORK, block_identifier="latest", allow_dirty=True)
-        boa.env.eoa = "0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"
+        FORKS.activate(FORKS.fork(url, eoa="0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"))
     else:
-        boa.set_network_env(ETH_NETWORK if mainnet else L2_NETWORK)
-        boa.env.add_account(account_load('curve'))
+        global _account
+        _account = _account or account_load('curve')
+        FORKS.activate(FORKS.network(url, _account))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,242 @@
+"""
+Deploy FastBridge to L1 and every L2 of `deploy_config.json` in one resumable run.
+
+L2s are deployed concurrently, one process per chain. Every deployed address and
+finished step is written to the state file as soon as it happens, so rerunning after
+a failure skips whatever is already done. L1 peers of all new L2s are set in one L1
+session and their DVN configs are sent to the endpoint in a single `setConfig`.
+
+    python scripts/deploy_all.py --simulate
+    python scripts/deploy_all.py --chains fraxtal --account curve
+"""
+
+import argparse
+import fcntl
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from getpass import getpass
+from pathlib import Path
+
+import boa
+from eth_abi import encode
+from eth_account import account
+from web3 import Web3
+
+from compile_cache import load_partial
+from fork_pool import FORKS
+
+SCRIPTS = Path(__file__).parent
+ULN_CONFIG_TYPE = 2
+SIMULATION_EOA = "0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"
+
+L1 = "l1"
+
+_account = None  # unlocked once in the main process, inherited by chain workers
+
+
+class DeploymentState:
+    """Addresses and finished steps per chain, safe to update from several processes"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def _read(self) -> dict:
+        return json.loads(self.path.read_text()) if self.path.exists() else {}
+
+    def get(self, chain: str) -> dict:
+        return self._read().get(chain, {})
+
+    def is_done(self, chain: str, step: str) -> bool:
+        return step in self.get(chain).get("done", [])
+
+    def update(self, chain: str, done: str = None, **addresses):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            data = self._read()
+            chain_state = data.setdefault(chain, {})
+            chain_state.update({name: str(address) for name, address in addresses.items()})
+            if done is not None and done not in chain_state.setdefault("done", []):
+                chain_state["done"].append(done)
+            tmp = self.path.with_suffix(".tmp")
+            tmp.write_text(json.dumps(data, indent=2) + "\n")
+            tmp.replace(self.path)
+
+
+def step(state: DeploymentState, chain: str, name: str, fn, *args):
+    if state.is_done(chain, name):
+        print(f"[{chain}] {name}: already done")
+        return
+    fn(*args)
+    state.update(chain, done=name)
+    print(f"[{chain}] {name}: done")
+
+
+def deploy(state: DeploymentState, chain: str, name: str, path: str, *args):
+    """Deploy a contract unless the state already has it"""
+    address = state.get(chain).get(name)
+    if address is None:
+        address = load_partial(path).deploy(*args).address
+        state.update(chain, **{name: address})
+        print(f"[{chain}] {name}: deployed at {address}")
+    return load_partial(path).at(address)
+
+
+def uln_config(cfg: dict) -> bytes:
+    required_dvns = sorted(Web3.to_checksum_address(addr) for addr in cfg["required_dvns"])
+    optional_dvns = sorted(Web3.to_checksum_address(addr) for addr in cfg["optional_dvns"])
+    config_struct = (
+        0,  # confirmations (uint64)
+        len(required_dvns),
+        len(optional_dvns),
+        len(optional_dvns) if optional_dvns else 0,
+        required_dvns,
+        optional_dvns,
+    )
+    return encode(["(uint64,uint8,uint8,uint8,address[],address[])"], [config_struct])
+
+
+def account_load(fname):
+    path = os.path.expanduser(os.path.join("~", ".brownie", "accounts", fname + ".json"))
+    with open(path, "r") as f:
+        pkey = account.decode_keyfile_json(json.load(f), getpass())
+        return account.Account.from_key(pkey)
+
+
+def set_env(rpc: str, simulation: bool):
+    rpc = os.path.expandvars(rpc)
+    if simulation:
+        FORKS.activate(FORKS.fork(rpc, eoa=SIMULATION_EOA))
+    else:
+        FORKS.activate(FORKS.network(rpc, _account))
+
+
+def deploy_l1(cfg: dict, state: DeploymentState):
+    vault_messenger = deploy(state, L1, "VaultMessengerLZ", "contracts/messengers/VaultMessengerLZ.vy",
+                             cfg["lz_endpoint"])
+    fast_bridge_vault = deploy(state, L1, "FastBridgeVault", "contracts/FastBridgeVault.vy",
+                               cfg["ownership_dao"], cfg["emergency_dao"], [vault_messenger])
+    deploy(state, L1, "VaultLens", "contracts/lens/VaultLens.vy")
+    step(state, L1, "set_vault", vault_messenger.set_vault, fast_bridge_vault)
+    step(state, L1, "set_delegate", vault_messenger.setDelegate, boa.env.eoa)
+
+
+def deploy_l2(chain: str, cfg: dict, l1_cfg: dict, state_path: Path, simulation: bool):
+    """Full L2 rollout of one chain, run in its own process"""
+    try:
+        return _deploy_l2(chain, cfg, l1_cfg, DeploymentState(state_path), simulation)
+    except Exception as e:
+        # boa errors hold EVM computations which can't be sent back to the main process
+        raise RuntimeError(f"{type(e).__name__}: {e}") from None
+
+
+def _deploy_l2(chain: str, cfg: dict, l1_cfg: dict, state: DeploymentState, simulation: bool):
+    set_env(cfg["rpc"], simulation)
+    l1 = state.get(L1)
+
+    l2_messenger = deploy(state, chain, "L2MessengerLZ", "contracts/messengers/L2MessengerLZ.vy",
+                          cfg["lz_endpoint"], l1_cfg["eid"], cfg["gas_limit"])
+    bridger = deploy(state, chain, "Bridger", f"contracts/bridgers/{cfg['bridger']}.vy")
+    fast_bridge_l2 = deploy(state, chain, "FastBridgeL2", "contracts/FastBridgeL2.vy",
+                            cfg["crvusd"], l1["FastBridgeVault"], bridger, l2_messenger)
+    deploy(state, chain, "L2Lens", "contracts/lens/L2Lens.vy")
+    step(state, chain, "set_fast_bridge_l2", l2_messenger.set_fast_bridge_l2, fast_bridge_l2)
+
+    step(state, chain, "set_peer", l2_messenger.setPeer, l1_cfg["eid"], Web3.to_bytes(hexstr=l1["VaultMessengerLZ"]))
+    step(state, chain, "set_delegate", l2_messenger.setDelegate, boa.env.eoa)
+    endpoint = boa.load_abi("interfaces/ILayerZeroEndpointV2.json").at(cfg["lz_endpoint"])
+    step(state, chain, "set_config", endpoint.setConfig,
+         l2_messenger, cfg["send_lib"], [(l1_cfg["eid"], ULN_CONFIG_TYPE, uln_config(cfg))])
+
+    step(state, chain, "set_min_amount", fast_bridge_l2.set_min_amount, cfg["min_amount"] * 10**18)
+    step(state, chain, "set_limit", fast_bridge_l2.set_limit, cfg["limit"] * 10**18)
+
+    if cfg["revoke_ownership"]:
+        step(state, chain, "revoke_ownership", revoke_ownership_l2, fast_bridge_l2, l2_messenger, cfg["owner"])
+    return chain
+
+
+def setup_l1(cfg: dict, l2_cfgs: dict, state: DeploymentState):
+    """Set peers of every deployed L2 and send all their DVN configs in one `setConfig`"""
+    vault_messenger = load_partial("contracts/messengers/VaultMessengerLZ.vy").at(state.get(L1)["VaultMessengerLZ"])
+    ready = {chain: l2_cfg for chain, l2_cfg in l2_cfgs.items() if state.is_done(chain, "set_config")}
+
+    # setPeer is owner-only, so it can't go through a multicall
+    for chain, l2_cfg in ready.items():
+        messenger = state.get(chain)["L2MessengerLZ"]
+        step(state, L1, f"set_peer:{chain}", vault_messenger.setPeer, l2_cfg["eid"], Web3.to_bytes(hexstr=messenger))
+
+    pending = {chain: l2_cfg for chain, l2_cfg in ready.items() if not state.is_done(L1, f"set_config:{chain}")}
+    if pending:
+        endpoint = boa.load_abi("interfaces/ILayerZeroEndpointV2.json").at(cfg["lz_endpoint"])
+        endpoint.setConfig(
+            vault_messenger, cfg["receive_lib"],
+            [(l2_cfg["eid"], ULN_CONFIG_TYPE, uln_config(cfg)) for l2_cfg in pending.values()],
+        )
+        for chain in pending:
+            state.update(L1, done=f"set_config:{chain}")
+        print(f"[{L1}] set_config: done for {', '.join(pending)}")
+
+    if cfg["revoke_ownership"] and len(ready) == len(l2_cfgs):
+        step(state, L1, "revoke_ownership", revoke_ownership_l1, vault_messenger, cfg["ownership_dao"])
+
+
+def revoke_ownership_l1(vault_messenger, ownership_dao):
+    vault_messenger.setDelegate(ownership_dao)
+    vault_messenger.transfer_ownership(ownership_dao)
+
+
+def revoke_ownership_l2(fast_bridge_l2, l2_messenger, owner):
+    fast_bridge_l2.transfer_ownership(owner)
+    l2_messenger.setDelegate(owner)
+    l2_messenger.transfer_ownership(owner)
+
+
+def main():
+    global _account
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--config", type=Path, default=SCRIPTS / "deploy_config.json")
+    parser.add_argument("--state", type=Path, help="Defaults to deployments/<config>[.simulation].json")
+    parser.add_argument("--chains", help="Comma-separated L2s to deploy, all by default")
+    parser.add_argument("--simulate", action="store_true", help="Deploy to forks instead of live networks")
+    parser.add_argument("--account", default="curve", help="Brownie account to deploy from")
+    args = parser.parse_args()
+
+    config = json.loads(args.config.read_text())
+    l2_cfgs = config["l2"]
+    if args.chains:
+        l2_cfgs = {chain: l2_cfgs[chain] for chain in args.chains.split(",")}
+    suffix = ".simulation.json" if args.simulate else ".json"
+    state = DeploymentState(args.state or SCRIPTS / "deployments" / (args.config.stem + suffix))
+    if args.simulate:
+        # forks start from the live chains every time, nothing to resume
+        state.path.unlink(missing_ok=True)
+
+    if not args.simulate:
+        _account = account_load(args.account)
+
+    set_env(config[L1]["rpc"], args.simulate)
+    deploy_l1(config[L1], state)
+
+    # fork keeps the unlocked account and loaded compiler data in the workers
+    context = multiprocessing.get_context("fork")
+    with ProcessPoolExecutor(max_workers=len(l2_cfgs) or 1, mp_context=context) as pool:
+        futures = {
+            pool.submit(deploy_l2, chain, l2_cfg, config[L1], state.path, args.simulate): chain
+            for chain, l2_cfg in l2_cfgs.items()
+        }
+        for future in as_completed(futures):
+            try:
+                future.result()
+            except Exception as e:
+                print(f"[{futures[future]}] failed: {e!r}, rerun to resume")
+
+    setup_l1(config[L1], l2_cfgs, state)
+    print(state.path.read_text())
+
+
+if __name__ == "__main__":
+    main()
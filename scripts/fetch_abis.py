@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Fetch every ABI the scripts use from Etherscan v2.
+
+Contracts are listed in `REGISTRY` with the chain and the file their ABI is saved to.
+Requests run concurrently under a shared rate limit. Proxies are resolved to their
+implementation, and ABIs are cached in `.cache/abis` by chain and implementation
+address: an implementation's code never changes, so its ABI is fetched only once and
+output files are only rewritten when the hash of the ABI differs.
+
+    ETHERSCAN_API_KEY=... python scripts/fetch_abis.py
+    python scripts/fetch_abis.py --chains arbitrum
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import NamedTuple
+
+import requests
+
+SCRIPTS = Path(__file__).parent
+CACHE_DIR = Path(os.getenv("FASTBRIDGE_ABI_CACHE", SCRIPTS.parent / ".cache" / "abis"))
+API_URL = "https://api.etherscan.io/v2/api"
+
+CHAIN_IDS = {
+    "mainnet": 1,
+    "optimism": 10,
+    "fraxtal": 252,
+    "arbitrum": 42161,
+}
+
+
+class Contract(NamedTuple):
+    chain: str
+    address: str
+    output: Path
+
+
+REGISTRY = {
+    # Arbitrum withdrawals
+    "Rollup": Contract("mainnet", "0x5eF0D09d1E6204141B4d37530808eD19f60FBa35", SCRIPTS / "arb_proof/abis/Rollup_impl.json"),
+    "Outbox": Contract("mainnet", "0x0B9857ae2D4A3DBe74ffE1d7DF045bb7F96E4840", SCRIPTS / "arb_proof/abis/Outbox_impl.json"),
+    "ArbSys": Contract("arbitrum", "0x0000000000000000000000000000000000000064", SCRIPTS / "arb_proof/abis/ArbSys.json"),
+    "NodeInterface": Contract("arbitrum", "0x00000000000000000000000000000000000000C8", SCRIPTS / "arb_proof/abis/NodeInterface.json"),
+    # Optimism withdrawals
+    "L1Portal": Contract("mainnet", "0xbEb5Fc579115071764c7423A4f12eDde41f106Ed", SCRIPTS / "op_proof/abi/L1Portal.json"),
+    "L1DisputeGameFactory": Contract("mainnet", "0xe5965Ab5962eDc7477C8520243A95517CD252fA9", SCRIPTS / "op_proof/abi/L1DisputeGameFactory.json"),
+    "L1AnchorStateRegistry": Contract("mainnet", "0x23B2C62946350F4246f9f9D027e071f0264FD113", SCRIPTS / "op_proof/abi/L1AnchorStateRegistry.json"),
+    "L2MessagePasser": Contract("optimism", "0x4200000000000000000000000000000000000016", SCRIPTS / "op_proof/abi/L2MessagePasser.json"),
+    # Fraxtal withdrawals
+    "FraxtalL1Portal": Contract("mainnet", "0x36cb65c1967A0Fb0EEE11569C51C2f2aA1Ca6f6D", SCRIPTS / "op_proof/abi/fraxtal/L1Portal.json"),
+    "FraxtalL2MessagePasser": Contract("fraxtal", "0x4200000000000000000000000000000000000016", SCRIPTS / "op_proof/abi/fraxtal/L2MessagePasser.json"),
+}
+
+
+class RateLimiter:
+    """Spaces calls at least `1 / rate` seconds apart across threads"""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._lock = threading.Lock()
+        self._next = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+
+class AbiFetcher:
+    def __init__(self, api_key: str, rate: float = 4, cache_dir: Path = CACHE_DIR, retries: int = 3):
+        """
+        @param rate Requests per second shared by all workers, Etherscan's free tier allows 5
+        @param cache_dir Directory of cached ABIs, keyed by chain and implementation address
+        """
+        self.api_key = api_key
+        self.limiter = RateLimiter(rate)
+        self.cache_dir = cache_dir
+        self.retries = retries
+        self._session = requests.Session()
+
+    def _get(self, chain: str, **params) -> dict | str:
+        params = {"chainid": CHAIN_IDS[chain], "module": "contract", "apikey": self.api_key, **params}
+        for attempt in range(self.retries):
+            self.limiter.wait()
+            response = self._session.get(API_URL, params=params, timeout=30)
+            response.raise_for_status()
+            data = response.json()
+            if data.get("status") == "1":
+                return data["result"]
+            # Rate limit errors come back as status 0 with a message in `result`
+            if "rate limit" not in str(data.get("result", "")).lower():
+                break
+            if attempt + 1 < self.retries:
+                time.sleep(2**attempt)
+        raise RuntimeError(f"Etherscan {params['action']} {params.get('address')} on {chain}: {data.get('result')}")
+
+    def _cache_path(self, chain: str, address: str) -> Path:
+        return self.cache_dir / f"{CHAIN_IDS[chain]}-{address.lower()}.json"
+
+    def implementation(self, chain: str, address: str) -> tuple[str, list | None]:
+        """
+        @return Implementation address (`address` itself unless it is a proxy),
+                and its ABI when Etherscan already returned it
+        """
+        source = self._get(chain, action="getsourcecode", address=address)[0]
+        if source.get("Implementation"):
+            return source["Implementation"], None
+        abi = source.get("ABI", "")
+        return address, json.loads(abi) if abi.startswith("[") else None
+
+    def fetch(self, chain: str, address: str) -> tuple[str, list]:
+        """
+        @return Implementation address and its ABI
+        """
+        impl, abi = self.implementation(chain, address)
+        cached = self._cache_path(chain, impl)
+        if cached.exists():
+            return impl, json.loads(cached.read_text())
+        if abi is None:
+            abi = json.loads(self._get(chain, action="getabi", address=impl))
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cached.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(abi))
+        tmp.replace(cached)
+        return impl, abi
+
+
+def abi_hash(abi: list) -> str:
+    return hashlib.sha256(json.dumps(abi, sort_keys=True).encode()).hexdigest()
+
+
+def save(contract: Contract, abi: list) -> bool:
+    """Write `abi` to the contract's output file, return whether it changed"""
+    if contract.output.exists() and abi_hash(json.loads(contract.output.read_text())) == abi_hash(abi):
+        return False
+    contract.output.parent.mkdir(parents=True, exist_ok=True)
+    contract.output.write_text(json.dumps(abi, indent=2) + "\n")
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chains", help=f"Comma-separated chains, all of {', '.join(CHAIN_IDS)} by default")
+    parser.add_argument("--rate", type=float, default=4, help="Etherscan requests per second")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    api_key = os.getenv("ETHERSCAN_API_KEY")
+    if not api_key:
+        raise ValueError("ETHERSCAN_API_KEY not set in environment")
+    chains = set(args.chains.split(",")) if args.chains else set(CHAIN_IDS)
+    contracts = {name: contract for name, contract in REGISTRY.items() if contract.chain in chains}
+
+    fetcher = AbiFetcher(api_key, rate=args.rate)
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        futures = {pool.submit(fetcher.fetch, c.chain, c.address): name for name, c in contracts.items()}
+        for future in as_completed(futures):
+            name = futures[future]
+            contract = contracts[name]
+            try:
+                impl, abi = future.result()
+            except Exception as e:
+                failed.append(name)
+                print(f"{name}: failed, {e}")
+                continue
+            proxy = f" (implementation {impl})" if impl.lower() != contract.address.lower() else ""
+            status = "updated" if save(contract, abi) else "unchanged"
+            print(f"{name}: {len(abi)} entries{proxy}, {status} {contract.output.relative_to(SCRIPTS)}")
+
+    if failed:
+        raise SystemExit(f"Failed to fetch {', '.join(sorted(failed))}")
+
+
+if __name__ == "__main__":
+    main()
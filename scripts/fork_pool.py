@@ -0,0 +1,90 @@
+"""
+One live boa environment per chain for scripts that hop between L1 and L2.
+
+`boa.fork` builds a fresh environment on every call, dropping everything fetched so
+far. The pool forks each RPC once and then only swaps the active environment, so
+contracts deployed on one chain are still there when the script comes back to it.
+
+The fork block of every chain is pinned for `FASTBRIDGE_FORK_TTL` seconds (an hour by
+default) and recorded in `.cache/forks/blocks.json`. boa keys its sqlite RPC cache by
+block, so reruns within that window fork the same block and start from warm storage.
+"""
+
+import contextlib
+import fcntl
+import json
+import os
+import time
+from pathlib import Path
+
+import boa
+from boa.rpc import EthereumRPC
+
+from rpc_metrics import instrument_rpc
+
+ROOT = Path(__file__).parent.parent
+CACHE_DIR = Path(os.getenv("FASTBRIDGE_FORK_CACHE", ROOT / ".cache" / "forks"))
+BLOCK_TTL = int(os.getenv("FASTBRIDGE_FORK_TTL", 3600))
+
+
+class ForkPool:
+    def __init__(self, cache_dir: Path = CACHE_DIR, block_ttl: int = BLOCK_TTL):
+        """
+        @param cache_dir Directory for pinned blocks and boa's RPC cache, None to keep everything in memory
+        @param block_ttl Seconds a pinned block is reused across runs, 0 to fork the latest block every run
+        """
+        self.cache_dir = cache_dir
+        self.block_ttl = block_ttl
+        self._envs = {}
+
+    def _pin_block(self, rpc: EthereumRPC) -> int:
+        chain_id = str(int(rpc.fetch_uncached("eth_chainId", []), 16))
+        if self.cache_dir is None:
+            return int(rpc.fetch_uncached("eth_blockNumber", []), 16)
+
+        path = Path(self.cache_dir) / "blocks.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            blocks = json.loads(path.read_text()) if path.exists() else {}
+            pinned = blocks.get(chain_id)
+            if pinned is None or time.time() - pinned["pinned_at"] >= self.block_ttl:
+                pinned = {"block": int(rpc.fetch_uncached("eth_blockNumber", []), 16), "pinned_at": int(time.time())}
+                blocks[chain_id] = pinned
+                tmp = path.with_suffix(".tmp")
+                tmp.write_text(json.dumps(blocks, indent=2) + "\n")
+                tmp.replace(path)
+        return pinned["block"]
+
+    def fork(self, url: str, eoa: str = None) -> boa.Env:
+        """Env forked from `url`, created on first use"""
+        if ("fork", url) not in self._envs:
+            rpc = instrument_rpc(EthereumRPC(url))
+            env = boa.Env()
+            env.fork_rpc(rpc, block_identifier=self._pin_block(rpc), cache_dir=self.cache_dir and str(self.cache_dir))
+            if eoa is not None:
+                env.eoa = eoa
+            self._envs["fork", url] = env
+        return self._envs["fork", url]
+
+    def network(self, url: str, account=None) -> boa.Env:
+        """NetworkEnv for live transactions to `url`, created on first use"""
+        if ("network", url) not in self._envs:
+            env = boa.NetworkEnv(instrument_rpc(EthereumRPC(url)))
+            if account is not None:
+                env.add_account(account)
+            self._envs["network", url] = env
+        return self._envs["network", url]
+
+    def activate(self, env: boa.Env):
+        """Make `env` the global `boa.env` until the next switch"""
+        boa.set_env(env)
+
+    @contextlib.contextmanager
+    def use(self, env: boa.Env):
+        """Make `env` the global `boa.env` inside the block"""
+        with boa.swap_env(env):
+            yield env
+
+
+FORKS = ForkPool()
@@ -0,0 +1,105 @@
+"""Local Merkle-Patricia proof verification for OP withdrawals.
+
+A withdrawal is provable when `sentMessages[withdrawalHash]` is set in the
+L2ToL1MessagePasser storage trie, and the output root built from that trie's root
+matches the root claim of the dispute game. Both are checked here, offline, so a bad
+proof is rejected before it costs an L1 round trip.
+"""
+from typing import Dict, List, Optional, Tuple
+
+import rlp
+from eth_abi import encode
+from eth_utils import keccak
+
+
+class InvalidProof(ValueError):
+    pass
+
+
+def _to_bytes(value) -> bytes:
+    if isinstance(value, str):
+        return bytes.fromhex(value.removeprefix("0x"))
+    return bytes(value)
+
+
+def _nibbles(data: bytes) -> List[int]:
+    return [n for byte in data for n in (byte >> 4, byte & 0x0F)]
+
+
+def _decode_path(encoded: bytes) -> Tuple[List[int], bool]:
+    """Hex-prefix decoding, returns the path nibbles and whether the node is a leaf."""
+    nibbles = _nibbles(encoded)
+    flag = nibbles[0]
+    return nibbles[2 - (flag & 1):], flag >= 2
+
+
+def _walk(root: bytes, key: bytes, proof: List[bytes]) -> Tuple[Optional[bytes], Optional[list]]:
+    """
+    Follow `key` from `root` through the proof nodes.
+    @return Value at `key` (None if the proof shows it is absent),
+            and the terminal node when it is embedded in its parent instead of hashed
+    """
+    path = _nibbles(keccak(key))  # storage tries are keyed by the hash of the slot
+    ref, i = root, 0
+    while True:
+        inline = None
+        if isinstance(ref, list):
+            node = inline = ref
+            # Optimism's MerkleTrie expects embedded nodes to be repeated as their own proof element
+            if i < len(proof) and proof[i] == rlp.encode(ref):
+                i += 1
+        elif ref == b"":
+            return None, None
+        else:
+            if i == len(proof):
+                raise InvalidProof(f"Proof ends after {i} nodes before the key is resolved")
+            if keccak(proof[i]) != ref:
+                raise InvalidProof(f"Proof node {i} does not match the hash referencing it")
+            node = rlp.decode(proof[i])
+            i += 1
+
+        if len(node) == 17:
+            if not path:
+                return node[16] or None, inline
+            ref, path = node[path[0]], path[1:]
+            continue
+        if len(node) != 2:
+            raise InvalidProof(f"Malformed trie node with {len(node)} items")
+
+        prefix, is_leaf = _decode_path(node[0])
+        if path[:len(prefix)] != prefix:
+            return None, None
+        path = path[len(prefix):]
+        if is_leaf:
+            if path:
+                return None, None
+            if i != len(proof):
+                raise InvalidProof(f"Proof has {len(proof) - i} unused nodes")
+            return rlp.decode(node[1]), inline
+        ref = node[1]
+
+
+def verify_storage_proof(storage_root, slot, proof: List) -> Optional[bytes]:
+    """
+    Value of `slot` proven against `storage_root`, None if the proof shows it is empty
+    @raise InvalidProof When the proof is not a valid path in the trie
+    """
+    value, _ = _walk(_to_bytes(storage_root), _to_bytes(slot), [_to_bytes(node) for node in proof])
+    return value
+
+
+def complete_proof(storage_root, slot, proof: List[str]) -> List[str]:
+    """Append the leaf as its own node when it is embedded in the last branch, as Optimism's MerkleTrie expects."""
+    _, inline = _walk(_to_bytes(storage_root), _to_bytes(slot), [_to_bytes(node) for node in proof])
+    if inline is None or (proof and _to_bytes(proof[-1]) == rlp.encode(inline)):
+        return list(proof)
+    return [*proof, "0x" + rlp.encode(inline).hex()]
+
+
+def output_root(output_root_proof: Dict[str, str]) -> bytes:
+    """Hashing.hashOutputRootProof of the fields returned by `build_output_root_proof`."""
+    return keccak(encode(
+        ["bytes32", "bytes32", "bytes32", "bytes32"],
+        [_to_bytes(output_root_proof[field]) for field in
+         ("version", "stateRoot", "messagePasserStorageRoot", "latestBlockhash")],
+    ))
@@ -1,187 +1,127 @@
 #!/usr/bin/env python3
-"""Optimism withdrawal proof builder."""
+"""
+Optimism withdrawal proof builder.
+
+    DRPC_API_KEY=... python scripts/op_proof/op_proof.py 0x<l2 tx>
+    WEB3_TESTNET_PK=... python scripts/op_proof/op_proof.py 0x<l2 tx> --execute
+"""
+import argparse
 import os
-import json
+import sys
+import time
+from typing import Any, Dict
+
 from eth_account import Account
 from web3 import Web3
-import time
 
-from op_proof_utils import (
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from op_proof_utils import (  # noqa: E402
     find_corresponding_game,
+    get_providers,
     get_withdrawal_proof,
     build_output_root_proof,
     build_withdrawal_transaction,
     build_prove_transaction,
     estimate_prove_gas,
-    get_withdrawal_hash_storage_slot,
+    load_contracts,
+    parse_withdrawal,
+    verify_withdrawal,
+    RootClaimMismatch,
 )
-
-DRY_RUN = True
-
-script_path = os.path.dirname(os.path.abspath(__file__))
-abi_path = os.path.join(script_path, 'abi')
-
-# Load environment variables
-DRPC_KEY = os.getenv("DRPC_API_KEY")
-private_key = os.getenv("WEB3_TESTNET_PK")
-
-if not DRPC_KEY:
-    raise ValueError("DRPC_API_KEY not found in environment")
-if not private_key:
-    raise ValueError("WEB3_TESTNET_PK not found in environment")
-
-# Setup account
-deployer = Account.from_key(private_key)
-
-# Setup RPC connections
-rpc_l1 = f"https://lb.drpc.org/ethereum/{DRPC_KEY}"
-rpc_l2 = f"https://lb.drpc.org/optimism/{DRPC_KEY}"
-
-w3_l1 = Web3(Web3.HTTPProvider(rpc_l1))
-w3_l2 = Web3(Web3.HTTPProvider(rpc_l2))
-
-# Load L2ToL1MessagePasser on L2
-message_passer_address = '0x4200000000000000000000000000000000000016'
-message_passer_abi = json.load(open(os.path.join(abi_path, 'L2MessagePasser.json')))
-message_passer = w3_l2.eth.contract(address=message_passer_address, abi=message_passer_abi)
-
-# Load OptimismPortal on L1
-portal_address = '0xbEb5Fc579115071764c7423A4f12eDde41f106Ed'
-portal_abi = json.load(open(os.path.join(abi_path, 'L1Portal.json')))
-portal = w3_l1.eth.contract(address=portal_address, abi=portal_abi)
-
-# Load L1DisputeGameFactory on L1
-dispute_game_factory_address = '0xe5965Ab5962eDc7477C8520243A95517CD252fA9'
-dispute_game_factory_abi = json.load(open(os.path.join(abi_path, 'L1DisputeGameFactory.json')))
-dispute_game_factory = w3_l1.eth.contract(address=dispute_game_factory_address, abi=dispute_game_factory_abi)
-
-# Load L1AnchorStateRegistry on L1
-anchor_state_registry_address = '0x23B2C62946350F4246f9f9D027e071f0264FD113'
-anchor_state_registry_abi = json.load(open(os.path.join(abi_path, 'L1AnchorStateRegistry.json')))
-anchor_state_registry = w3_l1.eth.contract(address=anchor_state_registry_address, abi=anchor_state_registry_abi)
-
-# Get transaction receipt from L2
-tx_hash = '0x91ae0d834c48c79e207ec185a53d6710fbf4ab0f190978147190ae97f6b3cd02'
-receipt = w3_l2.eth.get_transaction_receipt(tx_hash)
-
-# Find and decode MessagePassed event
-message_passed_log = [
-    log for log in receipt.logs 
-    if log.address.lower() == message_passer_address.lower()
-][0]
-decoded = message_passer.events.MessagePassed().process_log(message_passed_log)
-
-withdrawal_hash = decoded['args']['withdrawalHash']
-print(f"Withdrawal Hash: {withdrawal_hash.hex()}")
-
-# Find corresponding game for the withdrawal
-print("\nFinding corresponding dispute game...")
-# Try with just recent games first
-analysis = find_corresponding_game(
-    dispute_game_factory, 
-    portal, 
-    anchor_state_registry,
-    receipt['blockNumber'], 
-)
-
-if not analysis['can_prove']:
-    print("\n❌ Withdrawal cannot be proven yet")
-    print(f"Your withdrawal block: {receipt['blockNumber']}")
-    
-    if analysis.get('recent_games'):
-        print("\nRecent dispute games:")
-        for i, game in enumerate(analysis['recent_games']):
+from mpt import InvalidProof  # noqa: E402
+from tx_sender import TxSender  # noqa: E402
+
+ZERO_ADDRESS = "0x" + "00" * 20
+
+
+def prove(w3_l1: Web3, w3_l2: Web3, tx_hash: str, sender: str = ZERO_ADDRESS) -> Dict[str, Any]:
+    """
+    Build proveWithdrawalTransaction of an L2 withdrawal, the proof is verified locally against the game first.
+
+    Returns a dict with `status`:
+    - 'waiting-for-game': no game covers the withdrawal block yet
+    - 'invalid-proof': the proof does not match the game's root claim
+    - 'ready-to-prove': `tx` is the prove transaction from `sender`, `gas` its estimate or None
+    """
+    contracts = load_contracts(w3_l1, w3_l2)
+    portal = contracts['portal']
+    receipt, args = parse_withdrawal(w3_l2, contracts['message_passer'], tx_hash)
+    withdrawal_hash = args['withdrawalHash']
+    result = {'withdrawal_hash': '0x' + withdrawal_hash.hex(), 'l2_block': receipt['blockNumber']}
+    print(f"Withdrawal Hash: {withdrawal_hash.hex()}")
+
+    print("\nFinding corresponding dispute game...")
+    analysis = find_corresponding_game(
+        contracts['dispute_game_factory'],
+        portal,
+        contracts['anchor_state_registry'],
+        receipt['blockNumber'],
+    )
+    if not analysis['can_prove']:
+        print("\n❌ Withdrawal cannot be proven yet")
+        print(f"Your withdrawal block: {receipt['blockNumber']}")
+        for i, game in enumerate(analysis.get('recent_games') or []):
             mins_ago = (time.time() - game['timestamp']) // 60
             print(f"  Game {i+1}: L2 block {game['l2BlockNumber']} ({mins_ago} minutes ago)")
-    
-    print("\n⏳ Wait a bit for a new game to be created")
-    exit(1)
+        return {**result, 'status': 'waiting-for-game'}
 
-print("✅ Withdrawal can be proven!")
+    game = analysis['game']
+    result['game'] = game['index']
+    print("✅ Withdrawal can be proven!")
+    print(f"  Game index: {game['index']}")
+    print(f"  Game L2 block: {game['l2BlockNumber']}")
+    print(f"  Blocks ahead of withdrawal: {game['l2BlockNumber'] - receipt['blockNumber']}")
 
-game = analysis['game']
-print(f"\nFound optimal game:")
-print(f"  Game index: {game['index']}")
-print(f"  Game L2 block: {game['l2BlockNumber']}")
-print(f"  Blocks ahead of withdrawal: {game['l2BlockNumber'] - receipt['blockNumber']}")
+    # Proofs are taken at the GAME's L2 block
+    game_l2_block_number = game['l2BlockNumber']
+    withdrawal_proof, storage_hash = get_withdrawal_proof(w3_l2, withdrawal_hash, game_l2_block_number)
+    output_root_proof = build_output_root_proof(w3_l2, game_l2_block_number, storage_hash)
 
-# Use the game's L2 block number for proofs 
-game_l2_block_number = game['l2BlockNumber']
-
-# Get withdrawal proof from L2 at the GAME's L2 block 
-withdrawal_proof = get_withdrawal_proof(w3_l2, withdrawal_hash, game_l2_block_number)
-
-# Get storage hash for output root proof at the GAME's L2 block
-storage_slot = get_withdrawal_hash_storage_slot(withdrawal_hash)
-proof_response = w3_l2.manager.request_blocking(
-    "eth_getProof",
-    [message_passer_address, [f"0x{storage_slot.hex()}"], hex(game_l2_block_number)]
-)
-storage_hash = proof_response['storageHash']
-
-# Build output root proof using the GAME's L2 block
-output_root_proof = build_output_root_proof(w3_l2, game_l2_block_number, storage_hash)
-
-# Build withdrawal transaction
-withdrawal_tx = build_withdrawal_transaction(decoded['args'])
-
-# Print proof details
-print("\n=== Withdrawal Proof ===")
-print(f"L2 Block Number: {receipt['blockNumber']}")
-print(f"L2 Output Index: {game['index']}")
-print("\nWithdrawal Transaction:")
-print(f"  Nonce: {withdrawal_tx[0]}")
-print(f"  Sender: {withdrawal_tx[1]}")
-print(f"  Target: {withdrawal_tx[2]}")
-print(f"  Value: {withdrawal_tx[3]}")
-print(f"  Gas Limit: {withdrawal_tx[4]}")
-print(f"  Data: {withdrawal_tx[5].hex() if withdrawal_tx[5] else '0x'}")
-print("\nGame Info:")
-print(f"  Game L2 Block: {game_l2_block_number}")
-print("\nOutput Root Proof (at game L2 block):")
-print(f"  Version: {output_root_proof['version']}")
-print(f"  State Root: {output_root_proof['stateRoot']}")
-print(f"  Message Passer Storage Root: {output_root_proof['messagePasserStorageRoot']}")
-print(f"  Latest Block Hash: {output_root_proof['latestBlockhash']}")
-print(f"\nWithdrawal Proof: {len(withdrawal_proof)} nodes")
-
-# Build proof transaction
-try:
-    tx = build_prove_transaction(
-        portal,
-        withdrawal_tx,
-        game['index'],
-        output_root_proof,
-        withdrawal_proof,
-        deployer.address
-        )
-    
-    # Estimate gas
+    # Check the proof locally before spending an L1 round trip on it
     try:
-        gas_estimate = estimate_prove_gas(
-            portal,
-            withdrawal_tx,
-            game['index'],
-            output_root_proof,
-            withdrawal_proof,
-            deployer.address
-        )
-        print(f"\nEstimated gas: {gas_estimate}")
-    except ValueError as ge:
-        print(f"\n⚠️  {ge}")
-        gas_estimate = None
-    
+        verify_withdrawal(withdrawal_hash, withdrawal_proof, output_root_proof, game['rootClaim'])
+    except RootClaimMismatch as e:
+        print(f"\n❌ Game {game['index']} does not commit to this L2 state: {e}")
+        return {**result, 'status': 'invalid-proof', 'error': str(e)}
+    except InvalidProof as e:
+        print(f"\n❌ Invalid withdrawal proof: {e}")
+        return {**result, 'status': 'invalid-proof', 'error': str(e)}
+    print("✅ Withdrawal proof verified locally against the game's root claim")
+
+    withdrawal_tx = build_withdrawal_transaction(args)
+    print(f"\nWithdrawal Proof: {len(withdrawal_proof)} nodes")
+    proof_args = (portal, withdrawal_tx, game['index'], output_root_proof, withdrawal_proof, sender)
+    tx = build_prove_transaction(*proof_args)
+    try:
+        gas = estimate_prove_gas(*proof_args)
+        print(f"\nEstimated gas: {gas}")
+    except ValueError as e:
+        print(f"\n⚠️  {e}")
+        gas = None
+    return {**result, 'status': 'ready-to-prove', 'tx': tx, 'gas': gas}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tx_hash", help="L2 transaction of the withdrawal")
+    parser.add_argument("--execute", action="store_true", help="Send the prove transaction, dry run otherwise")
+    args = parser.parse_args()
+
+    w3_l1, w3_l2 = get_providers()
+    deployer = Account.from_key(os.environ["WEB3_TESTNET_PK"]) if args.execute else None
+    result = prove(w3_l1, w3_l2, args.tx_hash, deployer.address if deployer else ZERO_ADDRESS)
+    if result['status'] != 'ready-to-prove':
+        return 1
+
     print("\n✅ Proof transaction built successfully!")
-    if DRY_RUN:
+    if not args.execute:
         print("⚠️  Transaction NOT submitted (dry run mode)")
-    else:
-        tx['maxFeePerGas'] = w3_l1.eth.gas_price
-        tx['maxPriorityFeePerGas'] = w3_l1.eth.gas_price//100
-        tx['nonce'] = w3_l1.eth.get_transaction_count(deployer.address)
-        signed_tx = w3_l1.eth.account.sign_transaction(tx, deployer.key)
-        tx_hash = w3_l1.eth.send_raw_transaction(signed_tx.raw_transaction)
-        print(f"Transaction submitted: {tx_hash.hex()}")
-except Exception as e:
-    print(f"\n❌ Error building proof transaction: {e}")
-    import traceback
-    traceback.print_exc()
\ No newline at end of file
+        return 0
+    pending = TxSender(w3_l1, deployer).send(result['tx'])
+    print(f"Transaction submitted: {pending.hash.hex()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,53 @@
 """Optimism withdrawal proof utilities."""
-from typing import List, Tuple, Dict, Any
+import os
+from pathlib import Path
+from typing import List, Optional, Tuple, Dict, Any
 from web3 import Web3
 from web3.exceptions import ContractCustomError
 from eth_utils import keccak
 from eth_abi import encode
-import rlp
 import time
 
+from abi_registry import ABIS
+from mpt import InvalidProof, complete_proof, output_root, verify_storage_proof
+from rpc_metrics import instrument
+
 
 # Constants
 L2_MESSAGE_PASSER = "0x4200000000000000000000000000000000000016"
+PORTAL = "0xbEb5Fc579115071764c7423A4f12eDde41f106Ed"
+DISPUTE_GAME_FACTORY = "0xe5965Ab5962eDc7477C8520243A95517CD252fA9"
+ANCHOR_STATE_REGISTRY = "0x23B2C62946350F4246f9f9D027e071f0264FD113"
 ZERO_VERSION = "0x" + "00" * 32
+ABI_PATH = Path(__file__).parent / "abi"
+
+
+def get_providers() -> Tuple[Web3, Web3]:
+    """L1 and OP Mainnet web3 providers using DRPC."""
+    key = os.getenv("DRPC_API_KEY")
+    if not key:
+        raise ValueError("DRPC_API_KEY not found in environment")
+    return (instrument(Web3(Web3.HTTPProvider(f"https://lb.drpc.org/ethereum/{key}"))),
+            instrument(Web3(Web3.HTTPProvider(f"https://lb.drpc.org/optimism/{key}"))))
+
+
+def load_contracts(w3_l1: Web3, w3_l2: Web3) -> Dict[str, Any]:
+    """OptimismPortal, L1DisputeGameFactory, L1AnchorStateRegistry and L2ToL1MessagePasser."""
+    return {
+        'portal': ABIS.contract(w3_l1, PORTAL, ABI_PATH / 'L1Portal.json'),
+        'dispute_game_factory': ABIS.contract(w3_l1, DISPUTE_GAME_FACTORY, ABI_PATH / 'L1DisputeGameFactory.json'),
+        'anchor_state_registry': ABIS.contract(w3_l1, ANCHOR_STATE_REGISTRY, ABI_PATH / 'L1AnchorStateRegistry.json'),
+        'message_passer': ABIS.contract(w3_l2, L2_MESSAGE_PASSER, ABI_PATH / 'L2MessagePasser.json'),
+    }
+
+
+def parse_withdrawal(w3_l2: Web3, message_passer: Any, tx_hash: str) -> Tuple[Any, Dict]:
+    """Receipt of an L2 withdrawal transaction and the arguments of its MessagePassed event."""
+    receipt = w3_l2.eth.get_transaction_receipt(tx_hash)
+    log = next((log for log in receipt.logs if log.address.lower() == L2_MESSAGE_PASSER.lower()), None)
+    if log is None:
+        raise ValueError(f"No MessagePassed event in {tx_hash}, not a withdrawal transaction")
+    return receipt, message_passer.events.MessagePassed().process_log(log)['args']
 
 
 def find_corresponding_game(
@@ -32,9 +69,11 @@ def find_corresponding_game(
         retirement_ts = anchor_state_registry.functions.retirementTimestamp().call()
         print(f"Retirement timestamp: {retirement_ts}")
         
-        optimal_game = None
-        
-        for start in range(total_games - 1, 0, -batch_size):
+        candidates = []  # Games covering the block, newest first
+        latest_game = None
+
+        # Newest first: games covering the block up to the first one that doesn't, the oldest valid one is optimal
+        for start in range(total_games - 1, -1, -batch_size):
             end = start
             start_idx = max(0, start - batch_size + 1)
             
@@ -57,49 +96,65 @@ def find_corresponding_game(
                             'extraData': _ensure_hex(game[4]),
                             'l2BlockNumber': l2_block
                         }
+                    latest_game = latest_game or parsed_game
                     if l2_block >= l2_block_number and game_ts >= retirement_ts:
-                        optimal_game = parsed_game
-                    elif optimal_game:
-                        # Found the boundary - now validate with AnchorStateRegistry
-                        _, _, proxy = dispute_game_factory.functions.gameAtIndex(optimal_game['index']).call()
-                        
-                        # Check all anchor state registry flags
-                        validation_errors = []
-                        try:
-                            is_game_proper = anchor_state_registry.functions.isGameProper(proxy).call()
-                            if not is_game_proper:
-                                validation_errors.append("Game is not proper (might be blacklisted or system paused)")
-                                
-                            is_game_respected = anchor_state_registry.functions.isGameRespected(proxy).call()
-                            if not is_game_respected:
-                                validation_errors.append("Game is not respected (wrong game type)")
-                                
-                            if validation_errors:
-                                print(f"\n⚠️  Game {optimal_game['index']} validation failed:")
-                                for error in validation_errors:
-                                    print(f"   - {error}")
-                                optimal_game = None  # Reset and continue searching
-                                continue
-                        except Exception as e:
-                            print(f"\n⚠️  Could not validate game {optimal_game['index']}: {e}")
-                            optimal_game = None
-                            continue
-                            
-                        return {'can_prove': True, 'game': optimal_game, 'recent_games': None}
-            return {'can_prove': False, 'game': None, 'recent_games': [parsed_game]}
+                        candidates.append(parsed_game)
+                    else:
+                        # Found the boundary, older games cover even earlier blocks
+                        return _first_valid_game(dispute_game_factory, anchor_state_registry, candidates, latest_game)
+
+        # Every game covers the block
+        return _first_valid_game(dispute_game_factory, anchor_state_registry, candidates, latest_game)
         
     except Exception as e:
         return {'can_prove': False, 'game': None, 'recent_games': [], 'error': str(e)}
 
 
+def _first_valid_game(
+    dispute_game_factory: Any,
+    anchor_state_registry: Any,
+    candidates: List[Dict[str, Any]],
+    latest_game: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Validate games covering the block with AnchorStateRegistry, closest to the block first."""
+    for game in reversed(candidates):
+        if _validate_game(dispute_game_factory, anchor_state_registry, game):
+            return {'can_prove': True, 'game': game, 'recent_games': None}
+    return {'can_prove': False, 'game': None, 'recent_games': [latest_game] if latest_game else []}
+
+
+def _validate_game(dispute_game_factory: Any, anchor_state_registry: Any, game: Dict[str, Any]) -> bool:
+    """Check all AnchorStateRegistry flags of a game, printing why it can't be used."""
+    _, _, proxy = dispute_game_factory.functions.gameAtIndex(game['index']).call()
+    validation_errors = []
+    try:
+        is_game_proper = anchor_state_registry.functions.isGameProper(proxy).call()
+        if not is_game_proper:
+            validation_errors.append("Game is not proper (might be blacklisted or system paused)")
+            
+        is_game_respected = anchor_state_registry.functions.isGameRespected(proxy).call()
+        if not is_game_respected:
+            validation_errors.append("Game is not respected (wrong game type)")
+    except Exception as e:
+        print(f"\n⚠️  Could not validate game {game['index']}: {e}")
+        return False
+
+    if validation_errors:
+        print(f"\n⚠️  Game {game['index']} validation failed:")
+        for error in validation_errors:
+            print(f"   - {error}")
+        return False
+    return True
+
+
 def get_withdrawal_hash_storage_slot(withdrawal_hash: bytes) -> bytes:
     """Calculate storage slot for withdrawal hash in L2ToL1MessagePasser."""
     # sentMessages mapping at slot 0: keccak256(withdrawalHash . uint256(0))
     return keccak(encode(['bytes32', 'uint256'], [withdrawal_hash, 0]))
 
 
-def get_withdrawal_proof(w3_l2: Web3, withdrawal_hash: bytes, l2_block_number: int) -> List[str]:
-    """Get Merkle Patricia proof for withdrawal from L2."""
+def get_withdrawal_proof(w3_l2: Web3, withdrawal_hash: bytes, l2_block_number: int) -> Tuple[List[str], str]:
+    """Get Merkle Patricia proof for withdrawal from L2 and the L2ToL1MessagePasser storage root it is against."""
     storage_slot = get_withdrawal_hash_storage_slot(withdrawal_hash)
     
     proof_response = w3_l2.manager.request_blocking(
@@ -108,7 +163,44 @@ def get_withdrawal_proof(w3_l2: Web3, withdrawal_hash: bytes, l2_block_number: i
     )
     
     storage_proof = proof_response['storageProof'][0]['proof']
-    return _maybe_add_proof_node(storage_slot.hex(), storage_proof)
+    return complete_proof(proof_response['storageHash'], storage_slot, storage_proof), proof_response['storageHash']
+
+
+class RootClaimMismatch(InvalidProof):
+    """The storage proof is valid but the output root is not the one the game claims."""
+
+
+def verify_withdrawal(
+    withdrawal_hash: bytes,
+    withdrawal_proof: List[str],
+    output_root_proof: Dict[str, str],
+    root_claim: str
+) -> None:
+    """Check a withdrawal proof locally, exactly what proveWithdrawalTransaction checks against the game.
+
+    Raises InvalidProof for a bad storage proof, RootClaimMismatch when the output root differs from the game's."""
+    storage_slot = get_withdrawal_hash_storage_slot(withdrawal_hash)
+    value = verify_storage_proof(output_root_proof['messagePasserStorageRoot'], storage_slot, withdrawal_proof)
+    if value is None or int.from_bytes(value, 'big') != 1:
+        raise InvalidProof("Withdrawal hash is not in L2ToL1MessagePasser.sentMessages")
+
+    computed = _ensure_hex(output_root(output_root_proof))
+    if computed.lower() != _ensure_hex(root_claim).lower():
+        raise RootClaimMismatch(f"Output root {computed} does not match root claim {_ensure_hex(root_claim)}")
+
+
+def verify_withdrawals(withdrawals: List[Dict[str, Any]]) -> List[Optional[InvalidProof]]:
+    """Verify many withdrawals offline.
+
+    Each item has the keyword arguments of verify_withdrawal, returns None for every valid proof."""
+    errors = []
+    for withdrawal in withdrawals:
+        try:
+            verify_withdrawal(**withdrawal)
+            errors.append(None)
+        except InvalidProof as e:
+            errors.append(e)
+    return errors
 
 
 def build_output_root_proof(w3_l2: Web3, l2_block_number: int, storage_hash: str) -> Dict[str, str]:
@@ -200,16 +292,8 @@ def estimate_prove_gas(
             withdrawal_proof_bytes
         ).estimate_gas({'from': sender})
     except ContractCustomError as e:
-        # Build error mapping from ABI
-        error_map = {
-            Web3.keccak(text=f"{err['name']}()")[:4].hex(): err['name']
-            for err in portal.abi if err.get('type') == 'error'
-        }
-        
-        error_selector = str(e.args[0]).replace("0x", "")
-        error_name = error_map.get(error_selector, f"Unknown({error_selector})")
-        
-        raise ValueError(f"Gas estimation failed with error: {error_name}") from e
+        error = ABIS.of(portal).format_error(e.data)
+        raise ValueError(f"Gas estimation failed with error: {error}") from e
 
 
 def get_withdrawal_status(portal: Any, anchor_state_registry: Any, withdrawal_hash: bytes, proof_submitter: str = None) -> str:
@@ -233,11 +317,12 @@ def get_withdrawal_status(portal: Any, anchor_state_registry: Any, withdrawal_ha
             # Try to get from proofSubmitters
             try:
                 num_submitters = portal.functions.numProofSubmitters(withdrawal_hash).call()
-                if num_submitters > 0:
-                    proof_submitter = portal.functions.proofSubmitters(
-                        withdrawal_hash, 
-                        num_submitters - 1
-                    ).call()
+                if num_submitters == 0:
+                    return 'ready-to-prove'  # Nobody proved it
+                proof_submitter = portal.functions.proofSubmitters(
+                    withdrawal_hash,
+                    num_submitters - 1
+                ).call()
             except Exception:
                 return 'ready-to-prove'  # Assume not proven
         
@@ -258,15 +343,8 @@ def get_withdrawal_status(portal: Any, anchor_state_registry: Any, withdrawal_ha
             portal.functions.checkWithdrawal(withdrawal_hash, proof_submitter).call()
             return 'ready-to-finalize'
         except ContractCustomError as e:
-            # Build error mapping from ABI
-            error_map = {
-                Web3.keccak(text=f"{err['name']}()")[:4].hex(): err['name']
-                for err in portal.abi if err.get('type') == 'error'
-            }
-            
-            error_selector = str(e.args[0]).replace("0x", "")
-            error_name = error_map.get(error_selector, f"Unknown({error_selector})")
-            
+            error_name, _ = ABIS.of(portal).decode_error(e.data)
+
             # Check specific errors
             if error_name in ['OptimismPortal_ProofNotOldEnough']:
                 return 'waiting-to-finalize'
@@ -364,27 +442,3 @@ def _ensure_hex(value: Any) -> str:
     elif isinstance(value, str) and not value.startswith('0x'):
         return '0x' + value
     return value
-
-
-def _maybe_add_proof_node(storage_slot_hex: str, proof: List[str]) -> List[str]:
-    """Add proof node if needed (Viem's maybeAddProofNode)."""
-    if not proof:
-        return proof
-    
-    try:
-        # Decode last proof node
-        last_node_hex = proof[-1][2:] if proof[-1].startswith('0x') else proof[-1]
-        last_node = rlp.decode(bytes.fromhex(last_node_hex))
-        
-        # Only process branch nodes (17 elements)
-        if len(last_node) != 17:
-            return proof
-        
-        # Check if any branch matches our path
-        for i in range(16):
-            if last_node[i] and storage_slot_hex.endswith(hex(i)[2:]):
-                return proof + [f"0x{rlp.encode(last_node[i]).hex()}"]
-        
-        return proof
-    except Exception:
-        return proof
\ No newline at end of file
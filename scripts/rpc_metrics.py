@@ -0,0 +1,281 @@
+"""
+JSON-RPC usage of the scripts: calls, latency, bytes and errors per method and per calling function.
+
+Disabled unless `FASTBRIDGE_RPC_METRICS` names a report file, then `instrument` and `instrument_rpc` are the
+identity and nothing is measured. When enabled the report is written at exit, as JSON if the path ends with
+`.json` and in Prometheus text format otherwise.
+
+    FASTBRIDGE_RPC_METRICS=rpc.json python scripts/arb_proof/arb_proof.py 0x<l2 tx>
+
+    w3 = instrument(Web3(Web3.HTTPProvider(url)))  # web3 scripts
+    env = boa.NetworkEnv(instrument_rpc(EthereumRPC(url)))  # boa scripts
+
+A request answered from web3's request cache (`cache_allowed_requests`) is counted as a cache hit and costs no
+round trip; requests of a JSON-RPC batch share one. boa's sqlite fork cache sits in front of `instrument_rpc`,
+so only its misses are seen there.
+"""
+import atexit
+import json
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+REPORT_PATH = os.getenv("FASTBRIDGE_RPC_METRICS")
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)  # seconds, +Inf implied
+PREFIX = "fastbridge_rpc"
+# Frames of these modules are skipped when looking for the function that made a request
+LIBRARIES = ("web3", "eth_", "requests", "urllib3", "boa", "functools", "concurrent", "threading", __name__)
+
+
+@dataclass
+class MethodStats:
+    calls: int = 0
+    errors: int = 0
+    cache_hits: int = 0
+    batched: int = 0  # Calls sent inside a JSON-RPC batch
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    seconds: float = 0.0
+    buckets: List[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def as_dict(self) -> Dict[str, Any]:
+        latency, total = {}, 0
+        for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), self.buckets):
+            total += count
+            latency[str(bound)] = total
+        return {
+            "calls": self.calls, "errors": self.errors, "cache_hits": self.cache_hits, "batched": self.batched,
+            "bytes_sent": self.bytes_sent, "bytes_received": self.bytes_received,
+            "seconds": round(self.seconds, 6), "latency_le": latency,
+        }
+
+
+class RpcMetrics:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.methods: Dict[str, MethodStats] = {}
+        self.callers: Counter = Counter()  # (caller, method) -> calls
+        self.round_trips = 0
+        self.batches = 0
+        self._lock = threading.Lock()
+
+    def record(self, method: str, caller: str, seconds: float, sent: int = 0, received: int = 0,
+               error: bool = False, cached: bool = False, batched: bool = False):
+        with self._lock:
+            stats = self.methods.get(method)
+            if stats is None:
+                stats = self.methods[method] = MethodStats()
+            stats.calls += 1
+            stats.errors += error
+            stats.cache_hits += cached
+            stats.batched += batched
+            stats.bytes_sent += sent
+            stats.bytes_received += received
+            stats.seconds += seconds
+            stats.buckets[bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            self.callers[(caller, method)] += 1
+
+    def round_trip(self, batch: bool = False):
+        with self._lock:
+            self.round_trips += 1
+            self.batches += batch
+
+    def reset(self):
+        with self._lock:
+            self.methods.clear()
+            self.callers.clear()
+            self.round_trips = self.batches = 0
+
+    def calls(self, method: Optional[str] = None) -> int:
+        """Requests made, of `method` only when given, cache hits included"""
+        if method is not None:
+            return self.methods[method].calls if method in self.methods else 0
+        return sum(stats.calls for stats in self.methods.values())
+
+    def report(self) -> Dict[str, Any]:
+        with self._lock:
+            calls = sum(stats.calls for stats in self.methods.values())
+            hits = sum(stats.cache_hits for stats in self.methods.values())
+            batched = sum(stats.batched for stats in self.methods.values())
+            callers: Dict[str, Dict[str, int]] = {}
+            for (caller, method), count in sorted(self.callers.items()):
+                callers.setdefault(caller, {})[method] = count
+            return {
+                "calls": calls,
+                "round_trips": self.round_trips,
+                "cache_hit_rate": hits / calls if calls else 0.0,
+                "batches": self.batches,
+                "calls_per_batch": batched / self.batches if self.batches else 0.0,
+                "methods": {method: stats.as_dict() for method, stats in sorted(self.methods.items())},
+                "callers": callers,
+            }
+
+    def prometheus(self) -> str:
+        report = self.report()
+        lines = []
+
+        def metric(name: str, kind: str, doc: str):
+            lines.extend([f"# HELP {PREFIX}_{name} {doc}", f"# TYPE {PREFIX}_{name} {kind}"])
+
+        metric("requests_total", "counter", "JSON-RPC requests by method and calling function")
+        for caller, methods in report["callers"].items():
+            for method, count in methods.items():
+                lines.append(f'{PREFIX}_requests_total{{method="{method}",caller="{caller}"}} {count}')
+        for name, key, doc in (("errors_total", "errors", "Requests that raised or returned an error"),
+                               ("cache_hits_total", "cache_hits", "Requests answered from the request cache"),
+                               ("batched_total", "batched", "Requests sent inside a JSON-RPC batch")):
+            metric(name, "counter", doc)
+            lines += [f'{PREFIX}_{name}{{method="{m}"}} {s[key]}' for m, s in report["methods"].items()]
+        metric("bytes_total", "counter", "JSON-RPC payload bytes")
+        for method, stats in report["methods"].items():
+            lines.append(f'{PREFIX}_bytes_total{{method="{method}",direction="sent"}} {stats["bytes_sent"]}')
+            lines.append(f'{PREFIX}_bytes_total{{method="{method}",direction="received"}} {stats["bytes_received"]}')
+        metric("request_duration_seconds", "histogram", "Request latency as seen by the caller")
+        for method, stats in report["methods"].items():
+            for bound, count in stats["latency_le"].items():
+                lines.append(f'{PREFIX}_request_duration_seconds_bucket{{method="{method}",le="{bound}"}} {count}')
+            lines.append(f'{PREFIX}_request_duration_seconds_sum{{method="{method}"}} {stats["seconds"]}')
+            lines.append(f'{PREFIX}_request_duration_seconds_count{{method="{method}"}} {stats["calls"]}')
+        metric("round_trips_total", "counter", "HTTP requests sent, a batch is one")
+        lines.append(f"{PREFIX}_round_trips_total {report['round_trips']}")
+        metric("batches_total", "counter", "JSON-RPC batches sent")
+        lines.append(f"{PREFIX}_batches_total {report['batches']}")
+        return "\n".join(lines) + "\n"
+
+    def dump(self, path: str):
+        text = json.dumps(self.report(), indent=2) + "\n" if path.endswith(".json") else self.prometheus()
+        Path(path).write_text(text)
+
+
+METRICS = RpcMetrics(enabled=REPORT_PATH is not None)
+if REPORT_PATH is not None:
+    atexit.register(METRICS.dump, REPORT_PATH)
+
+
+def _caller() -> str:
+    """`module.function` of the first frame outside web3, boa and their dependencies"""
+    frame = sys._getframe(2)
+    while frame is not None:
+        module = frame.f_globals.get("__name__", "")
+        if not module.startswith(LIBRARIES):
+            return f"{module}.{frame.f_code.co_qualname}"
+        frame = frame.f_back
+    return "?"
+
+
+def instrument(w3, metrics: Optional[RpcMetrics] = None):
+    """Measure every request of a web3 instance, returned unchanged when metrics are disabled"""
+    metrics = METRICS if metrics is None else metrics
+    provider = w3.provider
+    if not metrics.enabled or getattr(provider, "_rpc_metrics", None) is not None:
+        return w3
+    provider._rpc_metrics = metrics
+    local = threading.local()
+    # JSON providers expose the raw payloads, other providers are measured as if nothing was cached
+    transport = hasattr(provider, "encode_rpc_request") and hasattr(provider, "decode_rpc_response")
+
+    if transport:
+        encode, encode_batch, decode = (provider.encode_rpc_request, provider.encode_batch_rpc_request,
+                                        provider.decode_rpc_response)
+
+        def encode_rpc_request(method, params):
+            data = encode(method, params)
+            local.sent = len(data)
+            return data
+
+        def encode_batch_rpc_request(requests):
+            data = encode_batch(requests)
+            local.sent = len(data)
+            return data
+
+        def decode_rpc_response(raw):
+            local.received = len(raw)
+            return decode(raw)
+
+        provider.encode_rpc_request = encode_rpc_request
+        provider.encode_batch_rpc_request = encode_batch_rpc_request
+        provider.decode_rpc_response = decode_rpc_response
+
+    make_request, make_batch_request = provider.make_request, provider.make_batch_request
+
+    def metered_make_request(method, params):
+        local.sent = local.received = None
+        start = time.perf_counter()
+        error = True
+        try:
+            response = make_request(method, params)
+            error = "error" in response
+            return response
+        finally:
+            cached = transport and local.received is None
+            if not cached:
+                metrics.round_trip()
+            metrics.record(method, _caller(), time.perf_counter() - start, local.sent or 0, local.received or 0,
+                           error, cached)
+
+    def metered_make_batch_request(requests):
+        local.sent = local.received = None
+        start = time.perf_counter()
+        responses = None
+        try:
+            responses = make_batch_request(requests)
+            return responses
+        finally:
+            seconds, caller = time.perf_counter() - start, _caller()
+            failed = not isinstance(responses, list)  # One error for the whole batch
+            metrics.round_trip(batch=True)
+            count = max(len(requests), 1)
+            for i, (method, _) in enumerate(requests):
+                error = failed or "error" in responses[i]
+                metrics.record(method, caller, seconds, (local.sent or 0) // count, (local.received or 0) // count,
+                               error, batched=True)
+
+    provider.make_request = metered_make_request
+    provider.make_batch_request = metered_make_batch_request
+    # Middleware chains built so far hold the unmetered functions
+    provider._request_func_cache = (None, None)
+    provider._batch_request_func_cache = (None, None)
+    return w3
+
+
+def instrument_rpc(rpc, metrics: Optional[RpcMetrics] = None):
+    """Measure every request of a boa RPC, returned unchanged when metrics are disabled"""
+    metrics = METRICS if metrics is None else metrics
+    if not metrics.enabled:
+        return rpc
+    fetch, fetch_multi = rpc.fetch, rpc.fetch_multi
+
+    def metered_fetch(method, params):
+        start = time.perf_counter()
+        result, error = None, True
+        try:
+            result = fetch(method, params)
+            error = False
+            return result
+        finally:
+            metrics.round_trip()
+            metrics.record(method, _caller(), time.perf_counter() - start, len(json.dumps(params)),
+                           len(json.dumps(result)), error)
+
+    def metered_fetch_multi(payloads: List[Tuple[str, Any]]):
+        start = time.perf_counter()
+        results, error = None, True
+        try:
+            results = fetch_multi(payloads)
+            error = False
+            return results
+        finally:
+            seconds, caller = time.perf_counter() - start, _caller()
+            metrics.round_trip(batch=True)
+            for i, (method, params) in enumerate(payloads):
+                received = len(json.dumps(results[i])) if results is not None else 0
+                metrics.record(method, caller, seconds, len(json.dumps(params)), received, error, batched=True)
+
+    rpc.fetch, rpc.fetch_multi = metered_fetch, metered_fetch_multi
+    return rpc
@@ -6,6 +6,10 @@ import os
 from getpass import getpass
 from eth_account import account
 
+from compile_cache import load_partial
+from fastbridge import DEPLOYMENTS
+from fork_pool import FORKS
+
 
 L2_NETWORK = (
     f"https://arb-mainnet.g.alchemy.com/v2/{os.environ['WEB3_ARBITRUM_MAINNET_ALCHEMY_API_KEY']}"  # ALTER
@@ -18,8 +22,9 @@ CRVUSD_L2 = "0x498Bf2B1e120FeD3ad3D42EA2165E9b73f99C1e5"  # ALTER
 CRVUSD = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
 AMOUNT = 10 ** 18  # Amount of crvUSD to test with
 
-FAST_BRIDGE_VAULT = "0xadB10d2d5A95e58Ddb1A0744a0d2D7B55Db7843D"  # ALTER
-FAST_BRIDGE_L2 = "0x1F2aF270029d028400265Ce1dd0919BA8780dAe1"  # ALTER
+DEPLOYMENT = DEPLOYMENTS["arbitrum"]  # ALTER
+FAST_BRIDGE_VAULT = DEPLOYMENT.vault
+FAST_BRIDGE_L2 = DEPLOYMENT.fast_bridge_l2
 
 
 def seed(fast_bridge_vault=FAST_BRIDGE_VAULT):
@@ -35,15 +40,15 @@ def initiate_fast_bridge(fast_bridge_l2=FAST_BRIDGE_L2):
     crvusd = IERC20.at(CRVUSD_L2)
     crvusd.approve(fast_bridge_l2, AMOUNT)
 
-    fast_bridge_l2 = boa.load_partial("contracts/FastBridgeL2.vy").at(FAST_BRIDGE_L2)
-    bridger = boa.load_partial("contracts/bridgers/ArbitrumBridger.vy").at("0x8A5a5299f35614Ac558AA290C2d5856EDeC1B5Ad")
+    fast_bridge_l2 = load_partial("contracts/FastBridgeL2.vy").at(FAST_BRIDGE_L2)
+    bridger = load_partial("contracts/bridgers/ArbitrumBridger.vy").at(DEPLOYMENT.bridger)
     fast_bridge_l2.bridge(crvusd, boa.env.eoa, AMOUNT, value=fast_bridge_l2.cost())
     print("Fast Bridge started")
 
 
 def retry(fast_bridge_vault=FAST_BRIDGE_VAULT):
     crvusd = IERC20.at(CRVUSD)
-    fast_bridge_vault = boa.load_partial("contracts/FastBridgeVault.vy").at(fast_bridge_vault)
+    fast_bridge_vault = load_partial("contracts/FastBridgeVault.vy").at(fast_bridge_vault)
 
     bal = crvusd.balanceOf(boa.env.eoa)
     fast_bridge_vault.mint(boa.env.eoa, 0)
@@ -51,6 +56,9 @@ def retry(fast_bridge_vault=FAST_BRIDGE_VAULT):
     print(f"Retry resulted with new {(new_bal-bal)/10**18:.2f} crvUSD")
 
 
+_account = None
+
+
 def account_load(fname):
     path = os.path.expanduser(os.path.join("~", ".brownie", "accounts", fname + ".json"))
     with open(path, "r") as f:
@@ -59,12 +67,13 @@ def account_load(fname):
 
 
 def set_env(simulation: bool, mainnet: bool):
+    url = ETH_NETWORK if mainnet else L2_NETWORK
     if simulation:
-        boa.fork(ETH_NETWORK if mainnet else L2_NETWORK, block_identifier="latest", allow_dirty=True)
-        boa.env.eoa = "0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"
+        FORKS.activate(FORKS.fork(url, eoa="0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"))
     else:
-        boa.set_network_env(ETH_NETWORK if mainnet else L2_NETWORK)
-        boa.env.add_account(account_load('curve'))
+        global _account
+        _account = _account or account_load('curve')
+        FORKS.activate(FORKS.network(url, _account))
 
 
 def test_seeded(simulate):
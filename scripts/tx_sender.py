@@ -0,0 +1,220 @@
+"""
+Pipelined transaction submission shared by the scripts.
+
+`TxSender` owns the nonce of one account. Nonces are assigned locally, so up to
+`max_in_flight` transactions are pending at once instead of one per block. Fees are
+priced from `eth_feeHistory`: the priority fee is a percentile of recent tips and the
+max fee leaves room for the base fee to grow by `base_fee_multiplier`. A transaction
+pending for longer than `stuck_after` seconds is re-sent at the same nonce with fees
+bumped by at least `REPLACEMENT_BUMP`, which every client accepts as a replacement.
+
+    sender = TxSender(w3, account)
+    pending = [sender.send(tx) for tx in txs]
+    receipts = sender.wait_all()
+"""
+import math
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from web3 import Web3
+from web3.exceptions import TransactionNotFound, Web3RPCError
+
+REPLACEMENT_BUMP = 1.125  # geth requires +10% on both fees, some clients +12.5%
+GAS_MARGIN = 1.2
+RECEIPT_GRACE = 30  # Seconds a receipt may lag behind the mined nonce, e.g. behind a load balancer
+
+
+class Fees(NamedTuple):
+    max_fee: int
+    priority_fee: int
+
+
+@dataclass
+class PendingTx:
+    nonce: int
+    tx: dict
+    hashes: List[bytes] = field(default_factory=list)  # every version sent, latest last
+    sent_at: float = 0.0
+    receipt: Optional[dict] = None
+    nonce_mined_at: Optional[float] = None  # When the nonce was first seen mined without a receipt of ours
+
+    @property
+    def hash(self) -> bytes:
+        return self.hashes[-1]
+
+
+def _error(e: Exception) -> str:
+    return str(e).lower()
+
+
+class TxSender:
+    def __init__(self, w3: Web3, account, max_in_flight: int = 8, reward_percentile: float = 50,
+                 history_blocks: int = 10, base_fee_multiplier: float = 2, stuck_after: float = 60,
+                 poll_interval: float = 2, max_fee_cap: Optional[int] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        """
+        @param account eth_account LocalAccount signing every transaction
+        @param max_in_flight Pending transactions allowed before `send` waits for one to be mined
+        @param reward_percentile Percentile of the tips in each recent block paid as priority fee
+        @param stuck_after Seconds a transaction may stay pending before it is replaced
+        @param max_fee_cap Upper bound of maxFeePerGas, replacements stop bumping there
+        """
+        self.w3 = w3
+        self.account = account
+        self.max_in_flight = max_in_flight
+        self.reward_percentile = reward_percentile
+        self.history_blocks = history_blocks
+        self.base_fee_multiplier = base_fee_multiplier
+        self.stuck_after = stuck_after
+        self.poll_interval = poll_interval
+        self.max_fee_cap = max_fee_cap
+        self.clock = clock
+        self.sleep = sleep
+
+        self.chain_id = w3.eth.chain_id
+        self.nonce = self._pending_nonce()
+        self.in_flight: Dict[int, PendingTx] = {}
+
+    @property
+    def address(self) -> str:
+        return self.account.address
+
+    def _pending_nonce(self) -> int:
+        return self.w3.eth.get_transaction_count(self.address, "pending")
+
+    def fees(self) -> Fees:
+        """Fees for the next block from the base fee and tips of the last `history_blocks` blocks"""
+        history = self.w3.eth.fee_history(self.history_blocks, "latest", [self.reward_percentile])
+        tips = sorted(reward[0] for reward in history.get("reward") or [] if reward)
+        priority_fee = tips[len(tips) // 2] if tips else 0
+        next_base_fee = history["baseFeePerGas"][-1]
+        max_fee = int(next_base_fee * self.base_fee_multiplier) + priority_fee
+        if self.max_fee_cap is not None:
+            max_fee = min(max_fee, self.max_fee_cap)
+        return Fees(max_fee, min(priority_fee, max_fee))
+
+    def send(self, tx: dict) -> PendingTx:
+        """
+        Sign and broadcast `tx` with the next local nonce, waiting first if `max_in_flight` are pending.
+        Gas is estimated when `tx` has none, nonce, chain id and fees are always set here.
+        """
+        while len(self.in_flight) >= self.max_in_flight:
+            if not self.poll():
+                self.sleep(self.poll_interval)
+
+        tx = {key: value for key, value in tx.items() if key not in ("nonce", "gasPrice")}
+        tx.update({"from": self.address, "chainId": self.chain_id})
+        if "gas" not in tx:
+            tx["gas"] = int(self.w3.eth.estimate_gas(tx) * GAS_MARGIN)
+        fees = self.fees()
+        tx.update({"maxFeePerGas": fees.max_fee, "maxPriorityFeePerGas": fees.priority_fee})
+
+        pending = PendingTx(self.nonce, {**tx, "nonce": self.nonce})
+        try:
+            self._broadcast(pending, pending.tx)
+        except Web3RPCError as e:
+            if "nonce too low" not in _error(e):
+                raise
+            # The account was used outside of this sender, continue after its transactions
+            self.nonce = self._pending_nonce()
+            pending = PendingTx(self.nonce, {**tx, "nonce": self.nonce})
+            self._broadcast(pending, pending.tx)
+        self.in_flight[pending.nonce] = pending
+        self.nonce += 1
+        return pending
+
+    def _broadcast(self, pending: PendingTx, tx: dict):
+        signed = self.account.sign_transaction(tx)
+        try:
+            self.w3.eth.send_raw_transaction(signed.raw_transaction)
+        except Web3RPCError as e:
+            if "already known" not in _error(e):
+                raise
+        pending.tx = tx
+        pending.hashes.append(bytes(signed.hash))
+        pending.sent_at = self.clock()
+
+    def _receipt(self, pending: PendingTx) -> Optional[dict]:
+        for tx_hash in reversed(pending.hashes):
+            try:
+                return self.w3.eth.get_transaction_receipt(tx_hash)
+            except TransactionNotFound:
+                continue
+        return None
+
+    def poll(self) -> List[PendingTx]:
+        """
+        Collect receipts of mined transactions and replace the ones pending for too long.
+        Raises when a nonce was mined without any of our versions for `RECEIPT_GRACE` seconds.
+        @return Transactions mined since the last poll
+        """
+        if not self.in_flight:
+            return []
+        mined_nonce = self.w3.eth.get_transaction_count(self.address, "latest")
+        mined = []
+        for nonce in sorted(self.in_flight):
+            pending = self.in_flight[nonce]
+            if nonce < mined_nonce:
+                pending.receipt = self._receipt(pending)
+                if pending.receipt is not None:
+                    mined.append(self.in_flight.pop(nonce))
+                    continue
+                if pending.nonce_mined_at is None:
+                    pending.nonce_mined_at = self.clock()
+                elif self.clock() - pending.nonce_mined_at >= RECEIPT_GRACE:
+                    del self.in_flight[nonce]
+                    raise RuntimeError(f"Nonce {nonce} was used by a transaction not sent by this sender")
+            elif self.clock() - pending.sent_at >= self.stuck_after:
+                self.replace(pending)
+        return mined
+
+    def replace(self, pending: PendingTx, tx: Optional[dict] = None):
+        """
+        Re-send `pending` (or `tx` in its place) at the same nonce,
+        fees are the current market or the previous ones bumped, whichever is higher
+        """
+        old = pending.tx
+        fees = self.fees()
+        max_fee = max(fees.max_fee, math.ceil(old["maxFeePerGas"] * REPLACEMENT_BUMP))
+        priority_fee = max(fees.priority_fee, math.ceil(old["maxPriorityFeePerGas"] * REPLACEMENT_BUMP))
+        if self.max_fee_cap is not None:
+            max_fee = min(max_fee, self.max_fee_cap)
+        if max_fee <= old["maxFeePerGas"] and tx is None:
+            pending.sent_at = self.clock()  # At the cap, nothing to do but wait
+            return
+
+        tx = {**(tx or old), "nonce": pending.nonce, "chainId": self.chain_id,
+              "maxFeePerGas": max_fee, "maxPriorityFeePerGas": min(priority_fee, max_fee)}
+        try:
+            self._broadcast(pending, tx)
+        except Web3RPCError as e:
+            message = _error(e)
+            if "nonce too low" in message:
+                if self._receipt(pending) is None:
+                    raise RuntimeError(f"Nonce {pending.nonce} was used by a transaction not sent by this sender")
+                return  # Mined meanwhile, picked up by the next poll
+            if "underpriced" not in message:
+                raise
+            # Keep the bumped fees so the next replacement goes higher
+            pending.tx = tx
+            pending.sent_at = self.clock()
+
+    def cancel(self, pending: PendingTx):
+        """Free the nonce of `pending` with an empty self-transfer"""
+        self.replace(pending, {"from": self.address, "to": self.address, "value": 0, "data": b"", "gas": 21_000})
+
+    def wait(self, pending: PendingTx, timeout: Optional[float] = None) -> dict:
+        """Receipt of `pending`, replacing it while it is stuck"""
+        deadline = None if timeout is None else self.clock() + timeout
+        while pending.receipt is None:
+            if not self.poll() and pending.receipt is None:
+                if deadline is not None and self.clock() >= deadline:
+                    raise TimeoutError(f"Transaction with nonce {pending.nonce} not mined after {timeout}s")
+                self.sleep(self.poll_interval)
+        return pending.receipt
+
+    def wait_all(self, timeout: Optional[float] = None) -> List[dict]:
+        """Receipts of every transaction in flight, in nonce order"""
+        pending = [self.in_flight[nonce] for nonce in sorted(self.in_flight)]
+        return [self.wait(p, timeout) for p in pending]
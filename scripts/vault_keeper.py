@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Keeper of FastBridgeVault liquidity.
+
+Every block the keeper:
+- schedules a rug when the minter cut the vault's debt ceiling
+  (`debt_ceiling_residual > debt_ceiling`), and applies it right away with an empty `mint`
+- pays out receivers holding `balanceOf` IOUs as soon as the vault has crvUSD,
+  oldest IOU first, with `mint(receiver, 0)`
+- then claims fees for `fee_receiver`, which accrue in `fees_accrued` and not in its `balanceOf`
+
+Receivers are discovered from the vault's `Minted` events, any receiver still owed after
+a mint is kept in the queue until paid in full.
+
+    python scripts/vault_keeper.py --vault 0x... [--from-block N] [--simulate]
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional
+
+import boa
+from eth_account import Account
+from eth_utils import to_checksum_address
+from web3 import Web3
+
+from compile_cache import load_partial
+from fork_pool import FORKS
+from rpc_metrics import instrument
+
+ROOT = Path(__file__).parent.parent
+IERC20 = boa.load_abi(str(ROOT / "interfaces" / "IERC20.json"))
+IMINTER = boa.load_abi(str(ROOT / "interfaces" / "IMinter.json"))
+MINTED_TOPIC = Web3.keccak(text="Minted(address,uint256)")
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+ETH_NETWORK = f"https://eth-mainnet.alchemyapi.io/v2/{os.getenv('WEB3_ETHEREUM_MAINNET_ALCHEMY_PROJECT_ID')}"  # ALTER
+
+
+class Tick(NamedTuple):
+    rug_scheduled: bool  # schedule_rug was called in this tick
+    rugged: bool  # the cut was applied in this tick
+    paid: Dict[str, int]
+    balance: int  # crvUSD left in the vault
+
+
+class VaultKeeper:
+    def __init__(self, vault):
+        """
+        @param vault FastBridgeVault contract in the active boa env
+        """
+        self.vault = vault
+        self.crvusd = IERC20.at(vault.CRVUSD())
+        self.minter = IMINTER.at(vault.MINTER())
+        self.pending: Dict[str, None] = {}  # receivers by the order their IOU was seen
+
+    def track(self, receivers: Iterable[str]):
+        for receiver in receivers:
+            self.pending.setdefault(to_checksum_address(receiver), None)
+
+    def need_to_rug(self) -> bool:
+        """Same check as FastBridgeVault._need_to_rug"""
+        vault = self.vault.address
+        return self.minter.debt_ceiling_residual(vault) > self.minter.debt_ceiling(vault)
+
+    def tick(self) -> Tick:
+        scheduled = rugged = False
+        if not self.vault.rug_scheduled() and self.need_to_rug():
+            self.vault.schedule_rug()
+            scheduled = True
+        if self.vault.is_killed(ZERO_ADDRESS):
+            return Tick(scheduled, rugged, {}, self.crvusd.balanceOf(self.vault.address))
+
+        if self.vault.rug_scheduled():
+            # Any mint rugs the debt ceiling, the cut applies now instead of on the next bridge
+            self.vault.mint(boa.env.eoa, 0)
+            rugged = not self.vault.rug_scheduled()
+            if not rugged:
+                return Tick(scheduled, rugged, {}, 0)  # Nothing is paid out until the cut is covered
+
+        balance = self.crvusd.balanceOf(self.vault.address)
+        paid = {}
+        for receiver in list(self.pending):
+            if balance == 0:
+                break
+            owed = self.vault.balanceOf(receiver)
+            if owed == 0:
+                del self.pending[receiver]
+                continue
+            amount = self.vault.mint(receiver, 0)
+            paid[receiver] = amount
+            balance -= amount
+            if amount == owed:
+                del self.pending[receiver]
+
+        if balance > 0 and self.vault.fees_accrued() > 0:
+            fee_receiver = to_checksum_address(self.vault.fee_receiver())
+            amount = self.vault.mint(fee_receiver, 0)  # Also pays its IOU, if any
+            paid[fee_receiver] = paid.get(fee_receiver, 0) + amount
+            balance -= amount
+            if self.vault.balanceOf(fee_receiver) > 0:
+                self.track([fee_receiver])  # Fees not covered became an IOU
+        return Tick(scheduled, rugged, paid, balance)
+
+    def run(self, discover: Optional[Callable[[], Iterable[str]]] = None, interval: float = 12,
+            ticks: Optional[int] = None):
+        """Tick every `interval` seconds, tracking new receivers from `discover` first"""
+        while ticks is None or ticks > 0:
+            if discover is not None:
+                self.track(discover())
+            tick = self.tick()
+            if tick.rug_scheduled or tick.rugged or tick.paid:
+                print(f"rug scheduled: {tick.rug_scheduled}, rugged: {tick.rugged}, "
+                      f"paid {sum(tick.paid.values()) / 10**18:.2f} crvUSD to {len(tick.paid)} receivers, "
+                      f"{len(self.pending)} pending, {tick.balance / 10**18:.2f} crvUSD left")
+            if ticks is not None:
+                ticks -= 1
+            time.sleep(interval)
+
+
+def minted_receivers(w3: Web3, vault: str, from_block: int, to_block: int) -> List[str]:
+    """Receivers of `Minted` events in the range, in the order they were emitted"""
+    logs = w3.eth.get_logs({
+        "address": to_checksum_address(vault),
+        "topics": [MINTED_TOPIC],
+        "fromBlock": from_block,
+        "toBlock": to_block,
+    })
+    return [to_checksum_address(log["topics"][1][-20:]) for log in logs]
+
+
+def log_cursor(w3: Web3, vault: str, from_block: int) -> Callable[[], List[str]]:
+    """`discover` callable returning receivers of `Minted` events since the previous call"""
+    next_block = from_block
+
+    def discover() -> List[str]:
+        nonlocal next_block
+        latest = w3.eth.block_number
+        if latest < next_block:
+            return []
+        receivers = minted_receivers(w3, vault, next_block, latest)
+        next_block = latest + 1
+        return receivers
+
+    return discover
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vault", required=True, help="FastBridgeVault address")
+    parser.add_argument("--from-block", type=int, help="First block to look for IOUs, 50k blocks back by default")
+    parser.add_argument("--interval", type=float, default=12, help="Seconds between ticks")
+    parser.add_argument("--simulate", action="store_true", help="Run against a fork instead of sending transactions")
+    args = parser.parse_args()
+
+    if args.simulate:
+        FORKS.activate(FORKS.fork(ETH_NETWORK))
+    else:
+        FORKS.activate(FORKS.network(ETH_NETWORK, Account.from_key(os.environ["KEEPER_PK"])))
+    w3 = instrument(Web3(Web3.HTTPProvider(ETH_NETWORK)))
+    from_block = args.from_block if args.from_block is not None else max(0, w3.eth.block_number - 50_000)
+
+    vault = load_partial("contracts/FastBridgeVault.vy").at(args.vault)
+    VaultKeeper(vault).run(log_cursor(w3, args.vault, from_block), args.interval)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,35 @@
+import boa
+import pytest
+from boachain import BoaChain
+from compile_cache import load
+from web3 import Web3
+
+from fastbridge import CHAINS, MULTICALL3, Deployment, FastBridge
+
+
+@pytest.fixture(scope="session")
+def multicall():
+    return load("tests/mocks/MockMulticall3.vy", override_address=MULTICALL3)
+
+
+@pytest.fixture()
+def fast_bridge_l2(fast_bridge_l2, dev_deployer):
+    """FastBridgeL2 with a mock messenger, so it can bridge without LayerZero peers"""
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(100 * 10**18)
+        fast_bridge_l2.set_messenger(load("tests/mocks/MockMessenger.vy"))
+    return fast_bridge_l2
+
+
+@pytest.fixture()
+def providers():
+    return {"ethereum": BoaChain(1), "arbitrum": BoaChain(42161)}
+
+
+@pytest.fixture()
+def client(providers, multicall, fast_bridge_l2, fast_bridge_vault, bridger, vault_messenger):
+    """Client of the test deployment, both chains read from the same boa env"""
+    deployment = Deployment("arbitrum", fast_bridge_l2.address, fast_bridge_l2.messenger(), bridger.address,
+                            fast_bridge_vault.address, vault_messenger.address)
+    return FastBridge({"arbitrum": deployment}, CHAINS,
+                      {chain: Web3(provider) for chain, provider in providers.items()})
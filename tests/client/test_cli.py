@@ -0,0 +1,117 @@
+import io
+import json
+import subprocess
+import sys
+import threading
+
+import pytest
+
+from fastbridge import cli
+
+
+class FakeChain:
+    """
+    Withdrawals by hash: 'ready' builds a transaction, 'unestimated' one whose gas estimate failed,
+    'fail' raises, anything else is pending
+    """
+
+    def __init__(self, block: threading.Event = None):
+        self.block = block
+
+    def status(self, tx_hash, sender=cli.ZERO_ADDRESS):
+        if tx_hash == "fail":
+            raise ValueError("no withdrawal")
+        if tx_hash == "slow" and self.block is not None:
+            assert self.block.wait(5)
+        return {"status": "ready" if tx_hash in ("ready", "unestimated") else "pending"}
+
+    def finalize(self, tx_hash, sender=cli.ZERO_ADDRESS):
+        result = self.status(tx_hash)
+        if result["status"] == "ready":
+            result["tx"] = {"from": sender, "to": "0x" + "11" * 20, "data": "0x1234", "gas": 100_000}
+            result["gas"] = None if tx_hash == "unestimated" else 100_000
+        return result
+
+
+def lines(out):
+    return [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_read_items():
+    text = """
+    # withdrawals
+    0xaa
+    optimism 0xbb  # proven already
+    arbitrum, 0xcc
+    """
+    assert cli.read_items(text.splitlines(), "arbitrum") == [
+        ("arbitrum", "0xaa"), ("optimism", "0xbb"), ("arbitrum", "0xcc"),
+    ]
+    with pytest.raises(ValueError, match="Line 1"):
+        cli.read_items(["0xaa"], None)
+    with pytest.raises(ValueError, match="Line 2"):
+        cli.read_items(["optimism 0xaa", "fraxtal 0xbb"], None)
+
+
+def test_run_streams_results():
+    block = threading.Event()
+    out = io.StringIO()
+    items = [("arbitrum", "slow"), ("arbitrum", "ready"), ("optimism", "fail")]
+    handlers = {"arbitrum": FakeChain(block), "optimism": FakeChain()}
+
+    thread = threading.Thread(target=lambda: setattr(thread, "failed", cli.run("finalize", items, handlers, out)))
+    thread.start()
+    while len(out.getvalue().splitlines()) < 2:  # Written before the slow one is done
+        assert thread.is_alive()
+    block.set()
+    thread.join()
+
+    results = {line["tx_hash"]: line for line in lines(out)}
+    assert results["ready"]["tx"] == {"to": "0x" + "11" * 20, "data": "0x1234", "gas": 100_000}
+    assert results["slow"]["status"] == "pending"
+    assert results["fail"]["error"] == "ValueError: no withdrawal"
+    assert thread.failed == 1
+
+
+def test_run_execute():
+    class Sender:
+        address = "0x" + "22" * 20
+
+        def __init__(self):
+            self.sent = []
+
+        def send(self, tx):
+            self.sent.append(tx)
+            return type("Pending", (), {"hash": bytes([len(self.sent)]) * 32})()
+
+        def wait(self, pending):
+            return {"status": 1, "gasUsed": 90_000}
+
+    sender, out = Sender(), io.StringIO()
+    items = [("optimism", "ready"), ("optimism", "0xaa"), ("optimism", "unestimated")]
+    failed = cli.run("finalize", items, {"optimism": FakeChain()}, out, sender=sender)
+
+    # A transaction that would revert is reported, not sent
+    assert failed == 1
+    assert [tx["from"] for tx in sender.sent] == [Sender.address]
+    *results, receipt = lines(out)
+    assert {line["tx_hash"]: line.get("submitted") for line in results} == {
+        "ready": "0x" + "01" * 32, "0xaa": None, "unestimated": None,
+    }
+    assert next(line for line in results if line["tx_hash"] == "unestimated")["error"] == \
+        "Gas estimation failed, not sent"
+    assert receipt == {"chain": "optimism", "tx_hash": "ready", "operation": "finalize", "tx": "0x" + "01" * 32,
+                       "receipt_status": 1, "gas_used": 90_000}
+
+
+def test_scripts_not_installed(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(cli, "SCRIPTS", tmp_path / "scripts")
+    with pytest.raises(SystemExit) as e:
+        cli.main(["status", "--chain", "arbitrum", "0xaa"])
+    assert e.value.code == 2
+    assert "not packaged" in capsys.readouterr().err
+
+
+def test_cli_import_is_light():
+    code = "import sys, fastbridge.cli; print('web3' in sys.modules)"
+    assert subprocess.check_output([sys.executable, "-c", code], text=True).strip() == "False"
@@ -0,0 +1,98 @@
+import boa
+import pytest
+from compile_cache import artifact
+from web3 import Web3
+
+from fastbridge import CHAINS, INTERVAL, Batch, Chain, Deployment, FastBridge, FastBridgeL2, load_abi
+
+AMOUNT = 10 * 10**18
+
+
+def bridge(fast_bridge_l2, crvusd, user, amount=AMOUNT):
+    boa.deal(crvusd, user, amount)
+    with boa.env.prank(user):
+        crvusd.approve(fast_bridge_l2, amount)
+        boa.env.set_balance(user, fast_bridge_l2.cost())
+        fast_bridge_l2.bridge(crvusd, user, amount, value=fast_bridge_l2.cost())
+
+
+@pytest.mark.parametrize("name", ["FastBridgeL2", "FastBridgeVault"])
+def test_abis_match_contracts(name):
+    assert load_abi(name) == artifact(f"contracts/{name}.vy")["abi"]
+
+
+def test_quote(client, providers, fast_bridge_l2, crvusd, alice):
+    bridge(fast_bridge_l2, crvusd, alice)
+    boa.deal(crvusd, alice, 5 * AMOUNT)
+
+    quote = client.quote(alice)["arbitrum"]
+
+    assert quote.timestamp == boa.env.evm.patch.timestamp
+    assert (quote.min_amount, quote.max_amount) == fast_bridge_l2.allowed_to_bridge()
+    assert quote.max_amount == quote.limit - AMOUNT
+    assert quote.cost == fast_bridge_l2.cost()
+    assert (quote.balance, quote.allowance) == (5 * AMOUNT, 0)
+    assert quote.next_interval == (quote.timestamp // INTERVAL + 1) * INTERVAL
+
+    # crvUSD address is read once, every quote after is a single eth_call
+    assert providers["arbitrum"].requests["eth_call"] == 2
+    client.quote(alice)
+    client.quote()
+    assert providers["arbitrum"].requests["eth_call"] == 4
+
+
+def test_status(client, providers, fast_bridge_vault, crvusd, vault_messenger, alice, bob):
+    receivers = [boa.env.generate_address() for _ in range(50)]
+    with boa.env.prank(vault_messenger.address):
+        for receiver in receivers:
+            fast_bridge_vault.mint(receiver, AMOUNT)
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT * 3 // 2)
+
+    statuses = client.status([("arbitrum", receiver) for receiver in receivers + [alice]])
+
+    assert [s.owed for s in statuses] == [AMOUNT] * 50 + [0]
+    assert [s.claimable for s in statuses] == [AMOUNT] * 50 + [0]  # Each alone could claim in full
+    assert statuses[0].receiver == Web3.to_checksum_address(receivers[0])
+    assert providers["ethereum"].requests["eth_call"] == 2  # Vault's crvUSD, then one multicall
+
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT // 2)
+    assert client.status([("arbitrum", bob), ("arbitrum", receivers[1])])[1].claimable == AMOUNT // 2
+    assert providers["ethereum"].requests["eth_call"] == 3
+
+
+def test_status_killed(client, fast_bridge_vault, crvusd, vault_messenger, emergency_dao, alice):
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, AMOUNT)
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    with boa.env.prank(emergency_dao):
+        fast_bridge_vault.set_killed(True)
+
+    (status,) = client.status([("arbitrum", alice)])
+    assert (status.owed, status.claimable) == (AMOUNT, 0)
+
+
+def test_batch_split_and_failures(providers, multicall, fast_bridge_l2):
+    w3 = Web3(providers["arbitrum"])
+    batch = Batch(w3, multicall.address, max_calls=2)
+    bridge_ = FastBridgeL2(fast_bridge_l2.address)
+    no_code = FastBridgeL2(boa.env.generate_address())
+    for call in (bridge_.limit(), no_code.limit(), bridge_.bridged(0), bridge_.min_amount(), bridge_.limit()):
+        batch.add(call)
+
+    assert batch.execute() == [fast_bridge_l2.limit(), None, 0, fast_bridge_l2.min_amount(), fast_bridge_l2.limit()]
+    assert providers["arbitrum"].requests["eth_call"] == 3
+    assert batch.calls == []
+
+
+def test_without_multicall(providers, fast_bridge_l2, fast_bridge_vault, bridger, vault_messenger, alice):
+    chains = {**CHAINS, "arbitrum": Chain("arbitrum", 42161, 30110, "", "", multicall=None)}
+    deployment = Deployment("arbitrum", fast_bridge_l2.address, fast_bridge_l2.messenger(), bridger.address,
+                            fast_bridge_vault.address, vault_messenger.address)
+    client = FastBridge({"arbitrum": deployment}, chains,
+                        {chain: Web3(provider) for chain, provider in providers.items()})
+
+    quote = client.quote(alice)["arbitrum"]
+
+    assert quote.limit == fast_bridge_l2.limit()
+    assert quote.timestamp == boa.env.evm.patch.timestamp
+    assert providers["arbitrum"].requests["eth_call"] == 7  # Immutables, then every read separately
@@ -1,85 +1,130 @@
+"""
+Deployments are session-scoped and built once per worker. Each test (and each
+function-scoped fixture) runs inside `boa.env.anchor()` from titanoboa's pytest
+plugin, so state changes are reverted after every test.
+"""
+
 import boa
+import gas_trace
 import pytest
+from compile_cache import load
 
 CRVUSD_ADDRESS = '0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E'
 MINTER_ADDRESS = '0xC9332fdCB1C491Dcc683bAe86Fe3cb70360738BC'
 
 
-@pytest.fixture()
+def pytest_addoption(parser):
+    parser.addoption(
+        "--update-gas-baseline",
+        action="store_true",
+        default=False,
+        help="Record measured gas as the new baseline in tests/gas/gas_baseline.json",
+    )
+    parser.addoption(
+        "--gas-trace",
+        action="store_true",
+        default=False,
+        help="Report gas per external and internal call frame of every call in the run (see tests/gas_trace.py)",
+    )
+    parser.addoption("--gas-trace-dir", default=None, help="Where to write the gas trace, .cache/gas_trace by default")
+
+
+def pytest_configure(config):
+    gas_trace.configure(config)
+
+
+def pytest_sessionfinish(session):
+    gas_trace.sessionfinish(session)
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    gas_trace.terminal_summary(terminalreporter, config)
+
+
+@pytest.fixture(scope="session")
 def alice():
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def bob():
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dev_deployer():
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def curve_dao():
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def emergency_dao():
     return boa.env.generate_address()
 
 
-
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def lz_endpoint():
-    return boa.load("tests/mocks/MockLZEndpoint.vy")
+    return load("tests/mocks/MockLZEndpoint.vy")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def vault_eid():
     return 1
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def gas_limit():
     return 1000000
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def crvusd():
-    return boa.load("tests/mocks/MockERC20.vy", override_address=CRVUSD_ADDRESS)
+    return load("tests/mocks/MockERC20.vy", override_address=CRVUSD_ADDRESS)
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def minter():
-    return boa.load("tests/mocks/MockControllerFactory.vy", override_address=MINTER_ADDRESS)
+    return load("tests/mocks/MockControllerFactory.vy", override_address=MINTER_ADDRESS)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def bridger():
-    return boa.load("tests/mocks/MockBridger.vy")
+    return load("tests/mocks/MockBridger.vy")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def l2_messenger(dev_deployer, lz_endpoint, vault_eid, gas_limit):
     with boa.env.prank(dev_deployer):
-        return boa.load("contracts/messengers/L2MessengerLZ.vy", lz_endpoint, vault_eid, gas_limit)
+        return load("contracts/messengers/L2MessengerLZ.vy", lz_endpoint, vault_eid, gas_limit)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def vault_messenger(dev_deployer, lz_endpoint):
     with boa.env.prank(dev_deployer):
-        return boa.load("contracts/messengers/VaultMessengerLZ.vy", lz_endpoint)
+        return load("contracts/messengers/VaultMessengerLZ.vy", lz_endpoint)
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fast_bridge_vault(dev_deployer, crvusd, minter, curve_dao, emergency_dao, vault_messenger):
     with boa.env.prank(dev_deployer):
-        return boa.load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [vault_messenger])
+        return load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [vault_messenger])
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def fast_bridge_l2(dev_deployer, crvusd, fast_bridge_vault, bridger, l2_messenger):
     with boa.env.prank(dev_deployer):
-        return boa.load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, l2_messenger)
\ No newline at end of file
+        return load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, l2_messenger)
+
+
+@pytest.fixture(scope="session")
+def l2_lens():
+    return load("contracts/lens/L2Lens.vy")
+
+
+@pytest.fixture(scope="session")
+def vault_lens():
+    return load("contracts/lens/VaultLens.vy")
@@ -0,0 +1,47 @@
+"""
+Stateful fuzzing of FastBridgeL2 limiter and FastBridgeVault accounting.
+
+Contracts are deployed once per session, and titanoboa's pytest plugin wraps every
+Hypothesis example in `boa.env.anchor()`, so each sequence of rules starts from the
+same snapshot and is reverted afterwards instead of redeploying.
+Select a profile with `HYPOTHESIS_PROFILE=nightly` for longer runs.
+"""
+
+import os
+
+import boa
+import pytest
+from compile_cache import load
+from hypothesis import HealthCheck, settings
+
+settings.register_profile(
+    "default",
+    max_examples=200,
+    stateful_step_count=30,
+    deadline=None,
+    suppress_health_check=[HealthCheck.too_slow],
+)
+settings.register_profile("nightly", parent=settings.get_profile("default"), max_examples=5000, stateful_step_count=60)
+settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "default"))
+
+
+@pytest.fixture(scope="session")
+def users():
+    return [boa.env.generate_address() for _ in range(3)]
+
+
+@pytest.fixture(scope="session")
+def mock_messenger():
+    return load("tests/mocks/MockMessenger.vy")
+
+
+@pytest.fixture(scope="session")
+def fast_bridge_l2(dev_deployer, crvusd, fast_bridge_vault, bridger, mock_messenger, users):
+    """FastBridgeL2 with a mock messenger: delivery to the vault is driven by the state machine"""
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2 = load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, mock_messenger)
+    for user in users:
+        boa.deal(crvusd, user, 10**30)
+        with boa.env.prank(user):
+            crvusd.approve(fast_bridge_l2, 2**256 - 1)
+    return fast_bridge_l2
@@ -0,0 +1,221 @@
+import boa
+from hypothesis import strategies as st
+from hypothesis.stateful import RuleBasedStateMachine, initialize, invariant, precondition, rule, run_state_machine_as_test
+
+INTERVAL = 86400 * 7 // 4
+LIMIT = 1000 * 10**18
+VAULT_LIQUIDITY = 500 * 10**18
+MESSAGING_FEE = 10**15
+ZERO_ADDRESS = "0x0000000000000000000000000000000000000000"
+
+amounts = st.one_of(st.integers(0, 2 * LIMIT), st.just(2**256 - 1))
+fees = st.one_of(st.integers(0, 10**18), st.sampled_from([0, 10**16, 10**18, 10**18 + 1]))
+# Land on both sides of INTERVAL boundaries as well as anywhere in between
+time_steps = st.one_of(st.integers(1, 2 * INTERVAL), st.sampled_from([INTERVAL - 1, INTERVAL, INTERVAL + 1]))
+
+
+class BridgeStateMachine(RuleBasedStateMachine):
+    """
+    Models FastBridgeL2 limiter and FastBridgeVault IOU accounting.
+    Messages initiated on L2 are queued and delivered to the vault by `mint`,
+    crvUSD sent through the native bridge arrives at the vault with `native_arrival`.
+    """
+    l2 = vault = crvusd = minter = bridger = None
+    vault_messenger = curve_dao = emergency_dao = dev_deployer = None
+    users = []
+
+    def __init__(self):
+        super().__init__()
+        self.fee_receiver = self.vault.fee_receiver()
+        self.recover_receiver = boa.env.generate_address()
+        self.holders = [*self.users, self.fee_receiver, self.l2.address, self.bridger.address, self.vault.address, self.recover_receiver]
+
+        self.pending = []  # (receiver, amount) messages to deliver to the vault
+        self.in_native_bridge = 0
+        self.delivered = 0
+        self.paid_out = 0
+        self.iou = {}
+        self.fees_accrued = 0
+        self.limit = LIMIT
+        self.min_amount = 10**18
+        self.fee = 0
+        self.killed_all = False
+        self.killed_messenger = False
+        self.rug_scheduled = False
+
+    @initialize()
+    def setup(self):
+        with boa.env.prank(self.dev_deployer):
+            self.l2.set_limit(LIMIT)
+        boa.deal(self.crvusd, self.vault.address, VAULT_LIQUIDITY)
+        self.vault_balance = VAULT_LIQUIDITY
+        self.total = sum(self.crvusd.balanceOf(holder) for holder in self.holders)
+
+    def _bridged(self) -> int:
+        return self.l2.bridged(boa.env.timestamp // INTERVAL)
+
+    @rule(user=st.integers(0, 2), amount=amounts)
+    def bridge(self, user, amount):
+        user = self.users[user]
+        requested = amount
+        if amount == 2**256 - 1:
+            requested = min(self.crvusd.balanceOf(user), self.crvusd.allowance(user, self.l2))
+        expected = min(requested, self.limit - min(self._bridged(), self.limit))
+
+        boa.env.set_balance(user, MESSAGING_FEE)
+        with boa.env.prank(user):
+            assert self.l2.bridge(self.crvusd, user, amount, value=MESSAGING_FEE) == expected
+
+        assert expected == 0 or self._bridged() <= self.limit
+        self.pending.append((user, expected))
+        self.in_native_bridge += expected
+
+    @rule(limit=st.integers(0, 2 * LIMIT))
+    def set_limit(self, limit):
+        with boa.env.prank(self.dev_deployer):
+            self.l2.set_limit(limit)
+        self.limit = limit
+
+    @rule(min_amount=st.integers(0, LIMIT))
+    def set_min_amount(self, min_amount):
+        with boa.env.prank(self.dev_deployer):
+            self.l2.set_min_amount(min_amount)
+        self.min_amount = min_amount
+
+    @rule(seconds=time_steps)
+    def time_travel(self, seconds):
+        boa.env.time_travel(seconds=seconds)
+
+    def _mint(self, receiver, amount, as_minter: bool) -> int:
+        sender = self.vault_messenger.address if as_minter else receiver
+        if self.killed_all or (as_minter and self.killed_messenger):
+            with boa.env.prank(sender), boa.reverts():
+                self.vault.mint(receiver, amount)
+            return None
+
+        owed = self.iou.get(receiver, 0)
+        if as_minter:
+            fee = amount * self.fee // 10**18
+            self.fees_accrued += fee
+            owed += amount - fee
+        elif receiver == self.fee_receiver:
+            owed += self.fees_accrued
+            self.fees_accrued = 0
+        # MockControllerFactory restores the debt ceiling on the first rug
+        expected = min(self.vault_balance, owed)
+
+        with boa.env.prank(sender):
+            assert self.vault.mint(receiver, amount if as_minter else 0) == expected
+        self.rug_scheduled = False
+        self.iou[receiver] = owed - expected
+        assert self.vault.balanceOf(receiver) == self.iou[receiver]
+        self.vault_balance -= expected
+        self.paid_out += expected
+        return expected
+
+    @precondition(lambda self: self.pending)
+    @rule(index=st.integers(0))
+    def mint(self, index):
+        receiver, amount = self.pending[index % len(self.pending)]
+        if self._mint(receiver, amount, as_minter=True) is not None:
+            self.pending.pop(index % len(self.pending))
+            self.delivered += amount
+
+    @rule(user=st.integers(0, 3))
+    def claim(self, user):
+        self._mint(([*self.users, self.fee_receiver])[user], 0, as_minter=False)
+
+    @precondition(lambda self: self.in_native_bridge)
+    @rule(share=st.integers(1, 100))
+    def native_arrival(self, share):
+        amount = self.in_native_bridge * share // 100
+        with boa.env.prank(self.bridger.address):
+            self.crvusd.transfer(self.vault, amount)
+        self.in_native_bridge -= amount
+        self.vault_balance += amount
+
+    @rule(excess=st.integers(0, LIMIT))
+    def schedule_rug(self, excess):
+        self.minter.set_debt_ceiling(self.vault, LIMIT, LIMIT + excess)
+        assert self.vault.schedule_rug() == (excess > 0)
+        self.rug_scheduled = excess > 0
+
+    @rule(status=st.booleans(), everyone=st.booleans())
+    def set_killed(self, status, everyone):
+        with boa.env.prank(self.emergency_dao):
+            if everyone:
+                self.vault.set_killed(status)
+                self.killed_all = status
+            else:
+                self.vault.set_killed(status, self.vault_messenger.address)
+                self.killed_messenger = status
+
+    @rule(fee=fees)
+    def set_fee(self, fee):
+        with boa.env.prank(self.curve_dao):
+            if fee > 10**18:
+                with boa.reverts():
+                    self.vault.set_fee(fee)
+                return
+            self.vault.set_fee(fee)
+        self.fee = fee
+
+    @rule(amount=st.one_of(st.integers(0, VAULT_LIQUIDITY), st.just(2**256 - 1)))
+    def recover(self, amount):
+        if amount == 2**256 - 1:
+            amount = self.vault_balance
+        with boa.env.prank(self.curve_dao):
+            if amount > self.vault_balance:
+                with boa.reverts():
+                    self.vault.recover([(self.crvusd, amount)], self.recover_receiver)
+                return
+            self.vault.recover([(self.crvusd, amount)], self.recover_receiver)
+        self.vault_balance -= amount
+
+    @invariant()
+    def crvusd_conserved(self):
+        assert self.crvusd.balanceOf(self.bridger) == self.in_native_bridge
+        assert self.crvusd.balanceOf(self.vault) == self.vault_balance
+
+    @invariant()
+    def ious_conserved(self):
+        # Every delivered amount is either paid out or owed, fees included
+        assert self.paid_out + sum(self.iou.values()) + self.fees_accrued == self.delivered
+
+    @invariant()
+    def limiter(self):
+        available = self.limit - min(self._bridged(), self.limit)
+        expected = (0, 0) if available < self.min_amount else (self.min_amount, available)
+        assert self.l2.allowed_to_bridge() == expected
+
+    @invariant()
+    def vault_flags(self):
+        assert self.vault.fee() == self.fee
+        assert self.vault.fees_accrued() == self.fees_accrued
+        assert self.vault.rug_scheduled() == self.rug_scheduled
+        assert self.vault.is_killed(ZERO_ADDRESS) == self.killed_all
+
+    def teardown(self):
+        # Checks touching every holder are only done once per sequence
+        if not hasattr(self, "total"):
+            return
+        assert sum(self.crvusd.balanceOf(holder) for holder in self.holders) == self.total
+        for receiver, owed in self.iou.items():
+            assert self.vault.balanceOf(receiver) == owed
+
+
+def test_bridge_state_machine(
+    fast_bridge_l2, fast_bridge_vault, crvusd, minter, bridger, vault_messenger,
+    curve_dao, emergency_dao, dev_deployer, users,
+):
+    BridgeStateMachine.l2 = fast_bridge_l2
+    BridgeStateMachine.vault = fast_bridge_vault
+    BridgeStateMachine.crvusd = crvusd
+    BridgeStateMachine.minter = minter
+    BridgeStateMachine.bridger = bridger
+    BridgeStateMachine.vault_messenger = vault_messenger
+    BridgeStateMachine.curve_dao = curve_dao
+    BridgeStateMachine.emergency_dao = emergency_dao
+    BridgeStateMachine.dev_deployer = dev_deployer
+    BridgeStateMachine.users = users
+    run_state_machine_as_test(BridgeStateMachine)
@@ -0,0 +1,121 @@
+"""
+Gas benchmarks for every external entry point.
+
+Each benchmark measures execution gas (intrinsic tx cost excluded) of a single call
+and compares it against `gas_baseline.json`. Accounts and slots touched while setting
+up the test stay warm, so keep setup deterministic.
+A call that costs more than `baseline * (1 + rel_tolerance) + abs_tolerance`, or has no baseline, fails.
+Run with `--update-gas-baseline -n 0` to record new values.
+"""
+
+import json
+from pathlib import Path
+
+import boa
+import pytest
+from compile_cache import load
+
+BASELINE_PATH = Path(__file__).parent / "gas_baseline.json"
+
+AMOUNT = 1000 * 10**18
+MESSAGING_FEE = 10**15
+
+
+class GasBenchmark:
+    def __init__(self, path: Path, update: bool):
+        self.path = path
+        self.update = update
+        baseline = json.loads(path.read_text()) if path.exists() else {}
+        self.rel_tolerance = baseline.get("rel_tolerance", 0.01)
+        self.abs_tolerance = baseline.get("abs_tolerance", 100)
+        self.baseline = baseline.get("gas", {})
+        self.measured = {}
+
+    def measure(self, name: str, fn, *args, **kwargs):
+        """
+        Call `fn` and check gas it used against the baseline
+        @return Whatever `fn` returned
+        """
+        gas_before = boa.env.get_gas_used()
+        result = fn(*args, **kwargs)
+        gas = boa.env.get_gas_used() - gas_before
+        self.measured[name] = gas
+
+        if self.update:
+            return result
+        expected = self.baseline.get(name)
+        assert expected is not None, f"No gas baseline for {name} ({gas}), run with --update-gas-baseline"
+        allowed = int(expected * (1 + self.rel_tolerance)) + self.abs_tolerance
+        assert gas <= allowed, f"Gas regression in {name}: {gas} > {expected} (allowed up to {allowed})"
+        return result
+
+    def save(self):
+        gas = {**self.baseline, **self.measured}
+        data = {
+            "rel_tolerance": self.rel_tolerance,
+            "abs_tolerance": self.abs_tolerance,
+            "gas": dict(sorted(gas.items())),
+        }
+        self.path.write_text(json.dumps(data, indent=2) + "\n")
+
+    def summary(self):
+        for name, gas in sorted(self.measured.items()):
+            expected = self.baseline.get(name)
+            if expected is None:
+                yield f"{name}: {gas} (new)"
+            else:
+                yield f"{name}: {gas} ({gas - expected:+d} vs {expected})"
+
+
+def _gas_benchmark(config) -> GasBenchmark:
+    if not hasattr(config, "_gas_benchmark"):
+        config._gas_benchmark = GasBenchmark(BASELINE_PATH, config.getoption("--update-gas-baseline"))
+    return config._gas_benchmark
+
+
+@pytest.fixture()
+def gas_bench(request):
+    return _gas_benchmark(request.config).measure
+
+
+def pytest_sessionfinish(session):
+    benchmark = getattr(session.config, "_gas_benchmark", None)
+    if benchmark is not None and benchmark.update and benchmark.measured:
+        benchmark.save()
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    benchmark = getattr(config, "_gas_benchmark", None)
+    if benchmark is None or not benchmark.measured:
+        return
+    terminalreporter.section("gas")
+    for line in benchmark.summary():
+        terminalreporter.write_line(line)
+
+
+@pytest.fixture(scope="session")
+def mock_messenger():
+    messenger = load("tests/mocks/MockMessenger.vy")
+    messenger.set_fee(MESSAGING_FEE)
+    return messenger
+
+
+@pytest.fixture(scope="session")
+def fast_bridge_l2(dev_deployer, crvusd, fast_bridge_vault, bridger, mock_messenger):
+    """FastBridgeL2 with a mock messenger, so messenger gas is benchmarked on its own"""
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2 = load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, mock_messenger)
+        fast_bridge_l2.set_limit(100 * AMOUNT)
+    return fast_bridge_l2
+
+
+@pytest.fixture(scope="session")
+def l2_gateway():
+    return load("tests/mocks/MockL2Gateway.vy")
+
+
+@pytest.fixture(scope="session")
+def l2_crvusd(l2_gateway, crvusd):
+    token = load("tests/mocks/MockL2Token.vy", l2_gateway, crvusd)
+    l2_gateway.set_token(token)
+    return token
@@ -0,0 +1,20 @@
+"""Gas benchmarks for native bridge adapters."""
+
+import boa
+import pytest
+from compile_cache import load
+
+AMOUNT = 10 * 10**18
+
+
+@pytest.mark.parametrize("name", ["ArbitrumBridger", "OptimismBridger"])
+def test_bridge(gas_bench, l2_crvusd, l2_gateway, alice, bob, name):
+    bridger = load(f"contracts/bridgers/{name}.vy")
+    boa.deal(l2_crvusd, alice, 2 * AMOUNT)
+    with boa.env.prank(alice):
+        l2_crvusd.approve(bridger, 2**256 - 1)
+        # First bridge also approves the gateway
+        gas_bench(f"{name}.bridge[first]", bridger.bridge, l2_crvusd, bob, AMOUNT)
+        gas_bench(f"{name}.bridge", bridger.bridge, l2_crvusd, bob, AMOUNT)
+
+    assert l2_crvusd.balanceOf(l2_gateway) == 2 * AMOUNT
@@ -0,0 +1,54 @@
+"""Gas benchmarks for FastBridgeL2 entry points."""
+
+import boa
+import pytest
+
+AMOUNT = 10 * 10**18
+
+
+@pytest.fixture()
+def sender(crvusd, fast_bridge_l2):
+    sender = boa.env.generate_address()
+    boa.deal(crvusd, sender, 10 * AMOUNT)
+    boa.env.set_balance(sender, 10**18)
+    with boa.env.prank(sender):
+        crvusd.approve(fast_bridge_l2, 2**256 - 1)
+    return sender
+
+
+@pytest.mark.parametrize("refund", [False, True])
+def test_bridge(gas_bench, fast_bridge_l2, crvusd, sender, bob, refund):
+    cost = fast_bridge_l2.cost()
+    assert cost > 0
+    value = 2 * cost if refund else cost
+    suffix = ",refund" if refund else ""
+
+    with boa.env.prank(sender):
+        gas_bench(f"FastBridgeL2.bridge[first_in_interval{suffix}]",
+                  fast_bridge_l2.bridge, crvusd, bob, AMOUNT, value=value)
+        gas_bench(f"FastBridgeL2.bridge[same_interval{suffix}]",
+                  fast_bridge_l2.bridge, crvusd, bob, AMOUNT, value=value)
+
+    assert boa.env.get_balance(sender) == 10**18 - 2 * cost
+
+
+def test_cost(gas_bench, fast_bridge_l2):
+    gas_bench("FastBridgeL2.cost", fast_bridge_l2.cost)
+
+
+def test_allowed_to_bridge(gas_bench, fast_bridge_l2):
+    gas_bench("FastBridgeL2.allowed_to_bridge", fast_bridge_l2.allowed_to_bridge)
+
+
+def test_bridge_queued(gas_bench, fast_bridge_l2, crvusd, sender, bob, dev_deployer):
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(AMOUNT)
+    cost = fast_bridge_l2.cost()
+
+    with boa.env.prank(sender):
+        gas_bench("FastBridgeL2.bridge_queued[now,2_queued]",
+                  fast_bridge_l2.bridge_queued, crvusd, bob, 3 * AMOUNT, value=3 * cost)
+    boa.env.time_travel(seconds=fast_bridge_l2.queue(0).interval * 86400 * 7 // 4 - boa.env.evm.patch.timestamp)
+    gas_bench("FastBridgeL2.release_queued[1]", fast_bridge_l2.release_queued, 1)
+
+    assert fast_bridge_l2.queue_head() == 1
@@ -0,0 +1,59 @@
+"""Gas benchmarks for FastBridgeVault.mint paths."""
+
+import boa
+
+AMOUNT = 10 * 10**18
+
+
+def test_mint_full(gas_bench, fast_bridge_vault, crvusd, vault_messenger, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * AMOUNT)
+    with boa.env.prank(vault_messenger.address):
+        assert gas_bench("FastBridgeVault.mint[full]", fast_bridge_vault.mint, alice, AMOUNT) == AMOUNT
+
+
+def test_mint_partial(gas_bench, fast_bridge_vault, crvusd, vault_messenger, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT // 2)
+    with boa.env.prank(vault_messenger.address):
+        assert gas_bench("FastBridgeVault.mint[partial]", fast_bridge_vault.mint, alice, AMOUNT) == AMOUNT // 2
+    assert fast_bridge_vault.balanceOf(alice) == AMOUNT // 2
+
+
+def test_mint_iou(gas_bench, fast_bridge_vault, crvusd, vault_messenger, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, 0)
+    with boa.env.prank(vault_messenger.address):
+        assert gas_bench("FastBridgeVault.mint[iou]", fast_bridge_vault.mint, alice, AMOUNT) == 0
+    assert fast_bridge_vault.balanceOf(alice) == AMOUNT
+
+
+def test_mint_claim(gas_bench, fast_bridge_vault, crvusd, vault_messenger, alice, bob):
+    boa.deal(crvusd, fast_bridge_vault.address, 0)
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, AMOUNT)
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    with boa.env.prank(bob):
+        assert gas_bench("FastBridgeVault.mint[claim]", fast_bridge_vault.mint, alice, 0) == AMOUNT
+
+
+def test_mint_rug_scheduled(gas_bench, fast_bridge_vault, crvusd, minter, vault_messenger, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * AMOUNT)
+    minter.set_debt_ceiling(fast_bridge_vault, AMOUNT, 2 * AMOUNT)
+    assert fast_bridge_vault.schedule_rug()
+
+    with boa.env.prank(vault_messenger.address):
+        assert gas_bench("FastBridgeVault.mint[rug_scheduled]", fast_bridge_vault.mint, alice, AMOUNT) == AMOUNT
+    assert not fast_bridge_vault.rug_scheduled()
+
+
+def test_schedule_rug(gas_bench, fast_bridge_vault, minter):
+    minter.set_debt_ceiling(fast_bridge_vault, AMOUNT, 2 * AMOUNT)
+    assert gas_bench("FastBridgeVault.schedule_rug", fast_bridge_vault.schedule_rug)
+    minter.set_debt_ceiling(fast_bridge_vault, 0, 0)
+
+
+def test_mint_fee(gas_bench, fast_bridge_vault, crvusd, curve_dao, vault_messenger, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * AMOUNT)
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    with boa.env.prank(vault_messenger.address):
+        gas_bench("FastBridgeVault.mint[fee]", fast_bridge_vault.mint, alice, AMOUNT)
+    assert fast_bridge_vault.fees_accrued() == AMOUNT // 100
@@ -0,0 +1,61 @@
+import boa
+from gas_trace import GasTrace, TraceGasMeter
+
+SOURCE = """
+interface Counter:
+    def bump() -> uint256: nonpayable
+
+count: uint256
+
+@internal
+def _add(n: uint256) -> uint256:
+    self.count += n
+    return self.count
+
+@internal
+def _bump() -> uint256:
+    return self._add(1)
+
+@external
+def bump() -> uint256:
+    return self._bump()
+
+@external
+def run(other: Counter) -> uint256:
+    return self._bump() + extcall other.bump() + self._add(2)
+"""
+
+
+def test_frames():
+    first, second = boa.loads(SOURCE, name="First"), boa.loads(SOURCE, name="Second")
+    with boa.env.gas_meter_class(TraceGasMeter):
+        first.run(second)
+    computation = first._computation
+    trace = GasTrace()
+    trace.record(boa.env, computation)
+
+    functions = trace.functions()
+    assert functions["First.run"]["gas"] == computation.get_gas_used()
+    assert functions["Second.bump"]["gas"] == computation.children[0].get_gas_used()
+    assert functions["First._add"]["calls"] == 2  # From _bump and from run
+    assert functions["First._bump"]["calls"] == 1
+    assert ("First.run", "First._bump", "First._add") in trace.self_gas
+    assert ("First.run", "Second.bump", "Second._bump", "Second._add") in trace.self_gas
+    assert set(trace.breakdown()["First.run"]) == {"<self>", "First._bump", "First._add", "Second.bump"}
+    assert all(gas >= 0 for gas in trace.self_gas.values())
+
+
+def test_merge():
+    first, second = boa.loads(SOURCE, name="First"), boa.loads(SOURCE, name="Second")
+    traces = []
+    for _ in range(2):
+        with boa.env.gas_meter_class(TraceGasMeter):
+            first.run(second)
+        traces.append(GasTrace())
+        traces[-1].record(boa.env, first._computation)
+
+    merged = GasTrace()
+    for trace in traces:
+        merged.merge(trace.dump())
+    assert merged.functions()["First.run"]["calls"] == 2
+    assert merged.folded().splitlines()[0].startswith("First.run")
@@ -0,0 +1,67 @@
+"""
+Gas benchmarks for LayerZero messengers against the mock endpoint.
+
+Most of their gas is spent in the OApp module, so they only run against a checkout of the
+oapp_vyper submodule, not a copy of its sources the baseline may not have been recorded with.
+"""
+
+from pathlib import Path
+
+import boa
+import pytest
+
+AMOUNT = 10 * 10**18
+L2_EID = 999
+
+OAPP = Path(__file__).parents[2] / "contracts/modules/oapp_vyper"
+
+pytestmark = pytest.mark.skipif(not (OAPP / ".git").exists(), reason="oapp_vyper submodule is not checked out")
+
+
+@pytest.fixture()
+def l2_peer(dev_deployer, vault_messenger, fast_bridge_vault):
+    peer = boa.env.generate_address()
+    with boa.env.prank(dev_deployer):
+        vault_messenger.set_vault(fast_bridge_vault)
+        vault_messenger.setPeer(L2_EID, boa.eval(f"convert({peer}, bytes32)"))
+    return peer
+
+
+@pytest.mark.parametrize("funded", [True, False])
+def test_lz_receive(gas_bench, vault_messenger, fast_bridge_vault, lz_endpoint, crvusd, l2_peer, alice, funded):
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * AMOUNT if funded else 0)
+    origin = (L2_EID, boa.eval(f"convert({l2_peer}, bytes32)"), 1)
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (alice, AMOUNT, bytes(32)))
+
+    with boa.env.prank(lz_endpoint.address):
+        gas_bench(f"VaultMessengerLZ.lzReceive[{'mint' if funded else 'iou'}]",
+                  vault_messenger.lzReceive, origin, bytes(32), message, lz_endpoint.address, b"")
+    assert fast_bridge_vault.balanceOf(alice) == (0 if funded else AMOUNT)
+
+
+def test_lz_receive_worst_case(gas_bench, vault_messenger, fast_bridge_vault, lz_endpoint, crvusd, curve_dao, l2_peer,
+                               alice):
+    """Heaviest regular delivery: a transfer id to record and a fee to accrue, what L2MessengerLZ.gas_limit covers"""
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * AMOUNT)
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    origin = (L2_EID, boa.eval(f"convert({l2_peer}, bytes32)"), 1)
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (alice, AMOUNT, b"\x01" * 32))
+
+    with boa.env.prank(lz_endpoint.address):
+        gas_bench("VaultMessengerLZ.lzReceive[mint,transfer_id,fee]",
+                  vault_messenger.lzReceive, origin, bytes(32), message, lz_endpoint.address, b"")
+    assert fast_bridge_vault.fees_accrued() == AMOUNT // 100
+
+
+def test_initiate_fast_bridge(gas_bench, l2_messenger, lz_endpoint, vault_eid, dev_deployer, alice):
+    fast_bridge_l2 = boa.env.generate_address()
+    with boa.env.prank(dev_deployer):
+        l2_messenger.setPeer(vault_eid, boa.eval(f"convert({boa.env.generate_address()}, bytes32)"))
+        l2_messenger.set_fast_bridge_l2(fast_bridge_l2)
+
+    fee = l2_messenger.quote_message_fee()
+    boa.env.set_balance(fast_bridge_l2, fee)
+    with boa.env.prank(fast_bridge_l2):
+        gas_bench("L2MessengerLZ.initiate_fast_bridge",
+                  l2_messenger.initiate_fast_bridge, alice, AMOUNT, fast_bridge_l2, value=fee)
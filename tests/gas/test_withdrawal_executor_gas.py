@@ -0,0 +1,14 @@
+"""Gas benchmarks for batched L1 withdrawal execution."""
+
+import pytest
+from compile_cache import load
+
+
+@pytest.mark.parametrize("calls", [1, 8])
+def test_execute(gas_bench, alice, calls):
+    executor = load("contracts/WithdrawalExecutor.vy")
+    token = load("tests/mocks/MockERC20.vy")
+    # Stand-in for a withdrawal: one external call with a storage write each
+    batch = [(token.address, 0, token.approve.prepare_calldata(alice, i + 1)) for i in range(calls)]
+
+    assert gas_bench(f"WithdrawalExecutor.execute[{calls}]", executor.execute, batch) == [True] * calls
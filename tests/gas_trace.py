@@ -0,0 +1,228 @@
+"""
+Gas of every call frame in the suite, run with `--gas-trace`.
+
+Every call made through boa is executed with boa's per-PC gas meter. Its opcode trace is then split into frames:
+external calls into child computations, and internal functions of Vyper contracts (modules included) from the
+source map. Vyper has no recursion, so an internal function that is already on the stack is a return to it and any
+other one is a call. Gas of a PC is split evenly over its executions; a CALL is charged only its own cost, the
+callee's gas goes to the callee's frame. Gas is gross, refunds are settled per transaction and not per frame.
+Deployments are not traced.
+
+Self gas per stack is summed over the run (xdist workers included) and written to `.cache/gas_trace`:
+- `gas_trace.folded`: `Frame;Frame;Frame gas` lines for flamegraph.pl, inferno or speedscope
+- `gas_trace.json`: calls, self and inclusive gas of every function, and the split of each entry point over its callees
+The terminal summary shows that split for the most expensive functions that call others.
+"""
+
+import json
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from boa.contracts.vyper.ast_utils import get_fn_ancestor_from_node
+from boa.environment import Env
+from boa.vm.gas_meters import GasMeter, ProfilingGasMeter
+from eth_utils import function_abi_to_4byte_selector, to_checksum_address
+
+OUTPUT_DIR = Path(__file__).parent.parent / ".cache" / "gas_trace"
+CALL_OPCODES = {0xF0, 0xF1, 0xF2, 0xF4, 0xF5, 0xFA}  # CREATE, CALL, CALLCODE, DELEGATECALL, CREATE2, STATICCALL
+
+Stack = Tuple[str, ...]
+
+
+class TraceGasMeter(ProfilingGasMeter):
+    """Per-PC gas without feeding titanoboa's `--gas-profile` tables, which only look for ProfilingGasMeter"""
+
+
+class GasTrace:
+    def __init__(self):
+        self.self_gas: Counter = Counter()  # stack -> gas spent in its last frame
+        self.calls: Counter = Counter()  # frame -> times entered
+        self._functions: Dict[Tuple[int, int], Optional[str]] = {}  # (id of contract, pc) -> function
+        self._selectors: Dict[int, Dict[bytes, str]] = {}
+
+    # Collection
+
+    def _contract_name(self, contract, address: bytes) -> str:
+        if contract is None:
+            return to_checksum_address(address)[:10] if address else "?"
+        return contract.contract_name
+
+    def _entry(self, contract, computation) -> str:
+        if computation.msg.is_create:
+            return "__init__"
+        if contract is None:
+            return "transfer" if not computation.msg.data else "call"
+        if id(contract) not in self._selectors:
+            self._selectors[id(contract)] = {
+                function_abi_to_4byte_selector(item): item["name"]
+                for item in getattr(contract, "abi", []) if item.get("type") == "function"
+            }
+        return self._selectors[id(contract)].get(bytes(computation.msg.data[:4]), "__default__")
+
+    def _function(self, contract, pc: int) -> Optional[str]:
+        key = (id(contract), pc)
+        if key not in self._functions:
+            node = contract.source_map["pc_raw_ast_map"].get(pc)
+            fn = get_fn_ancestor_from_node(node)
+            if fn is None:
+                self._functions[key] = None
+            else:
+                path = fn.module_node.resolved_path  # None for code injected with eval
+                main = contract.compiler_data.annotated_vyper_module.resolved_path
+                self._functions[key] = fn.name if path in (None, main) else f"{Path(path).stem}.{fn.name}"
+        return self._functions[key]
+
+    def record(self, env: Env, computation, parent: Stack = ()):
+        address = computation.msg.code_address
+        contract = env.lookup_contract(address) if address else None
+        name = self._contract_name(contract, address)
+        entry = self._entry(contract, computation)
+        stack: List[str] = [entry]
+        self.calls[f"{name}.{entry}"] += 1
+
+        def path() -> Stack:
+            return parent + tuple(f"{name}.{frame}" for frame in stack)
+
+        meter = computation._gas_meter
+        trace = computation.code._trace
+        children = list(computation.children)
+        if not isinstance(meter, ProfilingGasMeter) or not trace:  # Metering disabled
+            self.self_gas[path()] += computation.get_gas_used() - sum(c.get_gas_used() for c in children)
+            for child in children:
+                self.record(env, child, path())
+            return
+
+        # Gas of every PC per execution, callees excluded
+        hits = Counter(trace)
+        gas = defaultdict(int, meter._gas_used_of)
+        for pc, child in zip(computation._child_pcs, children):
+            gas[pc - 1] -= child.get_gas_used()
+
+        source_mapped = hasattr(contract, "source_map")
+        code = computation.code._raw_code_bytes
+        next_child = 0
+        current = path()
+        for pc in trace:
+            if source_mapped:
+                fn = self._function(contract, pc)
+                if fn is not None and fn != stack[-1]:
+                    if fn in stack:
+                        del stack[stack.index(fn) + 1:]
+                    else:
+                        stack.append(fn)
+                        self.calls[f"{name}.{fn}"] += 1
+                    current = path()
+            self.self_gas[current] += gas[pc] / hits[pc]
+            if (next_child < len(children) and pc < len(code) and code[pc] in CALL_OPCODES
+                    and computation._child_pcs[next_child] - 1 == pc):
+                self.record(env, children[next_child], current)
+                next_child += 1
+        for child in children[next_child:]:  # Not matched to a call site
+            self.record(env, child, current)
+
+    # Reports
+
+    def merge(self, data: dict):
+        for stack, gas in data["self_gas"]:
+            self.self_gas[tuple(stack)] += gas
+        self.calls.update(data["calls"])
+
+    def dump(self) -> dict:
+        return {"self_gas": [[list(stack), gas] for stack, gas in self.self_gas.items()], "calls": dict(self.calls)}
+
+    def functions(self) -> Dict[str, dict]:
+        """Calls, self and inclusive gas of every frame, a frame counts once per stack even if repeated in it"""
+        result = {name: {"calls": calls, "self_gas": 0, "gas": 0} for name, calls in self.calls.items()}
+        for stack, gas in self.self_gas.items():
+            result.setdefault(stack[-1], {"calls": 0, "self_gas": 0, "gas": 0})["self_gas"] += gas
+            for frame in set(stack):
+                result.setdefault(frame, {"calls": 0, "self_gas": 0, "gas": 0})["gas"] += gas
+        for stats in result.values():
+            stats["self_gas"], stats["gas"] = round(stats["self_gas"]), round(stats["gas"])
+        return result
+
+    def breakdown(self) -> Dict[str, Dict[str, int]]:
+        """Inclusive gas of every frame by direct callee, `<self>` for its own code"""
+        result: Dict[str, Counter] = defaultdict(Counter)
+        for stack, gas in self.self_gas.items():
+            seen = set()
+            for i, frame in enumerate(stack):
+                if frame not in seen:
+                    seen.add(frame)
+                    result[frame][stack[i + 1] if i + 1 < len(stack) else "<self>"] += gas
+        return {root: {frame: round(gas) for frame, gas in callees.most_common()} for root, callees in result.items()}
+
+    def folded(self) -> str:
+        lines = [f"{';'.join(stack)} {round(gas)}" for stack, gas in sorted(self.self_gas.items()) if round(gas) > 0]
+        return "\n".join(lines) + "\n"
+
+    def write(self, directory: Path):
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "gas_trace.folded").write_text(self.folded())
+        report = {"functions": dict(sorted(self.functions().items())), "breakdown": self.breakdown()}
+        (directory / "gas_trace.json").write_text(json.dumps(report, indent=2) + "\n")
+
+    def summary(self, top: int = 10):
+        functions = self.functions()
+        frames = sorted(self.breakdown().items(), key=lambda item: -functions[item[0]]["gas"])
+        for root, callees in [(frame, callees) for frame, callees in frames if len(callees) > 1][:top]:
+            stats = functions[root]
+            yield f"{root}: {stats['gas']} gas in {stats['calls']} calls"
+            for frame, gas in callees.items():
+                yield f"    {frame}: {gas} ({gas / max(stats['gas'], 1):.0%})"
+
+
+def install(trace: GasTrace):
+    """Trace every call made through `Env.execute_code` from now on"""
+    execute_code = Env.execute_code
+
+    def traced_execute_code(self, *args, **kwargs):
+        if self.get_gas_meter_class() is not GasMeter:  # Metering disabled or profiled by titanoboa
+            return execute_code(self, *args, **kwargs)
+        with self.gas_meter_class(TraceGasMeter):
+            computation = execute_code(self, *args, **kwargs)
+        trace.record(self, computation)
+        return computation
+
+    Env.execute_code = traced_execute_code
+
+
+def output_dir(config) -> Path:
+    return Path(config.getoption("--gas-trace-dir") or OUTPUT_DIR)
+
+
+def configure(config):
+    if not config.getoption("--gas-trace"):
+        return
+    config._gas_trace = GasTrace()
+    install(config._gas_trace)
+    if not hasattr(config, "workerinput"):  # Stale worker dumps of a previous run
+        for path in output_dir(config).glob("worker-*.json"):
+            path.unlink()
+
+
+def sessionfinish(session):
+    trace = getattr(session.config, "_gas_trace", None)
+    if trace is None:
+        return
+    directory = output_dir(session.config)
+    directory.mkdir(parents=True, exist_ok=True)
+    workerinput = getattr(session.config, "workerinput", None)
+    if workerinput is not None:
+        (directory / f"worker-{workerinput['workerid']}.json").write_text(json.dumps(trace.dump()))
+        return
+    for path in sorted(directory.glob("worker-*.json")):
+        trace.merge(json.loads(path.read_text()))
+        path.unlink()
+    trace.write(directory)
+
+
+def terminal_summary(terminalreporter, config):
+    trace = getattr(config, "_gas_trace", None)
+    if trace is None or not trace.self_gas:
+        return
+    terminalreporter.section("gas trace")
+    for line in trace.summary():
+        terminalreporter.write_line(line)
+    terminalreporter.write_line(f"Full report in {output_dir(config)}")
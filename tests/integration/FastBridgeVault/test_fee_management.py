@@ -90,7 +90,7 @@ def test_fee_collection_integration(forked_env, fast_bridge_vault, vault_messeng
     receiver = boa.env.generate_address()
     mint_amount = 1000 * 10**18
     
-    initial_fee_balance = fast_bridge_vault.balanceOf(new_fee_receiver)
+    initial_fees = fast_bridge_vault.fees_accrued()
     
     with boa.env.prank(vault_messenger.address):
         minted = fast_bridge_vault.mint(receiver, mint_amount)
@@ -102,14 +102,15 @@ def test_fee_collection_integration(forked_env, fast_bridge_vault, vault_messeng
     # Verify fee collection
     assert minted == expected_received
     assert crvusd.balanceOf(receiver) == expected_received
-    assert fast_bridge_vault.balanceOf(new_fee_receiver) == initial_fee_balance + expected_fee
+    assert fast_bridge_vault.fees_accrued() == initial_fees + expected_fee
     
-    # Fee receiver can claim their balance
+    # Fee receiver can claim accrued fees
     with boa.env.prank(boa.env.generate_address()):  # Anyone can trigger mint for fee receiver
         fee_minted = fast_bridge_vault.mint(new_fee_receiver, 0)
     
-    assert fee_minted == expected_fee
-    assert crvusd.balanceOf(new_fee_receiver) == expected_fee
+    assert fee_minted == initial_fees + expected_fee
+    assert crvusd.balanceOf(new_fee_receiver) == initial_fees + expected_fee
+    assert fast_bridge_vault.fees_accrued() == 0
     assert fast_bridge_vault.balanceOf(new_fee_receiver) == 0
 
 
@@ -119,7 +120,6 @@ def test_fee_changes_during_operations(forked_env, fast_bridge_vault, vault_mess
     boa.deal(crvusd, fast_bridge_vault.address, 10000 * 10**18)
     
     receiver = boa.env.generate_address()
-    fee_receiver = fast_bridge_vault.fee_receiver()
     
     # First mint with 0% fee
     with boa.env.prank(vault_messenger.address):
@@ -136,4 +136,4 @@ def test_fee_changes_during_operations(forked_env, fast_bridge_vault, vault_mess
     assert minted2 == 990 * 10**18  # 1% fee deducted
     
     # Verify fee was collected
-    assert fast_bridge_vault.balanceOf(fee_receiver) == 10 * 10**18
\ No newline at end of file
+    assert fast_bridge_vault.fees_accrued() == 10 * 10**18
\ No newline at end of file
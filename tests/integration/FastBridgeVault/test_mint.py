@@ -39,8 +39,7 @@ def test_mint_with_fee(forked_env, fast_bridge_vault, vault_messenger, crvusd, d
     # Fund the vault
     boa.deal(crvusd, fast_bridge_vault.address, mint_amount * 2)
     
-    fee_receiver = fast_bridge_vault.fee_receiver()
-    initial_fee_balance = fast_bridge_vault.balanceOf(fee_receiver)
+    initial_fees = fast_bridge_vault.fees_accrued()
     
     # Mint as authorized minter
     with boa.env.prank(vault_messenger.address):
@@ -53,7 +52,7 @@ def test_mint_with_fee(forked_env, fast_bridge_vault, vault_messenger, crvusd, d
     # Verify mint with fee
     assert minted == expected_received
     assert crvusd.balanceOf(receiver) == expected_received
-    assert fast_bridge_vault.balanceOf(fee_receiver) == initial_fee_balance + expected_fee
+    assert fast_bridge_vault.fees_accrued() == initial_fees + expected_fee
 
 
 def test_mint_insufficient_balance(forked_env, fast_bridge_vault, vault_messenger, crvusd):
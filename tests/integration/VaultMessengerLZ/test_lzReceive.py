@@ -16,7 +16,7 @@ def test_lz_receive_no_crvusd(forked_env, vault_messenger, l2_messenger, fast_br
     # Create a message with block data
     to_mint = 10**18
     receiver = boa.env.generate_address()
-    message = boa.util.abi.abi_encode("(address,uint256)", (receiver, to_mint))
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (receiver, to_mint, bytes(32)))
 
     # Add peer for the source chain to allow the message
     with boa.env.prank(dev_deployer):
@@ -47,7 +47,7 @@ def test_lz_receive_with_crvusd(forked_env, vault_messenger, l2_messenger, fast_
     # Create a message with block data
     to_mint = 10**18
     receiver = boa.env.generate_address()
-    message = boa.util.abi.abi_encode("(address,uint256)", (receiver, to_mint))
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (receiver, to_mint, bytes(32)))
 
     # Add peer for the source chain to allow the message
     with boa.env.prank(dev_deployer):
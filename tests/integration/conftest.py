@@ -2,13 +2,23 @@ import boa
 import pytest
 import os
 import json
+from pathlib import Path
+from boa.rpc import EthereumRPC
 from eth_utils import to_bytes
 
-boa.set_etherscan(api_key=os.getenv("ETHERSCAN_API_KEY"))
+from compile_cache import load
+from rpc_cassette import CassetteRPC
 
 
 BOA_CACHE = True
 
+# Forked state is pinned so that runs are deterministic and can be replayed from a cassette.
+# RPC_CASSETTE=record captures responses, RPC_CASSETTE=replay serves them offline,
+# RPC_CASSETTE=live forks without a cassette. Defaults to replay when a cassette exists.
+FORK_BLOCK = 23_000_000
+CASSETTE_PATH = Path(__file__).parent / "cassettes" / f"mainnet-{FORK_BLOCK}.json.gz"
+RPC_MODE = os.getenv("RPC_CASSETTE", "replay" if CASSETTE_PATH.exists() else "live")
+
 LZ_ENDPOINT = "0x1a44076050125825900e736c501f859c50fE728c"  # mainnet
 LZ_EID = 30101  # Ethereum mainnet
 EMPTY_ADDRESS = boa.eval("empty(address)")
@@ -27,82 +37,103 @@ def drpc_api_key():
     return os.getenv("DRPC_API_KEY")
 
 
-@pytest.fixture(scope="function")
+@pytest.fixture(scope="session")
 def rpc_url(drpc_api_key):
     """Fixture to generate the correct RPC URL for each chain."""
     if drpc_api_key:
         return 'https://lb.drpc.org/ogrpc?network=ethereum&dkey=' + drpc_api_key
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def forked_env(rpc_url):
-    """Automatically fork each test with the specified chain."""
-    block_to_fork = "latest"
-    with boa.swap_env(boa.Env()):
-        if BOA_CACHE:
-            boa.fork(url=rpc_url, block_identifier=block_to_fork)
+    """Fork the chain once per session (i.e. once per xdist worker)."""
+    assert RPC_MODE in ("record", "replay", "live"), f"Bad RPC_CASSETTE value: {RPC_MODE}"
+    if RPC_MODE == "replay":
+        rpc = CassetteRPC(CASSETTE_PATH)
+    elif rpc_url is None:
+        pytest.skip("DRPC_API_KEY is not set and there is no RPC cassette to replay")
+    elif RPC_MODE == "record":
+        rpc = CassetteRPC(CASSETTE_PATH, EthereumRPC(rpc_url))
+    else:
+        rpc = EthereumRPC(rpc_url)
+
+    env = boa.Env()
+    with boa.swap_env(env):
+        if BOA_CACHE and RPC_MODE == "live":
+            boa.env.fork_rpc(rpc, block_identifier=FORK_BLOCK)
         else:
-            boa.fork(url=rpc_url, block_identifier=block_to_fork, cache_dir=None)
+            # Disk cache would hide requests from the recorder
+            boa.env.fork_rpc(rpc, block_identifier=FORK_BLOCK, cache_dir=None)
         boa.env.enable_fast_mode()
-        yield
+    yield env
+
+    if RPC_MODE == "record":
+        rpc.save()
 
 
+@pytest.fixture(autouse=True)
+def _in_forked_env(forked_env):
+    """Run each test in the forked env. titanoboa's plugin anchors every test, so state is reverted after it."""
+    with boa.swap_env(forked_env):
+        yield
 
-@pytest.fixture()
-def l2_messenger(dev_deployer):
-    with boa.env.prank(dev_deployer):
-        messenger = boa.load("contracts/messengers/L2MessengerLZ.vy", LZ_ENDPOINT, LZ_EID, 100_000)
+
+@pytest.fixture(scope="session")
+def l2_messenger(forked_env, dev_deployer):
+    with boa.swap_env(forked_env), boa.env.prank(dev_deployer):
+        messenger = load("contracts/messengers/L2MessengerLZ.vy", LZ_ENDPOINT, LZ_EID, 100_000)
         # Set a peer to make quote_message_fee work
         test_peer = to_bytes32("0x" + "42" * 20)  # Dummy peer for testing
         messenger.setPeer(LZ_EID, test_peer)
         return messenger
 
 
-@pytest.fixture()
-def vault_messenger(dev_deployer):
-    with boa.env.prank(dev_deployer):
-        return boa.load("contracts/messengers/VaultMessengerLZ.vy", LZ_ENDPOINT)
+@pytest.fixture(scope="session")
+def vault_messenger(forked_env, dev_deployer):
+    with boa.swap_env(forked_env), boa.env.prank(dev_deployer):
+        return load("contracts/messengers/VaultMessengerLZ.vy", LZ_ENDPOINT)
 
 
-@pytest.fixture()
-def fast_bridge_vault(dev_deployer, curve_dao, emergency_dao, vault_messenger):
-    with boa.env.prank(dev_deployer):
-        return boa.load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [vault_messenger])
+@pytest.fixture(scope="session")
+def fast_bridge_vault(forked_env, dev_deployer, curve_dao, emergency_dao, vault_messenger):
+    with boa.swap_env(forked_env), boa.env.prank(dev_deployer):
+        return load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [vault_messenger])
 
 
-@pytest.fixture()
-def fast_bridge_l2(dev_deployer, crvusd, fast_bridge_vault, bridger, l2_messenger):
-    with boa.env.prank(dev_deployer):
-        fast_bridge_l2 = boa.load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, l2_messenger)
+@pytest.fixture(scope="session")
+def fast_bridge_l2(forked_env, dev_deployer, crvusd, fast_bridge_vault, bridger, l2_messenger):
+    with boa.swap_env(forked_env), boa.env.prank(dev_deployer):
+        fast_bridge_l2 = load("contracts/FastBridgeL2.vy", crvusd, fast_bridge_vault, bridger, l2_messenger)
         l2_messenger.set_fast_bridge_l2(fast_bridge_l2.address)
         return fast_bridge_l2
-    
 
-@pytest.fixture()
-def crvusd():
-    return boa.from_etherscan("0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E")
+
+@pytest.fixture(scope="session")
+def crvusd(forked_env):
+    with boa.swap_env(forked_env):
+        return boa.load_abi("interfaces/IERC20.json", name="crvUSD").at("0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E")
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def dev_deployer():
     """Developer deployer account."""
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def curve_dao():
     """Curve DAO address for admin functions."""
     return boa.env.generate_address()
 
 
-@pytest.fixture()
+@pytest.fixture(scope="session")
 def emergency_dao():
     """Emergency DAO address for kill functions."""
     return boa.env.generate_address()
 
 
-@pytest.fixture()
-def bridger(dev_deployer):
+@pytest.fixture(scope="session")
+def bridger(forked_env, dev_deployer):
     """Mock bridger contract."""
-    with boa.env.prank(dev_deployer):
-        return boa.load("tests/mocks/MockBridger.vy")
\ No newline at end of file
+    with boa.swap_env(forked_env), boa.env.prank(dev_deployer):
+        return load("tests/mocks/MockBridger.vy")
@@ -0,0 +1,91 @@
+"""
+Record-and-replay of the JSON-RPC traffic made by boa's fork.
+
+In record mode every response from the wrapped RPC is captured and written to a
+gzipped JSON cassette. In replay mode the cassette is the only source of data, so
+forked tests run offline and deterministically (given a pinned fork block).
+"""
+
+import fcntl
+import gzip
+import json
+from pathlib import Path
+from typing import Any, Optional
+
+from boa.rpc import RPC, RPCError
+
+
+class CassetteMiss(Exception):
+    pass
+
+
+def _key(method: str, params: Any) -> str:
+    return json.dumps([method, params], sort_keys=True, separators=(",", ":"))
+
+
+def _load(path: Path) -> dict:
+    with gzip.open(path, "rt") as f:
+        return json.load(f)
+
+
+class CassetteRPC(RPC):
+    def __init__(self, path: Path, rpc: Optional[RPC] = None):
+        """
+        @param path Cassette file
+        @param rpc RPC to record from, None to replay from the cassette
+        """
+        self._path = path
+        self._rpc = rpc
+        self._responses = _load(path) if rpc is None else {}
+
+    @property
+    def identifier(self) -> str:
+        return f"cassette:{self._path}"
+
+    @property
+    def name(self) -> str:
+        return f"cassette {self._path.name}" if self._rpc is None else self._rpc.name
+
+    @staticmethod
+    def _unwrap(response: dict) -> Any:
+        if "error" in response:
+            raise RPCError.from_json(response["error"])
+        return response["result"]
+
+    def _replay(self, method: str, params: Any) -> dict:
+        try:
+            return self._responses[_key(method, params)]
+        except KeyError:
+            raise CassetteMiss(f"{method} {params} is not in {self._path}, re-record the cassette") from None
+
+    def fetch(self, method, params):
+        if self._rpc is None:
+            return self._unwrap(self._replay(method, params))
+
+        try:
+            response = {"result": self._rpc.fetch(method, params)}
+        except RPCError as e:
+            response = {"error": {"code": e.code, "message": str(e).split(": ", 1)[-1]}}
+        self._responses[_key(method, params)] = response
+        return self._unwrap(response)
+
+    def fetch_multi(self, payloads):
+        if self._rpc is None:
+            return [self._unwrap(self._replay(method, params)) for method, params in payloads]
+
+        results = self._rpc.fetch_multi(payloads)
+        for (method, params), result in zip(payloads, results):
+            self._responses[_key(method, params)] = {"result": result}
+        return results
+
+    def save(self):
+        """Merge recorded responses into the cassette. Safe to call from several xdist workers"""
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self._path.with_suffix(".lock"), "w") as lock:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+            responses = _load(self._path) if self._path.exists() else {}
+            responses.update(self._responses)
+            tmp = self._path.with_suffix(".tmp")
+            with gzip.open(tmp, "wt") as f:
+                json.dump(dict(sorted(responses.items())), f, separators=(",", ":"))
+            tmp.replace(self._path)
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from boa.rpc import RPC, RPCError
+
+from rpc_cassette import CassetteMiss, CassetteRPC
+
+RESPONSES = {
+    "eth_chainId": "0x1",
+    "eth_blockNumber": "0x15f1234",
+    "eth_getBlockByNumber": {"number": "0x15f1234", "hash": "0x" + "ab" * 32, "transactions": []},
+    "eth_getStorageAt": "0x" + "00" * 31 + "01",
+}
+
+
+class FakeRPC(RPC):
+    """Canned responses by method, `eth_call` fails like a revert"""
+
+    def __init__(self):
+        self.requests = []
+
+    @property
+    def identifier(self) -> str:
+        return "fake"
+
+    @property
+    def name(self) -> str:
+        return "fake"
+
+    def fetch(self, method, params):
+        self.requests.append((method, params))
+        if method == "eth_call":
+            raise RPCError("execution reverted", 3)
+        return RESPONSES[method]
+
+    def fetch_multi(self, payloads):
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+@pytest.fixture(autouse=True)
+def _in_forked_env():
+    """The cassette is tested on its own, without forking"""
+    yield
+
+
+def run(rpc: RPC) -> list:
+    """Requests a fork makes: single, batched and failing"""
+    results = [
+        rpc.fetch("eth_chainId", []),
+        rpc.fetch("eth_getBlockByNumber", ["0x15f1234", False]),
+        rpc.fetch_multi([("eth_blockNumber", []), ("eth_getStorageAt", ["0x" + "11" * 20, "0x0", "0x15f1234"])]),
+    ]
+    with pytest.raises(RPCError) as e:
+        rpc.fetch("eth_call", [{"to": "0x" + "11" * 20, "data": "0x"}, "0x15f1234"])
+    return results + [(e.value.code, str(e.value))]
+
+
+def test_record_replay(tmp_path):
+    path = tmp_path / "cassette.json.gz"
+    live = FakeRPC()
+    recorder = CassetteRPC(path, live)
+    recorded = run(recorder)
+    recorder.save()
+    assert recorder.name == "fake"
+
+    replay = CassetteRPC(path)
+    assert json.dumps(run(replay)) == json.dumps(recorded)
+    assert replay.name == "cassette cassette.json.gz"
+    assert len(live.requests) == 5  # Nothing reaches the live RPC on replay
+
+
+def test_replay_miss(tmp_path):
+    path = tmp_path / "cassette.json.gz"
+    recorder = CassetteRPC(path, FakeRPC())
+    recorder.fetch("eth_chainId", [])
+    recorder.save()
+
+    replay = CassetteRPC(path)
+    # Same method with other params is a miss too, nothing falls through to a live RPC
+    with pytest.raises(CassetteMiss, match="re-record"):
+        replay.fetch("eth_getBlockByNumber", ["0x15f1234", False])
+    with pytest.raises(CassetteMiss):
+        replay.fetch_multi([("eth_chainId", []), ("eth_blockNumber", [])])
+    with pytest.raises(CassetteMiss):
+        replay.fetch("eth_chainId", ["0x1"])
+
+
+def test_save_merges(tmp_path):
+    # xdist workers record separately into one cassette
+    path = tmp_path / "cassette.json.gz"
+    first, second = CassetteRPC(path, FakeRPC()), CassetteRPC(path, FakeRPC())
+    first.fetch("eth_chainId", [])
+    second.fetch("eth_blockNumber", [])
+    first.save()
+    second.save()
+
+    replay = CassetteRPC(path)
+    assert replay.fetch("eth_chainId", []) == "0x1"
+    assert replay.fetch("eth_blockNumber", []) == "0x15f1234"
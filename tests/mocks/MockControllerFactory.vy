@@ -1,15 +1,15 @@
 # pragma version 0.4.3
 
-@external
-def rug_debt_ceiling(_to: address):
-    pass
+debt_ceiling: public(HashMap[address, uint256])
+debt_ceiling_residual: public(HashMap[address, uint256])
+
 
 @external
-@view
-def debt_ceiling(of: address) -> uint256:
-    return 0
+def set_debt_ceiling(_to: address, _debt_ceiling: uint256, _debt_ceiling_residual: uint256):
+    self.debt_ceiling[_to] = _debt_ceiling
+    self.debt_ceiling_residual[_to] = _debt_ceiling_residual
+
 
 @external
-@view
-def debt_ceiling_residual(of: address) -> uint256:
-    return 0
\ No newline at end of file
+def rug_debt_ceiling(_to: address):
+    self.debt_ceiling_residual[_to] = self.debt_ceiling[_to]
@@ -0,0 +1,32 @@
+# pragma version 0.4.3
+"""
+@notice Native bridge stand-in: Arbitrum gateway and Optimism standard bridge in one
+"""
+
+from ethereum.ercs import IERC20
+
+event Withdrawal:
+    token: indexed(address)
+    sender: indexed(address)
+    to: indexed(address)
+    amount: uint256
+
+token: public(IERC20)  # L2 token for Arbitrum-style withdrawals keyed by L1 address
+
+
+@external
+def set_token(_token: IERC20):
+    self.token = _token
+
+
+@external
+@payable
+def outboundTransfer(_l1_token: address, _to: address, _amount: uint256, _data: Bytes[1]):
+    assert extcall self.token.transferFrom(msg.sender, self, _amount, default_return_value=True)
+    log Withdrawal(token=_l1_token, sender=msg.sender, to=_to, amount=_amount)
+
+
+@external
+def bridgeERC20To(_localToken: address, _remoteToken: address, _to: address, _amount: uint256, _minGasLimit: uint32, _extraData: Bytes[1]):
+    assert extcall IERC20(_localToken).transferFrom(msg.sender, self, _amount, default_return_value=True)
+    log Withdrawal(token=_remoteToken, sender=msg.sender, to=_to, amount=_amount)
@@ -0,0 +1,28 @@
+# pragma version 0.4.3
+"""
+@notice crvUSD on L2 as seen by native bridgers: ERC20 exposing both
+    Arbitrum (l2Gateway, l1Address) and Optimism (BRIDGE, REMOTE_TOKEN) getters
+"""
+
+from snekmate.tokens import erc20
+from snekmate.auth import ownable
+
+initializes: ownable
+initializes: erc20[ownable := ownable]
+
+exports: erc20.__interface__
+
+l2Gateway: public(address)
+l1Address: public(address)
+BRIDGE: public(address)
+REMOTE_TOKEN: public(address)
+
+
+@deploy
+def __init__(_gateway: address, _remote_token: address):
+    ownable.__init__()
+    erc20.__init__("mock", "mock", 18, "mock", "mock")
+    self.l2Gateway = _gateway
+    self.BRIDGE = _gateway
+    self.l1Address = _remote_token
+    self.REMOTE_TOKEN = _remote_token
@@ -1,6 +1,105 @@
 # pragma version 0.4.3
 
+struct MessagingParams:
+    dstEid: uint32
+    receiver: bytes32
+    message: Bytes[1024]
+    options: Bytes[512]
+    payInLzToken: bool
+
+struct MessagingFee:
+    nativeFee: uint256
+    lzTokenFee: uint256
+
+struct Origin:
+    srcEid: uint32
+    sender: bytes32
+    nonce: uint64
+
+struct MessagingReceipt:
+    guid: bytes32
+    nonce: uint64
+    fee: MessagingFee
+
+struct SetConfigParam:
+    eid: uint32
+    configType: uint32
+    config: Bytes[1024]
+
+interface ILayerZeroReceiver:
+    def lzReceive(_origin: Origin, _guid: bytes32, _message: Bytes[1024], _executor: address, _extraData: Bytes[64]): payable
+
+event PacketSent:
+    sender: indexed(address)
+    dstEid: uint32
+    receiver: bytes32
+    guid: bytes32
+    nonce: uint64
+    message: Bytes[1024]
+
+event PacketDelivered:
+    receiver: indexed(address)
+    srcEid: uint32
+    guid: bytes32
+
+eid: public(uint32)
+native_fee: public(uint256)
+outbound_nonce: public(HashMap[address, HashMap[uint32, HashMap[bytes32, uint64]]])
+configs: public(HashMap[address, HashMap[uint32, HashMap[uint32, Bytes[1024]]]])  # oapp -> eid -> config type
+set_config_calls: public(uint256)
+
+
+@deploy
+def __init__():
+    self.native_fee = 10**15
+
 
 @external
 def setDelegate(_delegate: address):
     pass
+
+
+@external
+def setConfig(_oapp: address, _lib: address, _params: DynArray[SetConfigParam, 16]):
+    self.set_config_calls += 1
+    for param: SetConfigParam in _params:
+        self.configs[_oapp][param.eid][param.configType] = param.config
+
+
+@external
+def set_eid(_eid: uint32):
+    self.eid = _eid
+
+
+@external
+def set_native_fee(_native_fee: uint256):
+    self.native_fee = _native_fee
+
+
+@external
+@view
+def quote(_params: MessagingParams, _sender: address) -> MessagingFee:
+    return MessagingFee(nativeFee=self.native_fee, lzTokenFee=0)
+
+
+@external
+@payable
+def send(_params: MessagingParams, _refundAddress: address) -> MessagingReceipt:
+    native_fee: uint256 = self.native_fee
+    assert msg.value >= native_fee, "Insufficient fee"
+
+    nonce: uint64 = self.outbound_nonce[msg.sender][_params.dstEid][_params.receiver] + 1
+    self.outbound_nonce[msg.sender][_params.dstEid][_params.receiver] = nonce
+    guid: bytes32 = keccak256(abi_encode(nonce, msg.sender, _params.dstEid, _params.receiver))
+
+    if msg.value > native_fee:
+        send(_refundAddress, msg.value - native_fee)
+
+    log PacketSent(sender=msg.sender, dstEid=_params.dstEid, receiver=_params.receiver, guid=guid, nonce=nonce, message=_params.message)
+    return MessagingReceipt(guid=guid, nonce=nonce, fee=MessagingFee(nativeFee=native_fee, lzTokenFee=0))
+
+
+@external
+def deliver(_origin: Origin, _receiver: address, _guid: bytes32, _message: Bytes[1024]):
+    extcall ILayerZeroReceiver(_receiver).lzReceive(_origin, _guid, _message, msg.sender, b"")
+    log PacketDelivered(receiver=_receiver, srcEid=_origin.srcEid, guid=_guid)
@@ -0,0 +1,31 @@
+# pragma version 0.4.3
+
+fee: public(uint256)
+initiated: public(uint256)
+broken: public(bool)
+
+
+@external
+def set_fee(_fee: uint256):
+    self.fee = _fee
+
+
+@external
+def set_broken(_broken: bool):
+    self.broken = _broken
+
+
+@external
+@view
+def quote_message_fee() -> uint256:
+    return self.fee
+
+
+@external
+@payable
+def initiate_fast_bridge(
+    _to: address, _amount: uint256, _lz_fee_refund: address, _transfer_id: bytes32=empty(bytes32)
+):
+    assert not self.broken, "Broken"
+    assert msg.value >= self.fee, "Underfunded"
+    self.initiated += _amount
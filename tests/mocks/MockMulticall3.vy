@@ -0,0 +1,36 @@
+# pragma version 0.4.3
+
+"""
+@notice Multicall3 subset used by the fastbridge client: aggregate3 and getCurrentBlockTimestamp
+"""
+
+MAX_CALLS: constant(uint256) = 512
+MAX_SIZE: constant(uint256) = 256
+
+struct Call3:
+    target: address
+    allowFailure: bool
+    callData: Bytes[MAX_SIZE]
+
+struct Result:
+    success: bool
+    returnData: Bytes[MAX_SIZE]
+
+
+@external
+@payable
+def aggregate3(_calls: DynArray[Call3, MAX_CALLS]) -> DynArray[Result, MAX_CALLS]:
+    results: DynArray[Result, MAX_CALLS] = []
+    for call: Call3 in _calls:
+        success: bool = False
+        data: Bytes[MAX_SIZE] = b""
+        success, data = raw_call(call.target, call.callData, max_outsize=MAX_SIZE, revert_on_failure=False)
+        assert success or call.allowFailure, "Multicall3: call failed"
+        results.append(Result(success=success, returnData=data))
+    return results
+
+
+@external
+@view
+def getCurrentBlockTimestamp() -> uint256:
+    return block.timestamp
@@ -0,0 +1,183 @@
+"""
+Canned chain state behind a web3 provider, standing in for an RPC node in RPC budget tests.
+
+Contract calls are answered by Python handlers registered per address and function name, and
+counted by function in `calls`. Receipts, blocks and storage proofs are served from dicts.
+Requests and responses go through the JSON encoding of a real HTTP provider, so
+`rpc_metrics.instrument` measures exactly what it would in production. Every round trip sleeps
+`latency` seconds, nothing else depends on time.
+"""
+
+import json
+import time
+from collections import Counter
+from typing import Any, Callable, Dict, Tuple
+
+from eth_abi import decode, encode
+from eth_utils import event_abi_to_log_topic, function_abi_to_4byte_selector
+from eth_utils.abi import get_abi_input_types, get_abi_output_types
+from web3._utils.caching import handle_request_caching
+from web3.providers import JSONBaseProvider
+
+GAS = 150_000
+GWEI = 10**9
+
+
+class Revert(Exception):
+    """Raised by a handler to revert the call with `data`"""
+
+    def __init__(self, data: bytes = b""):
+        super().__init__(data.hex())
+        self.data = data
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+def event_log(address: str, event: dict, **args) -> dict:
+    """Raw log of `event` (an ABI entry) emitted by `address`, as in a receipt"""
+    topics = [event_abi_to_log_topic(event)]
+    types, values = [], []
+    for arg in event["inputs"]:
+        if arg["indexed"]:
+            topics.append(encode([arg["type"]], [args[arg["name"]]]))
+        else:
+            types.append(arg["type"])
+            values.append(args[arg["name"]])
+    return {
+        "address": address,
+        "topics": ["0x" + topic.hex() for topic in topics],
+        "data": "0x" + encode(types, values).hex(),
+    }
+
+
+class CannedChain(JSONBaseProvider):
+    def __init__(self, chain_id: int = 1, block_number: int = 1_000_000, latency: float = 0.0):
+        super().__init__()
+        self.chain_id = chain_id
+        self.block_number = block_number
+        self.latency = latency
+        self.base_fee = 10 * GWEI
+        self.handlers: Dict[Tuple[str, bytes], Tuple[dict, Callable]] = {}  # (address, selector) -> (abi, handler)
+        self.receipts: Dict[str, dict] = {}  # tx hash -> receipt fields
+        self.blocks: Dict[int, dict] = {}  # number -> block fields
+        self.proofs: Dict[Tuple[str, int], dict] = {}  # (address, block) -> eth_getProof result
+        self.calls = Counter()  # function name -> eth_call and eth_estimateGas requests
+
+    # Chain state
+
+    def on(self, address: str, abi: list, name: str, handler: Callable):
+        """Answer calls of function `name` of `address` with `handler(*args)`, a value or a tuple of outputs"""
+        entries = [entry for entry in abi if entry.get("type") == "function" and entry["name"] == name]
+        assert entries, f"{name} is not in the ABI"
+        for entry in entries:
+            self.handlers[(address.lower(), function_abi_to_4byte_selector(entry))] = (entry, handler)
+
+    def add_receipt(self, tx_hash: str, block_number: int, logs: list):
+        self.receipts[tx_hash.lower()] = {"blockNumber": block_number, "logs": logs}
+
+    def add_block(self, number: int, **fields):
+        self.blocks[number] = {"number": number, **fields}
+
+    # JSON-RPC
+
+    def _block(self, number: int) -> dict:
+        fields = self.blocks.get(number, {})
+        block = {
+            "number": _hex(number),
+            "hash": "0x" + number.to_bytes(32, "big").hex(),
+            "parentHash": "0x" + max(number - 1, 0).to_bytes(32, "big").hex(),
+            "stateRoot": "0x" + bytes(32).hex(),
+            "timestamp": _hex(1_700_000_000 + 12 * number),
+            "baseFeePerGas": _hex(self.base_fee),
+            "gasLimit": _hex(30_000_000),
+            "gasUsed": "0x0",
+            "transactions": [],
+        }
+        for key, value in fields.items():
+            block[key] = value if isinstance(value, str) else _hex(value) if isinstance(value, int) else value
+        return block
+
+    def _receipt(self, tx_hash: str) -> dict:
+        canned = self.receipts.get(tx_hash.lower())
+        if canned is None:
+            return None
+        block = self._block(canned["blockNumber"])
+        logs = [{
+            **log, "blockNumber": block["number"], "blockHash": block["hash"], "transactionHash": tx_hash,
+            "transactionIndex": "0x0", "logIndex": _hex(i), "removed": False,
+        } for i, log in enumerate(canned["logs"])]
+        return {
+            "transactionHash": tx_hash, "transactionIndex": "0x0", "blockNumber": block["number"],
+            "blockHash": block["hash"], "from": "0x" + "00" * 20, "to": None, "status": "0x1", "gasUsed": _hex(GAS),
+            "cumulativeGasUsed": _hex(GAS), "effectiveGasPrice": _hex(self.base_fee), "contractAddress": None,
+            "logs": logs, "logsBloom": "0x" + "00" * 256, "type": "0x2",
+        }
+
+    def _call(self, tx: dict) -> Tuple[dict, Any]:
+        data = bytes.fromhex(tx.get("data", tx.get("input", "0x"))[2:])
+        key = (tx["to"].lower(), data[:4])
+        if key not in self.handlers:
+            raise KeyError(f"No handler for {data[:4].hex()} of {tx['to']}")
+        entry, handler = self.handlers[key]
+        self.calls[entry["name"]] += 1
+        result = handler(*decode(get_abi_input_types(entry), data[4:]))
+        return entry, result
+
+    def _eth_call(self, tx: dict) -> str:
+        entry, result = self._call(tx)
+        types = get_abi_output_types(entry)
+        values = result if isinstance(result, tuple) and len(types) != 1 else (result,) if types else ()
+        return "0x" + encode(types, values).hex()
+
+    def _eth_estimateGas(self, tx: dict) -> str:
+        key = (tx["to"].lower(), bytes.fromhex(tx.get("data", "0x")[2:10]))
+        if key in self.handlers:
+            self._call(tx)  # Reverts like the call would
+        return _hex(GAS)
+
+    def _result(self, method: str, params: list) -> Any:
+        if method == "eth_chainId":
+            return _hex(self.chain_id)
+        if method == "eth_blockNumber":
+            return _hex(self.block_number)
+        if method == "eth_getBlockByNumber":
+            return self._block(self.block_number if params[0] in ("latest", "safe", "finalized") else int(params[0], 16))
+        if method == "eth_getBlockByHash":
+            return self._block(int(params[0], 16))
+        if method == "eth_getTransactionReceipt":
+            return self._receipt(params[0])
+        if method == "eth_getProof":
+            return self.proofs[(params[0].lower(), int(params[2], 16))]
+        if method == "eth_call":
+            return self._eth_call(params[0])
+        if method == "eth_estimateGas":
+            return self._eth_estimateGas(params[0])
+        if method == "eth_maxPriorityFeePerGas":
+            return _hex(GWEI)
+        if method == "eth_gasPrice":
+            return _hex(self.base_fee + GWEI)
+        if method == "eth_getLogs":
+            return []
+        raise NotImplementedError(method)
+
+    def _answer(self, request: dict) -> dict:
+        try:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": self._result(request["method"], request["params"])}
+        except Revert as e:
+            error = {"code": 3, "message": "execution reverted", "data": "0x" + e.data.hex()}
+        except (KeyError, NotImplementedError) as e:
+            error = {"code": -32601, "message": str(e)}
+        return {"jsonrpc": "2.0", "id": request["id"], "error": error}
+
+    @handle_request_caching
+    def make_request(self, method, params):
+        request = json.loads(self.encode_rpc_request(method, params))
+        time.sleep(self.latency)
+        return self.decode_rpc_response(json.dumps(self._answer(request)).encode())
+
+    def make_batch_request(self, requests):
+        batch = json.loads(self.encode_batch_rpc_request(requests))
+        time.sleep(self.latency)
+        return self.decode_rpc_response(json.dumps([self._answer(request) for request in batch]).encode())
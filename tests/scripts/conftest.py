@@ -0,0 +1,27 @@
+import pytest
+from devchain import DevChain
+from eth_account import Account
+from tx_sender import TxSender
+from web3 import Web3
+
+
+@pytest.fixture()
+def chain():
+    return DevChain()
+
+
+@pytest.fixture()
+def w3(chain):
+    return Web3(chain)
+
+
+@pytest.fixture(scope="session")
+def account():
+    return Account.from_key("0x" + "11" * 32)
+
+
+@pytest.fixture()
+def sender(w3, chain, account):
+    """Sender on the dev chain's clock, every wait for a receipt mines a block"""
+    return TxSender(w3, account, max_in_flight=4, stuck_after=30, clock=lambda: chain.time,
+                    sleep=lambda _: chain.mine())
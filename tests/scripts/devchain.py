@@ -0,0 +1,160 @@
+"""
+In-memory dev chain behind a web3 provider, standing in for anvil in script tests.
+
+Only what a transaction sender needs is modelled: a mempool keyed by (sender, nonce)
+with geth's replacement rules, manual block production that includes transactions
+whose max fee covers the base fee, fee history and receipts. Every RPC call is counted
+in `requests`.
+"""
+
+from collections import Counter, defaultdict
+
+from eth_account import Account
+from eth_account.typed_transactions import TypedTransaction
+from eth_utils import keccak
+from hexbytes import HexBytes
+from web3.providers import BaseProvider
+
+GWEI = 10**9
+
+
+class RPCFailure(Exception):
+    pass
+
+
+def _hex(value: int) -> str:
+    return hex(value)
+
+
+class DevChain(BaseProvider):
+    def __init__(self, chain_id: int = 1, base_fee: int = 10 * GWEI, block_time: int = 12):
+        super().__init__()
+        self.chain_id = chain_id
+        self.base_fee = base_fee
+        self.block_time = block_time
+        self.time = 0
+        self.blocks = [{"number": 0, "base_fee": base_fee, "tips": [], "txs": []}]
+        self.nonces = defaultdict(int)  # sender -> next nonce to be mined
+        self.pool = {}  # (sender, nonce) -> tx
+        self.receipts = {}
+        self.requests = Counter()
+
+    # Block production
+
+    def mine(self, blocks: int = 1):
+        for _ in range(blocks):
+            self.time += self.block_time
+            number = len(self.blocks)
+            included, tips = [], []
+            while True:
+                ready = [tx for (sender, nonce), tx in self.pool.items()
+                         if nonce == self.nonces[sender] and tx["maxFeePerGas"] >= self.base_fee]
+                if not ready:
+                    break
+                for tx in ready:
+                    del self.pool[(tx["from"], tx["nonce"])]
+                    self.nonces[tx["from"]] += 1
+                    tip = min(tx["maxPriorityFeePerGas"], tx["maxFeePerGas"] - self.base_fee)
+                    tips.append(tip)
+                    self.receipts[tx["hash"]] = {
+                        "transactionHash": tx["hash"],
+                        "transactionIndex": _hex(len(included)),
+                        "blockNumber": _hex(number),
+                        "blockHash": "0x" + number.to_bytes(32, "big").hex(),
+                        "from": tx["from"],
+                        "to": tx["to"],
+                        "status": "0x1",
+                        "gasUsed": _hex(21_000),
+                        "cumulativeGasUsed": _hex(21_000 * (len(included) + 1)),
+                        "effectiveGasPrice": _hex(self.base_fee + tip),
+                        "contractAddress": None,
+                        "logs": [],
+                        "type": "0x2",
+                    }
+                    included.append(tx["hash"])
+            self.blocks.append({"number": number, "base_fee": self.base_fee, "tips": tips, "txs": included})
+
+    def send_external(self, account, to: str, nonce: int, tip: int = GWEI):
+        """Transaction from outside of the code under test, e.g. another process sharing the key"""
+        signed = account.sign_transaction({
+            "to": to, "value": 0, "gas": 21_000, "nonce": nonce, "chainId": self.chain_id,
+            "maxFeePerGas": 2 * self.base_fee + tip, "maxPriorityFeePerGas": tip,
+        })
+        return self.eth_sendRawTransaction("0x" + signed.raw_transaction.hex())
+
+    # JSON-RPC
+
+    def make_request(self, method, params):
+        self.requests[method] += 1
+        handler = getattr(self, method, None)
+        if handler is None:
+            return {"jsonrpc": "2.0", "id": 0, "error": {"code": -32601, "message": f"{method} not supported"}}
+        try:
+            return {"jsonrpc": "2.0", "id": 0, "result": handler(*params)}
+        except RPCFailure as e:
+            return {"jsonrpc": "2.0", "id": 0, "error": {"code": -32000, "message": str(e)}}
+
+    def is_connected(self, show_traceback: bool = False) -> bool:
+        return True
+
+    def eth_chainId(self):
+        return _hex(self.chain_id)
+
+    def eth_blockNumber(self):
+        return _hex(len(self.blocks) - 1)
+
+    def eth_estimateGas(self, tx, *_):
+        return _hex(21_000)
+
+    def eth_getTransactionCount(self, address, block="latest"):
+        nonce = self.nonces[address.lower()]
+        if block == "pending":
+            while (address.lower(), nonce) in self.pool:
+                nonce += 1
+        return _hex(nonce)
+
+    def eth_feeHistory(self, block_count, newest_block, percentiles):
+        count = int(block_count, 16) if isinstance(block_count, str) else block_count
+        blocks = self.blocks[-count:]
+        rewards = []
+        for block in blocks:
+            tips = sorted(block["tips"])
+            rewards.append([
+                _hex(tips[min(len(tips) - 1, int(len(tips) * p / 100))] if tips else 0) for p in percentiles
+            ])
+        return {
+            "oldestBlock": _hex(blocks[0]["number"]),
+            "baseFeePerGas": [_hex(block["base_fee"]) for block in blocks] + [_hex(self.base_fee)],
+            "gasUsedRatio": [0.5] * len(blocks),
+            "reward": rewards,
+        }
+
+    def eth_sendRawTransaction(self, raw):
+        data = HexBytes(raw)
+        typed = TypedTransaction.from_bytes(data)
+        fields = typed.as_dict()
+        sender = Account.recover_transaction(data).lower()
+        tx = {
+            "hash": "0x" + keccak(data).hex(),
+            "from": sender,
+            "to": "0x" + bytes(fields["to"]).hex(),
+            "nonce": fields["nonce"],
+            "maxFeePerGas": fields["maxFeePerGas"],
+            "maxPriorityFeePerGas": fields["maxPriorityFeePerGas"],
+        }
+        if fields["chainId"] != self.chain_id:
+            raise RPCFailure("invalid chain id")
+        if tx["nonce"] < self.nonces[sender]:
+            raise RPCFailure("nonce too low")
+        old = self.pool.get((sender, tx["nonce"]))
+        if old is not None:
+            if old["hash"] == tx["hash"]:
+                raise RPCFailure("already known")
+            if (tx["maxFeePerGas"] * 10 < old["maxFeePerGas"] * 11
+                    or tx["maxPriorityFeePerGas"] * 10 < old["maxPriorityFeePerGas"] * 11):
+                raise RPCFailure("replacement transaction underpriced")
+        self.pool[(sender, tx["nonce"])] = tx
+        return tx["hash"]
+
+    def eth_getTransactionReceipt(self, tx_hash):
+        return self.receipts.get(tx_hash)
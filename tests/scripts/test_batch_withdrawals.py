@@ -0,0 +1,137 @@
+"""
+Batched withdrawal finalization (`scripts/batch_withdrawals.py`) against canned Arbitrum and L1 state.
+
+Sends `SENDS` withdrawals, the Outbox root covers the first `POSTED`. Every withdrawal is in
+a transaction of its own whose hash is its leaf.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+from cannedchain import GAS, CannedChain, Revert, event_log
+from eth_utils import keccak
+from web3 import Web3
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+sys.path[:0] = [str(SCRIPTS / "arb_proof"), str(SCRIPTS / "op_proof")]
+
+import arb_proof  # noqa: E402
+import batch_withdrawals  # noqa: E402
+from abi_registry import ABIS  # noqa: E402
+from batch_withdrawals import GAS_MARGIN, MAX_CALLS, Call  # noqa: E402
+from compile_cache import artifact  # noqa: E402
+from send_tree import SendTree  # noqa: E402
+
+SENDS = 45
+POSTED = 37
+SPENT = {5}
+EXECUTOR = "0x" + "ee" * 20  # Not checksummed, as given on the command line
+OUTBOX = "0x" + "0b" * 20
+
+
+def tx_hash(leaf: int) -> str:
+    return "0x" + leaf.to_bytes(32, "big").hex()
+
+
+class Arbitrum:
+    def __init__(self, monkeypatch):
+        self.l1, self.l2 = CannedChain(1), CannedChain(42161)
+        self.tree = SendTree(keccak(i.to_bytes(32, "big")) for i in range(SENDS))
+        self.reverting = set()  # Leaves whose executeTransaction reverts from now on
+
+        arbsys = ABIS.abi(SCRIPTS / "arb_proof/abis/ArbSys.json").entries
+        withdrawal, merkle_update = [entry for entry in arbsys if entry.get("name") in ("L2ToL1Tx", "SendMerkleUpdate")]
+        for leaf in range(SENDS):
+            self.l2.add_receipt(tx_hash(leaf), 100 + leaf, [
+                event_log(arb_proof.ARBSYS, withdrawal, caller="0x" + "c0" * 20, destination="0x" + "de" * 20,
+                          hash=int.from_bytes(self.tree.sends[leaf], "big"), position=leaf, arbBlockNum=100 + leaf,
+                          ethBlockNum=90, timestamp=1_700_000_000, callvalue=0, data=b"\x01" * 100),
+                event_log(arb_proof.ARBSYS, merkle_update, reserved=0, hash=self.tree.root(leaf + 1),
+                          position=POSTED if leaf < POSTED else SENDS),
+            ])
+
+        def construct_outbox_proof(size, leaf):
+            proof = self.tree.proof(size, leaf)
+            return proof["send"], proof["root"], proof["proof"]
+
+        def execute_transaction(proof, index, *args):
+            if index in self.reverting:
+                raise Revert()
+
+        self.l2.on(arb_proof.NODE_INTERFACE, ABIS.abi(SCRIPTS / "arb_proof/abis/NodeInterface.json").entries,
+                   "constructOutboxProof", construct_outbox_proof)
+        self.l1.on(arb_proof.ROLLUP_PROXY, ABIS.abi(SCRIPTS / "arb_proof/abis/Rollup_impl.json").entries, "outbox",
+                   lambda: OUTBOX)
+        outbox_abi = ABIS.abi(SCRIPTS / "arb_proof/abis/Outbox_impl.json").entries
+        self.l1.on(OUTBOX, outbox_abi, "roots",
+                   lambda root: b"\x01" * 32 if root == self.tree.root(POSTED) else bytes(32))
+        self.l1.on(OUTBOX, outbox_abi, "isSpent", lambda index: index in SPENT)
+        self.l1.on(OUTBOX, outbox_abi, "executeTransaction", execute_transaction)
+        self.w3_l1, self.w3_l2 = Web3(self.l1), Web3(self.l2)
+
+        # Proofs from NodeInterface, whatever is in the local send cache
+        monkeypatch.setattr(batch_withdrawals, "send_index", lambda w3: None)
+
+    def calls(self, leaves):
+        return batch_withdrawals.arbitrum_calls(self.w3_l1, [tx_hash(leaf) for leaf in leaves], self.w3_l2)
+
+
+@pytest.fixture()
+def arbitrum(monkeypatch):
+    return Arbitrum(monkeypatch)
+
+
+def leaf_of(w3: Web3, call: Call) -> int:
+    outbox = arb_proof.contract(w3, OUTBOX, "Outbox_impl")
+    return outbox.decode_function_input(call.data)[1]["index"]
+
+
+def test_only_ready_withdrawals(arbitrum, capsys):
+    calls = arbitrum.calls([0, 5, 12, 40])
+
+    # Spent and not posted yet are skipped
+    assert [leaf_of(arbitrum.w3_l1, call) for call in calls] == [0, 12]
+    assert all(Web3.to_checksum_address(call.target) == Web3.to_checksum_address(OUTBOX) for call in calls)
+    out = capsys.readouterr().out
+    assert f"Skipping {tx_hash(5)}: EXECUTED" in out
+    assert f"Skipping {tx_hash(40)}: NOT_POSTED" in out
+
+
+def test_failed_estimate_dropped(arbitrum):
+    calls = arbitrum.calls(range(4))
+    arbitrum.reverting.add(2)  # Executed by someone else since its status was checked
+
+    ready = batch_withdrawals.estimated(arbitrum.w3_l1, EXECUTOR, calls)
+    assert [leaf_of(arbitrum.w3_l1, call) for call in ready] == [0, 1, 3]
+    assert {call.gas for call in ready} == {int(GAS * GAS_MARGIN)}
+
+
+def test_batches(arbitrum):
+    leaves = [leaf for leaf in range(POSTED) if leaf not in SPENT]
+    ready = batch_withdrawals.estimated(arbitrum.w3_l1, EXECUTOR, arbitrum.calls(leaves))
+    batches = batch_withdrawals.split(ready)
+
+    assert [len(batch) for batch in batches] == [MAX_CALLS, MAX_CALLS, len(leaves) - 2 * MAX_CALLS]
+    assert [call for batch in batches for call in batch] == ready
+
+    tx = batch_withdrawals.build_batch(arbitrum.w3_l1, EXECUTOR, batches[0], "0x" + "11" * 20)
+    assert tx["gas"] == MAX_CALLS * (int(GAS * GAS_MARGIN) + 50_000) + 50_000
+    executor = batch_withdrawals.executor_contract(arbitrum.w3_l1, EXECUTOR)
+    _, args = executor.decode_function_input(tx["data"])
+    assert [Call(**call) for call in args["_calls"]] == \
+        [call._replace(target=Web3.to_checksum_address(call.target)) for call in batches[0]]
+    with pytest.raises(AssertionError):
+        batch_withdrawals.build_batch(arbitrum.w3_l1, EXECUTOR, ready[:MAX_CALLS + 1], "0x" + "11" * 20)
+
+
+def test_failed_calls_from_receipt(arbitrum):
+    executed = next(entry for entry in artifact("contracts/WithdrawalExecutor.vy")["abi"]
+                    if entry.get("name") == "Executed")
+    batch_hash = "0x" + "ba" * 32
+    arbitrum.l1.add_receipt(batch_hash, 200, [
+        event_log(EXECUTOR, executed, target=OUTBOX, index=index, success=index != 2) for index in range(4)
+    ])
+    receipt = arbitrum.w3_l1.eth.get_transaction_receipt(batch_hash)
+
+    assert batch_withdrawals.failed_calls(arbitrum.w3_l1, EXECUTOR, receipt) == [2]
@@ -0,0 +1,145 @@
+"""
+Dry run of the multi-chain rollout (`scripts/deploy_all.py`) on local boa environments.
+
+Every chain of the config gets a fresh `boa.Env` with the LayerZero endpoint and crvUSD
+mocked at their configured addresses in place of a fork. L2s still deploy in their own
+processes, so their results are checked through the state file and the L1 side.
+"""
+
+import json
+import sys
+
+import boa
+import pytest
+from web3 import Web3
+
+import deploy_all
+from compile_cache import load, load_partial
+from deploy_all import L1, ULN_CONFIG_TYPE, uln_config
+
+CRVUSD_L1 = "0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E"
+L2S = ("alpha", "beta")
+L2_STEPS = ["set_fast_bridge_l2", "set_peer", "set_delegate", "set_config", "set_min_amount", "set_limit",
+            "revoke_ownership"]
+
+
+class Chains:
+    """One local env per RPC of the config, `failing` RPCs raise when activated"""
+
+    def __init__(self, config: dict):
+        self.config = config
+        self.envs = {}
+        self.failing = set()
+
+    def chain_config(self, rpc: str) -> dict:
+        if rpc == self.config[L1]["rpc"]:
+            return self.config[L1]
+        return next(cfg for cfg in self.config["l2"].values() if cfg["rpc"] == rpc)
+
+    def set_env(self, rpc: str, simulation: bool):
+        if rpc in self.failing:
+            raise RuntimeError(f"{rpc} is down")
+        if rpc not in self.envs:
+            cfg = self.chain_config(rpc)
+            env = self.envs[rpc] = boa.Env()
+            env.eoa = deploy_all.SIMULATION_EOA
+            with boa.swap_env(env):
+                load("tests/mocks/MockLZEndpoint.vy", override_address=cfg["lz_endpoint"])
+                load("tests/mocks/MockERC20.vy", override_address=cfg.get("crvusd", CRVUSD_L1))
+        boa.set_env(self.envs[rpc])
+
+    def at(self, path: str, address: str):
+        with boa.swap_env(self.envs[self.config[L1]["rpc"]]):
+            return load_partial(path).at(address)
+
+
+@pytest.fixture()
+def config(tmp_path):
+    base = json.loads((deploy_all.SCRIPTS / "deploy_config.json").read_text())
+    fraxtal = base["l2"]["fraxtal"]
+    config = {
+        L1: {**base[L1], "rpc": "l1", "revoke_ownership": True},
+        "l2": {
+            name: {**fraxtal, "rpc": name, "eid": 40_000 + i, "crvusd": "0x" + f"{0xc0 + i:040x}",
+                   "revoke_ownership": True}
+            for i, name in enumerate(L2S)
+        },
+    }
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps(config))
+    return path
+
+
+@pytest.fixture()
+def chains(config, monkeypatch):
+    chains = Chains(json.loads(config.read_text()))
+    monkeypatch.setattr(deploy_all, "set_env", chains.set_env)
+    monkeypatch.setattr(deploy_all, "account_load", lambda name: None)
+    original = boa.env
+    yield chains
+    boa.set_env(original)
+
+
+def run(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["deploy_all.py", *args])
+    deploy_all.main()
+
+
+def l1_contracts(chains: Chains, state: dict):
+    messenger = chains.at("contracts/messengers/VaultMessengerLZ.vy", state[L1]["VaultMessengerLZ"])
+    endpoint = chains.at("tests/mocks/MockLZEndpoint.vy", chains.config[L1]["lz_endpoint"])
+    return messenger, endpoint
+
+
+def test_dry_run(config, chains, tmp_path, monkeypatch):
+    state_path = tmp_path / "state.json"
+    run(monkeypatch, "--simulate", "--config", str(config), "--state", str(state_path))
+    state = json.loads(state_path.read_text())
+
+    for chain in L2S:
+        assert state[chain]["done"] == L2_STEPS
+        assert {"L2MessengerLZ", "Bridger", "FastBridgeL2", "L2Lens"} <= state[chain].keys()
+    assert state[L1]["done"][:2] == ["set_vault", "set_delegate"]
+    assert {f"set_peer:{chain}" for chain in L2S} | {f"set_config:{chain}" for chain in L2S} <= set(state[L1]["done"])
+    assert state[L1]["done"][-1] == "revoke_ownership"
+
+    l1_cfg = chains.config[L1]
+    messenger, endpoint = l1_contracts(chains, state)
+    vault = chains.at("contracts/FastBridgeVault.vy", state[L1]["FastBridgeVault"])
+    assert messenger.vault() == vault.address
+    assert vault.hasRole(vault.MINTER_ROLE(), messenger)
+    for chain, cfg in chains.config["l2"].items():
+        assert messenger.peers(cfg["eid"]) == Web3.to_bytes(hexstr=state[chain]["L2MessengerLZ"]).rjust(32, b"\0")
+        assert endpoint.configs(messenger, cfg["eid"], ULN_CONFIG_TYPE) == uln_config(l1_cfg)
+    # DVN configs of every L2 in a single setConfig
+    assert endpoint.set_config_calls() == 1
+    assert messenger.owner() == l1_cfg["ownership_dao"]
+
+
+def test_resume(config, chains, tmp_path, monkeypatch, capsys):
+    state_path = tmp_path / "state.json"
+    chains.failing.add("beta")
+    run(monkeypatch, "--config", str(config), "--state", str(state_path))
+    state = json.loads(state_path.read_text())
+
+    assert "[beta] failed" in capsys.readouterr().out
+    assert "beta" not in state
+    assert state["alpha"]["done"] == L2_STEPS
+    # L1 keeps its ownership until every L2 is connected
+    assert "set_peer:alpha" in state[L1]["done"] and "revoke_ownership" not in state[L1]["done"]
+
+    chains.failing.clear()
+    run(monkeypatch, "--chains", "beta", "--config", str(config), "--state", str(state_path))
+    resumed = json.loads(state_path.read_text())
+
+    assert f"[{L1}] set_vault: already done" in capsys.readouterr().out
+    assert {name: resumed[L1][name] for name in state[L1] if name != "done"} == \
+        {name: address for name, address in state[L1].items() if name != "done"}
+    assert resumed["alpha"] == state["alpha"]
+    assert resumed["beta"]["done"] == L2_STEPS
+    assert resumed[L1]["done"][-1] == "revoke_ownership"
+
+    messenger, endpoint = l1_contracts(chains, resumed)
+    assert messenger.peers(chains.config["l2"]["beta"]["eid"]) != bytes(32)
+    # One setConfig per run, each with the L2s connected in it
+    assert endpoint.set_config_calls() == 2
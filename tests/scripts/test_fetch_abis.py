@@ -0,0 +1,123 @@
+"""
+ABI fetching (`scripts/fetch_abis.py`) against a mocked Etherscan v2 API.
+"""
+
+import json
+
+import pytest
+
+import fetch_abis
+from fetch_abis import AbiFetcher, Contract, save
+
+PROXY = "0x" + "0a" * 20
+IMPLEMENTATION = "0x" + "1b" * 20
+PLAIN = "0x" + "2c" * 20
+IMPLEMENTATION_ABI = [{"type": "function", "name": "upgraded", "inputs": [], "outputs": []}]
+PLAIN_ABI = [{"type": "event", "name": "Plain", "inputs": [], "anonymous": False}]
+
+
+class Response:
+    def __init__(self, data: dict):
+        self.data = data
+
+    def raise_for_status(self):
+        pass
+
+    def json(self) -> dict:
+        return self.data
+
+
+class Explorer:
+    """Etherscan's `getsourcecode` and `getabi`, `rate_limited` requests answered with the rate limit error"""
+
+    def __init__(self):
+        self.requests = []
+        self.rate_limited = 0
+
+    def get(self, url, params, timeout):
+        assert url == fetch_abis.API_URL and params["apikey"] == "key"
+        self.requests.append((params["chainid"], params["action"], params["address"]))
+        if self.rate_limited:
+            self.rate_limited -= 1
+            return Response({"status": "0", "message": "NOTOK", "result": "Max calls per sec rate limit reached (5/sec)"})
+
+        if params["action"] == "getsourcecode":
+            source = {
+                PROXY: {"Implementation": IMPLEMENTATION, "ABI": "[]"},
+                IMPLEMENTATION: {"Implementation": "", "ABI": json.dumps(IMPLEMENTATION_ABI)},
+                PLAIN: {"Implementation": "", "ABI": json.dumps(PLAIN_ABI)},
+            }.get(params["address"])
+            if source is None:
+                return Response({"status": "0", "message": "NOTOK", "result": "Invalid Address format"})
+            return Response({"status": "1", "result": [source]})
+        if params["address"] == IMPLEMENTATION:
+            return Response({"status": "1", "result": json.dumps(IMPLEMENTATION_ABI)})
+        return Response({"status": "0", "message": "NOTOK", "result": "Contract source code not verified"})
+
+
+@pytest.fixture()
+def explorer():
+    return Explorer()
+
+
+@pytest.fixture()
+def fetcher(explorer, tmp_path):
+    fetcher = AbiFetcher("key", rate=1000, cache_dir=tmp_path / "cache")
+    fetcher._session = explorer
+    return fetcher
+
+
+def test_proxy_cache_miss_and_hit(fetcher, explorer):
+    assert fetcher.fetch("mainnet", PROXY) == (IMPLEMENTATION, IMPLEMENTATION_ABI)
+    assert explorer.requests == [(1, "getsourcecode", PROXY), (1, "getabi", IMPLEMENTATION)]
+    cached = fetcher.cache_dir / f"1-{IMPLEMENTATION}.json"
+    assert json.loads(cached.read_text()) == IMPLEMENTATION_ABI
+
+    # The proxy is still resolved, its implementation's ABI comes from the cache
+    explorer.requests.clear()
+    assert fetcher.fetch("mainnet", PROXY) == (IMPLEMENTATION, IMPLEMENTATION_ABI)
+    assert explorer.requests == [(1, "getsourcecode", PROXY)]
+
+
+def test_cache_per_chain(fetcher, explorer):
+    fetcher.fetch("mainnet", PLAIN)
+    fetcher.fetch("arbitrum", PLAIN)
+    assert sorted(path.name for path in fetcher.cache_dir.iterdir()) == [f"1-{PLAIN}.json", f"42161-{PLAIN}.json"]
+
+
+def test_abi_from_source(fetcher, explorer):
+    # Not a proxy: the ABI returned with the source is used, no getabi request
+    assert fetcher.fetch("arbitrum", PLAIN) == (PLAIN, PLAIN_ABI)
+    assert explorer.requests == [(42161, "getsourcecode", PLAIN)]
+
+
+def test_rate_limit_retried(fetcher, explorer, monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(fetch_abis.time, "sleep", sleeps.append)
+    monkeypatch.setattr(fetcher.limiter, "wait", lambda: None)
+    explorer.rate_limited = 2
+    assert fetcher.fetch("mainnet", PLAIN) == (PLAIN, PLAIN_ABI)
+    assert sleeps == [1, 2]
+
+    sleeps.clear()
+    explorer.rate_limited = fetcher.retries
+    with pytest.raises(RuntimeError, match="rate limit"):
+        fetcher.fetch("mainnet", PLAIN)
+    assert sleeps == [1, 2]  # No wait after the last attempt
+
+
+def test_error_not_retried(fetcher, explorer):
+    with pytest.raises(RuntimeError, match=f"getsourcecode {'0x' + 'ff' * 20} on optimism: Invalid Address"):
+        fetcher.fetch("optimism", "0x" + "ff" * 20)
+    assert len(explorer.requests) == 1
+    assert not fetcher.cache_dir.exists()
+
+
+def test_save(tmp_path):
+    contract = Contract("mainnet", PLAIN, tmp_path / "abis" / "Plain.json")
+    assert save(contract, PLAIN_ABI)
+    assert json.loads(contract.output.read_text()) == PLAIN_ABI
+    # Same ABI with other key order and formatting is not rewritten
+    contract.output.write_text(json.dumps([dict(reversed(PLAIN_ABI[0].items()))]))
+    assert not save(contract, PLAIN_ABI)
+    assert save(contract, IMPLEMENTATION_ABI)
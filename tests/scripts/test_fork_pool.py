@@ -0,0 +1,149 @@
+"""
+Fork reuse and isolation in `scripts/fork_pool.py`, forking a canned RPC instead of a live one.
+"""
+
+import json
+
+import boa
+import pytest
+from boa.rpc import RPC
+
+import fork_pool
+from compile_cache import load
+from fork_pool import ForkPool
+
+CHAIN_IDS = {"l1": 1, "l2": 10}
+EOA = "0x71F718D3e4d1449D1502A6A7595eb84eBcCB1683"
+
+
+class FakeRPC(RPC):
+    """Empty chain at `heads[url]`, every account without code or balance"""
+
+    heads = {}
+    requests = []
+
+    def __init__(self, url: str):
+        self.url = url
+
+    @property
+    def identifier(self) -> str:
+        return self.url
+
+    @property
+    def name(self) -> str:
+        return self.url
+
+    def fetch(self, method, params):
+        self.requests.append((self.url, method))
+        if method == "eth_chainId":
+            return hex(CHAIN_IDS[self.url])
+        if method == "eth_blockNumber":
+            return hex(self.heads[self.url])
+        if method == "eth_getBlockByNumber":
+            number = params[0] if params[0].startswith("0x") else hex(self.heads[self.url])
+            return {
+                "number": number, "timestamp": hex(1_700_000_000), "baseFeePerGas": "0x1",
+                "gasLimit": hex(30_000_000), "difficulty": "0x0", "hash": "0x" + "00" * 32,
+                "parentHash": "0x" + "00" * 32, "mixHash": "0x" + "00" * 32, "miner": "0x" + "00" * 20,
+            }
+        if method in ("eth_getBalance", "eth_getTransactionCount"):
+            return "0x0"
+        if method == "eth_getCode":
+            return "0x"
+        if method == "eth_getStorageAt":
+            return "0x" + "00" * 32
+        raise NotImplementedError(method)
+
+    fetch_uncached = fetch
+
+    def fetch_multi(self, payloads):
+        return [self.fetch(method, params) for method, params in payloads]
+
+
+@pytest.fixture(autouse=True)
+def fake_rpc(monkeypatch):
+    monkeypatch.setattr(fork_pool, "EthereumRPC", FakeRPC)
+    monkeypatch.setattr(FakeRPC, "heads", {"l1": 100, "l2": 5000})
+    monkeypatch.setattr(FakeRPC, "requests", [])
+    with boa.swap_env(boa.env):  # Leave the global env as it was
+        yield
+
+
+def has_code(env: boa.Env, address) -> bool:
+    return len(env.evm.get_code(address)) > 0
+
+
+def test_fork_reused(tmp_path):
+    pool = ForkPool(cache_dir=tmp_path)
+    l1 = pool.fork("l1", eoa=EOA)
+    assert pool.fork("l1") is l1 and l1.eoa == EOA
+    forked = len(FakeRPC.requests)
+    assert pool.fork("l1") is l1
+    assert len(FakeRPC.requests) == forked  # Nothing fetched again
+
+    pool.activate(l1)
+    token = load("tests/mocks/MockERC20.vy")
+    token.mint(EOA, 10**18)
+
+    pool.activate(pool.fork("l2"))
+    assert boa.env is not l1
+    # Back on L1 everything deployed before the switch is still there
+    pool.activate(pool.fork("l1"))
+    assert boa.env is l1
+    assert token.balanceOf(EOA) == 10**18
+
+
+def test_forks_isolated(tmp_path):
+    pool = ForkPool(cache_dir=tmp_path)
+    l1, l2 = pool.fork("l1"), pool.fork("l2")
+    assert l1 is not l2
+
+    with pool.use(l1):
+        token = load("tests/mocks/MockERC20.vy")
+    assert has_code(l1, token.address)
+    assert not has_code(l2, token.address)
+
+    # Another pool forks the same chain from scratch, nothing is shared in memory
+    other = ForkPool(cache_dir=tmp_path).fork("l1")
+    assert other is not l1
+    assert not has_code(other, token.address)
+
+
+def test_network_separate_from_fork():
+    pool = ForkPool(cache_dir=None)
+    network = pool.network("l1")
+    assert pool.network("l1") is network
+    assert network is not pool.fork("l1") and isinstance(network, boa.NetworkEnv)
+
+
+def test_use_restores_env():
+    pool = ForkPool(cache_dir=None)
+    before = boa.env
+    with pool.use(pool.fork("l1")) as env:
+        assert boa.env is env
+        with pool.use(pool.fork("l2")):
+            assert boa.env is pool.fork("l2")
+        assert boa.env is env
+    assert boa.env is before
+
+
+def test_block_pinned_across_runs(tmp_path):
+    ForkPool(cache_dir=tmp_path).fork("l1")
+    pinned = json.loads((tmp_path / "blocks.json").read_text())
+    assert pinned["1"]["block"] == 100
+
+    # A later run within the TTL forks the same block, not the new head
+    FakeRPC.heads["l1"] = 110
+    assert ForkPool(cache_dir=tmp_path).fork("l1").evm.patch.block_number == 100
+    assert json.loads((tmp_path / "blocks.json").read_text()) == pinned
+    # Other chains are pinned on their own
+    assert ForkPool(cache_dir=tmp_path).fork("l2").evm.patch.block_number == 5000
+
+    assert ForkPool(cache_dir=tmp_path, block_ttl=0).fork("l1").evm.patch.block_number == 110
+    assert json.loads((tmp_path / "blocks.json").read_text())["1"]["block"] == 110
+
+
+def test_in_memory(tmp_path):
+    FakeRPC.heads["l1"] = 120
+    assert ForkPool(cache_dir=None).fork("l1").evm.patch.block_number == 120
+    assert not (tmp_path / "blocks.json").exists()
@@ -0,0 +1,168 @@
+"""
+Offline withdrawal proof checks (`scripts/op_proof/mpt.py`, `op_proof_utils.verify_withdrawal`).
+
+Storage tries are built with py-trie the way L2ToL1MessagePasser's is: keyed by the hash of
+the slot, values RLP encoded. Hashed keys never get deep enough for a leaf to be embedded in
+its parent, so that case uses a hand-built trie.
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+import rlp
+from eth_utils import keccak
+from trie import HexaryTrie
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+sys.path[:0] = [str(SCRIPTS / "arb_proof"), str(SCRIPTS / "op_proof")]
+
+from mpt import InvalidProof, complete_proof, output_root, verify_storage_proof  # noqa: E402
+from op_proof_utils import RootClaimMismatch, get_withdrawal_hash_storage_slot, verify_withdrawal  # noqa: E402
+
+
+def slot(i: int) -> bytes:
+    return i.to_bytes(32, "big")
+
+
+def storage_trie(values) -> HexaryTrie:
+    trie = HexaryTrie({})
+    for key, value in values.items():
+        trie[keccak(key)] = rlp.encode(value)
+    return trie
+
+
+def proof(trie: HexaryTrie, key: bytes) -> list:
+    return [rlp.encode(node) for node in trie.get_proof(keccak(key))]
+
+
+def hex_prefix(nibbles, leaf: bool) -> bytes:
+    flag = 2 * leaf + len(nibbles) % 2
+    nibbles = [flag] + ([] if len(nibbles) % 2 else [0]) + list(nibbles)
+    return bytes(16 * nibbles[i] + nibbles[i + 1] for i in range(0, len(nibbles), 2))
+
+
+def nibbles(key: bytes) -> list:
+    return [n for byte in keccak(key) for n in (byte >> 4, byte & 0x0F)]
+
+
+@pytest.fixture(scope="module")
+def trie():
+    return storage_trie({slot(i): i.to_bytes(2, "big") for i in range(1, 200)})
+
+
+def test_inclusion(trie):
+    for i in range(1, 200):
+        nodes = proof(trie, slot(i))
+        assert len(rlp.decode(nodes[0])) == 17  # Branch root
+        assert verify_storage_proof(trie.root_hash, slot(i), nodes) == i.to_bytes(2, "big")
+        # Hex strings as returned by eth_getProof
+        assert verify_storage_proof("0x" + trie.root_hash.hex(), "0x" + slot(i).hex(),
+                                    ["0x" + node.hex() for node in nodes]) == i.to_bytes(2, "big")
+
+
+def test_extension():
+    # Two keys sharing the first nibble: extension, branch, leaf
+    first = nibbles(slot(0))[0]
+    other = next(i for i in range(1, 1000) if nibbles(slot(i))[0] == first)
+    trie = storage_trie({slot(0): b"\x01", slot(other): b"\x02"})
+    nodes = proof(trie, slot(other))
+
+    assert [len(rlp.decode(node)) for node in nodes] == [2, 17, 2]
+    assert verify_storage_proof(trie.root_hash, slot(other), nodes) == b"\x02"
+    assert verify_storage_proof(trie.root_hash, slot(0), proof(trie, slot(0))) == b"\x01"
+
+
+def test_exclusion(trie):
+    for i in range(1000, 1050):
+        assert verify_storage_proof(trie.root_hash, slot(i), proof(trie, slot(i))) is None
+
+
+def test_exclusion_diverging_leaf():
+    # A lone leaf for another key proves the key is absent
+    trie = storage_trie({slot(1): b"\x01"})
+    assert verify_storage_proof(trie.root_hash, slot(2), proof(trie, slot(2))) is None
+
+
+def test_embedded_leaf():
+    # Extension over all but the last two nibbles, then a branch holding the leaf inline
+    path = nibbles(slot(7))
+    leaf = [hex_prefix(path[-1:], leaf=True), rlp.encode(b"\x01")]
+    assert len(rlp.encode(leaf)) < 32
+    branch = [b""] * 17
+    branch[path[-2]] = leaf
+    branch[(path[-2] + 1) % 16] = [hex_prefix([0], leaf=True), rlp.encode(b"\x02")]
+    extension = [hex_prefix(path[:-2], leaf=False), keccak(rlp.encode(branch))]
+    root = keccak(rlp.encode(extension))
+    nodes = ["0x" + rlp.encode(extension).hex(), "0x" + rlp.encode(branch).hex()]
+
+    assert verify_storage_proof(root, slot(7), nodes) == b"\x01"
+    # Optimism's MerkleTrie wants the embedded leaf repeated as its own element
+    completed = complete_proof(root, slot(7), nodes)
+    assert completed == [*nodes, "0x" + rlp.encode(leaf).hex()]
+    assert verify_storage_proof(root, slot(7), completed) == b"\x01"
+    assert complete_proof(root, slot(7), completed) == completed
+
+
+def test_complete_proof_hashed_leaf(trie):
+    nodes = ["0x" + node.hex() for node in proof(trie, slot(5))]
+    assert complete_proof(trie.root_hash, slot(5), nodes) == nodes
+
+
+def test_tampered(trie):
+    nodes = proof(trie, slot(5))
+
+    tampered = list(nodes)
+    tampered[1] = tampered[1][:-1] + bytes([tampered[1][-1] ^ 1])
+    with pytest.raises(InvalidProof, match="does not match the hash"):
+        verify_storage_proof(trie.root_hash, slot(5), tampered)
+    with pytest.raises(InvalidProof, match="Proof ends"):
+        verify_storage_proof(trie.root_hash, slot(5), nodes[:-1])
+    with pytest.raises(InvalidProof, match="unused nodes"):
+        verify_storage_proof(trie.root_hash, slot(5), nodes + [nodes[-1]])
+    with pytest.raises(InvalidProof, match="does not match the hash"):
+        verify_storage_proof(keccak(b"other root"), slot(5), nodes)
+
+    malformed = rlp.encode([b"\x01", b"\x02", b"\x03"])
+    with pytest.raises(InvalidProof, match="Malformed"):
+        verify_storage_proof(keccak(malformed), slot(5), [malformed])
+
+
+WITHDRAWAL_HASH = keccak(b"withdrawal")
+
+
+@pytest.fixture(scope="module")
+def message_passer():
+    """sentMessages of L2ToL1MessagePasser with the withdrawal among others"""
+    sent = {get_withdrawal_hash_storage_slot(keccak(i.to_bytes(4, "big"))): b"\x01" for i in range(50)}
+    sent[get_withdrawal_hash_storage_slot(WITHDRAWAL_HASH)] = b"\x01"
+    return storage_trie(sent)
+
+
+def output_root_proof(storage_root: bytes) -> dict:
+    return {
+        "version": "0x" + bytes(32).hex(),
+        "stateRoot": "0x" + keccak(b"state").hex(),
+        "messagePasserStorageRoot": "0x" + storage_root.hex(),
+        "latestBlockhash": "0x" + keccak(b"block").hex(),
+    }
+
+
+def test_verify_withdrawal(message_passer):
+    nodes = ["0x" + node.hex() for node in proof(message_passer, get_withdrawal_hash_storage_slot(WITHDRAWAL_HASH))]
+    output = output_root_proof(message_passer.root_hash)
+    claim = "0x" + output_root(output).hex()
+
+    verify_withdrawal(WITHDRAWAL_HASH, nodes, output, claim)
+    with pytest.raises(RootClaimMismatch):
+        verify_withdrawal(WITHDRAWAL_HASH, nodes, output, "0x" + keccak(b"other output").hex())
+
+
+def test_verify_withdrawal_not_sent(message_passer):
+    missing = keccak(b"never sent")
+    nodes = ["0x" + node.hex() for node in proof(message_passer, get_withdrawal_hash_storage_slot(missing))]
+    output = output_root_proof(message_passer.root_hash)
+
+    with pytest.raises(InvalidProof, match="not in L2ToL1MessagePasser") as e:
+        verify_withdrawal(missing, nodes, output, "0x" + output_root(output).hex())
+    assert not isinstance(e.value, RootClaimMismatch)
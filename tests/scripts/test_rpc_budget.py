@@ -0,0 +1,271 @@
+"""
+RPC call budgets of the withdrawal tooling, run against canned chain state.
+
+Each test runs one status check, proof build or game search and fails when it makes more
+requests of a JSON-RPC method (or calls of a contract function) than budgeted, or takes longer
+than its budgeted round trips plus `LOCAL_SECONDS` of local work. Lower a budget when a change
+saves calls, raise it only on purpose.
+"""
+
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict
+
+import pytest
+import rlp
+from cannedchain import CannedChain, Revert, event_log
+from eth_abi import encode
+from eth_utils import function_abi_to_4byte_selector, keccak
+from rpc_metrics import RpcMetrics, instrument
+from web3 import Web3
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+sys.path[:0] = [str(SCRIPTS / "arb_proof"), str(SCRIPTS / "op_proof")]
+
+import arb_proof  # noqa: E402
+import op_proof  # noqa: E402
+import op_proof_utils  # noqa: E402
+from abi_registry import ABIS  # noqa: E402
+from mpt import output_root  # noqa: E402
+from send_tree import SendTree  # noqa: E402
+
+LATENCY = 0.005  # Seconds per round trip
+LOCAL_SECONDS = 1.0  # Allowed for everything but round trips, far above what any of these take
+TX_HASH = "0x" + "ab" * 32
+ZERO_ADDRESS = "0x" + "00" * 20
+
+
+def connect(chain: CannedChain) -> Web3:
+    return instrument(Web3(chain), RpcMetrics())
+
+
+def calls(n: int) -> Dict[str, int]:
+    """Budget of `n` contract calls, web3's validation requests the chain id twice for each"""
+    return {"eth_call": n, "eth_chainId": 2 * n}
+
+
+@contextmanager
+def rpc_budget(budgets: Dict[Web3, Dict[str, int]]):
+    """Fail if the block makes more requests per JSON-RPC method than budgeted on any chain, or is too slow"""
+    for w3 in budgets:
+        w3.provider._rpc_metrics.reset()
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+
+    round_trips = 0
+    for w3, budget in budgets.items():
+        metrics = w3.provider._rpc_metrics
+        used = {method: metrics.calls(method) for method in metrics.methods}
+        over = {method: calls for method, calls in used.items() if calls > budget.get(method, 0)}
+        assert not over, f"Chain {w3.provider.chain_id}: {used} is over the budget {budget}"
+        round_trips += sum(budget.values())
+    assert elapsed < round_trips * LATENCY + LOCAL_SECONDS
+
+
+# Arbitrum
+
+SENDS = 37
+LEAF = 29
+
+
+@pytest.fixture()
+def arbitrum():
+    """Withdrawal `LEAF` of `SENDS` sends, its root posted to the Outbox and not executed"""
+    l1, l2 = CannedChain(1, latency=LATENCY), CannedChain(42161, latency=LATENCY)
+    tree = SendTree(keccak(i.to_bytes(32, "big")) for i in range(SENDS))
+    outbox = "0x" + "0b" * 20
+    arbsys = ABIS.abi(SCRIPTS / "arb_proof/abis/ArbSys.json").entries
+    withdrawal, merkle_update = [entry for entry in arbsys if entry.get("name") in ("L2ToL1Tx", "SendMerkleUpdate")]
+    l2.add_receipt(TX_HASH, 100, [
+        event_log(arb_proof.ARBSYS, withdrawal, caller="0x" + "c0" * 20, destination="0x" + "de" * 20,
+                  hash=int.from_bytes(tree.sends[LEAF], "big"), position=LEAF, arbBlockNum=100, ethBlockNum=90,
+                  timestamp=1_700_000_000, callvalue=0, data=b"\x01" * 100),
+        event_log(arb_proof.ARBSYS, merkle_update, reserved=0, hash=tree.root(SENDS), position=SENDS),
+    ])
+
+    def construct_outbox_proof(size, leaf):
+        proof = tree.proof(size, leaf)
+        return proof["send"], proof["root"], proof["proof"]
+
+    l2.on(arb_proof.NODE_INTERFACE, ABIS.abi(SCRIPTS / "arb_proof/abis/NodeInterface.json").entries,
+          "constructOutboxProof", construct_outbox_proof)
+    l1.on(arb_proof.ROLLUP_PROXY, ABIS.abi(SCRIPTS / "arb_proof/abis/Rollup_impl.json").entries, "outbox",
+          lambda: outbox)
+    outbox_abi = ABIS.abi(SCRIPTS / "arb_proof/abis/Outbox_impl.json").entries
+    l1.on(outbox, outbox_abi, "roots", lambda root: b"\x01" * 32 if root == tree.root(SENDS) else bytes(32))
+    l1.on(outbox, outbox_abi, "isSpent", lambda index: False)
+    return connect(l1), connect(l2)
+
+
+def test_arbitrum_check_status(arbitrum):
+    w3_l1, w3_l2 = arbitrum
+    # The gas estimate is validated like a call
+    with rpc_budget({w3_l1: {**calls(3), "eth_chainId": 8, "eth_estimateGas": 1},
+                     w3_l2: {**calls(1), "eth_getTransactionReceipt": 1}}):
+        data = arb_proof.check_status(w3_l1, w3_l2, TX_HASH)
+    assert data["status"] == "READY"
+
+
+def test_arbitrum_execute_transaction(arbitrum):
+    w3_l1, w3_l2 = arbitrum
+    data = arb_proof.check_status(w3_l1, w3_l2, TX_HASH)
+    with rpc_budget({w3_l1: {"eth_maxPriorityFeePerGas": 1, "eth_getBlockByNumber": 1}}):
+        tx = arb_proof.build_execute_transaction(w3_l1, data, "0x" + "11" * 20)
+    assert tx["to"].lower() == "0x" + "0b" * 20
+
+
+# Optimism
+
+GAMES = 400
+BLOCKS_PER_GAME = 1800
+WITHDRAWAL_HASH = keccak(b"withdrawal")
+
+
+def game_block(index: int) -> int:
+    return (index + 1) * BLOCKS_PER_GAME
+
+
+def storage_trie():
+    """Storage root and proof of a L2ToL1MessagePasser trie holding only `sentMessages[WITHDRAWAL_HASH]`"""
+    slot = op_proof_utils.get_withdrawal_hash_storage_slot(WITHDRAWAL_HASH)
+    leaf = rlp.encode([b"\x20" + keccak(slot), rlp.encode(b"\x01")])
+    return keccak(leaf), ["0x" + leaf.hex()]
+
+
+class Optimism:
+    """Dispute games every BLOCKS_PER_GAME L2 blocks, all proper and respected, and an unproven withdrawal"""
+
+    def __init__(self):
+        self.l1, self.l2 = CannedChain(1, latency=LATENCY), CannedChain(10, latency=LATENCY)
+        self.storage_root, self.proof = storage_trie()
+        self.finalized = False
+        self.proven = None  # (proof submitter, timestamp, checkWithdrawal error) once proven
+
+        abi = {name: ABIS.abi(op_proof_utils.ABI_PATH / f"{name}.json").entries
+               for name in ("L1Portal", "L1DisputeGameFactory", "L1AnchorStateRegistry", "L2MessagePasser")}
+        self.errors = {entry["name"]: function_abi_to_4byte_selector(entry)
+                       for entry in abi["L1Portal"] if entry.get("type") == "error"}
+        portal, factory, registry = (op_proof_utils.PORTAL, op_proof_utils.DISPUTE_GAME_FACTORY,
+                                     op_proof_utils.ANCHOR_STATE_REGISTRY)
+        self.l1.on(portal, abi["L1Portal"], "respectedGameType", lambda: 0)
+        self.l1.on(portal, abi["L1Portal"], "finalizedWithdrawals", lambda _: self.finalized)
+        self.l1.on(portal, abi["L1Portal"], "numProofSubmitters", lambda _: int(self.proven is not None))
+        self.l1.on(portal, abi["L1Portal"], "proofSubmitters", lambda _, i: self.proven[0])
+        self.l1.on(portal, abi["L1Portal"], "provenWithdrawals",
+                   lambda _, submitter: ("0x" + "9a" * 20, self.proven[1]) if self.proven else (ZERO_ADDRESS, 0))
+        self.l1.on(portal, abi["L1Portal"], "checkWithdrawal", self.check_withdrawal)
+        self.l1.on(factory, abi["L1DisputeGameFactory"], "gameCount", lambda: GAMES)
+        self.l1.on(factory, abi["L1DisputeGameFactory"], "findLatestGames", self.find_latest_games)
+        self.l1.on(factory, abi["L1DisputeGameFactory"], "gameAtIndex",
+                   lambda i: (0, 1_700_000_000 + i, "0x" + (i + 1).to_bytes(20, "big").hex()))
+        for name, value in (("retirementTimestamp", 0), ("isGameProper", True), ("isGameRespected", True),
+                            ("isGameFinalized", True)):
+            self.l1.on(registry, abi["L1AnchorStateRegistry"], name, lambda *_, value=value: value)
+
+        passed = next(entry for entry in abi["L2MessagePasser"] if entry.get("name") == "MessagePassed")
+        self.l2.add_receipt(TX_HASH, self.withdrawal_block, [event_log(
+            op_proof_utils.L2_MESSAGE_PASSER, passed, nonce=7, sender="0x" + "5e" * 20, target="0x" + "7a" * 20,
+            value=0, gasLimit=200_000, data=b"\x02" * 68, withdrawalHash=WITHDRAWAL_HASH,
+        )])
+        for index in range(GAMES):
+            self.l2.proofs[(op_proof_utils.L2_MESSAGE_PASSER.lower(), game_block(index))] = {
+                "storageHash": "0x" + self.storage_root.hex(),
+                "storageProof": [{"proof": self.proof}],
+            }
+        self.w3_l1, self.w3_l2 = connect(self.l1), connect(self.l2)
+        self.contracts = op_proof_utils.load_contracts(self.w3_l1, self.w3_l2)
+
+    withdrawal_block = game_block(GAMES - 3) - 1  # Covered by the 3 latest games
+
+    def root_claim(self, index: int) -> bytes:
+        block = self.l2._block(game_block(index))
+        return output_root({"version": op_proof_utils.ZERO_VERSION, "stateRoot": block["stateRoot"],
+                            "messagePasserStorageRoot": "0x" + self.storage_root.hex(),
+                            "latestBlockhash": block["hash"]})
+
+    def find_latest_games(self, game_type, start, n):
+        return [(i, bytes(32), 1_700_000_000 + i, self.root_claim(i), encode(["uint256"], [game_block(i)]))
+                for i in range(start, max(start - n, -1), -1)]
+
+    def check_withdrawal(self, withdrawal_hash, submitter):
+        if self.proven[2] is not None:
+            raise Revert(self.errors[self.proven[2]])
+
+    def find_game(self, block: int):
+        return op_proof_utils.find_corresponding_game(self.contracts["dispute_game_factory"], self.contracts["portal"],
+                                                      self.contracts["anchor_state_registry"], block)
+
+    def status(self) -> str:
+        return op_proof_utils.get_withdrawal_status(self.contracts["portal"], self.contracts["anchor_state_registry"],
+                                                    WITHDRAWAL_HASH)
+
+
+@pytest.fixture()
+def optimism():
+    return Optimism()
+
+
+@pytest.mark.parametrize("games_back,batches", [(3, 1), (150, 2), (399, 4)])
+def test_optimism_find_game(optimism, games_back, batches):
+    block = game_block(GAMES - games_back) - 1
+    # respectedGameType, gameCount and retirementTimestamp, a batch of 100 games per findLatestGames, then
+    # gameAtIndex, isGameProper and isGameRespected of the game found
+    with rpc_budget({optimism.w3_l1: calls(6 + batches)}):
+        analysis = optimism.find_game(block)
+    assert analysis["game"]["l2BlockNumber"] == game_block(GAMES - games_back)
+    assert optimism.l1.calls["findLatestGames"] == batches
+
+
+def test_optimism_find_game_skips_invalid(optimism):
+    invalid = "0x" + (GAMES - 3 + 1).to_bytes(20, "big").hex()  # Proxy of the game closest to the block
+    registry = optimism.contracts["anchor_state_registry"].abi
+    optimism.l1.on(op_proof_utils.ANCHOR_STATE_REGISTRY, registry, "isGameProper", lambda proxy: proxy != invalid)
+
+    # Both games are validated
+    with rpc_budget({optimism.w3_l1: calls(4 + 2 * 3)}):
+        analysis = optimism.find_game(optimism.withdrawal_block)
+    assert analysis["game"]["index"] == GAMES - 2
+
+
+def test_optimism_find_game_waiting(optimism):
+    with rpc_budget({optimism.w3_l1: calls(4)}):
+        analysis = optimism.find_game(game_block(GAMES - 1) + 1)
+    assert not analysis["can_prove"]
+
+
+def test_optimism_prove(optimism):
+    # Game search in the latest batch, then the chain id of the gas estimate and of the transaction
+    budget = {
+        optimism.w3_l1: {**calls(7), "eth_chainId": 17, "eth_maxPriorityFeePerGas": 1, "eth_getBlockByNumber": 1,
+                         "eth_estimateGas": 1},
+        optimism.w3_l2: {"eth_getTransactionReceipt": 1, "eth_getProof": 1, "eth_getBlockByNumber": 1},
+    }
+    with rpc_budget(budget):
+        result = op_proof.prove(optimism.w3_l1, optimism.w3_l2, TX_HASH, "0x" + "11" * 20)
+    assert result["status"] == "ready-to-prove" and result["gas"] is not None
+
+
+@pytest.mark.parametrize("state,status,n", [
+    ("finalized", "finalized", 1),
+    ("unproven", "ready-to-prove", 2),
+    ("young", "waiting-to-finalize", 5),
+    ("mature", "ready-to-finalize", 5),
+    ("invalid", "waiting-to-finalize", 8),
+])
+def test_optimism_withdrawal_status(optimism, state, status, n):
+    submitter = "0x" + "11" * 20
+    optimism.finalized = state == "finalized"
+    optimism.proven = {
+        "young": (submitter, 1_700_000_000, "OptimismPortal_ProofNotOldEnough"),
+        "mature": (submitter, 1_700_000_000, None),
+        "invalid": (submitter, 1_700_000_000, "OptimismPortal_InvalidRootClaim"),
+    }.get(state)
+    if state == "invalid":
+        registry = optimism.contracts["anchor_state_registry"].abi
+        optimism.l1.on(op_proof_utils.ANCHOR_STATE_REGISTRY, registry, "isGameFinalized", lambda _: False)
+
+    with rpc_budget({optimism.w3_l1: calls(n)}):
+        assert optimism.status() == status
@@ -0,0 +1,131 @@
+import json
+
+import pytest
+from rpc_metrics import RpcMetrics, instrument, instrument_rpc
+from web3 import Web3
+from web3._utils.caching import handle_request_caching
+from web3.exceptions import Web3RPCError
+from web3.providers import JSONBaseProvider
+
+BLOCK = {"number": "0x10", "hash": "0x" + "ab" * 32, "timestamp": "0x1"}
+
+
+class JSONChain(JSONBaseProvider):
+    """Answers from a fixed table through the JSON encoding of a real transport"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.results = {"eth_chainId": "0x1", "eth_blockNumber": "0x10", "eth_getBlockByNumber": BLOCK}
+
+    def _answer(self, request):
+        if request["method"] not in self.results:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32601, "message": "not found"}}
+        return {"jsonrpc": "2.0", "id": request["id"], "result": self.results[request["method"]]}
+
+    @handle_request_caching
+    def make_request(self, method, params):
+        request = json.loads(self.encode_rpc_request(method, params))
+        return self.decode_rpc_response(json.dumps(self._answer(request)).encode())
+
+    def make_batch_request(self, requests):
+        batch = json.loads(self.encode_batch_rpc_request(requests))
+        return self.decode_rpc_response(json.dumps([self._answer(r) for r in batch]).encode())
+
+
+def read_block(w3):
+    return w3.eth.get_block(16)
+
+
+def test_disabled_is_untouched():
+    w3 = Web3(JSONChain())
+    make_request = w3.provider.make_request
+    assert instrument(w3, RpcMetrics(enabled=False)) is w3
+    assert w3.provider.make_request == make_request
+
+
+def test_counts_callers_and_bytes():
+    metrics = RpcMetrics()
+    w3 = instrument(Web3(JSONChain()), metrics)
+
+    w3.eth.block_number
+    read_block(w3)
+    read_block(w3)
+    with pytest.raises(Web3RPCError):
+        w3.eth.get_balance("0x" + "11" * 20)
+
+    report = metrics.report()
+    assert report["callers"][f"{__name__}.read_block"] == {"eth_getBlockByNumber": 2}
+    assert metrics.calls("eth_getBlockByNumber") == 2
+    block = report["methods"]["eth_getBlockByNumber"]
+    assert block["bytes_received"] > 2 * len(json.dumps(BLOCK))
+    assert block["latency_le"]["+Inf"] == 2
+    assert report["methods"]["eth_getBalance"]["errors"] == 1
+    assert report["round_trips"] == report["calls"]  # No cache
+
+
+def test_cache_hits():
+    metrics = RpcMetrics()
+    w3 = instrument(Web3(JSONChain(cache_allowed_requests=True)), metrics)
+
+    w3.eth.chain_id
+    round_trips = metrics.round_trips
+    for _ in range(3):
+        w3.eth.chain_id  # Always cached
+
+    stats = metrics.methods["eth_chainId"]
+    assert metrics.round_trips == round_trips == stats.calls - stats.cache_hits
+    assert stats.cache_hits >= 3
+    assert metrics.report()["cache_hit_rate"] == pytest.approx(stats.cache_hits / stats.calls)
+
+
+def test_batch():
+    metrics = RpcMetrics()
+    w3 = instrument(Web3(JSONChain()), metrics)
+
+    with w3.batch_requests() as batch:
+        batch.add(w3.eth.get_block(16))
+        batch.add(w3.eth.get_block(16))
+        batch.add(w3.eth.get_block(16))
+        batch.execute()
+
+    report = metrics.report()
+    assert (report["round_trips"], report["batches"], report["calls_per_batch"]) == (1, 1, 3)
+    assert report["methods"]["eth_getBlockByNumber"]["batched"] == 3
+
+
+def test_boa_rpc():
+    class RPC:
+        def fetch(self, method, params):
+            if method == "eth_fail":
+                raise RuntimeError(method)
+            return "0x10"
+
+        def fetch_multi(self, payloads):
+            return ["0x10" for _ in payloads]
+
+    metrics = RpcMetrics()
+    rpc = instrument_rpc(RPC(), metrics)
+    rpc.fetch("eth_blockNumber", [])
+    rpc.fetch_multi([("eth_getBalance", ["0x00", "latest"])] * 4)
+    with pytest.raises(RuntimeError):
+        rpc.fetch("eth_fail", [])
+
+    assert (metrics.calls(), metrics.round_trips, metrics.batches) == (6, 3, 1)
+    assert metrics.methods["eth_fail"].errors == 1
+    assert metrics.methods["eth_getBalance"].bytes_received == 4 * len('"0x10"')
+
+
+def test_exports(tmp_path):
+    metrics = RpcMetrics()
+    w3 = instrument(Web3(JSONChain()), metrics)
+    read_block(w3)
+
+    text = metrics.prometheus()
+    assert f'fastbridge_rpc_requests_total{{method="eth_getBlockByNumber",caller="{__name__}.read_block"}} 1' in text
+    assert 'fastbridge_rpc_request_duration_seconds_bucket{method="eth_getBlockByNumber",le="+Inf"} 1' in text
+    assert "# TYPE fastbridge_rpc_request_duration_seconds histogram" in text
+
+    metrics.dump(str(tmp_path / "rpc.json"))
+    metrics.dump(str(tmp_path / "rpc.prom"))
+    assert json.loads((tmp_path / "rpc.json").read_text())["calls"] == 1
+    assert (tmp_path / "rpc.prom").read_text() == text
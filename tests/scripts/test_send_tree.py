@@ -0,0 +1,145 @@
+"""
+Local Arbitrum outbox proofs (`scripts/arb_proof/send_tree.py`).
+
+Roots are checked against a port of Nitro's merkleAccumulator and proofs against the Outbox's
+root calculation for every (size, leaf) up to `SENDS`. With DRPC_API_KEY set, the proof
+NodeInterface builds for the latest posted root is checked the same way.
+"""
+
+import os
+import sys
+from functools import partial
+from pathlib import Path
+
+import pytest
+from cannedchain import CannedChain
+from eth_utils import keccak
+from web3 import Web3
+
+SCRIPTS = Path(__file__).parent.parent.parent / "scripts"
+sys.path[:0] = [str(SCRIPTS / "arb_proof"), str(SCRIPTS / "op_proof")]
+
+import arb_proof  # noqa: E402
+from send_tree import GROW_CHUNK_AFTER, SendIndex, SendTree, calculate_root, latest_send_root  # noqa: E402
+
+SENDS = 64
+
+
+def nitro_root(sends) -> bytes:
+    """Root of arbos/merkleAccumulator: partials appended level by level, Root() pads them with zero hashes"""
+    partials = []
+    for send in sends:
+        node, level = keccak(send), 0
+        while level < len(partials) and partials[level] is not None:
+            node = keccak(partials[level] + node)
+            partials[level] = None
+            level += 1
+        if level == len(partials):
+            partials.append(None)
+        partials[level] = node
+
+    root, capacity_in_root = None, 0
+    for level, partial in enumerate(partials):
+        if partial is None:
+            continue
+        if root is None:
+            root, capacity_in_root = partial, 1 << level
+            continue
+        while capacity_in_root < 1 << level:
+            root = keccak(root + bytes(32))
+            capacity_in_root *= 2
+        root, capacity_in_root = keccak(partial + root), 2 << level
+    return root
+
+
+@pytest.fixture(scope="module")
+def sends():
+    return [keccak(i.to_bytes(32, "big")) for i in range(SENDS)]
+
+
+def test_root_matches_nitro(sends):
+    tree = SendTree(sends)
+    for size in range(1, SENDS + 1):
+        assert tree.root(size) == nitro_root(sends[:size]), size
+
+
+def test_every_proof_verifies(sends):
+    tree = SendTree(sends)
+    for size in range(1, SENDS + 1):
+        root = tree.root(size)
+        proofs = tree.proofs(size, range(size))
+        for leaf, proof in enumerate(proofs):
+            assert proof["root"] == root
+            assert len(proof["proof"]) == SendTree.depth(size)
+            assert calculate_root(proof["proof"], leaf, proof["send"]) == root, (size, leaf)
+            assert tree.proof(size, leaf) == proof
+
+
+def test_proof_bounds(sends):
+    tree = SendTree(sends[:5])
+    with pytest.raises(ValueError):
+        tree.proof(5, 5)
+    with pytest.raises(ValueError):
+        tree.root(6)
+
+
+@pytest.mark.skipif(not os.getenv("DRPC_API_KEY"), reason="DRPC_API_KEY is not set")
+def test_nitro_outbox_proof():
+    # Latest root posted to the Outbox and NodeInterface proofs against it
+    w3_l1, w3_l2 = arb_proof.get_providers()
+    outbox = arb_proof.contract(w3_l1, arb_proof.ROLLUP_PROXY, "Rollup_impl").functions.outbox().call()
+    root, size = latest_send_root(w3_l1, w3_l2, outbox)
+    node = arb_proof.contract(w3_l2, arb_proof.NODE_INTERFACE, "NodeInterface")
+    for leaf in (0, size // 3, size - 1):
+        send, node_root, proof = node.functions.constructOutboxProof(size, leaf).call()
+        assert node_root == root
+        assert len(proof) == SendTree.depth(size)
+        assert calculate_root(proof, leaf, send) == root
+
+
+class DenseIndex(SendIndex):
+    """Index whose RPC refuses log ranges wider than `limit` blocks below `dense_until`"""
+
+    def __init__(self, *args, limit: int, dense_until: int, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.limit, self.dense_until = limit, dense_until
+        self.ranges = []  # (from, to, ok) of every request
+
+    def _get_logs(self, from_block: int, to_block: int) -> list:
+        ok = to_block - from_block + 1 <= self.limit or from_block >= self.dense_until
+        self.ranges.append((from_block, to_block, ok))
+        if not ok:
+            raise ValueError("query returned more than 10000 results")
+        return []
+
+
+def test_sync_keeps_shrunk_chunk(tmp_path):
+    w3 = Web3(CannedChain(chain_id=42161))
+    index = DenseIndex(w3, tmp_path, start_block=0, chunk=64, limit=16, dense_until=512)
+    index.sync(to_block=1023)
+
+    scanned = [(start, end) for start, end, ok in index.ranges if ok]
+    assert [start for start, _ in scanned] == [0] + [end + 1 for _, end in scanned[:-1]]
+    assert scanned[-1][1] == 1023
+    # A failed wide range is retried only after GROW_CHUNK_AFTER ranges, not after every one
+    failed = len(index.ranges) - len(scanned)
+    dense = [start for start, _ in scanned if start < 512]
+    assert failed <= 2 + len(dense) // GROW_CHUNK_AFTER
+    # Back to the full chunk after the dense blocks
+    assert scanned[-1][1] - scanned[-1][0] + 1 == 64
+    assert index.next_block == 1024
+
+
+def test_local_proofs_need_warm_cache(tmp_path, monkeypatch):
+    w3 = Web3(CannedChain(chain_id=42161))
+    monkeypatch.setattr(arb_proof, "SendIndex", partial(SendIndex, cache_dir=tmp_path, start_block=0))
+    monkeypatch.setattr(arb_proof, "LOCAL_PROOFS", False)
+    # No cache, proofs come from NodeInterface instead of a scan from Nitro genesis
+    assert arb_proof.send_index(w3) is None
+
+    monkeypatch.setattr(arb_proof, "LOCAL_PROOFS", True)
+    arb_proof.send_index(w3).sync(to_block=10)
+
+    monkeypatch.setattr(arb_proof, "LOCAL_PROOFS", False)
+    index = arb_proof.send_index(w3)
+    assert index.warm and index.next_block == 11
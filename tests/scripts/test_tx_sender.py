@@ -0,0 +1,114 @@
+import math
+
+import pytest
+from devchain import GWEI
+from eth_account import Account
+from tx_sender import REPLACEMENT_BUMP, TxSender
+
+RECIPIENT = "0x" + "22" * 20
+
+
+def transfer(value: int = 0) -> dict:
+    return {"to": RECIPIENT, "value": value, "gas": 21_000}
+
+
+def test_nonces_assigned_locally(sender, chain, account):
+    pending = [sender.send(transfer(i)) for i in range(4)]
+
+    assert [p.nonce for p in pending] == [0, 1, 2, 3]
+    assert len(chain.pool) == 4
+    assert chain.requests["eth_getTransactionCount"] == 1  # Only when the sender is created
+
+    chain.mine()
+    receipts = sender.wait_all()
+    assert [int(r["blockNumber"]) for r in receipts] == [1] * 4
+    assert not sender.in_flight
+
+
+def test_waits_when_max_in_flight(sender, chain):
+    for i in range(6):
+        sender.send(transfer(i))
+
+    # The first 4 had to be mined before the last 2 were sent
+    assert [len(block["txs"]) for block in chain.blocks] == [0, 4]
+    assert sorted(sender.in_flight) == [4, 5]
+
+
+def test_fees_from_fee_history(sender, chain):
+    assert sender.fees() == (2 * 10 * GWEI, 0)  # No tips in history yet
+
+    for tip in (1, 3, 2):
+        other = Account.create()
+        chain.send_external(other, RECIPIENT, 0, tip * GWEI)
+        chain.mine()
+    chain.base_fee = 12 * GWEI
+
+    fees = sender.fees()
+    assert fees.priority_fee == 2 * GWEI  # Median of the blocks' tips
+    assert fees.max_fee == 2 * 12 * GWEI + 2 * GWEI
+
+
+def test_stuck_transaction_replaced(sender, chain):
+    pending = sender.send(transfer())
+    first_fee = pending.tx["maxFeePerGas"]
+    chain.base_fee = first_fee + 1
+    chain.mine()
+    sender.poll()
+    assert len(pending.hashes) == 1  # Not stuck for long enough yet
+
+    chain.mine(2)
+    sender.poll()
+    assert len(pending.hashes) == 2
+    assert pending.tx["maxFeePerGas"] >= math.ceil(first_fee * REPLACEMENT_BUMP)
+
+    receipt = sender.wait(pending)
+    assert receipt["transactionHash"] == pending.hashes[-1]
+
+
+def test_replacements_stop_at_fee_cap(w3, chain, account):
+    sender = TxSender(w3, account, stuck_after=30, max_fee_cap=25 * GWEI, clock=lambda: chain.time,
+                      sleep=lambda _: chain.mine())
+    pending = sender.send(transfer())
+    chain.base_fee = 30 * GWEI
+    chain.mine(3)
+    sender.poll()
+    chain.mine(3)
+    sender.poll()
+
+    assert len(pending.hashes) == 2
+    assert pending.tx["maxFeePerGas"] == 25 * GWEI
+    with pytest.raises(TimeoutError):
+        sender.wait(pending, timeout=120)
+
+
+def test_nonce_used_elsewhere(sender, chain, account):
+    chain.send_external(account, RECIPIENT, 0)
+    chain.mine()
+
+    pending = sender.send(transfer())
+    assert pending.nonce == 1
+    assert sender.nonce == 2
+    chain.mine()
+    assert sender.wait(pending)["status"] == 1
+
+
+def test_nonce_taken_while_pending(sender, chain, account):
+    # Another process replaces our pending transaction, its nonce is mined without any of our hashes
+    pending = sender.send(transfer())
+    chain.send_external(account, RECIPIENT, pending.nonce, tip=5 * GWEI)
+    chain.mine()
+
+    with pytest.raises(RuntimeError, match="not sent by this sender"):
+        sender.wait(pending)
+    assert pending.nonce not in sender.in_flight
+    assert sender.wait_all() == []
+
+
+def test_cancel(sender, chain, account):
+    pending = sender.send(transfer(10))
+    sender.cancel(pending)
+
+    receipt = sender.wait(pending)
+    assert receipt["to"] == account.address
+    assert receipt["transactionHash"] == pending.hashes[-1]
+    assert len(chain.pool) == 0
@@ -0,0 +1,100 @@
+import boa
+import pytest
+from vault_keeper import VaultKeeper
+
+AMOUNT = 10**20
+
+
+@pytest.fixture()
+def keeper(fast_bridge_vault, crvusd, minter):
+    return VaultKeeper(fast_bridge_vault)
+
+
+def owe(vault, messenger, receiver, amount=AMOUNT):
+    """Bridge `amount` to `receiver` while the vault is empty, leaving an IOU"""
+    with boa.env.prank(messenger.address):
+        vault.mint(receiver, amount)
+    assert vault.balanceOf(receiver) > 0
+
+
+def test_idle(keeper, fast_bridge_vault, crvusd):
+    tick = keeper.tick()
+
+    assert tick == (False, False, {}, 0)
+    assert not fast_bridge_vault.rug_scheduled()
+
+
+def test_pays_iou_when_liquidity_arrives(keeper, fast_bridge_vault, crvusd, vault_messenger, alice):
+    owe(fast_bridge_vault, vault_messenger, alice)
+    keeper.track([alice])
+    assert keeper.tick().paid == {}
+
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    tick = keeper.tick()
+
+    assert tick.paid == {alice: AMOUNT}
+    assert crvusd.balanceOf(alice) == AMOUNT
+    assert fast_bridge_vault.balanceOf(alice) == 0
+    assert not keeper.pending
+
+
+def test_priority_order(keeper, fast_bridge_vault, crvusd, vault_messenger, alice, bob):
+    owe(fast_bridge_vault, vault_messenger, bob)
+    owe(fast_bridge_vault, vault_messenger, alice)
+    keeper.track([bob, alice])
+
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT * 3 // 2)
+    tick = keeper.tick()
+
+    # Bob's IOU is older and paid in full, Alice gets the rest and stays in the queue
+    assert tick.paid == {bob: AMOUNT, alice: AMOUNT // 2}
+    assert fast_bridge_vault.balanceOf(alice) == AMOUNT // 2
+    assert list(keeper.pending) == [alice]
+
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    assert keeper.tick().paid == {alice: AMOUNT // 2}
+    assert not keeper.pending
+
+
+def test_claims_fees_after_ious(keeper, fast_bridge_vault, crvusd, vault_messenger, curve_dao, alice, bob):
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(bob, AMOUNT)  # Paid 99%, 1% accrued as fees
+    boa.deal(crvusd, fast_bridge_vault.address, 0)
+    owe(fast_bridge_vault, vault_messenger, alice, AMOUNT // 2)
+    keeper.track([alice])
+    fee_receiver = fast_bridge_vault.fee_receiver()
+
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    tick = keeper.tick()
+
+    assert tick.paid == {alice: AMOUNT // 2 * 99 // 100, fee_receiver: AMOUNT * 3 // 200}
+    assert crvusd.balanceOf(fee_receiver) == AMOUNT * 3 // 200
+    assert fast_bridge_vault.fees_accrued() == 0
+
+
+def test_schedules_and_applies_rug(keeper, fast_bridge_vault, crvusd, minter, vault_messenger, alice):
+    minter.set_debt_ceiling(fast_bridge_vault, AMOUNT, 2 * AMOUNT)
+    owe(fast_bridge_vault, vault_messenger, alice)
+    keeper.track([alice])
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+
+    tick = keeper.tick()
+
+    assert tick.rug_scheduled and tick.rugged
+    assert minter.debt_ceiling_residual(fast_bridge_vault) == AMOUNT
+    assert not fast_bridge_vault.rug_scheduled()
+    assert tick.paid == {alice: AMOUNT}
+
+
+def test_killed(keeper, fast_bridge_vault, crvusd, vault_messenger, emergency_dao, alice):
+    owe(fast_bridge_vault, vault_messenger, alice)
+    keeper.track([alice])
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    with boa.env.prank(emergency_dao):
+        fast_bridge_vault.set_killed(True)
+
+    assert keeper.tick().paid == {}
+    assert list(keeper.pending) == [alice]
@@ -0,0 +1,24 @@
+import pytest
+from simulator import TwoChainSimulator
+
+
+@pytest.fixture(scope="session")
+def two_chains():
+    return TwoChainSimulator(message_latency=60, challenge_delay=7 * 86400)
+
+
+@pytest.fixture()
+def sim(two_chains):
+    """Simulator reverted to the fresh deployment after every test"""
+    with two_chains.anchor():
+        yield two_chains
+
+
+@pytest.fixture(scope="session")
+def alice(two_chains):
+    return two_chains.l2.generate_address("alice")
+
+
+@pytest.fixture(scope="session")
+def bob(two_chains):
+    return two_chains.l2.generate_address("bob")
@@ -0,0 +1,234 @@
+"""
+Load generator for the two-chain simulator.
+
+Bridges arrive as a Poisson process (or from a trace) and run through FastBridgeL2,
+LZ delivery and the native bridge on the simulator's virtual clock. For every bridge
+the harness records how long the receiver waits for crvUSD, either paid on delivery
+(`Minted` in full) or later as an IOU claimed once native crvUSD reaches the vault.
+Limiter truncation, msg.value refunds and gas of every step are recorded as well.
+
+    PYTHONPATH=scripts python tests/simulation/load.py --rate 100 --days 14
+"""
+
+import argparse
+import csv
+import json
+import math
+import random
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from boa.util.abi import Address
+from simulator import NativeTransfer, Packet, TwoChainSimulator
+
+HOUR = 3600
+DAY = 24 * HOUR
+
+
+def poisson_arrivals(rate: float, duration: int, mean_amount: int, seed: int = 0) -> Iterator[tuple[int, int]]:
+    """
+    @param rate Mean number of bridges per hour
+    @param duration Seconds of traffic to generate
+    @param mean_amount Mean bridged amount, amounts are log-normally distributed
+    @return Iterator of (seconds since start, amount)
+    """
+    rng = random.Random(seed)
+    sigma = 1.0
+    mu = math.log(mean_amount) - sigma**2 / 2
+    t = 0.0
+    while True:
+        t += rng.expovariate(rate / HOUR)
+        if t >= duration:
+            return
+        yield int(t), int(rng.lognormvariate(mu, sigma))
+
+
+def trace_arrivals(path: Path) -> Iterator[tuple[int, int]]:
+    """
+    @param path CSV with `offset,amount` rows, offset in seconds since start
+    """
+    with open(path) as f:
+        for row in csv.reader(f):
+            if row and not row[0].startswith("#"):
+                yield int(row[0]), int(row[1])
+
+
+def percentile(values: list, q: float):
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, math.ceil(q / 100 * len(values)) - 1)]
+
+
+class LoadSimulator(TwoChainSimulator):
+    """TwoChainSimulator that pays out IOUs once native crvUSD arrives and records metrics"""
+
+    def __init__(self, *args, overpay: float = 0.1, senders: int = 16, **kwargs):
+        """
+        @param overpay Fraction of `cost()` users send on top, refunded by FastBridgeL2
+        @param senders Number of funded L2 accounts bridges are sent from, every bridge has its own receiver
+        """
+        super().__init__(*args, **kwargs)
+        self.overpay = overpay
+        self.senders = [self.l2.generate_address() for _ in range(senders)]
+        self.l1.enable_fast_mode()
+        self.l2.enable_fast_mode()
+        self.started = {}  # receiver -> (bridge time, bridged amount)
+        self.paid = defaultdict(int)
+        self.ious = deque()  # receivers in the order their IOUs appeared
+        self.latency = {"minted": [], "iou": []}
+        self.gas = defaultdict(list)
+        self.submitted = self.requested = self.bridged = self.truncated = 0
+        self.refunded = 0
+
+    def setup(self, limit: int, liquidity: int):
+        """
+        @param limit FastBridgeL2 limit per interval
+        @param liquidity crvUSD in the vault before the first bridge
+        """
+        with self.l2.prank(self.owner):
+            self.fast_bridge_l2.set_limit(limit)
+        with self.l1.prank(self.escrow):
+            self.l1_crvusd.transfer(self.vault, liquidity)
+        for sender in self.senders:
+            self.fund(sender, 10**30)
+        self.cost = self.fast_bridge_l2.cost()  # fees stay constant during a run
+
+    def _gas(self, env, name: str, fn, *args, **kwargs):
+        before = env.get_gas_used()
+        result = fn(*args, **kwargs)
+        self.gas[name].append(env.get_gas_used() - before)
+        return result
+
+    def submit(self, amount: int):
+        sender = self.senders[self.submitted % len(self.senders)]
+        receiver = self.l2.generate_address()
+        value = self.cost + int(self.cost * self.overpay)
+        balance = self.l2.get_balance(sender)
+
+        with self.l2.prank(sender):
+            bridged = self._gas(
+                self.l2, "FastBridgeL2.bridge", self.fast_bridge_l2.bridge, self.l2_crvusd, receiver, amount, value=value
+            )
+        self._collect(self.fast_bridge_l2)
+
+        self.refunded += self.l2.get_balance(sender) - (balance - value)
+        self.l2.set_balance(sender, balance)
+        self.submitted += 1
+        self.requested += amount
+        self.bridged += bridged
+        self.truncated += bridged < amount
+        if bridged > 0:
+            self.started[receiver] = (self.now, bridged)
+
+    def _record_payouts(self, contract, path: str):
+        for log in contract.get_logs(strict=False):
+            if type(log).__name__ != "Minted" or log.address != self.vault.address or log.amount == 0:
+                continue
+            receiver = log.receiver
+            if receiver not in self.started:
+                continue
+            self.paid[receiver] += log.amount
+            started, amount = self.started[receiver]
+            if self.paid[receiver] >= amount:
+                self.latency[path].append(self.now - started)
+                del self.started[receiver], self.paid[receiver]
+
+    def _execute(self, event: Packet | NativeTransfer):
+        if isinstance(event, NativeTransfer):
+            self._gas(self.l1, "native_arrival", super()._execute, event)
+            self._pay_ious()
+            return
+
+        self._gas(self.l1, "VaultMessengerLZ.lzReceive", super()._execute, event)
+        receiver = _message_receiver(event.message)
+        self._record_payouts(self.l1_endpoint, "minted")
+        if receiver in self.started:
+            self.ious.append(receiver)
+
+    def _pay_ious(self):
+        """Claim IOUs first come first served while the vault has crvUSD, like a keeper would"""
+        while self.ious and self.l1_crvusd.balanceOf(self.vault) > 0:
+            receiver = self.ious[0]
+            with self.l1.prank(receiver):
+                self._gas(self.l1, "FastBridgeVault.mint[claim]", self.vault.mint, receiver, 0)
+            self._record_payouts(self.vault, "iou")
+            if receiver in self.started:
+                break  # vault ran dry paying this one
+            self.ious.popleft()
+
+    def run(self, arrivals: Iterable[tuple[int, int]]):
+        start = self.now
+        for offset, amount in arrivals:
+            self.advance(start + offset - self.now)
+            self.submit(amount)
+        self.run_until_idle()
+
+    def report(self) -> dict:
+        latencies = self.latency["minted"] + self.latency["iou"]
+        return {
+            "bridges": self.submitted,
+            "unpaid": len(self.started),
+            "latency": {
+                path: {
+                    "count": len(values),
+                    **{f"p{q}": percentile(values, q) for q in (50, 90, 99)},
+                    "max": max(values, default=None),
+                }
+                for path, values in (*self.latency.items(), ("all", latencies))
+            },
+            "limiter": {
+                "requested": self.requested,
+                "bridged": self.bridged,
+                "truncated_bridges": self.truncated,
+            },
+            "refunded": self.refunded,
+            "gas": {
+                name: {"count": len(values), "mean": sum(values) // len(values), "p99": percentile(values, 99)}
+                for name, values in sorted(self.gas.items())
+            },
+        }
+
+
+def _message_receiver(message: bytes) -> str:
+    return Address("0x" + message[12:32].hex())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rate", type=float, default=50, help="Mean bridges per hour")
+    parser.add_argument("--days", type=float, default=7, help="Days of traffic")
+    parser.add_argument("--trace", type=Path, help="CSV of `offset,amount` instead of Poisson arrivals")
+    parser.add_argument("--mean-amount", type=float, default=5_000, help="Mean bridge in crvUSD")
+    parser.add_argument("--limit", type=float, default=1_000_000, help="FastBridgeL2 limit per interval in crvUSD")
+    parser.add_argument("--liquidity", type=float, default=500_000, help="crvUSD in the vault at start")
+    parser.add_argument("--message-latency", type=int, default=60)
+    parser.add_argument("--challenge-delay", type=int, default=7 * DAY)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    sim = LoadSimulator(message_latency=args.message_latency, challenge_delay=args.challenge_delay)
+    sim.setup(limit=int(args.limit * 10**18), liquidity=int(args.liquidity * 10**18))
+    if args.trace:
+        arrivals = trace_arrivals(args.trace)
+    else:
+        arrivals = poisson_arrivals(args.rate, int(args.days * DAY), int(args.mean_amount * 10**18), args.seed)
+    sim.run(arrivals)
+
+    report = sim.report()
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    print(f"bridges: {report['bridges']}, unpaid: {report['unpaid']}")
+    for path, stats in report["latency"].items():
+        print(f"latency[{path}]: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+    print("limiter: " + ", ".join(f"{k}={v}" for k, v in report["limiter"].items()))
+    print(f"refunded: {report['refunded']}")
+    for name, stats in report["gas"].items():
+        print(f"gas[{name}]: " + ", ".join(f"{k}={v}" for k, v in stats.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Offline two-chain simulator of the whole bridge path.
+
+L2 and L1 are separate boa environments. Packets sent through the L2 `MockLZEndpoint`
+are queued and delivered to `VaultMessengerLZ.lzReceive` by the L1 endpoint after
+`message_latency`, or after the latency of their transport for redundant messenger pairs
+added with `add_transport`. crvUSD taken by the L2 bridger is released to the vault from an
+L1 escrow after `challenge_delay`, like a native bridge finalizing a withdrawal.
+Both chains follow a single virtual clock that only moves with `advance`.
+"""
+
+import contextlib
+import heapq
+from typing import NamedTuple
+
+import boa
+from compile_cache import load
+
+L1_EID = 30101
+L2_EID = 30110
+
+CRVUSD_ADDRESS = '0xf939E0A03FB07F59A73314E73794Be0E57ac1b4E'
+MINTER_ADDRESS = '0xC9332fdCB1C491Dcc683bAe86Fe3cb70360738BC'
+
+START_TIMESTAMP = 1_750_000_000
+
+
+class Packet(NamedTuple):
+    sender: str
+    receiver: str
+    guid: bytes
+    nonce: int
+    message: bytes
+
+
+class NativeTransfer(NamedTuple):
+    amount: int
+
+
+class TwoChainSimulator:
+    def __init__(self, message_latency: int = 60, challenge_delay: int = 7 * 86400):
+        """
+        @param message_latency Seconds between an LZ packet being sent and delivered
+        @param challenge_delay Seconds between a native bridge and crvUSD arriving to the vault
+        """
+        self.message_latency = message_latency
+        self.challenge_delay = challenge_delay
+
+        self.l1 = boa.Env()
+        self.l2 = boa.Env()
+        self.now = START_TIMESTAMP
+        self._set_time(self.now)
+        self._queue = []  # heap of (time, seq, Packet | NativeTransfer)
+        self._seq = 0
+        self.transport_latency = {}  # redundant L2 messenger -> seconds to deliver its packets
+
+        self.owner = self.l1.generate_address("owner")
+        self.executor = self.l1.generate_address("executor")
+        self.escrow = self.l1.generate_address("native bridge escrow")
+        self._deploy()
+
+    def _deploy(self):
+        with boa.swap_env(self.l1), self.l1.prank(self.owner):
+            self.l1_endpoint = load("tests/mocks/MockLZEndpoint.vy")
+            self.l1_endpoint.set_eid(L1_EID)
+            self.l1_crvusd = load("tests/mocks/MockERC20.vy", override_address=CRVUSD_ADDRESS)
+            self.minter = load("tests/mocks/MockControllerFactory.vy", override_address=MINTER_ADDRESS)
+            self.vault_messenger = load("contracts/messengers/VaultMessengerLZ.vy", self.l1_endpoint)
+            self.vault = load("contracts/FastBridgeVault.vy", self.owner, self.owner, [self.vault_messenger])
+            self.vault_messenger.set_vault(self.vault)
+            boa.deal(self.l1_crvusd, self.escrow, 10**30)
+
+        with boa.swap_env(self.l2), self.l2.prank(self.owner):
+            self.l2_endpoint = load("tests/mocks/MockLZEndpoint.vy")
+            self.l2_endpoint.set_eid(L2_EID)
+            self.l2_crvusd = load("tests/mocks/MockERC20.vy")
+            self.bridger = load("tests/mocks/MockBridger.vy")
+            self.l2_messenger = load("contracts/messengers/L2MessengerLZ.vy", self.l2_endpoint, L1_EID, 200_000)
+            self.fast_bridge_l2 = load(
+                "contracts/FastBridgeL2.vy", self.l2_crvusd, self.vault, self.bridger, self.l2_messenger
+            )
+            self.l2_messenger.set_fast_bridge_l2(self.fast_bridge_l2)
+
+        with self.l1.prank(self.owner):
+            self.vault_messenger.setPeer(L2_EID, _to_bytes32(self.l2_messenger.address))
+        with self.l2.prank(self.owner):
+            self.l2_messenger.setPeer(L1_EID, _to_bytes32(self.vault_messenger.address))
+
+    def add_transport(self, latency: int):
+        """
+        Deploy another messenger pair on its own transport and make FastBridgeL2 send through it too
+        @param latency Seconds between a packet of this transport being sent and delivered
+        @return (L2 messenger, vault messenger) of the transport
+        """
+        with boa.swap_env(self.l1), self.l1.prank(self.owner):
+            vault_messenger = load("contracts/messengers/VaultMessengerLZ.vy", self.l1_endpoint)
+            vault_messenger.set_vault(self.vault)
+            self.vault.grantRole(self.vault.MINTER_ROLE(), vault_messenger)
+        with boa.swap_env(self.l2), self.l2.prank(self.owner):
+            l2_messenger = load("contracts/messengers/L2MessengerLZ.vy", self.l2_endpoint, L1_EID, 200_000)
+            l2_messenger.set_fast_bridge_l2(self.fast_bridge_l2)
+            l2_messenger.setPeer(L1_EID, _to_bytes32(vault_messenger.address))
+            self.fast_bridge_l2.set_redundant_messengers(list(self.transport_latency) + [l2_messenger.address])
+        with self.l1.prank(self.owner):
+            vault_messenger.setPeer(L2_EID, _to_bytes32(l2_messenger.address))
+        self.transport_latency[l2_messenger.address] = latency
+        return l2_messenger, vault_messenger
+
+    def _set_time(self, ts: int):
+        self.l1.timestamp = ts
+        self.l2.timestamp = ts
+
+    def _schedule(self, at: int, event: Packet | NativeTransfer):
+        heapq.heappush(self._queue, (at, self._seq, event))
+        self._seq += 1
+
+    @property
+    def pending(self) -> list[Packet | NativeTransfer]:
+        return [event for _, _, event in sorted(self._queue)]
+
+    def fund(self, user: str, amount: int):
+        """Give `user` L2 crvUSD and native token for fees, and approve FastBridgeL2"""
+        with boa.swap_env(self.l2):
+            boa.deal(self.l2_crvusd, user, self.l2_crvusd.balanceOf(user) + amount)
+        self.l2.set_balance(user, 10**20)
+        with self.l2.prank(user):
+            self.l2_crvusd.approve(self.fast_bridge_l2, 2**256 - 1)
+
+    def bridge(self, user: str, amount: int, to: str = None) -> int:
+        """
+        Bridge from L2 and queue the resulting packet and native transfer
+        @return Amount accepted by FastBridgeL2
+        """
+        with self.l2.prank(user):
+            bridged = self.fast_bridge_l2.bridge(self.l2_crvusd, to or user, amount, value=self.fast_bridge_l2.cost())
+        self._collect(self.fast_bridge_l2)
+        return bridged
+
+    def _collect(self, contract):
+        """Queue packets and native bridges emitted by the last call to an L2 contract"""
+        for log in contract.get_logs(strict=False):
+            name = type(log).__name__
+            if name == "PacketSent" and log.address == self.l2_endpoint.address:
+                packet = Packet(log.sender, _to_address(log.receiver), log.guid, log.nonce, log.message)
+                latency = self.transport_latency.get(log.sender, self.message_latency)
+                self._schedule(self.now + latency, packet)
+            elif name == "Bridge" and log.address == self.fast_bridge_l2.address and log.amount > 0:
+                self._schedule(self.now + self.challenge_delay, NativeTransfer(log.amount))
+
+    def _execute(self, event: Packet | NativeTransfer):
+        if isinstance(event, Packet):
+            origin = (L2_EID, _to_bytes32(event.sender), event.nonce)
+            with self.l1.prank(self.executor):
+                self.l1_endpoint.deliver(origin, event.receiver, event.guid, event.message)
+        else:
+            with self.l1.prank(self.escrow):
+                self.l1_crvusd.transfer(self.vault, event.amount)
+
+    def advance(self, seconds: int):
+        """Move the virtual clock, executing everything that becomes due in order"""
+        until = self.now + seconds
+        while self._queue and self._queue[0][0] <= until:
+            at, _, event = heapq.heappop(self._queue)
+            self.now = at
+            self._set_time(at)
+            self._execute(event)
+        self.now = until
+        self._set_time(until)
+
+    def run_until_idle(self):
+        """Advance until every queued packet and native transfer is executed"""
+        if self._queue:
+            self.advance(max(at for at, _, _ in self._queue) - self.now)
+
+    @contextlib.contextmanager
+    def anchor(self):
+        """Revert both chains, the clock, the queue and latencies on exit"""
+        queue, seq, now = list(self._queue), self._seq, self.now
+        latencies = self.message_latency, self.challenge_delay, dict(self.transport_latency)
+        try:
+            with self.l1.anchor(), self.l2.anchor():
+                yield self
+        finally:
+            self._queue, self._seq, self.now = queue, seq, now
+            self.message_latency, self.challenge_delay, self.transport_latency = latencies
+
+
+def _to_bytes32(address: str) -> bytes:
+    return bytes(12) + bytes.fromhex(str(address)[2:])
+
+
+def _to_address(b: bytes) -> str:
+    return boa.util.abi.Address("0x" + b[-20:].hex())
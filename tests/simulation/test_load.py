@@ -0,0 +1,34 @@
+from load import DAY, LoadSimulator, percentile, poisson_arrivals
+
+AMOUNT = 10**18
+
+
+def test_poisson_arrivals():
+    arrivals = list(poisson_arrivals(rate=60, duration=DAY, mean_amount=AMOUNT, seed=1))
+    assert arrivals == list(poisson_arrivals(rate=60, duration=DAY, mean_amount=AMOUNT, seed=1))
+    assert 1300 < len(arrivals) < 1600
+    assert all(a[0] <= b[0] for a, b in zip(arrivals, arrivals[1:]))
+    assert all(0 <= t < DAY for t, _ in arrivals)
+
+
+def test_percentile():
+    assert percentile([], 50) is None
+    assert percentile([3, 1, 2], 50) == 2
+    assert percentile(list(range(1, 101)), 99) == 99
+
+
+def test_load_report():
+    sim = LoadSimulator(message_latency=60, challenge_delay=DAY)
+    sim.setup(limit=10 * AMOUNT, liquidity=3 * AMOUNT)
+    # 3 paid on delivery, 2 wait for native crvUSD, the last one is truncated by the limit
+    sim.run([(0, AMOUNT), (60, AMOUNT), (120, AMOUNT), (180, AMOUNT), (240, AMOUNT), (300, 100 * AMOUNT)])
+    report = sim.report()
+
+    assert report["bridges"] == 6
+    assert report["unpaid"] == 0
+    assert sim.latency["minted"] == [60] * 3
+    assert sorted(sim.latency["iou"]) == [DAY - 180, DAY - 180, DAY]
+    assert report["limiter"] == {"requested": 105 * AMOUNT, "bridged": 10 * AMOUNT, "truncated_bridges": 1}
+    assert report["refunded"] == 6 * int(sim.cost * sim.overpay)
+    assert report["gas"]["FastBridgeL2.bridge"]["count"] == 6
+    assert sim.l1_crvusd.balanceOf(sim.vault) == 3 * AMOUNT
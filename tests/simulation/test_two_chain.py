@@ -0,0 +1,115 @@
+from simulator import NativeTransfer, Packet
+
+AMOUNT = 10**18
+
+
+def test_fast_path(sim, alice):
+    sim.fund(alice, AMOUNT)
+    with sim.l1.prank(sim.escrow):
+        sim.l1_crvusd.transfer(sim.vault, AMOUNT)
+
+    assert sim.bridge(alice, AMOUNT) == AMOUNT
+    assert [type(event) for event in sim.pending] == [Packet, NativeTransfer]
+    assert sim.l1_crvusd.balanceOf(alice) == 0
+
+    sim.advance(sim.message_latency - 1)
+    assert sim.l1_crvusd.balanceOf(alice) == 0
+
+    sim.advance(1)
+    assert sim.l1_crvusd.balanceOf(alice) == AMOUNT
+    assert sim.l2_crvusd.balanceOf(alice) == 0
+
+
+def test_iou_until_native_arrival(sim, alice):
+    sim.fund(alice, AMOUNT)
+    sim.bridge(alice, AMOUNT)
+
+    sim.advance(sim.message_latency)
+    assert sim.l1_crvusd.balanceOf(alice) == 0
+    assert sim.vault.balanceOf(alice) == AMOUNT
+
+    sim.advance(sim.challenge_delay - sim.message_latency)
+    assert sim.pending == []
+    assert sim.l1_crvusd.balanceOf(sim.vault) == AMOUNT
+
+    with sim.l1.prank(alice):
+        assert sim.vault.mint(alice, 0) == AMOUNT
+    assert sim.vault.balanceOf(alice) == 0
+
+
+def test_packets_delivered_in_order(sim, alice, bob):
+    sim.fund(alice, AMOUNT)
+    sim.message_latency = 100
+    sim.bridge(alice, AMOUNT // 4, bob)
+    sim.advance(10)
+    sim.bridge(alice, AMOUNT // 4, alice)
+
+    nonces = [event.nonce for event in sim.pending if isinstance(event, Packet)]
+    assert nonces == [1, 2]
+
+    sim.advance(90)
+    assert sim.vault.balanceOf(bob) == AMOUNT // 4
+    assert sim.vault.balanceOf(alice) == 0
+
+    sim.run_until_idle()
+    assert sim.l1_crvusd.balanceOf(sim.vault) == AMOUNT // 2
+    for user in (alice, bob):
+        with sim.l1.prank(user):
+            assert sim.vault.mint(user, 0) == AMOUNT // 4
+
+
+def test_single_clock(sim, alice):
+    sim.fund(alice, AMOUNT)
+    start = sim.now
+    sim.bridge(alice, AMOUNT)
+    sim.run_until_idle()
+
+    assert sim.now == start + sim.challenge_delay
+    assert sim.l1.timestamp == sim.l2.timestamp == sim.now
+
+
+def test_reverted_between_tests(sim, alice):
+    assert sim.pending == []
+    assert sim.l2_crvusd.balanceOf(alice) == 0
+    assert sim.l1_crvusd.balanceOf(sim.vault) == 0
+
+
+def test_redundant_transports_first_arrival_mints(sim, alice):
+    sim.message_latency = 600
+    sim.add_transport(latency=30)
+    sim.add_transport(latency=120)
+    sim.fund(alice, 2 * AMOUNT)
+    with sim.l1.prank(sim.escrow):
+        sim.l1_crvusd.transfer(sim.vault, 2 * AMOUNT)
+
+    sim.bridge(alice, AMOUNT)
+    assert sum(isinstance(event, Packet) for event in sim.pending) == 3
+
+    sim.advance(30)  # The fastest transport pays out
+    assert sim.l1_crvusd.balanceOf(alice) == AMOUNT
+    sim.advance(600)  # The other two arrive late and are ignored
+    assert [event for event in sim.pending if isinstance(event, Packet)] == []
+    assert sim.l1_crvusd.balanceOf(alice) == AMOUNT
+    assert sim.vault.balanceOf(alice) == 0
+
+
+def test_redundant_transport_revoked(sim, alice):
+    _, vault_messenger = sim.add_transport(latency=30)
+    sim.fund(alice, AMOUNT)
+    with sim.l1.prank(sim.escrow):
+        sim.l1_crvusd.transfer(sim.vault, AMOUNT)
+    with sim.l1.prank(sim.owner):
+        sim.vault.revokeRole(sim.vault.MINTER_ROLE(), vault_messenger)
+
+    sim.bridge(alice, AMOUNT)
+    sim.advance(30)  # Arrives first but can't mint, nor burn the transfer id
+    assert sim.l1_crvusd.balanceOf(alice) == 0
+    sim.advance(sim.message_latency - 30)
+    assert sim.l1_crvusd.balanceOf(alice) == AMOUNT
+
+
+def test_anchor_restores_latencies(two_chains):
+    latencies = two_chains.message_latency, two_chains.challenge_delay
+    with two_chains.anchor():
+        two_chains.message_latency, two_chains.challenge_delay = 1, 1
+    assert (two_chains.message_latency, two_chains.challenge_delay) == latencies
@@ -0,0 +1,204 @@
+import boa
+import pytest
+from compile_cache import load
+
+INTERVAL = 86400 * 7 // 4
+LIMIT = 100 * 10**18
+FEE = 10**15
+
+
+@pytest.fixture()
+def messenger():
+    messenger = load("tests/mocks/MockMessenger.vy")
+    messenger.set_fee(FEE)
+    return messenger
+
+
+@pytest.fixture()
+def fast_bridge_l2(fast_bridge_l2, dev_deployer, messenger):
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(LIMIT)
+        fast_bridge_l2.set_messenger(messenger)
+    # Start of an interval, so every test has a full one ahead
+    boa.env.time_travel(seconds=INTERVAL - boa.env.evm.patch.timestamp % INTERVAL)
+    return fast_bridge_l2
+
+
+def interval():
+    return boa.env.evm.patch.timestamp // INTERVAL
+
+
+def queue_bridge(fast_bridge_l2, crvusd, user, amount, value=None, receiver=None):
+    boa.deal(crvusd, user, amount)
+    value = FEE * 10 if value is None else value
+    boa.env.set_balance(user, value)
+    with boa.env.prank(user):
+        crvusd.approve(fast_bridge_l2, amount)
+        return fast_bridge_l2.bridge_queued(crvusd, receiver or user, amount, value=value)
+
+
+def queued(fast_bridge_l2):
+    return [fast_bridge_l2.queue(i) for i in range(fast_bridge_l2.queue_head(), fast_bridge_l2.queue_tail())]
+
+
+def test_bridges_available_and_queues_rest(fast_bridge_l2, crvusd, messenger, alice):
+    now = queue_bridge(fast_bridge_l2, crvusd, alice, 250 * 10**18)
+
+    assert now == LIMIT
+    assert messenger.initiated() == LIMIT
+    assert crvusd.balanceOf(fast_bridge_l2) == 150 * 10**18
+    start = interval()
+    assert [(q.amount, q.interval, q.prepaid) for q in queued(fast_bridge_l2)] == [
+        (LIMIT, start + 1, FEE), (50 * 10**18, start + 2, FEE),
+    ]
+    # Reserved limit is not available to anyone else
+    assert fast_bridge_l2.allowed_to_bridge((start + 1) * INTERVAL) == (0, 0)
+    assert fast_bridge_l2.allowed_to_bridge((start + 2) * INTERVAL) == (10**18, 50 * 10**18)
+    # Three parts paid, the rest is refunded
+    assert boa.env.get_balance(alice) == 7 * FEE
+
+
+def test_release(fast_bridge_l2, crvusd, messenger, alice, bob):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 250 * 10**18)
+    assert fast_bridge_l2.release_queued(5) == 0  # Interval has not started
+
+    boa.env.time_travel(seconds=INTERVAL)
+    with boa.env.prank(bob):
+        assert fast_bridge_l2.release_queued(5) == 1
+    logs = fast_bridge_l2.get_logs()
+    assert [log.amount for log in logs if type(log).__name__ == "ReleaseQueued"] == [LIMIT]
+    assert messenger.initiated() == 2 * LIMIT
+    assert fast_bridge_l2.queue_head() == 1
+    assert fast_bridge_l2.queue(0).amount == 0
+
+    boa.env.time_travel(seconds=3 * INTERVAL)
+    fast_bridge_l2.release_queued(5)
+    assert messenger.initiated() == 250 * 10**18
+    assert crvusd.balanceOf(fast_bridge_l2) == 0
+    assert fast_bridge_l2.queue_head() == fast_bridge_l2.queue_tail() == 2
+
+
+def test_queue_is_fifo(fast_bridge_l2, crvusd, alice, bob, dev_deployer):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 250 * 10**18)
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(2 * LIMIT)  # Frees limit in the current interval and the next one
+
+    assert queue_bridge(fast_bridge_l2, crvusd, bob, 300 * 10**18) == LIMIT
+    start = interval()
+    # Bob's parts start where Alice's end, never ahead of hers
+    assert [(q.sender, q.amount, q.interval) for q in queued(fast_bridge_l2)][2:] == [
+        (bob, 150 * 10**18, start + 2), (bob, 50 * 10**18, start + 3),
+    ]
+
+
+def test_nothing_available_now(fast_bridge_l2, crvusd, messenger, alice, bob):
+    queue_bridge(fast_bridge_l2, crvusd, alice, LIMIT - 10**17)  # Less than min_amount left
+
+    assert queue_bridge(fast_bridge_l2, crvusd, bob, 30 * 10**18) == 0
+    assert [(q.sender, q.interval) for q in queued(fast_bridge_l2)] == [(bob, interval() + 1)]
+    assert boa.env.get_balance(bob) == 9 * FEE
+
+
+def test_costs_went_up(fast_bridge_l2, crvusd, messenger, alice, bob):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 150 * 10**18)
+    messenger.set_fee(3 * FEE)
+    boa.env.time_travel(seconds=INTERVAL)
+
+    with boa.env.prank(bob):
+        with boa.reverts("Insufficient msg.value"):
+            fast_bridge_l2.release_queued()
+        boa.env.set_balance(bob, 5 * FEE)
+        fast_bridge_l2.release_queued(value=5 * FEE)
+    assert boa.env.get_balance(bob) == 3 * FEE  # Prepaid FEE and 2 * FEE of his own paid the messenger
+
+
+def test_costs_went_down(fast_bridge_l2, crvusd, messenger, alice, bob):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 150 * 10**18)
+    messenger.set_fee(FEE // 4)
+    boa.env.time_travel(seconds=INTERVAL)
+
+    balance = boa.env.get_balance(alice)
+    boa.env.set_balance(bob, FEE)
+    with boa.env.prank(bob):
+        fast_bridge_l2.release_queued(value=FEE)
+    assert boa.env.get_balance(bob) == FEE
+    assert boa.env.get_balance(alice) == balance + FEE - FEE // 4  # What is left of the prepaid amount
+
+
+def test_no_tail_below_min_amount(fast_bridge_l2, crvusd, messenger, alice):
+    min_amount = fast_bridge_l2.min_amount()
+    now = queue_bridge(fast_bridge_l2, crvusd, alice, LIMIT + 1)
+
+    # The tail is topped up to min_amount from what is bridged now
+    assert now == LIMIT + 1 - min_amount
+    assert [q.amount for q in queued(fast_bridge_l2)] == [min_amount]
+    boa.env.time_travel(seconds=INTERVAL)
+    assert fast_bridge_l2.release_queued() == 1
+    assert messenger.initiated() == LIMIT + 1
+
+
+def test_no_queued_part_below_min_amount(fast_bridge_l2, crvusd, alice):
+    min_amount = fast_bridge_l2.min_amount()
+    queue_bridge(fast_bridge_l2, crvusd, alice, LIMIT)
+    queue_bridge(fast_bridge_l2, crvusd, alice, LIMIT + min_amount // 2)
+
+    assert [q.amount for q in queued(fast_bridge_l2)] == [LIMIT + min_amount // 2 - min_amount, min_amount]
+    assert all(q.amount >= min_amount for q in queued(fast_bridge_l2))
+
+
+def test_min_amount_raised(fast_bridge_l2, crvusd, messenger, alice, bob, dev_deployer):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 150 * 10**18)  # 50 queued
+    queue_bridge(fast_bridge_l2, crvusd, bob, 150 * 10**18)  # 50 and 100 queued after alice
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_min_amount(60 * 10**18)
+    boa.env.time_travel(seconds=INTERVAL)
+
+    balance = boa.env.get_balance(alice)
+    assert fast_bridge_l2.release_queued(5) == 0  # Both parts of the interval are too small now and returned
+    assert crvusd.balanceOf(alice) == crvusd.balanceOf(bob) == 50 * 10**18
+    assert boa.env.get_balance(alice) == balance + FEE
+    cancelled = [log for log in fast_bridge_l2.get_logs() if type(log).__name__ == "CancelQueued"]
+    assert [(log.sender, log.amount) for log in cancelled] == [(alice, 50 * 10**18), (bob, 50 * 10**18)]
+
+    # The queue goes on
+    boa.env.time_travel(seconds=INTERVAL)
+    assert fast_bridge_l2.release_queued(5) == 1
+    assert messenger.initiated() == 200 * 10**18  # Alice's first 100 and Bob's 100
+    assert fast_bridge_l2.queue_head() == fast_bridge_l2.queue_tail()
+
+
+def test_cancel_queued(fast_bridge_l2, crvusd, alice, bob, dev_deployer):
+    queue_bridge(fast_bridge_l2, crvusd, alice, 350 * 10**18)  # 100, 100 and 50 queued
+    with boa.env.prank(bob):
+        with boa.reverts("Access denied"):
+            fast_bridge_l2.cancel_queued(1)
+
+    balance = boa.env.get_balance(alice)
+    with boa.env.prank(alice):
+        fast_bridge_l2.cancel_queued(1)
+    assert crvusd.balanceOf(alice) == LIMIT
+    assert boa.env.get_balance(alice) == balance + FEE
+    assert fast_bridge_l2.allowed_to_bridge((interval() + 2) * INTERVAL) == (10**18, LIMIT)  # Limit is free again
+    with boa.env.prank(dev_deployer):  # Owner can cancel too, but only once
+        with boa.reverts("Not queued"):
+            fast_bridge_l2.cancel_queued(1)
+        fast_bridge_l2.cancel_queued(2)
+    assert crvusd.balanceOf(alice) == 150 * 10**18
+
+    # Cancelled parts are skipped, parts queued later are still scheduled after them
+    queue_bridge(fast_bridge_l2, crvusd, bob, 50 * 10**18)
+    assert fast_bridge_l2.queue(3).interval == interval() + 3
+    boa.env.time_travel(seconds=3 * INTERVAL)
+    assert fast_bridge_l2.release_queued(5) == 2
+    assert fast_bridge_l2.queue_head() == 4
+
+
+def test_reverts(fast_bridge_l2, crvusd, alice):
+    with boa.reverts("Insufficient msg.value"):
+        queue_bridge(fast_bridge_l2, crvusd, alice, 250 * 10**18, value=2 * FEE)
+    with boa.reverts("Queue too long"):
+        queue_bridge(fast_bridge_l2, crvusd, alice, 10 * LIMIT)
+    with boa.reverts("Amount too small"):
+        queue_bridge(fast_bridge_l2, crvusd, alice, 10**17)
+    with boa.reverts("Not supported"):
+        fast_bridge_l2.bridge_queued(alice, alice, LIMIT)
@@ -0,0 +1,103 @@
+import boa
+import pytest
+from compile_cache import load
+
+FEE = 10**15
+
+
+@pytest.fixture()
+def messengers():
+    messengers = [load("tests/mocks/MockMessenger.vy") for _ in range(3)]
+    for i, messenger in enumerate(messengers):
+        messenger.set_fee((i + 1) * FEE)
+    return messengers
+
+
+def test_default_behavior(fast_bridge_l2, messengers, dev_deployer):
+    cost = fast_bridge_l2.cost()
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_redundant_messengers(messengers[1:])
+    assert [fast_bridge_l2.redundant_messengers(i) for i in range(2)] == [m.address for m in messengers[1:]]
+    assert fast_bridge_l2.cost() == cost + 5 * FEE
+
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_redundant_messengers([])
+    assert fast_bridge_l2.cost() == cost
+
+
+def test_bridge_through_every_messenger(fast_bridge_l2, messengers, crvusd, dev_deployer, alice):
+    amount = 10**18
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(2 * amount)
+        fast_bridge_l2.set_messenger(messengers[0])
+        fast_bridge_l2.set_redundant_messengers(messengers[1:])
+    boa.deal(crvusd, alice, 2 * amount)
+    boa.env.set_balance(alice, 2 * fast_bridge_l2.cost())
+    with boa.env.prank(alice):
+        crvusd.approve(fast_bridge_l2, 2 * amount)
+        fast_bridge_l2.bridge(crvusd, alice, amount, value=fast_bridge_l2.cost())
+        first = [log.transfer_id for log in fast_bridge_l2.get_logs() if type(log).__name__ == "InitiateRedundant"]
+        fast_bridge_l2.bridge(crvusd, alice, amount, value=fast_bridge_l2.cost())
+        second = [log.transfer_id for log in fast_bridge_l2.get_logs() if type(log).__name__ == "InitiateRedundant"]
+
+    assert [m.initiated() for m in messengers] == [2 * amount] * 3
+    assert [boa.env.get_balance(m.address) for m in messengers] == [2 * FEE, 4 * FEE, 6 * FEE]
+    assert fast_bridge_l2.transfer_nonce() == 2
+    assert len(first) == len(second) == 1 and first != second
+
+
+def test_redundant_messenger_fails(fast_bridge_l2, messengers, crvusd, dev_deployer, alice):
+    amount = 10**18
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_messenger(messengers[0])
+        fast_bridge_l2.set_redundant_messengers(messengers[1:])
+    messengers[2].set_broken(True)
+    boa.deal(crvusd, alice, amount)
+    cost = fast_bridge_l2.cost()
+    boa.env.set_balance(alice, cost)
+    with boa.env.prank(alice):
+        crvusd.approve(fast_bridge_l2, amount)
+        assert fast_bridge_l2.bridge(crvusd, alice, amount, value=cost) == amount
+    failed = [log for log in fast_bridge_l2.get_logs() if type(log).__name__ == "RedundantFailed"]
+
+    # The other transports carry the message, the fee of the broken one is refunded
+    assert [m.initiated() for m in messengers] == [amount, amount, 0]
+    assert [boa.env.get_balance(m.address) for m in messengers] == [FEE, 2 * FEE, 0]
+    assert boa.env.get_balance(alice) == 3 * FEE
+    assert [log.messenger for log in failed] == [messengers[2].address]
+
+
+def test_redundant_messenger_fails_queued(fast_bridge_l2, messengers, crvusd, dev_deployer, alice, bob):
+    amount = 10**18
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(amount)
+        fast_bridge_l2.set_messenger(messengers[0])
+        fast_bridge_l2.set_redundant_messengers(messengers[1:])
+    boa.deal(crvusd, alice, 2 * amount)
+    cost = fast_bridge_l2.cost()
+    boa.env.set_balance(alice, 2 * cost)
+    with boa.env.prank(alice):
+        crvusd.approve(fast_bridge_l2, 2 * amount)
+        fast_bridge_l2.bridge_queued(crvusd, alice, 2 * amount, value=2 * cost)
+
+    messengers[1].set_broken(True)
+    boa.env.time_travel(seconds=86400 * 7 // 4)
+    with boa.env.prank(bob):
+        assert fast_bridge_l2.release_queued() == 1
+    assert [m.initiated() for m in messengers] == [2 * amount, amount, 2 * amount]
+    assert boa.env.get_balance(alice) == 2 * FEE  # Prepaid for the broken messenger
+    assert boa.env.get_balance(bob) == 0
+
+
+def test_bad_values(fast_bridge_l2, messengers, l2_messenger, dev_deployer):
+    with boa.env.prank(dev_deployer):
+        with boa.reverts("Bad messenger value"):
+            fast_bridge_l2.set_redundant_messengers([messengers[0].address, boa.eval("empty(address)")])
+        with boa.reverts("Duplicate messenger"):
+            fast_bridge_l2.set_redundant_messengers([l2_messenger])
+
+
+def test_not_owner(fast_bridge_l2, messengers):
+    with boa.env.prank(boa.env.generate_address()):
+        with boa.reverts("ownable: caller is not the owner"):
+            fast_bridge_l2.set_redundant_messengers(messengers)
@@ -43,4 +43,17 @@ def test_set_fee_zero(fast_bridge_vault, curve_dao):
     with boa.env.prank(curve_dao):
         fast_bridge_vault.set_fee(0)
     
-    assert fast_bridge_vault.fee() == 0
\ No newline at end of file
+    assert fast_bridge_vault.fee() == 0
+
+
+def test_set_fee_keeps_accrued(fast_bridge_vault, vault_messenger, curve_dao, alice):
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, 10**20)
+
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**18)
+
+    assert fast_bridge_vault.fee() == 10**18
+    assert fast_bridge_vault.fees_accrued() == 10**18
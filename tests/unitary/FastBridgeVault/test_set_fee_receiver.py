@@ -43,4 +43,10 @@ def test_fee_receiver_gets_fees(fast_bridge_vault, crvusd, vault_messenger, curv
         fast_bridge_vault.mint(alice, amount)
     
     expected_fee = amount * 10**16 // 10**18
-    assert fast_bridge_vault.balanceOf(new_receiver) == expected_fee
\ No newline at end of file
+    assert fast_bridge_vault.fees_accrued() == expected_fee
+
+    # Fees are claimed by anyone minting to the fee receiver
+    with boa.env.prank(alice):
+        assert fast_bridge_vault.mint(new_receiver, 0) == expected_fee
+    assert crvusd.balanceOf(new_receiver) == expected_fee
+    assert fast_bridge_vault.fees_accrued() == 0
\ No newline at end of file
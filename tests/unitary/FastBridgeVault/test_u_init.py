@@ -1,6 +1,7 @@
 import pytest
 import boa
 from boa import env
+from compile_cache import load
 
 
 def test_default_behavior(fast_bridge_vault, crvusd, minter, curve_dao, emergency_dao, vault_messenger):
@@ -25,7 +26,7 @@ def test_multiple_minters(dev_deployer, crvusd, minter, curve_dao, emergency_dao
     minter3 = env.generate_address()
     
     with boa.env.prank(dev_deployer):
-        vault = boa.load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [minter1, minter2, minter3])
+        vault = load("contracts/FastBridgeVault.vy", curve_dao, emergency_dao, [minter1, minter2, minter3])
     
     assert vault.hasRole(vault.MINTER_ROLE(), minter1) == True
     assert vault.hasRole(vault.MINTER_ROLE(), minter2) == True
@@ -1,6 +1,11 @@
 import pytest
 import boa
 from boa import env
+from eth_utils import keccak
+
+
+def delivery(transfer_id, receiver, amount):
+    return keccak(boa.util.abi.abi_encode("(bytes32,address,uint256)", (transfer_id, receiver, amount)))
 
 
 def test_mint_as_minter(fast_bridge_vault, crvusd, vault_messenger, alice):
@@ -63,7 +68,40 @@ def test_mint_with_fee(fast_bridge_vault, crvusd, vault_messenger, curve_dao, al
     assert result == expected_amount
     assert crvusd.balanceOf(alice) == expected_amount
     assert fast_bridge_vault.balanceOf(alice) == 0
+    assert fast_bridge_vault.balanceOf(fee_receiver) == 0
+    assert fast_bridge_vault.fees_accrued() == expected_fee
+
+
+def test_mint_to_fee_receiver_no_fee(fast_bridge_vault, crvusd, vault_messenger, curve_dao):
+    # Transfers to the fee receiver are not charged a fee
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    amount = 10**20
+    boa.deal(crvusd, fast_bridge_vault.address, amount)
+
+    fee_receiver = fast_bridge_vault.fee_receiver()
+    with boa.env.prank(vault_messenger.address):
+        assert fast_bridge_vault.mint(fee_receiver, amount) == amount
+    assert crvusd.balanceOf(fee_receiver) == amount
+    assert fast_bridge_vault.fees_accrued() == 0
+
+
+def test_claim_fees_without_liquidity(fast_bridge_vault, crvusd, vault_messenger, curve_dao, alice, bob):
+    fee = 10**16
+    amount = 10**20
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(fee)
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, amount)
+    expected_fee = amount * fee // 10**18
+
+    # Claimed fees that can't be paid become an IOU of the fee receiver
+    fee_receiver = fast_bridge_vault.fee_receiver()
+    with boa.env.prank(bob):
+        assert fast_bridge_vault.mint(fee_receiver, 0) == 0
+    assert fast_bridge_vault.fees_accrued() == 0
     assert fast_bridge_vault.balanceOf(fee_receiver) == expected_fee
+    assert fast_bridge_vault.fee() == fee
 
 
 def test_mint_when_killed(fast_bridge_vault, crvusd, vault_messenger, emergency_dao, alice):
@@ -101,4 +139,48 @@ def test_mint_partial_balance(fast_bridge_vault, crvusd, vault_messenger, alice)
     
     assert result == vault_amount
     assert crvusd.balanceOf(alice) == vault_amount
-    assert fast_bridge_vault.balanceOf(alice) == requested_amount - vault_amount
\ No newline at end of file
+    assert fast_bridge_vault.balanceOf(alice) == requested_amount - vault_amount
+
+def test_mint_transfer_id_once(fast_bridge_vault, crvusd, vault_messenger, curve_dao, alice):
+    # The same transfer through two minters, only the first arrival mints
+    other_minter = boa.env.generate_address()
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.grantRole(fast_bridge_vault.MINTER_ROLE(), other_minter)
+    amount = 10**20
+    boa.deal(crvusd, fast_bridge_vault.address, 2 * amount)
+    transfer_id = b"\x01" * 32
+
+    with boa.env.prank(other_minter):
+        assert fast_bridge_vault.mint(alice, amount, transfer_id) == amount
+    with boa.env.prank(vault_messenger.address):
+        assert fast_bridge_vault.mint(alice, amount, transfer_id) == 0
+    logs = [log for log in fast_bridge_vault.get_logs() if type(log).__name__ == "DuplicateIgnored"]
+    assert [(log.transfer_id, log.minter) for log in logs] == [(transfer_id, vault_messenger.address)]
+
+    assert fast_bridge_vault.delivered(delivery(transfer_id, alice, amount))
+    assert crvusd.balanceOf(alice) == amount
+    # Transfers without an id are never deduplicated
+    with boa.env.prank(vault_messenger.address):
+        assert fast_bridge_vault.mint(alice, amount) == amount
+
+
+def test_mint_transfer_id_not_minter(fast_bridge_vault, alice, bob):
+    # Ignored for non-minters, so they can't burn an id before it arrives
+    with boa.env.prank(bob):
+        fast_bridge_vault.mint(alice, 10**18, b"\x01" * 32)
+    assert not fast_bridge_vault.delivered(delivery(b"\x01" * 32, alice, 10**18))
+
+
+def test_mint_transfer_id_other_transfer(fast_bridge_vault, crvusd, vault_messenger, alice, bob):
+    # A reused id only dedupes copies of the same transfer, other receivers and amounts still mint
+    amount = 10**20
+    boa.deal(crvusd, fast_bridge_vault.address, 3 * amount)
+    transfer_id = b"\x01" * 32
+
+    with boa.env.prank(vault_messenger.address):
+        assert fast_bridge_vault.mint(alice, amount, transfer_id) == amount
+        assert fast_bridge_vault.mint(bob, amount, transfer_id) == amount
+        assert fast_bridge_vault.mint(alice, amount // 2, transfer_id) == amount // 2
+        assert fast_bridge_vault.mint(alice, amount, transfer_id) == 0
+    assert crvusd.balanceOf(alice) == amount + amount // 2
+    assert crvusd.balanceOf(bob) == amount
@@ -1,11 +1,12 @@
 import pytest
 import boa
 from boa import env
+from compile_cache import load
 
 
 @pytest.fixture
 def mock_token():
-    return boa.load("tests/mocks/MockERC20.vy")
+    return load("tests/mocks/MockERC20.vy")
 
 
 def test_recover_specific_amount(fast_bridge_vault, curve_dao, alice, mock_token):
@@ -40,8 +41,8 @@ def test_recover_max_amount(fast_bridge_vault, curve_dao, alice, mock_token):
 
 def test_recover_multiple_tokens(fast_bridge_vault, curve_dao, alice):
     # Create multiple tokens
-    token1 = boa.load("tests/mocks/MockERC20.vy")
-    token2 = boa.load("tests/mocks/MockERC20.vy")
+    token1 = load("tests/mocks/MockERC20.vy")
+    token2 = load("tests/mocks/MockERC20.vy")
     
     amount1 = 10**20
     amount2 = 2 * 10**20
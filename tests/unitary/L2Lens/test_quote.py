@@ -0,0 +1,49 @@
+import boa
+from compile_cache import load
+
+INTERVAL = 86400 * 7 // 4
+
+
+def test_quote(l2_lens, fast_bridge_l2, l2_messenger, bridger):
+    quote = l2_lens.quote(fast_bridge_l2)
+
+    assert quote.timestamp == boa.env.evm.patch.timestamp
+    assert (quote.min_amount, quote.max_amount) == fast_bridge_l2.allowed_to_bridge()
+    assert quote.available == quote.limit == fast_bridge_l2.limit()
+    assert quote.next_interval == (quote.timestamp // INTERVAL + 1) * INTERVAL
+    assert quote.messaging_cost == l2_messenger.quote_message_fee()
+    assert quote.bridger_cost == bridger.cost()
+    assert quote.cost == fast_bridge_l2.cost()
+    assert (quote.balance, quote.allowance) == (0, 0)
+
+
+def test_quote_after_bridge(l2_lens, fast_bridge_l2, crvusd, dev_deployer, alice):
+    limit = 100 * 10**18
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_limit(limit)
+        fast_bridge_l2.set_messenger(load("tests/mocks/MockMessenger.vy"))
+    boa.deal(crvusd, alice, limit)
+    with boa.env.prank(alice):
+        crvusd.approve(fast_bridge_l2, 2**256 - 1)
+        boa.env.set_balance(alice, fast_bridge_l2.cost())
+        fast_bridge_l2.bridge(crvusd, alice, 60 * 10**18, value=fast_bridge_l2.cost())
+
+    quote = l2_lens.quote(fast_bridge_l2, alice)
+
+    assert quote.available == quote.max_amount == 40 * 10**18
+    assert quote.limit == limit
+    assert quote.balance == crvusd.balanceOf(alice) == 40 * 10**18
+    assert quote.allowance == 2**256 - 1
+
+    boa.env.time_travel(seconds=quote.next_interval - quote.timestamp)
+    assert l2_lens.quote(fast_bridge_l2).available == limit
+
+
+def test_quote_below_min_amount(l2_lens, fast_bridge_l2, dev_deployer):
+    with boa.env.prank(dev_deployer):
+        fast_bridge_l2.set_min_amount(fast_bridge_l2.limit() + 1)
+
+    quote = l2_lens.quote(fast_bridge_l2)
+
+    assert (quote.min_amount, quote.max_amount) == (0, 0)
+    assert quote.available == fast_bridge_l2.limit()
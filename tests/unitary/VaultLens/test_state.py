@@ -0,0 +1,50 @@
+import boa
+
+AMOUNT = 10**20
+
+
+def test_state(vault_lens, fast_bridge_vault, crvusd, minter):
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    minter.set_debt_ceiling(fast_bridge_vault, 5 * AMOUNT, 5 * AMOUNT)
+
+    state = vault_lens.state(fast_bridge_vault)
+
+    assert state.balance == AMOUNT
+    assert (state.debt_ceiling, state.debt_ceiling_residual) == (5 * AMOUNT, 5 * AMOUNT)
+    assert not state.need_to_rug and not state.rug_scheduled and not state.killed
+    assert state.fee == fast_bridge_vault.fee()
+    assert state.fee_receiver == fast_bridge_vault.fee_receiver()
+    assert state.balances == []
+
+
+def test_rug_state(vault_lens, fast_bridge_vault, minter):
+    minter.set_debt_ceiling(fast_bridge_vault, AMOUNT, 2 * AMOUNT)
+    assert vault_lens.state(fast_bridge_vault).need_to_rug
+
+    fast_bridge_vault.schedule_rug()
+    state = vault_lens.state(fast_bridge_vault)
+    assert state.need_to_rug and state.rug_scheduled
+
+
+def test_receiver_balances(vault_lens, fast_bridge_vault, vault_messenger, emergency_dao, alice, bob):
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, AMOUNT)
+    with boa.env.prank(emergency_dao):
+        fast_bridge_vault.set_killed(True)
+
+    state = vault_lens.state(fast_bridge_vault, [bob, alice, bob])
+
+    assert state.balances == [0, AMOUNT, 0]
+    assert state.killed
+
+
+def test_fees_accrued(vault_lens, fast_bridge_vault, crvusd, vault_messenger, curve_dao, alice):
+    boa.deal(crvusd, fast_bridge_vault.address, AMOUNT)
+    with boa.env.prank(curve_dao):
+        fast_bridge_vault.set_fee(10**16)
+    with boa.env.prank(vault_messenger.address):
+        fast_bridge_vault.mint(alice, AMOUNT)
+
+    state = vault_lens.state(fast_bridge_vault, [fast_bridge_vault.fee_receiver()])
+    assert state.fees_accrued == AMOUNT // 100
+    assert state.balances == [0]  # Fees are not an IOU of the fee receiver
@@ -0,0 +1,42 @@
+import boa
+import pytest
+
+L2_EID = 999
+AMOUNT = 10**18
+
+
+@pytest.fixture()
+def origin(dev_deployer, vault_messenger, fast_bridge_vault):
+    peer = boa.eval(f"convert({boa.env.generate_address()}, bytes32)")
+    with boa.env.prank(dev_deployer):
+        vault_messenger.set_vault(fast_bridge_vault.address)
+        vault_messenger.setPeer(L2_EID, peer)
+    return (L2_EID, peer, 1)
+
+
+def test_lz_receive(vault_messenger, fast_bridge_vault, lz_endpoint, origin, alice):
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (alice, AMOUNT, b"\x01" * 32))
+    with boa.env.prank(lz_endpoint.address):
+        vault_messenger.lzReceive(origin, bytes(32), message, lz_endpoint.address, b"")
+        # Same transfer through another messenger
+        vault_messenger.lzReceive(origin, bytes(32), message, lz_endpoint.address, b"")
+    assert fast_bridge_vault.balanceOf(alice) == AMOUNT
+
+
+def test_lz_receive_legacy(vault_messenger, fast_bridge_vault, lz_endpoint, origin, alice):
+    # (to, amount) from an L2MessengerLZ not upgraded yet, never deduplicated
+    message = boa.util.abi.abi_encode("(address,uint256)", (alice, AMOUNT))
+    assert len(message) == 64
+    with boa.env.prank(lz_endpoint.address):
+        vault_messenger.lzReceive(origin, bytes(32), message, lz_endpoint.address, b"")
+        vault_messenger.lzReceive(origin, bytes(32), message, lz_endpoint.address, b"")
+    assert fast_bridge_vault.balanceOf(alice) == 2 * AMOUNT
+
+
+@pytest.mark.parametrize("size", [32, 65, 128])
+def test_lz_receive_bad_message(vault_messenger, lz_endpoint, origin, alice, size):
+    message = boa.util.abi.abi_encode("(address,uint256,bytes32)", (alice, AMOUNT, b"\x01" * 32))
+    message = (message + bytes(32))[:size]
+    with boa.env.prank(lz_endpoint.address):
+        with boa.reverts():
+            vault_messenger.lzReceive(origin, bytes(32), message, lz_endpoint.address, b"")
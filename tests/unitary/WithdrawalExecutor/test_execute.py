@@ -0,0 +1,54 @@
+import boa
+import pytest
+from compile_cache import load
+
+
+@pytest.fixture(scope="module")
+def executor():
+    return load("contracts/WithdrawalExecutor.vy")
+
+
+@pytest.fixture(scope="module")
+def token():
+    return load("tests/mocks/MockERC20.vy")
+
+
+def _approve(token, spender, amount=1):
+    return token.address, 0, token.approve.prepare_calldata(spender, amount)
+
+
+def _transfer(token, receiver, amount):
+    return token.address, 0, token.transfer.prepare_calldata(receiver, amount)
+
+
+def test_execute_all(executor, token, alice, bob):
+    assert executor.execute([_approve(token, alice), _approve(token, bob, 2)]) == [True, True]
+    assert token.allowance(executor, alice) == 1
+    assert token.allowance(executor, bob) == 2
+
+
+def test_failure_does_not_revert_batch(executor, token, alice, bob):
+    boa.deal(token, executor.address, 10)
+    results = executor.execute([_transfer(token, alice, 100), _transfer(token, bob, 10)])
+
+    assert results == [False, True]
+    assert token.balanceOf(alice) == 0
+    assert token.balanceOf(bob) == 10
+    logs = [log for log in executor.get_logs() if type(log).__name__ == "Executed"]
+    assert [(log.index, log.success) for log in logs] == [(0, False), (1, True)]
+    assert all(log.target == token.address for log in logs)
+
+
+def test_gas_per_call(executor, token, alice, bob):
+    target, _, data = _approve(token, alice)
+    assert executor.execute([(target, 1_000, data), (target, 100_000, data)]) == [False, True]
+
+
+def test_not_enough_gas_left(executor, token, alice):
+    target, _, data = _approve(token, alice)
+    with boa.reverts("Out of gas"):
+        executor.execute([(target, 10**9, data)], gas=1_000_000)
+
+
+def test_empty(executor):
+    assert executor.execute([]) == []